@@ -14,15 +14,24 @@ class AttendanceAnalyticsService:
     """Computes attendance analytics, trends, and statistics."""
 
     @staticmethod
-    def get_attendance_trends(period='weekly', weeks_back=12):
+    def get_attendance_trends(period='weekly', weeks_back=12, use_rollups=False):
         """Get attendance trends over time (weekly or monthly counts).
 
+        With use_rollups, closed days come from the daily rollup table and
+        only check-ins after the rollup watermark are counted from raw rows.
+
         Returns list of {'period': date, 'count': int} dicts.
         """
         from .models import AttendanceRecord, AttendanceSession
 
         start_date = timezone.now().date() - timedelta(weeks=weeks_back)
 
+        if use_rollups:
+            from apps.reports.services_rollup import RollupService
+
+            granularity = 'month' if period == 'monthly' else 'week'
+            return RollupService.attendance_trends(granularity, start_date)
+
         records = AttendanceRecord.objects.filter(
             session__date__gte=start_date
         )
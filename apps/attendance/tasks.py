@@ -1,9 +1,11 @@
 """Celery tasks for attendance-based inactivity tracking."""
 import logging
+import time
+from contextlib import contextmanager
 from datetime import timedelta
 
 from celery import shared_task
-from django.db.models import Count
+from django.db.models import Count, Max, Q
 from django.utils import timezone
 
 from apps.core.constants import MembershipStatus, AttendanceSessionType, Roles
@@ -11,77 +13,103 @@ from apps.core.constants import MembershipStatus, AttendanceSessionType, Roles
 logger = logging.getLogger(__name__)
 
 
+BULK_BATCH_SIZE = 500
+
+
+@contextmanager
+def _timed(timings, phase):
+    """Record the wall-clock duration of a block in ``timings[phase]`` (ms)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def _last_attendance():
+    """Aggregate for a member's most recent active check-in."""
+    return Max(
+        'attendance_records__checked_in_at',
+        filter=Q(attendance_records__is_active=True),
+    )
+
+
 @shared_task
 def check_member_inactivity():
     """
     Check member inactivity based on attendance records.
     - 2 months without any attendance -> INACTIVE
     - 6 months inactive -> EXPIRED (must redo onboarding, account conserved)
+
+    Candidates and their last check-in come from a single annotated query;
+    status changes are written with bulk_update.
     """
     from apps.members.models import Member
-    from apps.attendance.models import AttendanceRecord
+    from apps.core.models_extended import SearchDocument
 
     now = timezone.now()
     two_months_ago = now - timedelta(days=60)
     six_months_ago = now - timedelta(days=180)
+    timings = {}
+
+    with _timed(timings, 'query'):
+        # Active members with history but nothing in 2 months, plus every
+        # inactive member (including those demoted in this same run).
+        candidates = list(
+            Member.objects.annotate(last_attendance=_last_attendance())
+            .filter(
+                Q(
+                    membership_status=MembershipStatus.ACTIVE,
+                    last_attendance__lt=two_months_ago,
+                )
+                | Q(membership_status=MembershipStatus.INACTIVE)
+            )
+            .only('id', 'first_name', 'last_name', 'member_number', 'membership_status', 'is_active')
+        )
 
-    total_inactive = 0
-    total_expired = 0
-
-    # Step 1: Active members with no attendance in 2 months -> INACTIVE
-    active_members = Member.objects.filter(
-        membership_status=MembershipStatus.ACTIVE,
-        is_active=True,
-    )
-
-    for member in active_members:
-        last_attendance = AttendanceRecord.objects.filter(
-            member=member,
-            checked_in_at__gte=two_months_ago,
-        ).exists()
-
-        if not last_attendance:
-            # Check they have at least some attendance history (not brand new)
-            has_any_attendance = AttendanceRecord.objects.filter(
-                member=member,
-            ).exists()
-            if has_any_attendance:
+    to_inactive = []
+    to_expired = []
+    with _timed(timings, 'evaluate'):
+        for member in candidates:
+            if member.membership_status == MembershipStatus.ACTIVE:
                 member.membership_status = MembershipStatus.INACTIVE
-                member.save(update_fields=['membership_status', 'updated_at'])
-                total_inactive += 1
+                member.updated_at = now
+                to_inactive.append(member)
                 logger.info(
                     f'Member marked INACTIVE: {member.full_name} '
                     f'({member.member_number})'
                 )
 
-    # Step 2: Inactive members for 6+ months -> EXPIRED
-    inactive_members = Member.objects.filter(
-        membership_status=MembershipStatus.INACTIVE,
-    )
-
-    for member in inactive_members:
-        last_attendance = AttendanceRecord.objects.filter(
-            member=member,
-            checked_in_at__gte=six_months_ago,
-        ).exists()
-
-        if not last_attendance:
-            member.membership_status = MembershipStatus.EXPIRED
-            member.is_active = False
-            member.save(update_fields=[
-                'membership_status', 'is_active', 'updated_at'
-            ])
-            total_expired += 1
-            logger.info(
-                f'Member marked EXPIRED: {member.full_name} '
-                f'({member.member_number})'
-            )
+            if member.last_attendance is None or member.last_attendance < six_months_ago:
+                member.membership_status = MembershipStatus.EXPIRED
+                member.is_active = False
+                member.updated_at = now
+                to_expired.append(member)
+                logger.info(
+                    f'Member marked EXPIRED: {member.full_name} '
+                    f'({member.member_number})'
+                )
 
+    with _timed(timings, 'update'):
+        changed = {member.pk: member for member in to_inactive + to_expired}
+        Member.objects.bulk_update(
+            changed.values(),
+            ['membership_status', 'is_active', 'updated_at'],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        # bulk_update skips post_save, so keep the search index in step
+        SearchDocument.all_objects.filter(
+            category='members',
+            object_id__in=[str(member.pk) for member in to_expired],
+        ).update(is_active=False)
+
+    total_inactive = len(to_inactive)
+    total_expired = len(to_expired)
     logger.info(
         f'Inactivity check: {total_inactive} marked inactive, '
-        f'{total_expired} marked expired.'
+        f'{total_expired} marked expired. Timings (ms): {timings}'
     )
-    return {'inactive': total_inactive, 'expired': total_expired}
+    return {'inactive': total_inactive, 'expired': total_expired, 'timings': timings}
 
 
 @shared_task
@@ -89,13 +117,17 @@ def check_absence_alerts():
     """
     Check for members who missed 3+ worship sessions in the last 30 days.
     Creates AbsenceAlert records and notifies leaders/admins.
+
+    Attended-session counts and last check-in dates come from a single
+    annotated query; alerts and notifications are written in bulk.
     """
     from apps.members.models import Member
-    from apps.attendance.models import AttendanceSession, AttendanceRecord, AbsenceAlert
+    from apps.attendance.models import AttendanceSession, AbsenceAlert
     from apps.communication.models import Notification
 
     now = timezone.now()
     thirty_days_ago = now - timedelta(days=30)
+    timings = {}
 
     # Get all worship sessions in the last 30 days
     recent_sessions = AttendanceSession.objects.filter(
@@ -106,80 +138,97 @@ def check_absence_alerts():
     session_count = recent_sessions.count()
 
     if session_count == 0:
-        return 0
-
-    total_alerts = 0
-
-    # Check active members
-    active_members = Member.objects.filter(
-        membership_status=MembershipStatus.ACTIVE,
-        is_active=True,
-    )
-
-    for member in active_members:
-        # Count sessions this member attended
-        attended = AttendanceRecord.objects.filter(
-            member=member,
-            session__in=recent_sessions,
-        ).count()
-
-        missed = session_count - attended
-        if missed < 3:
-            continue
+        return {'created': 0, 'updated': 0, 'timings': timings}
+
+    with _timed(timings, 'query'):
+        absentees = list(
+            Member.objects.filter(membership_status=MembershipStatus.ACTIVE, is_active=True)
+            .annotate(
+                attended=Count(
+                    'attendance_records',
+                    filter=Q(
+                        attendance_records__is_active=True,
+                        attendance_records__session__in=recent_sessions,
+                    ),
+                ),
+                last_attendance=_last_attendance(),
+            )
+            .filter(attended__lte=session_count - 3)
+            .only('id', 'first_name', 'last_name')
+        )
 
-        # Check if an unacknowledged alert already exists
-        existing_alert = AbsenceAlert.objects.filter(
-            member=member,
+        open_alerts = {}
+        for alert in AbsenceAlert.objects.filter(
+            member__in=[member.pk for member in absentees],
             acknowledged_by__isnull=True,
-        ).first()
-
-        if existing_alert:
-            # Update consecutive count if it increased
-            if missed > existing_alert.consecutive_absences:
-                existing_alert.consecutive_absences = missed
-                existing_alert.save(update_fields=['consecutive_absences', 'updated_at'])
-            continue
-
-        # Get last attendance date
-        last_record = AttendanceRecord.objects.filter(
-            member=member,
-        ).order_by('-checked_in_at').first()
-
-        last_date = last_record.checked_in_at.date() if last_record else None
-
-        # Create alert
-        AbsenceAlert.objects.create(
-            member=member,
-            consecutive_absences=missed,
-            last_attendance_date=last_date,
-            alert_sent=True,
-            alert_sent_at=now,
-        )
+        ):
+            open_alerts.setdefault(alert.member_id, alert)
 
-        # Notify admins and pastors
-        leaders = Member.objects.filter(
+        leaders = list(Member.objects.filter(
             role__in=[Roles.ADMIN, Roles.PASTOR],
             is_active=True,
-        )
-        for leader in leaders:
-            Notification.objects.create(
-                member=leader,
-                title=f"Alerte d'absence: {member.full_name}",
-                message=(
-                    f'{member.full_name} a manqué {missed} cultes '
-                    f'au cours des 30 derniers jours.'
+        ).only('id'))
+
+    alerts_to_update = []
+    alerts_to_create = []
+    notifications = []
+    with _timed(timings, 'evaluate'):
+        for member in absentees:
+            missed = session_count - member.attended
+
+            existing_alert = open_alerts.get(member.pk)
+            if existing_alert:
+                # Update consecutive count if it increased
+                if missed > existing_alert.consecutive_absences:
+                    existing_alert.consecutive_absences = missed
+                    existing_alert.updated_at = now
+                    alerts_to_update.append(existing_alert)
+                continue
+
+            alerts_to_create.append(AbsenceAlert(
+                member=member,
+                consecutive_absences=missed,
+                last_attendance_date=(
+                    member.last_attendance.date() if member.last_attendance else None
                 ),
-                notification_type='attendance',
-                link='/attendance/alerts/',
+                alert_sent=True,
+                alert_sent_at=now,
+            ))
+
+            # Notify admins and pastors
+            for leader in leaders:
+                notifications.append(Notification(
+                    member=leader,
+                    title=f"Alerte d'absence: {member.full_name}",
+                    message=(
+                        f'{member.full_name} a manqué {missed} cultes '
+                        f'au cours des 30 derniers jours.'
+                    ),
+                    notification_type='attendance',
+                    link='/attendance/alerts/',
+                ))
+
+            logger.info(
+                f'Absence alert created for {member.full_name}: '
+                f'{missed} missed sessions'
             )
 
-        total_alerts += 1
-        logger.info(
-            f'Absence alert created for {member.full_name}: '
-            f'{missed} missed sessions'
+    with _timed(timings, 'write'):
+        AbsenceAlert.objects.bulk_update(
+            alerts_to_update,
+            ['consecutive_absences', 'updated_at'],
+            batch_size=BULK_BATCH_SIZE,
         )
+        AbsenceAlert.objects.bulk_create(alerts_to_create, batch_size=BULK_BATCH_SIZE)
+        Notification.objects.bulk_create(notifications, batch_size=BULK_BATCH_SIZE)
 
-    return total_alerts
+    total_created = len(alerts_to_create)
+    total_updated = len(alerts_to_update)
+    logger.info(
+        f'Absence check: {total_created} alerts created, '
+        f'{total_updated} updated. Timings (ms): {timings}'
+    )
+    return {'created': total_created, 'updated': total_updated, 'timings': timings}
 
 
 @shared_task
@@ -104,6 +104,23 @@ class TestCheckMemberInactivity:
         member.refresh_from_db()
         assert member.membership_status == MembershipStatus.SUSPENDED
 
+    def test_active_absent_for_6_months_expires_in_same_run(self):
+        member = MemberFactory(membership_status=MembershipStatus.ACTIVE)
+        record = AttendanceRecordFactory(member=member, session=AttendanceSessionFactory())
+        from apps.attendance.models import AttendanceRecord
+        AttendanceRecord.objects.filter(pk=record.pk).update(
+            checked_in_at=timezone.now() - timedelta(days=210)
+        )
+
+        result = check_member_inactivity()
+        member = type(member).all_objects.get(pk=member.pk)
+        assert member.membership_status == MembershipStatus.EXPIRED
+        assert result == {'inactive': 1, 'expired': 1, 'timings': result['timings']}
+
+    def test_reports_phase_timings(self):
+        result = check_member_inactivity()
+        assert set(result['timings']) == {'query', 'evaluate', 'update'}
+
 
 @pytest.mark.django_db
 class TestCheckAbsenceAlerts:
@@ -129,7 +146,7 @@ class TestCheckAbsenceAlerts:
     def test_no_sessions_returns_zero(self):
         """No worship sessions in 30 days → no alerts."""
         result = check_absence_alerts()
-        assert result == 0
+        assert result['created'] == 0
 
     def test_member_attending_all_sessions_no_alert(self):
         """Member attending all sessions gets no alert."""
@@ -139,7 +156,7 @@ class TestCheckAbsenceAlerts:
             AttendanceRecordFactory(member=member, session=s)
 
         result = check_absence_alerts()
-        assert result == 0
+        assert result['created'] == 0
         assert AbsenceAlert.objects.filter(member=member).count() == 0
 
     def test_member_missing_2_sessions_no_alert(self):
@@ -151,7 +168,7 @@ class TestCheckAbsenceAlerts:
         AttendanceRecordFactory(member=member, session=sessions[1])
 
         result = check_absence_alerts()
-        assert result == 0
+        assert result['created'] == 0
 
     def test_member_missing_3_sessions_gets_alert(self):
         """Member missing 3+ sessions gets an absence alert."""
@@ -162,7 +179,7 @@ class TestCheckAbsenceAlerts:
 
         result = check_absence_alerts()
 
-        assert result == 1
+        assert result['created'] == 1
         alert = AbsenceAlert.objects.get(member=member)
         assert alert.consecutive_absences == 3
         assert alert.alert_sent is True
@@ -198,7 +215,7 @@ class TestCheckAbsenceAlerts:
 
         # Second run does NOT create duplicate
         result = check_absence_alerts()
-        assert result == 0
+        assert result['created'] == 0
         assert AbsenceAlert.objects.filter(member=member).count() == 1
 
     def test_alert_updates_count_if_increased(self):
@@ -225,9 +242,31 @@ class TestCheckAbsenceAlerts:
         member = MemberFactory(membership_status=MembershipStatus.INACTIVE)
 
         result = check_absence_alerts()
-        assert result == 0
+        assert result['created'] == 0
         assert AbsenceAlert.objects.filter(member=member).count() == 0
 
+    def test_deactivated_members_not_checked_or_notified(self):
+        """Deactivated members get no alert and deactivated leaders no notification."""
+        self._create_worship_sessions(4)
+        member = MemberFactory(membership_status=MembershipStatus.ACTIVE, is_active=False)
+        admin = MemberFactory(role=Roles.ADMIN, is_active=False)
+        MemberFactory(membership_status=MembershipStatus.ACTIVE)
+
+        result = check_absence_alerts()
+
+        assert result['created'] == 1
+        assert not AbsenceAlert.objects.filter(member=member).exists()
+        assert not Notification.objects.filter(member=admin).exists()
+
+    def test_returns_phase_timings(self):
+        """Like check_member_inactivity, the result carries per-phase timings."""
+        self._create_worship_sessions(3)
+        MemberFactory(membership_status=MembershipStatus.ACTIVE)
+
+        result = check_absence_alerts()
+
+        assert set(result['timings']) == {'query', 'evaluate', 'write'}
+
     def test_last_attendance_date_set(self):
         """Alert records the member's last attendance date."""
         sessions = self._create_worship_sessions(4)
@@ -254,3 +293,16 @@ class TestCheckAbsenceAlerts:
         assert notif is not None
         assert notif.notification_type == 'attendance'
         assert notif.link == '/attendance/alerts/'
+
+    def test_query_count_independent_of_member_count(self, django_assert_max_num_queries):
+        """Alerts and notifications for many members are written in bulk."""
+        self._create_worship_sessions(3)
+        MemberFactory.create_batch(5, membership_status=MembershipStatus.ACTIVE)
+        MemberFactory(role=Roles.ADMIN, membership_status=MembershipStatus.REGISTERED)
+        MemberFactory(role=Roles.PASTOR, membership_status=MembershipStatus.REGISTERED)
+
+        with django_assert_max_num_queries(7):
+            result = check_absence_alerts()
+
+        assert result['created'] == 5
+        assert Notification.objects.filter(notification_type='attendance').count() == 10
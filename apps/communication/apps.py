@@ -6,3 +6,6 @@ class CommunicationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.communication'
     verbose_name = 'Communication'
+
+    def ready(self):
+        import apps.communication.signals  # noqa: F401
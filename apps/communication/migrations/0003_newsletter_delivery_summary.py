@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communication", "0002_emailtemplate_smstemplate_abtest_automation_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsletter",
+            name="delivery_summary",
+            field=models.JSONField(
+                blank=True, default=dict, verbose_name="Résumé de l'envoi"
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:05
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communication", "0003_newsletter_delivery_summary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewsletterOpen",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Indique si cet enregistrement est actif",
+                        verbose_name="Actif",
+                    ),
+                ),
+                (
+                    "recipient_id",
+                    models.UUIDField(verbose_name="Destinataire"),
+                ),
+            ],
+            options={
+                "verbose_name": "Ouverture en attente",
+                "verbose_name_plural": "Ouvertures en attente",
+                "ordering": ["created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:10
+
+from django.db import migrations, models
+
+
+def tag_reengagement_notifications(apps, schema_editor):
+    """Re-engagement notifications used to be GENERAL and deduplicated by title."""
+    Notification = apps.get_model("communication", "Notification")
+    Notification.objects.filter(
+        notification_type="general", title="Vous nous manquez!",
+    ).update(notification_type="reengagement")
+
+
+def untag_reengagement_notifications(apps, schema_editor):
+    Notification = apps.get_model("communication", "Notification")
+    Notification.objects.filter(notification_type="reengagement").update(
+        notification_type="general",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communication", "0004_newsletteropen"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="notification",
+            name="notification_type",
+            field=models.CharField(
+                choices=[
+                    ("birthday", "Anniversaire"),
+                    ("event", "Rappel d'événement"),
+                    ("volunteer", "Rappel de bénévolat"),
+                    ("help_request", "Mise à jour de requête"),
+                    ("donation", "Reçu de don"),
+                    ("general", "Général"),
+                    ("reengagement", "Relance"),
+                ],
+                default="general",
+                max_length=50,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["member", "notification_type", "created_at"],
+                name="communicati_member__38235b_idx",
+            ),
+        ),
+        migrations.RunPython(
+            tag_reengagement_notifications, untag_reengagement_notifications,
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communication", "0005_notification_reengagement_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="automationenrollment",
+            name="claimed_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Bail du processeur d'étapes; expiré, l'inscription peut être reprise.",
+                null=True,
+                verbose_name="Réservée jusqu'au",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="automationenrollment",
+            index=models.Index(
+                fields=["status", "next_step_at"], name="communicati_status_adac0a_idx"
+            ),
+        ),
+    ]
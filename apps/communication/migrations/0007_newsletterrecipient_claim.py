@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communication", "0006_automationenrollment_claimed_until"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsletterrecipient",
+            name="claim_token",
+            field=models.UUIDField(
+                blank=True, null=True, verbose_name="Jeton de réservation"
+            ),
+        ),
+        migrations.AddField(
+            model_name="newsletterrecipient",
+            name="claimed_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Bail de la tâche d'envoi; expiré, le destinataire peut être repris.",
+                null=True,
+                verbose_name="Réservé jusqu'au",
+            ),
+        ),
+    ]
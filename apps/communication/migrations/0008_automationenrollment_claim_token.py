@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("communication", "0007_newsletterrecipient_claim"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="automationenrollment",
+            name="claim_token",
+            field=models.UUIDField(
+                blank=True, null=True, verbose_name="Jeton de réservation"
+            ),
+        ),
+    ]
@@ -1,7 +1,8 @@
 """Communication models."""
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from apps.core.models import BaseModel
+from apps.core.models import ActiveManager, BaseModel
 from apps.core.constants import (
     NewsletterStatus, NotificationType, SMSStatus, AutomationTrigger,
     AutomationStepChannel, AutomationStatus, ABTestStatus,
@@ -22,6 +23,7 @@ class Newsletter(BaseModel):
     target_groups = models.ManyToManyField('members.Group', blank=True, related_name='newsletters', verbose_name=_('Groupes cibles'))
     recipients_count = models.PositiveIntegerField(default=0, verbose_name=_('Destinataires'))
     opened_count = models.PositiveIntegerField(default=0, verbose_name=_('Ouvertures'))
+    delivery_summary = models.JSONField(default=dict, blank=True, verbose_name=_('Résumé de l\'envoi'))
 
     class Meta:
         verbose_name = _('Infolettre')
@@ -41,6 +43,11 @@ class NewsletterRecipient(BaseModel):
     opened_at = models.DateTimeField(null=True, blank=True)
     failed = models.BooleanField(default=False)
     failure_reason = models.TextField(blank=True)
+    claim_token = models.UUIDField(null=True, blank=True, verbose_name=_('Jeton de réservation'))
+    claimed_until = models.DateTimeField(
+        null=True, blank=True, verbose_name=_('Réservé jusqu\'au'),
+        help_text=_('Bail de la tâche d\'envoi; expiré, le destinataire peut être repris.'),
+    )
 
     class Meta:
         verbose_name = _('Destinataire')
@@ -48,6 +55,44 @@ class NewsletterRecipient(BaseModel):
         unique_together = ['newsletter', 'member']
 
 
+class NewsletterOpen(BaseModel):
+    """
+    Append-only buffer of tracking-pixel hits.
+
+    Opens are inserted here without touching the Newsletter or recipient
+    rows; ``NewsletterOpenService.flush`` folds them into
+    ``NewsletterRecipient.opened_at`` and ``Newsletter.opened_count``.
+    """
+    recipient_id = models.UUIDField(verbose_name=_('Destinataire'))
+
+    class Meta:
+        verbose_name = _('Ouverture en attente')
+        verbose_name_plural = _('Ouvertures en attente')
+        ordering = ['created_at']
+
+
+class NotificationManager(ActiveManager):
+    """Keeps the cached unread counters in step with bulk writes."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from .services_unread import UnreadCountService
+
+        created = super().bulk_create(objs, *args, **kwargs)
+        UnreadCountService.record_created(created)
+        return created
+
+    def mark_read(self, member, ids=None):
+        """Mark the member's unread notifications (or only ``ids``) as read."""
+        from .services_unread import UnreadCountService
+
+        notifications = self.filter(member=member, is_read=False)
+        if ids is not None:
+            notifications = notifications.filter(id__in=ids)
+        count = notifications.update(is_read=True, read_at=timezone.now())
+        UnreadCountService.adjust(member, -count)
+        return count
+
+
 class Notification(BaseModel):
     """In-app notification for a member."""
     member = models.ForeignKey('members.Member', on_delete=models.CASCADE, related_name='notifications')
@@ -58,10 +103,15 @@ class Notification(BaseModel):
     is_read = models.BooleanField(default=False, verbose_name=_('Lu'))
     read_at = models.DateTimeField(null=True, blank=True)
 
+    objects = NotificationManager()
+
     class Meta:
         verbose_name = _('Notification')
         verbose_name_plural = _('Notifications')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['member', 'notification_type', 'created_at']),
+        ]
 
 
 class NotificationPreference(BaseModel):
@@ -273,11 +323,19 @@ class AutomationEnrollment(BaseModel):
     started_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Débuté le'))
     completed_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Terminé le'))
     next_step_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Prochaine étape le'))
+    claimed_until = models.DateTimeField(
+        null=True, blank=True, verbose_name=_('Réservée jusqu\'au'),
+        help_text=_('Bail du processeur d\'étapes; expiré, l\'inscription peut être reprise.'),
+    )
+    claim_token = models.UUIDField(null=True, blank=True, verbose_name=_('Jeton de réservation'))
 
     class Meta:
         verbose_name = _('Inscription d\'automatisation')
         verbose_name_plural = _('Inscriptions d\'automatisation')
         unique_together = ['automation', 'member']
+        indexes = [
+            models.Index(fields=['status', 'next_step_at']),
+        ]
 
     def __str__(self):
         return f'{self.member} - {self.automation.name} (étape {self.current_step})'
@@ -1,6 +1,11 @@
 """Automation service for drip campaigns and triggered sequences."""
 import logging
+from collections import defaultdict
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min, Q
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -16,6 +21,11 @@ class AutomationService:
     Handles enrolling members, advancing steps, and completing automations.
     """
 
+    PROGRESS_FIELDS = [
+        'current_step', 'next_step_at', 'status', 'completed_at',
+        'claimed_until', 'claim_token', 'updated_at',
+    ]
+
     def trigger(self, trigger_type, member):
         """
         Enroll a member in all active automations matching the given trigger type.
@@ -71,30 +81,30 @@ class AutomationService:
         Returns:
             True if advanced, False if automation is complete or invalid.
         """
-        from .models import AutomationStep
-
         if enrollment.status != AutomationStatus.ACTIVE:
             return False
 
         steps = list(enrollment.automation.steps.order_by('order'))
-        if enrollment.current_step >= len(steps):
-            self.complete(enrollment)
-            return False
+        if enrollment.current_step < len(steps):
+            self._execute_step(steps[enrollment.current_step], enrollment.member)
 
-        step = steps[enrollment.current_step]
-        self._execute_step(step, enrollment.member)
+        advanced = self._advance(enrollment, steps, timezone.now())
+        enrollment.save(update_fields=self.PROGRESS_FIELDS)
+        return advanced
 
-        # Move to next step
+    def _advance(self, enrollment, steps, now):
+        """Move an enrollment past its current step in memory. Returns False if nothing was left to run."""
+        enrollment.claimed_until = None
+        enrollment.claim_token = None
         next_index = enrollment.current_step + 1
-        if next_index >= len(steps):
-            self.complete(enrollment)
-            return True
+        if enrollment.current_step >= len(steps) or next_index >= len(steps):
+            enrollment.status = AutomationStatus.COMPLETED
+            enrollment.completed_at = now
+            logger.info("Enrollment %s completed.", enrollment.pk)
+            return enrollment.current_step < len(steps)
 
-        next_step = steps[next_index]
         enrollment.current_step = next_index
-        enrollment.next_step_at = timezone.now() + timezone.timedelta(days=next_step.delay_days)
-        enrollment.save(update_fields=['current_step', 'next_step_at', 'updated_at'])
-
+        enrollment.next_step_at = now + timezone.timedelta(days=steps[next_index].delay_days)
         logger.info(
             "Enrollment %s advanced to step %d",
             enrollment.pk, next_index,
@@ -114,30 +124,223 @@ class AutomationService:
         enrollment.save(update_fields=['status', 'updated_at'])
         logger.info("Enrollment %s cancelled.", enrollment.pk)
 
-    def process_pending_steps(self):
+    # ── batched step processing ─────────────────────────────────────────────
+
+    @staticmethod
+    def batch_size():
+        return getattr(settings, 'AUTOMATION_BATCH_SIZE', 200)
+
+    @staticmethod
+    def claim_timeout():
+        """Seconds a claimed batch may take before other workers may reclaim it."""
+        return getattr(settings, 'AUTOMATION_CLAIM_TIMEOUT', 900)
+
+    @staticmethod
+    def _due(now):
+        from .models import AutomationEnrollment
+
+        return AutomationEnrollment.objects.filter(
+            status=AutomationStatus.ACTIVE,
+            next_step_at__lte=now,
+        ).filter(Q(claimed_until__isnull=True) | Q(claimed_until__lt=now))
+
+    @staticmethod
+    def _steps_by_automation(automation_ids):
+        """Ordered steps per automation id, in one query."""
+        from .models import AutomationStep
+
+        steps = {}
+        for step in AutomationStep.objects.filter(automation_id__in=automation_ids).order_by('order'):
+            steps.setdefault(step.automation_id, []).append(step)
+        return steps
+
+    def claim_due(self, limit):
         """
-        Process all enrollments whose next_step_at has passed.
-        Intended to be called by a periodic Celery task.
+        Lease up to ``limit`` due enrollments to the caller.
 
-        Returns:
-            Number of steps processed.
+        Rows locked by a concurrent claim are skipped rather than waited
+        on, and the lease outlives the transaction, so overlapping runs
+        never pick up the same enrollment.
+        Returns (claim_token, rows) with rows as (pk, automation_id, current_step).
         """
+        import uuid
+
         from .models import AutomationEnrollment
 
         now = timezone.now()
-        pending = AutomationEnrollment.objects.filter(
-            status=AutomationStatus.ACTIVE,
-            next_step_at__lte=now,
-        ).select_related('automation', 'member')
+        token = uuid.uuid4()
+        with transaction.atomic():
+            claimed = list(
+                self._due(now)
+                .select_for_update(skip_locked=True)
+                .order_by('next_step_at')
+                .values_list('pk', 'automation_id', 'current_step')[:limit]
+            )
+            if claimed:
+                AutomationEnrollment.objects.filter(pk__in=[row[0] for row in claimed]).update(
+                    claimed_until=now + timezone.timedelta(seconds=self.claim_timeout()),
+                    claim_token=token,
+                )
+        return token, claimed
+
+    def _group_by_channel(self, claimed):
+        steps = self._steps_by_automation({automation_id for _pk, automation_id, _step in claimed})
+        groups = defaultdict(list)
+        for pk, automation_id, current_step in claimed:
+            automation_steps = steps.get(automation_id, [])
+            channel = (
+                automation_steps[current_step].channel
+                if current_step < len(automation_steps) else None
+            )
+            groups[channel].append(str(pk))
+        return groups
+
+    def process_batch(self, enrollment_ids, claim_token):
+        """
+        Run the current step of each claimed enrollment and advance it.
+
+        Only rows still leased to ``claim_token`` are run: they are locked
+        with SKIP LOCKED before sending, and a batch that sat in the queue
+        past its lease (and was reclaimed by a later run) finds nothing.
+        Sends are grouped per channel so in-app and SMS rows are written
+        with bulk_create and push/SMS go through the concurrent fan-out;
+        progress is saved with one bulk_update that also releases the
+        claims. A worker dying mid-batch leaves the claims to expire, so
+        delivery is at-least-once.
+        Returns the number of steps executed.
+        """
+        with transaction.atomic():
+            return self._process_claimed(enrollment_ids, claim_token)
+
+    def _process_claimed(self, enrollment_ids, claim_token):
+        from .models import AutomationEnrollment
+
+        enrollments = list(
+            AutomationEnrollment.objects.filter(
+                pk__in=enrollment_ids,
+                status=AutomationStatus.ACTIVE,
+                claim_token=claim_token,
+                claimed_until__gte=timezone.now(),
+            ).select_for_update(skip_locked=True, of=('self',)).select_related('member')
+        )
+        if not enrollments:
+            return 0
+        steps = self._steps_by_automation({e.automation_id for e in enrollments})
+
+        by_channel = defaultdict(list)
+        for enrollment in enrollments:
+            automation_steps = steps.get(enrollment.automation_id, [])
+            if enrollment.current_step < len(automation_steps):
+                step = automation_steps[enrollment.current_step]
+                by_channel[step.channel].append((step, enrollment.member))
+        for channel, pairs in by_channel.items():
+            self._execute_batch(channel, pairs)
+            self._record_throughput(channel, len(pairs))
+
+        now = timezone.now()
+        processed = 0
+        for enrollment in enrollments:
+            if self._advance(enrollment, steps.get(enrollment.automation_id, []), now):
+                processed += 1
+            enrollment.updated_at = now
+        AutomationEnrollment.objects.bulk_update(enrollments, self.PROGRESS_FIELDS)
+        return processed
+
+    def process_pending_steps(self, dispatch=False, max_batches=50):
+        """
+        Process all enrollments whose next_step_at has passed.
+        Intended to be called by a periodic Celery task.
+
+        Due enrollments are claimed ``AUTOMATION_BATCH_SIZE`` at a time.
+        With ``dispatch`` each claimed batch is split per channel and
+        handed to ``process_automation_batch`` tasks so channels run in
+        parallel on the workers; otherwise batches are processed inline.
+
+        Returns:
+            Number of steps processed (or queued, when dispatching).
+        """
+        from .tasks import process_automation_batch
 
         count = 0
-        for enrollment in pending:
-            if self.advance_step(enrollment):
-                count += 1
+        for _batch in range(max_batches):
+            token, claimed = self.claim_due(self.batch_size())
+            if not claimed:
+                break
+            if not dispatch:
+                count += self.process_batch([row[0] for row in claimed], token)
+                continue
+            for channel, ids in self._group_by_channel(claimed).items():
+                process_automation_batch.delay(channel, ids, str(token))
+            count += len(claimed)
 
-        logger.info("Processed %d pending automation steps.", count)
+        logger.info(
+            "%s %d pending automation steps.", 'Queued' if dispatch else 'Processed', count,
+        )
         return count
 
+    # ── metrics ─────────────────────────────────────────────────────────────
+
+    THROUGHPUT_PREFIX = 'communication:automation:sent'
+
+    @classmethod
+    def _throughput_key(cls, channel, hour):
+        return f"{cls.THROUGHPUT_PREFIX}:{channel}:{hour:%Y%m%d%H}"
+
+    @classmethod
+    def _record_throughput(cls, channel, count):
+        key = cls._throughput_key(channel, timezone.now())
+        cache.add(key, 0, 2 * 3600)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            cache.set(key, count, 2 * 3600)
+
+    def metrics(self):
+        """
+        Scheduling health of the step processor.
+
+        ``due`` counts active enrollments past their next_step_at
+        (``claimed`` of them are leased to a worker), ``lag_seconds`` is
+        how far behind schedule the oldest unclaimed one is, and
+        ``throughput`` holds steps executed per channel in the current
+        and previous clock hour.
+        """
+        from .models import AutomationEnrollment
+
+        now = timezone.now()
+        unclaimed = Q(claimed_until__isnull=True) | Q(claimed_until__lt=now)
+        stats = AutomationEnrollment.objects.filter(
+            status=AutomationStatus.ACTIVE, next_step_at__lte=now,
+        ).aggregate(
+            due=Count('pk'),
+            claimed=Count('pk', filter=~unclaimed),
+            oldest=Min('next_step_at', filter=unclaimed),
+        )
+
+        hours = {'current_hour': now, 'previous_hour': now - timezone.timedelta(hours=1)}
+        keys = {
+            (label, channel): self._throughput_key(channel, hour)
+            for label, hour in hours.items()
+            for channel, _label in AutomationStepChannel.CHOICES
+        }
+        counts = cache.get_many(list(keys.values()))
+        throughput = {
+            label: {
+                channel: counts.get(keys[(label, channel)], 0)
+                for channel, _label in AutomationStepChannel.CHOICES
+            }
+            for label in hours
+        }
+
+        return {
+            'due': stats['due'],
+            'claimed': stats['claimed'],
+            'lag_seconds': (
+                int((now - stats['oldest']).total_seconds()) if stats['oldest'] else 0
+            ),
+            'throughput': throughput,
+        }
+
     def _execute_step(self, step, member):
         """
         Execute a single automation step by sending through the appropriate channel.
@@ -155,6 +358,50 @@ class AutomationService:
         else:
             logger.warning("Unknown channel '%s' for step %s", channel, step.pk)
 
+    def _execute_batch(self, channel, pairs):
+        """Execute many (step, member) pairs that share a channel."""
+        from apps.core.constants import NotificationType
+        from .models import Notification, PushSubscription, SMSMessage
+        from .services_push import WebPushService
+        from .services_sms import TwilioSMSService
+
+        if channel == AutomationStepChannel.IN_APP:
+            Notification.objects.bulk_create([
+                Notification(
+                    member=member,
+                    title=step.subject,
+                    message=step.body,
+                    notification_type=NotificationType.GENERAL,
+                )
+                for step, member in pairs
+            ])
+        elif channel == AutomationStepChannel.SMS:
+            sms_messages = []
+            for step, member in pairs:
+                if not member.phone:
+                    logger.warning("No phone for member %s, skipping SMS step.", member.pk)
+                    continue
+                sms_messages.append(SMSMessage(
+                    recipient_member=member,
+                    phone_number=member.phone,
+                    body=step.body,
+                ))
+            SMSMessage.objects.bulk_create(sms_messages)
+            TwilioSMSService().bulk_send(sms_messages)
+        elif channel == AutomationStepChannel.PUSH:
+            members_by_step = defaultdict(list)
+            for step, member in pairs:
+                members_by_step[step].append(member.pk)
+            service = WebPushService()
+            for step, member_ids in members_by_step.items():
+                service.send_many(
+                    PushSubscription.objects.filter(member_id__in=member_ids, is_active=True),
+                    step.subject, step.body,
+                )
+        else:
+            for step, member in pairs:
+                self._execute_step(step, member)
+
     def _send_email(self, step, member):
         """Send an email for an automation step (stub)."""
         logger.info(
@@ -0,0 +1,183 @@
+"""Batched in-app, SMS and push messaging for scheduled member campaigns."""
+import logging
+from itertools import islice
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class BatchMessagingService:
+    """
+    Send the same kind of message to many members with a fixed number of queries.
+
+    Members are processed ``batch_size`` at a time. For each batch the
+    notification preferences (and, when deduplicating, recent
+    notifications) are fetched with one query each, Notification and
+    SMSMessage rows are written with bulk_create, and the external sends
+    go through the concurrent push/SMS fan-out.
+
+    ``title``, ``message`` and ``sms_body`` may be strings or callables
+    taking the member; push title/body are shared by the whole campaign.
+    """
+
+    MEMBER_FIELDS = ['pk', 'user', 'first_name', 'last_name', 'phone']
+
+    @staticmethod
+    def _render(value, member):
+        return value(member) if callable(value) else value
+
+    @staticmethod
+    def _batches(members, batch_size):
+        if hasattr(members, 'iterator'):
+            members = members.iterator(chunk_size=batch_size)
+        members = iter(members)
+        while batch := list(islice(members, batch_size)):
+            yield batch
+
+    @staticmethod
+    def preferences(member_ids):
+        """NotificationPreference per member id, in one query."""
+        from .models import NotificationPreference
+
+        return {
+            pref.member_id: pref
+            for pref in NotificationPreference.objects.filter(member_id__in=member_ids)
+        }
+
+    @staticmethod
+    def recently_notified(member_ids, notification_type, since):
+        """Ids of members who already got a ``notification_type`` notification since ``since``."""
+        from .models import Notification
+
+        return set(
+            Notification.objects.filter(
+                member_id__in=member_ids,
+                notification_type=notification_type,
+                created_at__gte=since,
+            ).values_list('member_id', flat=True)
+        )
+
+    @classmethod
+    def deliver(cls, members, notification_type, title, message, sms_body=None,
+                push_title=None, push_body=None, skip_notified_since=None, batch_size=500):
+        """
+        Notify every member in-app, and by SMS/push where their preferences allow.
+
+        With ``skip_notified_since``, members who already received a
+        notification of this type since that moment are skipped.
+        Returns the number of members notified.
+        """
+        from .models import Notification, PushSubscription, SMSMessage
+        from .services_push import WebPushService
+        from .services_sms import TwilioSMSService
+
+        total = 0
+        for batch in cls._batches(members, batch_size):
+            if skip_notified_since is not None:
+                done = cls.recently_notified(
+                    [member.pk for member in batch], notification_type, skip_notified_since,
+                )
+                batch = [member for member in batch if member.pk not in done]
+                if not batch:
+                    continue
+
+            prefs = {}
+            if sms_body is not None or push_title is not None:
+                prefs = cls.preferences([member.pk for member in batch])
+
+            sms_messages = [
+                SMSMessage(
+                    recipient_member=member,
+                    phone_number=member.phone,
+                    body=cls._render(sms_body, member),
+                )
+                for member in batch
+                if sms_body is not None and member.phone
+                and member.pk in prefs and prefs[member.pk].sms_enabled
+            ]
+            push_member_ids = [
+                member.pk for member in batch
+                if push_title is not None
+                and member.pk in prefs and prefs[member.pk].push_enabled
+            ]
+
+            with transaction.atomic():
+                Notification.objects.bulk_create([
+                    Notification(
+                        member=member,
+                        title=cls._render(title, member),
+                        message=cls._render(message, member),
+                        notification_type=notification_type,
+                    )
+                    for member in batch
+                ])
+                SMSMessage.objects.bulk_create(sms_messages)
+
+            if sms_messages:
+                TwilioSMSService().bulk_send(sms_messages)
+            if push_member_ids:
+                WebPushService().send_many(
+                    PushSubscription.objects.filter(member_id__in=push_member_ids, is_active=True),
+                    push_title, push_body or '',
+                )
+
+            total += len(batch)
+            logger.info(
+                "%s batch: %d notifications, %d SMS, %d push recipients",
+                notification_type, len(batch), len(sms_messages), len(push_member_ids),
+            )
+        return total
+
+    @classmethod
+    def deliver_notifications(cls, notification_ids):
+        """
+        Send existing in-app notifications by SMS/push where preferences allow.
+
+        Used for notifications that were already written in bulk (e.g. the
+        reminder engine): preferences are fetched with one query, SMSMessage
+        rows are written with one bulk_create and each push subscription
+        gets its own notification's title, message and link.
+        Returns (sms_count, push_count).
+        """
+        from .models import Notification, PushSubscription, SMSMessage
+        from .services_push import WebPushService
+        from .services_sms import TwilioSMSService
+
+        notifications = list(
+            Notification.objects.filter(pk__in=notification_ids).select_related('member')
+        )
+        if not notifications:
+            return 0, 0
+        prefs = cls.preferences({n.member_id for n in notifications})
+
+        sms_messages = [
+            SMSMessage(
+                recipient_member=n.member,
+                phone_number=n.member.phone,
+                body=n.message,
+            )
+            for n in notifications
+            if n.member.phone and n.member_id in prefs and prefs[n.member_id].sms_enabled
+        ]
+        by_member = {}
+        for n in notifications:
+            if n.member_id in prefs and prefs[n.member_id].push_enabled:
+                by_member.setdefault(n.member_id, []).append(n)
+
+        SMSMessage.objects.bulk_create(sms_messages)
+        if sms_messages:
+            TwilioSMSService().bulk_send(sms_messages)
+        pushed = 0
+        if by_member:
+            pushed = WebPushService().send_each([
+                (sub, n.title, n.message, n.link)
+                for sub in PushSubscription.objects.filter(member_id__in=by_member, is_active=True)
+                for n in by_member[sub.member_id]
+            ])
+
+        logger.info(
+            "Notification channels: %d notifications, %d SMS, %d push sent",
+            len(notifications), len(sms_messages), pushed,
+        )
+        return len(sms_messages), pushed
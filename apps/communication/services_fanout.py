@@ -0,0 +1,58 @@
+"""Bounded, rate-limited concurrency for push and SMS delivery."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RateLimiter:
+    """
+    Thread-safe pacing shared by every worker of one sender.
+
+    Hands out send slots ``1 / rate`` seconds apart; a rate of 0 disables
+    throttling.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ConcurrentSender:
+    """
+    Run a provider call for many items on a bounded thread pool.
+
+    ``send`` runs on worker threads, so it must only do network I/O on
+    data loaded beforehand: callers prefetch everything they need and
+    write results back in bulk once ``map`` returns. ``send`` is expected
+    to handle its own provider errors; anything it raises propagates.
+    """
+
+    def __init__(self, workers, rate=0):
+        self.workers = max(int(workers), 1)
+        self.limiter = RateLimiter(rate)
+
+    def _call(self, send, item):
+        self.limiter.wait()
+        return send(item)
+
+    def map(self, send, items):
+        """Return ``[send(item) for item in items]``, computed concurrently."""
+        items = list(items)
+        if self.workers == 1 or len(items) <= 1:
+            return [self._call(send, item) for item in items]
+        with ThreadPoolExecutor(
+            max_workers=min(self.workers, len(items)),
+            thread_name_prefix='communication-fanout',
+        ) as pool:
+            return list(pool.map(lambda item: self._call(send, item), items))
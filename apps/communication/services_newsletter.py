@@ -0,0 +1,376 @@
+"""Batched newsletter delivery."""
+import logging
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from apps.core.constants import NewsletterStatus
+
+logger = logging.getLogger(__name__)
+
+
+class NewsletterDeliveryService:
+    """
+    Deliver a newsletter in chunks over reused SMTP connections.
+
+    ``start`` resolves the audience once and writes one NewsletterRecipient
+    row per member; ``send_newsletter_task`` then fans the unsent rows out
+    to ``send_newsletter_chunk`` tasks. Each chunk opens one connection,
+    sends at most ``NEWSLETTER_SEND_RATE`` messages per second and records
+    results every ``PROGRESS_BATCH`` messages. A recipient counts as pending
+    until its ``sent_at`` or ``failed`` is set, so re-running the fan-out
+    after a worker crash only resends what was never recorded.
+
+    Queued recipients are leased to their chunk (``claim_token`` plus
+    ``claimed_until``, covering the chunk's countdown), so a fan-out that
+    resumes a stalled newsletter skips chunks still waiting in the queue,
+    and a chunk only sends the rows it still holds.
+    """
+
+    RESULT_FIELDS = ['sent_at', 'failed', 'failure_reason', 'updated_at']
+    PROGRESS_BATCH = 20
+
+    @staticmethod
+    def chunk_size():
+        return getattr(settings, 'NEWSLETTER_CHUNK_SIZE', 200)
+
+    @staticmethod
+    def send_rate():
+        """Messages per second across all workers (0 disables throttling)."""
+        return getattr(settings, 'NEWSLETTER_SEND_RATE', 10)
+
+    @staticmethod
+    def claim_timeout():
+        """Seconds a chunk holds its recipients beyond its scheduled start."""
+        return getattr(settings, 'NEWSLETTER_CLAIM_TIMEOUT', 600)
+
+    @staticmethod
+    def audience(newsletter):
+        """Members who should receive the newsletter."""
+        from apps.members.models import Member
+
+        members = Member.objects.filter(is_active=True, email__isnull=False).exclude(email='')
+        if not newsletter.send_to_all:
+            members = members.filter(
+                group_memberships__group__in=newsletter.target_groups.all(),
+            ).distinct()
+        return members
+
+    @classmethod
+    def start(cls, newsletter):
+        """
+        Claim a draft or scheduled newsletter and queue its delivery.
+
+        Returns False if the newsletter was already being sent.
+        """
+        from .models import Newsletter, NewsletterRecipient
+        from .tasks import send_newsletter_task
+
+        claimed = Newsletter.objects.filter(
+            pk=newsletter.pk,
+            status__in=[NewsletterStatus.DRAFT, NewsletterStatus.SCHEDULED],
+        ).update(status=NewsletterStatus.SENDING, updated_at=timezone.now())
+        if not claimed:
+            return False
+
+        recipients = [
+            NewsletterRecipient(newsletter=newsletter, member_id=member_id, email=email)
+            for member_id, email in cls.audience(newsletter).values_list('pk', 'email').order_by()
+        ]
+        NewsletterRecipient.objects.bulk_create(
+            recipients, batch_size=cls.chunk_size(), ignore_conflicts=True,
+        )
+
+        newsletter.status = NewsletterStatus.SENDING
+        newsletter.recipients_count = len(recipients)
+        newsletter.delivery_summary = {
+            'sent': 0,
+            'failed': 0,
+            'started_at': timezone.now().isoformat(),
+        }
+        newsletter.save(update_fields=['status', 'recipients_count', 'delivery_summary', 'updated_at'])
+
+        transaction.on_commit(lambda: send_newsletter_task.delay(str(newsletter.pk)))
+        return True
+
+    @classmethod
+    def pending(cls, newsletter_id):
+        from .models import NewsletterRecipient
+
+        return NewsletterRecipient.objects.filter(
+            newsletter_id=newsletter_id, sent_at__isnull=True, failed=False,
+        )
+
+    @staticmethod
+    def unclaimed(queryset, now):
+        """Rows of ``queryset`` no chunk currently holds."""
+        from django.db.models import Q
+
+        return queryset.filter(Q(claimed_until__isnull=True) | Q(claimed_until__lt=now))
+
+    @classmethod
+    def fan_out(cls, newsletter):
+        """Queue one chunk task per batch of unclaimed pending recipients. Returns the chunk count."""
+        import uuid
+
+        from .models import Newsletter, NewsletterRecipient
+        from .tasks import send_newsletter_chunk
+
+        if not cls.pending(newsletter.pk).exists():
+            cls.finish(newsletter.pk)
+            return 0
+        now = timezone.now()
+        ids = [
+            str(pk) for pk in
+            cls.unclaimed(cls.pending(newsletter.pk), now).order_by('pk').values_list('pk', flat=True)
+        ]
+        if not ids:
+            return 0
+
+        # Touch the newsletter so resume_stalled_newsletters leaves it alone
+        Newsletter.all_objects.filter(pk=newsletter.pk).update(updated_at=timezone.now())
+
+        size = cls.chunk_size()
+        rate = cls.send_rate()
+        chunks = [ids[i:i + size] for i in range(0, len(ids), size)]
+        for index, chunk in enumerate(chunks):
+            # Stagger chunks so parallel workers stay under the global rate
+            countdown = int(index * size / rate) if rate else 0
+            token = uuid.uuid4()
+            NewsletterRecipient.objects.filter(pk__in=chunk).update(
+                claim_token=token,
+                claimed_until=now + timezone.timedelta(seconds=countdown + cls.claim_timeout()),
+            )
+            send_newsletter_chunk.apply_async(
+                args=[str(newsletter.pk), chunk, str(token)], countdown=countdown,
+            )
+        return len(chunks)
+
+    @classmethod
+    def claim(cls, newsletter_id, recipient_ids, claim_token=None):
+        """
+        Lease the pending recipients among ``recipient_ids`` that this chunk may send.
+
+        Rows still leased to ``claim_token`` (the chunk's own fan-out lease)
+        or not leased at all are locked with SKIP LOCKED and re-leased under
+        a fresh token; rows another chunk holds are left alone.
+        """
+        import uuid
+
+        from django.db.models import Q
+
+        from .models import NewsletterRecipient
+
+        now = timezone.now()
+        token = uuid.uuid4()
+        with transaction.atomic():
+            available = cls.pending(newsletter_id).filter(pk__in=recipient_ids)
+            condition = Q(claimed_until__isnull=True) | Q(claimed_until__lt=now)
+            if claim_token:
+                condition |= Q(claim_token=claim_token)
+            pks = list(
+                available.filter(condition)
+                .select_for_update(skip_locked=True)
+                .values_list('pk', flat=True)
+            )
+            NewsletterRecipient.objects.filter(pk__in=pks).update(
+                claim_token=token,
+                claimed_until=now + timezone.timedelta(seconds=cls.claim_timeout()),
+            )
+        return token, list(NewsletterRecipient.objects.filter(pk__in=pks).order_by('pk'))
+
+    @classmethod
+    def build_message(cls, newsletter, recipient, connection):
+        message = EmailMultiAlternatives(
+            subject=newsletter.subject,
+            body=newsletter.content_plain or strip_tags(newsletter.content),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[recipient.email],
+            connection=connection,
+        )
+        html = newsletter.content
+        pixel_url = NewsletterOpenService.tracking_url(recipient)
+        if pixel_url:
+            html += f'<img src="{pixel_url}" width="1" height="1" alt="" style="display:none">'
+        message.attach_alternative(html, 'text/html')
+        return message
+
+    @classmethod
+    def send_chunk(cls, newsletter_id, recipient_ids, claim_token=None):
+        """
+        Send one batch of recipients over a single connection. Returns (sent, failed).
+
+        Results are saved every PROGRESS_BATCH messages, renewing the lease
+        on the rest, so a killed worker resends at most one sub-batch.
+        """
+        from .models import Newsletter, NewsletterRecipient
+
+        newsletter = Newsletter.all_objects.get(pk=newsletter_id)
+        token, recipients = cls.claim(newsletter_id, recipient_ids, claim_token)
+        if not recipients:
+            cls.finish(newsletter_id)
+            return 0, 0
+
+        rate = cls.send_rate()
+        interval = 1 / rate if rate else 0
+        sent = failed = 0
+        unsaved = []
+
+        def save_progress():
+            NewsletterRecipient.objects.bulk_update(unsaved, cls.RESULT_FIELDS)
+            unsaved.clear()
+            NewsletterRecipient.objects.filter(claim_token=token).update(
+                claimed_until=timezone.now() + timezone.timedelta(seconds=cls.claim_timeout()),
+            )
+
+        connection = get_connection()
+        connection.open()
+        try:
+            for recipient in recipients:
+                started = time.monotonic()
+                try:
+                    connection.send_messages([cls.build_message(newsletter, recipient, connection)])
+                except Exception as exc:
+                    recipient.failed = True
+                    recipient.failure_reason = str(exc)[:1000]
+                    failed += 1
+                else:
+                    recipient.sent_at = timezone.now()
+                    sent += 1
+                recipient.updated_at = timezone.now()
+                unsaved.append(recipient)
+                if len(unsaved) >= cls.PROGRESS_BATCH:
+                    save_progress()
+
+                elapsed = time.monotonic() - started
+                if interval > elapsed:
+                    time.sleep(interval - elapsed)
+        finally:
+            connection.close()
+            NewsletterRecipient.objects.bulk_update(unsaved, cls.RESULT_FIELDS)
+
+        logger.info(
+            'Newsletter %s chunk: %d sent, %d failed', newsletter_id, sent, failed,
+        )
+        cls.finish(newsletter_id)
+        return sent, failed
+
+    @classmethod
+    def finish(cls, newsletter_id):
+        """Mark the newsletter sent and store a summary once nothing is pending."""
+        from django.db.models import Count, Q
+
+        from .models import Newsletter, NewsletterRecipient
+
+        if cls.pending(newsletter_id).exists():
+            return False
+
+        totals = NewsletterRecipient.objects.filter(newsletter_id=newsletter_id).aggregate(
+            sent=Count('pk', filter=Q(sent_at__isnull=False)),
+            failed=Count('pk', filter=Q(failed=True)),
+        )
+        with transaction.atomic():
+            newsletter = Newsletter.all_objects.select_for_update().get(pk=newsletter_id)
+            if newsletter.status != NewsletterStatus.SENDING:
+                return False
+            now = timezone.now()
+            newsletter.status = (
+                NewsletterStatus.FAILED
+                if totals['failed'] and not totals['sent'] else NewsletterStatus.SENT
+            )
+            newsletter.sent_at = now
+            newsletter.delivery_summary = {
+                **newsletter.delivery_summary,
+                **totals,
+                'finished_at': now.isoformat(),
+            }
+            newsletter.save(update_fields=['status', 'sent_at', 'delivery_summary', 'updated_at'])
+        logger.info("Newsletter '%s' delivered: %s", newsletter.subject, newsletter.delivery_summary)
+        return True
+
+
+class NewsletterOpenService:
+    """
+    Record tracking-pixel opens cheaply and fold them in periodically.
+
+    A hit only inserts a NewsletterOpen row, so a burst of opens right
+    after a large send never contends on the Newsletter row. ``flush``
+    then sets ``opened_at`` on first-time openers with one bulk_update and
+    bumps each newsletter's ``opened_count`` with one F() update.
+    """
+
+    # 1x1 transparent GIF
+    PIXEL = (
+        b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04'
+        b'\x01\x00\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;'
+    )
+
+    @staticmethod
+    def tracking_url(recipient):
+        """Absolute pixel URL for a recipient, or '' when SITE_URL is unset."""
+        from django.urls import reverse
+
+        site_url = getattr(settings, 'SITE_URL', '')
+        if not site_url:
+            return ''
+        path = reverse('frontend:communication:newsletter_open', args=[recipient.pk])
+        return f"{site_url.rstrip('/')}{path}"
+
+    @staticmethod
+    def record(recipient_id):
+        """
+        Buffer an open for a recipient who has not opened yet. Returns whether it was kept.
+
+        The pixel is public, so unknown ids are dropped with one indexed
+        read instead of filling the buffer.
+        """
+        from .models import NewsletterOpen, NewsletterRecipient
+
+        if not NewsletterRecipient.objects.filter(pk=recipient_id, opened_at__isnull=True).exists():
+            return False
+        NewsletterOpen.objects.create(recipient_id=recipient_id)
+        return True
+
+    @staticmethod
+    def flush(batch_size=5000):
+        """Apply buffered opens. Returns the number of first-time opens recorded."""
+        from django.db.models import F
+
+        from .models import Newsletter, NewsletterOpen, NewsletterRecipient
+
+        with transaction.atomic():
+            events = list(
+                NewsletterOpen.all_objects.select_for_update(skip_locked=True)
+                .order_by('created_at')
+                .values_list('pk', 'recipient_id', 'created_at')[:batch_size]
+            )
+            if not events:
+                return 0
+
+            first_open = {}
+            for _, recipient_id, opened_at in events:
+                first_open.setdefault(recipient_id, opened_at)
+
+            recipients = list(
+                NewsletterRecipient.objects.filter(pk__in=first_open, opened_at__isnull=True)
+                .only('pk', 'newsletter_id', 'opened_at')
+            )
+            per_newsletter = {}
+            for recipient in recipients:
+                recipient.opened_at = first_open[recipient.pk]
+                per_newsletter[recipient.newsletter_id] = per_newsletter.get(recipient.newsletter_id, 0) + 1
+            NewsletterRecipient.objects.bulk_update(recipients, ['opened_at'])
+
+            for newsletter_id, opens in per_newsletter.items():
+                Newsletter.all_objects.filter(pk=newsletter_id).update(
+                    opened_count=F('opened_count') + opens,
+                )
+
+            NewsletterOpen.all_objects.filter(pk__in=[pk for pk, _, _ in events]).delete()
+
+        logger.info('Flushed %d newsletter opens (%d new)', len(events), len(recipients))
+        return len(recipients)
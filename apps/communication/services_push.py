@@ -3,8 +3,11 @@ import json
 import logging
 
 from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .services_fanout import ConcurrentSender
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,6 +19,12 @@ class WebPushService:
     When not configured, operates in stub mode.
     """
 
+    SENT = 'sent'
+    GONE = 'gone'
+    FAILED = 'failed'
+
+    REQUEST_TIMEOUT = 10
+
     def __init__(self):
         self.vapid_public_key = getattr(settings, 'VAPID_PUBLIC_KEY', '')
         self.vapid_private_key = getattr(settings, 'VAPID_PRIVATE_KEY', '')
@@ -57,57 +66,139 @@ class WebPushService:
         ).update(is_active=False)
         return updated > 0
 
-    def send_notification(self, subscription, title, body, url='', icon=''):
-        """
-        Send a push notification to a single PushSubscription instance.
+    def _workers(self):
+        return getattr(settings, 'PUSH_FANOUT_WORKERS', 8)
 
-        Returns True on success, False on failure.
-        """
-        if not subscription.is_active:
-            return False
+    def _send_rate(self):
+        """Push requests per second across all workers (0 disables throttling)."""
+        return getattr(settings, 'PUSH_SEND_RATE', 50)
 
-        payload = json.dumps({
-            'title': str(title),
-            'body': str(body),
-            'url': url,
-            'icon': icon,
-        })
+    def _http_session(self):
+        """Pooled HTTP session shared by the fan-out workers."""
+        import requests
 
-        subscription_info = {
-            'endpoint': subscription.endpoint,
-            'keys': {
-                'p256dh': subscription.p256dh_key,
-                'auth': subscription.auth_key,
-            },
-        }
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=self._workers())
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _deliver(self, subscription, payload, webpush, session):
+        """
+        Push one payload to one subscription. Runs on a fan-out worker,
+        so it only touches the in-memory instance.
 
-        if not self.is_configured:
+        Returns SENT, GONE (endpoint answered 404/410) or FAILED.
+        """
+        if webpush is None:
             logger.info(
-                "[STUB] Push -> %s: %s - %s",
-                subscription.member.pk, title, body,
+                "[STUB] Push -> %s: %s", subscription.member_id, payload,
             )
-            return True
+            return self.SENT
 
         try:
-            from pywebpush import webpush, WebPushException
             webpush(
-                subscription_info=subscription_info,
+                subscription_info={
+                    'endpoint': subscription.endpoint,
+                    'keys': {
+                        'p256dh': subscription.p256dh_key,
+                        'auth': subscription.auth_key,
+                    },
+                },
                 data=payload,
                 vapid_private_key=self.vapid_private_key,
-                vapid_claims=self.vapid_claims,
+                # pywebpush fills in aud/exp on the dict it is given
+                vapid_claims=dict(self.vapid_claims),
+                timeout=self.REQUEST_TIMEOUT,
+                requests_session=session,
             )
             logger.info("Push sent to %s", subscription.endpoint[:40])
-            return True
-        except ImportError:
-            logger.warning("pywebpush not installed -- stub mode.")
-            return True
+            return self.SENT
         except Exception as exc:
             logger.error("Push send failed: %s", exc)
-            # Mark subscription as inactive if endpoint is gone (410)
-            if hasattr(exc, 'response') and getattr(exc.response, 'status_code', None) == 410:
-                subscription.is_active = False
-                subscription.save(update_fields=['is_active', 'updated_at'])
-            return False
+            response = getattr(exc, 'response', None)
+            if getattr(response, 'status_code', None) in (404, 410):
+                return self.GONE
+            return self.FAILED
+
+    @staticmethod
+    def _payload(title, body, url='', icon=''):
+        return json.dumps({
+            'title': str(title),
+            'body': str(body),
+            'url': url,
+            'icon': icon,
+        })
+
+    def send_many(self, subscriptions, title, body, url='', icon=''):
+        """
+        Send one push notification to many subscriptions concurrently.
+
+        Requests go through a bounded thread pool (PUSH_FANOUT_WORKERS)
+        paced at PUSH_SEND_RATE per second over one pooled HTTP session.
+        Subscriptions whose endpoint is gone are deactivated with a single
+        UPDATE once every send has finished.
+        Returns the number of successful sends.
+        """
+        payload = self._payload(title, body, url, icon)
+        return self._send_payloads([(sub, payload) for sub in subscriptions])
+
+    def send_each(self, messages, icon=''):
+        """
+        Send a different notification to each subscription, concurrently.
+
+        ``messages`` holds ``(subscription, title, body, url)`` tuples; the
+        fan-out and cleanup are the same as for send_many.
+        Returns the number of successful sends.
+        """
+        return self._send_payloads([
+            (sub, self._payload(title, body, url, icon)) for sub, title, body, url in messages
+        ])
+
+    def _send_payloads(self, jobs):
+        from .models import PushSubscription
+
+        jobs = [(sub, payload) for sub, payload in jobs if sub.is_active]
+        if not jobs:
+            return 0
+
+        webpush = session = None
+        if self.is_configured:
+            try:
+                from pywebpush import webpush
+            except ImportError:
+                logger.warning("pywebpush not installed -- stub mode.")
+            else:
+                session = self._http_session()
+
+        sender = ConcurrentSender(self._workers(), self._send_rate())
+        try:
+            outcomes = sender.map(
+                lambda job: self._deliver(job[0], job[1], webpush, session),
+                jobs,
+            )
+        finally:
+            if session is not None:
+                session.close()
+
+        gone = {sub.pk: sub for (sub, _payload), outcome in zip(jobs, outcomes) if outcome == self.GONE}
+        if gone:
+            PushSubscription.all_objects.filter(pk__in=list(gone)).update(
+                is_active=False, updated_at=timezone.now(),
+            )
+            for sub in gone.values():
+                sub.is_active = False
+            logger.info("Deactivated %d expired push subscriptions", len(gone))
+
+        return outcomes.count(self.SENT)
+
+    def send_notification(self, subscription, title, body, url='', icon=''):
+        """
+        Send a push notification to a single PushSubscription instance.
+
+        Returns True on success, False on failure.
+        """
+        return self.send_many([subscription], title, body, url, icon) == 1
 
     def send_to_member(self, member, title, body, url='', icon=''):
         """
@@ -117,11 +208,7 @@ class WebPushService:
         from .models import PushSubscription
 
         subscriptions = PushSubscription.objects.filter(member=member, is_active=True)
-        success_count = 0
-        for sub in subscriptions:
-            if self.send_notification(sub, title, body, url, icon):
-                success_count += 1
-        return success_count
+        return self.send_many(subscriptions, title, body, url, icon)
 
     def send_to_all(self, title, body, url='', icon=''):
         """
@@ -130,9 +217,7 @@ class WebPushService:
         """
         from .models import PushSubscription
 
-        subscriptions = PushSubscription.objects.filter(is_active=True)
-        success_count = 0
-        for sub in subscriptions:
-            if self.send_notification(sub, title, body, url, icon):
-                success_count += 1
-        return success_count
+        subscriptions = PushSubscription.objects.filter(is_active=True).only(
+            'pk', 'member_id', 'endpoint', 'p256dh_key', 'auth_key', 'is_active',
+        )
+        return self.send_many(subscriptions, title, body, url, icon)
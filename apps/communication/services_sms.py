@@ -7,6 +7,8 @@ from django.utils.translation import gettext_lazy as _
 
 from apps.core.constants import SMSStatus
 
+from .services_fanout import ConcurrentSender
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +22,8 @@ class TwilioSMSService:
     actually calling the Twilio API.
     """
 
+    RESULT_FIELDS = ['status', 'sent_at', 'twilio_sid', 'updated_at']
+
     def __init__(self):
         self.account_sid = getattr(settings, 'TWILIO_ACCOUNT_SID', '')
         self.auth_token = getattr(settings, 'TWILIO_AUTH_TOKEN', '')
@@ -43,23 +47,19 @@ class TwilioSMSService:
 
     # ── public API ───────────────────────────────────────────────────────────
 
-    def send_sms(self, sms_message):
-        """
-        Send a single SMSMessage instance.
+    def _workers(self):
+        return getattr(settings, 'SMS_FANOUT_WORKERS', 4)
 
-        Updates the model in-place with status and twilio_sid.
-        Returns the updated SMSMessage.
-        """
-        from .models import SMSOptOut
+    def _send_rate(self):
+        """Twilio API calls per second across all workers (0 disables throttling)."""
+        return getattr(settings, 'SMS_SEND_RATE', 10)
 
-        # Check opt-out
-        if SMSOptOut.objects.filter(phone_number=sms_message.phone_number).exists():
-            sms_message.status = SMSStatus.FAILED
-            sms_message.save(update_fields=['status', 'updated_at'])
-            logger.info("SMS to %s skipped -- opted out.", sms_message.phone_number)
-            return sms_message
-
-        if not self.is_configured or self.client is None:
+    def _deliver(self, sms_message, client):
+        """
+        Hand one message to Twilio, updating the instance in memory only.
+        Runs on a fan-out worker, so it must not query the database.
+        """
+        if client is None:
             # Stub mode
             logger.info(
                 "[STUB] SMS to %s: %s",
@@ -69,11 +69,10 @@ class TwilioSMSService:
             sms_message.status = SMSStatus.SENT
             sms_message.sent_at = timezone.now()
             sms_message.twilio_sid = 'STUB_SID'
-            sms_message.save(update_fields=['status', 'sent_at', 'twilio_sid', 'updated_at'])
             return sms_message
 
         try:
-            message = self.client.messages.create(
+            message = client.messages.create(
                 body=sms_message.body,
                 from_=self.from_number,
                 to=sms_message.phone_number,
@@ -81,21 +80,59 @@ class TwilioSMSService:
             sms_message.twilio_sid = message.sid
             sms_message.status = SMSStatus.SENT
             sms_message.sent_at = timezone.now()
-            sms_message.save(update_fields=['status', 'sent_at', 'twilio_sid', 'updated_at'])
             logger.info("SMS sent to %s (SID: %s)", sms_message.phone_number, message.sid)
         except Exception as exc:
             sms_message.status = SMSStatus.FAILED
-            sms_message.save(update_fields=['status', 'updated_at'])
             logger.error("SMS send failed to %s: %s", sms_message.phone_number, exc)
-
         return sms_message
 
+    def send_sms(self, sms_message):
+        """
+        Send a single SMSMessage instance.
+
+        Updates the model in-place with status and twilio_sid.
+        Returns the updated SMSMessage.
+        """
+        return self.bulk_send([sms_message])[0]
+
     def bulk_send(self, sms_messages):
-        """Send a list of SMSMessage instances. Returns list of updated instances."""
-        results = []
+        """
+        Send a list of SMSMessage instances. Returns list of updated instances.
+
+        Opted-out numbers are looked up with one query and marked failed;
+        the rest go to Twilio through a bounded thread pool
+        (SMS_FANOUT_WORKERS) paced at SMS_SEND_RATE per second. Every
+        result is written back with a single bulk_update.
+        """
+        from .models import SMSMessage, SMSOptOut
+
+        sms_messages = list(sms_messages)
+        if not sms_messages:
+            return []
+
+        opted_out = set(
+            SMSOptOut.objects.filter(
+                phone_number__in={msg.phone_number for msg in sms_messages},
+            ).values_list('phone_number', flat=True)
+        )
+        to_send = []
+        for msg in sms_messages:
+            if msg.phone_number in opted_out:
+                msg.status = SMSStatus.FAILED
+                logger.info("SMS to %s skipped -- opted out.", msg.phone_number)
+            else:
+                to_send.append(msg)
+
+        # Resolve the lazy client once, before the workers share it
+        client = self.client if self.is_configured else None
+        sender = ConcurrentSender(self._workers(), self._send_rate())
+        sender.map(lambda msg: self._deliver(msg, client), to_send)
+
+        now = timezone.now()
         for msg in sms_messages:
-            results.append(self.send_sms(msg))
-        return results
+            msg.updated_at = now
+        SMSMessage.objects.bulk_update(sms_messages, self.RESULT_FIELDS, batch_size=500)
+        return sms_messages
 
     def track_delivery(self, sms_message):
         """
@@ -0,0 +1,99 @@
+"""Cached per-member unread notification counter."""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class UnreadCountService:
+    """
+    Keeps each member's unread notification count in the cache.
+
+    Reads fall back to a COUNT query on a miss and store the result;
+    creations and mark-read operations adjust the cached value with an
+    atomic ``cache.incr``/``cache.decr`` once the transaction commits and
+    push the new value to the member's notification WebSocket. A missing
+    key is never adjusted, so the next read always recounts from the DB.
+    Notifications are also created by Celery tasks, so the counters rely on
+    the shared Redis cache (``REDIS_URL``) that every process reads.
+    """
+
+    CACHE_PREFIX = 'communication:unread'
+
+    @classmethod
+    def cache_key(cls, member_id):
+        return f'{cls.CACHE_PREFIX}:{member_id}'
+
+    @staticmethod
+    def _timeout():
+        return getattr(settings, 'NOTIFICATION_COUNT_CACHE_TIMEOUT', 86400)
+
+    @classmethod
+    def count_from_db(cls, member_id):
+        from .models import Notification
+
+        return Notification.objects.filter(member_id=member_id, is_read=False).count()
+
+    @classmethod
+    def get(cls, member):
+        """Return the member's unread count, recounting on a cache miss."""
+        key = cls.cache_key(member.pk)
+        count = cache.get(key)
+        if count is None:
+            count = cls.count_from_db(member.pk)
+            cache.add(key, count, cls._timeout())
+        return count
+
+    @classmethod
+    def refresh(cls, member):
+        """Recount from the DB, store and push the result."""
+        count = cls.count_from_db(member.pk)
+        cache.set(cls.cache_key(member.pk), count, cls._timeout())
+        cls.push(member, count)
+        return count
+
+    @classmethod
+    def adjust(cls, member, delta):
+        """Shift the member's count by ``delta`` after the current transaction commits."""
+        if delta:
+            transaction.on_commit(lambda: cls._apply(member, delta))
+
+    @classmethod
+    def _apply(cls, member, delta):
+        key = cls.cache_key(member.pk)
+        try:
+            count = cache.incr(key, delta)
+        except ValueError:
+            # Not cached: leave it to the next read to recount
+            count = None
+        if count is not None and count < 0:
+            cache.delete(key)
+            count = None
+        cls.push(member, cls.get(member) if count is None else count)
+
+    @classmethod
+    def record_created(cls, notifications):
+        """Count newly created unread notifications per member."""
+        per_member = {}
+        for notification in notifications:
+            if notification.is_read:
+                continue
+            member = notification.member
+            per_member.setdefault(member.pk, [member, 0])[1] += 1
+        for member, delta in per_member.values():
+            cls.adjust(member, delta)
+
+    @staticmethod
+    def push(member, count):
+        """Send the count to the member's notification WebSocket."""
+        if not member.user_id:
+            return
+        from apps.core.consumers import update_notification_count
+
+        try:
+            update_notification_count(member.user_id, count)
+        except Exception:
+            logger.warning('Could not push unread count for member %s', member.pk, exc_info=True)
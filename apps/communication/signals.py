@@ -0,0 +1,28 @@
+"""Signals keeping the cached unread notification counters in sync."""
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Notification
+from .services_unread import UnreadCountService
+
+
+@receiver(post_init, sender=Notification)
+def remember_read_state(sender, instance, **kwargs):
+    """Keep the loaded read flag so a save that toggles it adjusts the count."""
+    is_read = instance.__dict__.get('is_read')
+    instance._unread_original = None if is_read is None else not is_read
+
+
+@receiver(post_save, sender=Notification)
+def count_saved_notification(sender, instance, created, **kwargs):
+    unread = not instance.is_read
+    was_unread = False if created else getattr(instance, '_unread_original', None)
+    if was_unread is not None and unread != was_unread:
+        UnreadCountService.adjust(instance.member, 1 if unread else -1)
+    instance._unread_original = unread
+
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        UnreadCountService.adjust(instance.member, -1)
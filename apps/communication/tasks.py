@@ -8,12 +8,36 @@ logger = logging.getLogger(__name__)
 
 @shared_task
 def process_automation_steps():
-    """Process all pending automation enrollment steps."""
+    """
+    Claim due automation enrollments and queue per-channel batches.
+
+    Overlapping runs are safe: each claim leases its rows, so a slow run
+    and the next beat tick never pick up the same enrollment.
+    """
     from .services_automation import AutomationService
 
     service = AutomationService()
-    count = service.process_pending_steps()
-    return f"Processed {count} automation steps."
+    count = service.process_pending_steps(dispatch=True)
+    logger.info("Automation metrics: %s", service.metrics())
+    return f"Queued {count} automation steps."
+
+
+@shared_task(acks_late=True)
+def process_automation_batch(channel, enrollment_ids, claim_token=None):
+    """Execute one claimed batch of automation steps sharing ``channel``."""
+    from .services_automation import AutomationService
+
+    count = AutomationService().process_batch(enrollment_ids, claim_token)
+    return f"Processed {count} {channel} automation steps."
+
+
+@shared_task(acks_late=True)
+def deliver_notification_channels(notification_ids):
+    """Send already-created notifications by SMS/push, per member preferences."""
+    from .services_batch import BatchMessagingService
+
+    sms_count, push_count = BatchMessagingService.deliver_notifications(notification_ids)
+    return f"Delivered {sms_count} SMS and {push_count} push notifications."
 
 
 @shared_task
@@ -25,53 +49,25 @@ def send_birthday_messages():
     from django.utils import timezone
     from apps.members.models import Member
     from apps.core.constants import NotificationType
-    from .models import Notification, SMSMessage, NotificationPreference
-    from .services_sms import TwilioSMSService
-    from .services_push import WebPushService
+    from .services_batch import BatchMessagingService
 
     today = timezone.now().date()
     birthday_members = Member.objects.filter(
         birth_date__month=today.month,
         birth_date__day=today.day,
         is_active=True,
+    ).only(*BatchMessagingService.MEMBER_FIELDS)
+
+    count = BatchMessagingService.deliver(
+        birthday_members,
+        NotificationType.BIRTHDAY,
+        title="Joyeux anniversaire!",
+        message=lambda member: f"Toute l'eglise vous souhaite un joyeux anniversaire, {member.full_name}!",
+        sms_body=lambda member: f"Joyeux anniversaire, {member.full_name}! Votre eglise pense a vous.",
+        push_title="Joyeux anniversaire!",
+        push_body="Toute l'eglise vous souhaite un joyeux anniversaire!",
     )
 
-    sms_service = TwilioSMSService()
-    push_service = WebPushService()
-    count = 0
-
-    for member in birthday_members:
-        # In-app notification
-        Notification.objects.create(
-            member=member,
-            title="Joyeux anniversaire!",
-            message=f"Toute l'eglise vous souhaite un joyeux anniversaire, {member.full_name}!",
-            notification_type=NotificationType.BIRTHDAY,
-        )
-
-        # Check preferences
-        prefs = NotificationPreference.objects.filter(member=member).first()
-
-        # SMS if enabled
-        if prefs and prefs.sms_enabled and member.phone:
-            sms = SMSMessage.objects.create(
-                recipient_member=member,
-                phone_number=member.phone,
-                body=f"Joyeux anniversaire, {member.full_name}! Votre eglise pense a vous.",
-            )
-            sms_service.send_sms(sms)
-
-        # Push if enabled
-        if prefs and prefs.push_enabled:
-            push_service.send_to_member(
-                member,
-                "Joyeux anniversaire!",
-                f"Toute l'eglise vous souhaite un joyeux anniversaire!",
-            )
-
-        count += 1
-        logger.info("Birthday message sent to %s", member.pk)
-
     return f"Sent birthday messages to {count} members."
 
 
@@ -84,26 +80,29 @@ def send_anniversary_messages():
     from django.utils import timezone
     from apps.members.models import Member
     from apps.core.constants import NotificationType
-    from .models import Notification
+    from .services_batch import BatchMessagingService
 
     today = timezone.now().date()
     anniversary_members = Member.objects.filter(
         registration_date__month=today.month,
         registration_date__day=today.day,
         is_active=True,
-    ).exclude(registration_date__year=today.year)  # Skip first-day members
+    ).exclude(registration_date__year=today.year).only(  # Skip first-day members
+        *BatchMessagingService.MEMBER_FIELDS, 'registration_date',
+    )
 
-    count = 0
-    for member in anniversary_members:
-        years = today.year - member.registration_date.year
-        Notification.objects.create(
-            member=member,
-            title=f"Joyeux {years}e anniversaire de membre!",
-            message=f"Felicitations {member.full_name}! Cela fait {years} an(s) que vous etes membre de notre eglise.",
-            notification_type=NotificationType.GENERAL,
-        )
-        count += 1
-        logger.info("Anniversary message sent to %s (%d years)", member.pk, years)
+    def years(member):
+        return today.year - member.registration_date.year
+
+    count = BatchMessagingService.deliver(
+        anniversary_members,
+        NotificationType.GENERAL,
+        title=lambda member: f"Joyeux {years(member)}e anniversaire de membre!",
+        message=lambda member: (
+            f"Felicitations {member.full_name}! Cela fait {years(member)} an(s) "
+            f"que vous etes membre de notre eglise."
+        ),
+    )
 
     return f"Sent anniversary messages to {count} members."
 
@@ -118,7 +117,7 @@ def send_reengagement_messages():
     from datetime import timedelta
     from apps.members.models import Member
     from apps.core.constants import NotificationType
-    from .models import Notification
+    from .services_batch import BatchMessagingService
 
     weeks_threshold = 8
     cutoff = timezone.now() - timedelta(weeks=weeks_threshold)
@@ -127,35 +126,32 @@ def send_reengagement_messages():
     inactive_members = Member.objects.filter(
         is_active=True,
         updated_at__lt=cutoff,
+    ).only(*BatchMessagingService.MEMBER_FIELDS)
+
+    # Avoid sending duplicate re-engagement notifications
+    count = BatchMessagingService.deliver(
+        inactive_members,
+        NotificationType.REENGAGEMENT,
+        title="Vous nous manquez!",
+        message=lambda member: (
+            f"Bonjour {member.full_name}, nous n'avons pas eu de vos nouvelles recemment. "
+            f"N'hesitez pas a nous contacter!"
+        ),
+        skip_notified_since=cutoff,
     )
 
-    count = 0
-    for member in inactive_members:
-        # Avoid sending duplicate re-engagement notifications
-        recent = Notification.objects.filter(
-            member=member,
-            title__icontains='manquez',
-            created_at__gte=cutoff,
-        ).exists()
-
-        if not recent:
-            Notification.objects.create(
-                member=member,
-                title="Vous nous manquez!",
-                message=f"Bonjour {member.full_name}, nous n'avons pas eu de vos nouvelles recemment. N'hesitez pas a nous contacter!",
-                notification_type=NotificationType.GENERAL,
-            )
-            count += 1
-
     return f"Sent re-engagement messages to {count} members."
 
 
 @shared_task
 def send_newsletter_task(newsletter_id):
-    """Send a newsletter to all its recipients asynchronously."""
-    from django.utils import timezone
+    """
+    Deliver a newsletter: claim it if still a draft, otherwise fan the
+    pending recipients out to ``send_newsletter_chunk`` tasks.
+    """
     from apps.core.constants import NewsletterStatus
     from .models import Newsletter
+    from .services_newsletter import NewsletterDeliveryService
 
     try:
         newsletter = Newsletter.all_objects.get(pk=newsletter_id)
@@ -163,9 +159,59 @@ def send_newsletter_task(newsletter_id):
         logger.error("Newsletter %s not found.", newsletter_id)
         return
 
-    newsletter.status = NewsletterStatus.SENT
-    newsletter.sent_at = timezone.now()
-    newsletter.save(update_fields=['status', 'sent_at', 'updated_at'])
+    if newsletter.status in [NewsletterStatus.DRAFT, NewsletterStatus.SCHEDULED]:
+        NewsletterDeliveryService.start(newsletter)
+        return f"Newsletter {newsletter_id} queued."
+    if newsletter.status != NewsletterStatus.SENDING:
+        return f"Newsletter {newsletter_id} already {newsletter.status}."
+
+    chunks = NewsletterDeliveryService.fan_out(newsletter)
+    logger.info("Newsletter '%s' fanned out to %d chunks.", newsletter.subject, chunks)
+    return f"Newsletter {newsletter_id}: {chunks} chunks queued."
+
+
+@shared_task(acks_late=True)
+def send_newsletter_chunk(newsletter_id, recipient_ids, claim_token=None):
+    """Send one batch of newsletter recipients (redelivered if the worker dies)."""
+    from .services_newsletter import NewsletterDeliveryService
+
+    sent, failed = NewsletterDeliveryService.send_chunk(newsletter_id, recipient_ids, claim_token)
+    return f"{sent} sent, {failed} failed."
+
+
+@shared_task
+def resume_stalled_newsletters(stalled_after_minutes=30):
+    """
+    Periodic task: re-queue newsletters stuck in SENDING whose recipients
+    have not progressed for ``stalled_after_minutes`` (e.g. after a crash).
+    Recipients still leased to a queued or running chunk are not re-queued.
+    """
+    from datetime import timedelta
+    from django.db.models import Max
+    from django.utils import timezone
+    from apps.core.constants import NewsletterStatus
+    from .models import Newsletter
+    from .services_newsletter import NewsletterDeliveryService
+
+    cutoff = timezone.now() - timedelta(minutes=stalled_after_minutes)
+    stalled = Newsletter.objects.filter(
+        status=NewsletterStatus.SENDING,
+        updated_at__lt=cutoff,
+    ).annotate(
+        last_progress=Max('recipients__updated_at'),
+    ).filter(last_progress__lt=cutoff)
+
+    count = 0
+    for newsletter in stalled:
+        NewsletterDeliveryService.fan_out(newsletter)
+        count += 1
+    return f"Resumed {count} stalled newsletters."
+
+
+@shared_task
+def flush_newsletter_opens():
+    """Periodic task: fold buffered tracking-pixel opens into the counters."""
+    from .services_newsletter import NewsletterOpenService
 
-    logger.info("Newsletter '%s' marked as sent.", newsletter.subject)
-    return f"Newsletter {newsletter_id} sent."
+    count = NewsletterOpenService.flush()
+    return f"Recorded {count} newsletter opens."
@@ -1,6 +1,7 @@
 """Tests for automation models, service, and views."""
 import pytest
 from datetime import timedelta
+from unittest.mock import patch
 
 from django.utils import timezone
 
@@ -203,6 +204,100 @@ class TestAutomationService:
         assert result is False
 
 
+class TestAutomationStepProcessor:
+    def _due_enrollments(self, channel, count=3):
+        auto = AutomationFactory()
+        AutomationStepFactory(automation=auto, order=0, channel=channel, subject='Bienvenue')
+        AutomationStepFactory(automation=auto, order=1, delay_days=2)
+        return [
+            AutomationEnrollmentFactory(
+                automation=auto, next_step_at=timezone.now() - timedelta(hours=1),
+            )
+            for _ in range(count)
+        ]
+
+    def test_claim_leases_rows_to_one_caller(self):
+        enrollments = self._due_enrollments(AutomationStepChannel.EMAIL)
+        service = AutomationService()
+
+        _token, first = service.claim_due(10)
+        _token, second = service.claim_due(10)
+
+        assert sorted(row[0] for row in first) == sorted(e.pk for e in enrollments)
+        assert second == []
+        assert AutomationEnrollment.objects.filter(claimed_until__isnull=False).count() == 3
+
+    def test_expired_claim_is_reclaimed(self):
+        enrollment = self._due_enrollments(AutomationStepChannel.EMAIL, count=1)[0]
+        AutomationEnrollment.objects.filter(pk=enrollment.pk).update(
+            claimed_until=timezone.now() - timedelta(minutes=1),
+        )
+        _token, claimed = AutomationService().claim_due(10)
+        assert [row[0] for row in claimed] == [enrollment.pk]
+
+    def test_process_batch_sends_in_bulk_and_releases_claims(self, django_assert_max_num_queries):
+        enrollments = self._due_enrollments(AutomationStepChannel.IN_APP, count=5)
+        service = AutomationService()
+        token, claimed = service.claim_due(10)
+        ids = [row[0] for row in claimed]
+
+        # Lock + steps + notifications + progress, plus the batch's savepoint
+        with django_assert_max_num_queries(6):
+            assert service.process_batch(ids, token) == 5
+
+        assert Notification.objects.filter(
+            member__in=[e.member for e in enrollments], title='Bienvenue',
+        ).count() == 5
+        for enrollment in AutomationEnrollment.objects.filter(pk__in=ids):
+            assert enrollment.current_step == 1
+            assert enrollment.claimed_until is None
+            assert enrollment.claim_token is None
+            assert enrollment.next_step_at > timezone.now() + timedelta(days=1)
+
+    def test_batch_reclaimed_after_its_lease_is_not_sent_twice(self):
+        enrollments = self._due_enrollments(AutomationStepChannel.IN_APP, count=2)
+        service = AutomationService()
+        stale_token, claimed = service.claim_due(10)
+        ids = [row[0] for row in claimed]
+        AutomationEnrollment.objects.filter(pk__in=ids).update(
+            claimed_until=timezone.now() - timedelta(minutes=1),
+        )
+        fresh_token, _claimed = service.claim_due(10)
+
+        assert service.process_batch(ids, stale_token) == 0
+        assert service.process_batch(ids, fresh_token) == 2
+        assert service.process_batch(ids, fresh_token) == 0
+        assert Notification.objects.filter(
+            member__in=[e.member for e in enrollments], title='Bienvenue',
+        ).count() == 2
+
+    @patch('apps.communication.tasks.process_automation_batch.delay')
+    def test_dispatch_queues_one_task_per_channel(self, mock_delay):
+        self._due_enrollments(AutomationStepChannel.SMS, count=2)
+        self._due_enrollments(AutomationStepChannel.PUSH, count=1)
+
+        assert AutomationService().process_pending_steps(dispatch=True) == 3
+
+        queued = {call.args[0]: len(call.args[1]) for call in mock_delay.call_args_list}
+        assert queued == {AutomationStepChannel.SMS: 2, AutomationStepChannel.PUSH: 1}
+        assert AutomationService().process_pending_steps(dispatch=True) == 0
+
+    def test_metrics_report_backlog_lag_and_throughput(self):
+        self._due_enrollments(AutomationStepChannel.IN_APP, count=2)
+        service = AutomationService()
+
+        metrics = service.metrics()
+        assert metrics['due'] == 2
+        assert metrics['claimed'] == 0
+        assert metrics['lag_seconds'] >= 3600
+
+        service.process_pending_steps()
+        metrics = service.metrics()
+        assert metrics['due'] == 0
+        assert metrics['lag_seconds'] == 0
+        assert metrics['throughput']['current_hour'][AutomationStepChannel.IN_APP] == 2
+
+
 # ─── Frontend View Tests ─────────────────────────────────────────────────────────
 
 
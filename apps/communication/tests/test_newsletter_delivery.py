@@ -0,0 +1,215 @@
+"""Tests for batched newsletter delivery."""
+import pytest
+from unittest.mock import patch
+
+from django.core import mail
+
+from apps.core.constants import NewsletterStatus
+from apps.members.tests.factories import MemberFactory
+from apps.communication.models import NewsletterRecipient
+from apps.communication.services_newsletter import NewsletterDeliveryService
+from apps.communication.tests.factories import NewsletterFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _fast_delivery(settings):
+    settings.NEWSLETTER_SEND_RATE = 0
+    settings.NEWSLETTER_CHUNK_SIZE = 2
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+@pytest.fixture
+def newsletter():
+    for index in range(3):
+        MemberFactory(email=f'member{index}@example.com')
+    return NewsletterFactory(status=NewsletterStatus.DRAFT)
+
+
+def _recipient_ids(newsletter):
+    return [str(pk) for pk in newsletter.recipients.values_list('pk', flat=True)]
+
+
+class TestStart:
+    def test_creates_recipients_once(self, newsletter, django_capture_on_commit_callbacks):
+        with patch('apps.communication.tasks.send_newsletter_task.delay') as mock_delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                assert NewsletterDeliveryService.start(newsletter) is True
+        mock_delay.assert_called_once_with(str(newsletter.pk))
+
+        newsletter.refresh_from_db()
+        assert newsletter.status == NewsletterStatus.SENDING
+        assert newsletter.recipients_count == newsletter.recipients.count() >= 3
+
+    def test_second_start_is_refused(self, newsletter):
+        NewsletterDeliveryService.start(newsletter)
+        assert NewsletterDeliveryService.start(newsletter) is False
+
+
+class TestFanOut:
+    @patch('apps.communication.tasks.send_newsletter_chunk.apply_async')
+    def test_queues_one_task_per_chunk(self, mock_apply, newsletter):
+        NewsletterDeliveryService.start(newsletter)
+        total = newsletter.recipients.count()
+
+        chunks = NewsletterDeliveryService.fan_out(newsletter)
+
+        assert chunks == mock_apply.call_count == -(-total // 2)
+        queued = [pk for call in mock_apply.call_args_list for pk in call.kwargs['args'][1]]
+        assert sorted(queued) == sorted(_recipient_ids(newsletter))
+
+    @patch('apps.communication.tasks.send_newsletter_chunk.apply_async')
+    def test_resume_skips_chunks_still_queued(self, mock_apply, newsletter):
+        NewsletterDeliveryService.start(newsletter)
+        NewsletterDeliveryService.fan_out(newsletter)
+        mock_apply.reset_mock()
+
+        assert NewsletterDeliveryService.fan_out(newsletter) == 0
+        mock_apply.assert_not_called()
+
+
+class TestSendChunk:
+    def test_sends_over_one_connection_and_finishes(self, newsletter):
+        NewsletterDeliveryService.start(newsletter)
+        ids = _recipient_ids(newsletter)
+
+        with patch('apps.communication.services_newsletter.get_connection',
+                   wraps=mail.get_connection) as mock_conn:
+            sent, failed = NewsletterDeliveryService.send_chunk(str(newsletter.pk), ids)
+
+        assert mock_conn.call_count == 1
+        assert (sent, failed) == (len(ids), 0)
+        assert len(mail.outbox) == len(ids)
+        assert mail.outbox[0].subject == newsletter.subject
+
+        newsletter.refresh_from_db()
+        assert newsletter.status == NewsletterStatus.SENT
+        assert newsletter.sent_at is not None
+        assert newsletter.delivery_summary['sent'] == len(ids)
+        assert newsletter.delivery_summary['failed'] == 0
+
+    def test_resume_skips_recorded_recipients(self, newsletter):
+        NewsletterDeliveryService.start(newsletter)
+        ids = _recipient_ids(newsletter)
+        NewsletterDeliveryService.send_chunk(str(newsletter.pk), ids[:1])
+        mail.outbox.clear()
+
+        sent, _ = NewsletterDeliveryService.send_chunk(str(newsletter.pk), ids)
+
+        assert sent == len(ids) - 1
+        assert len(mail.outbox) == len(ids) - 1
+
+    @patch('apps.communication.tasks.send_newsletter_chunk.apply_async')
+    def test_stale_chunk_leaves_released_recipients_alone(self, mock_apply, newsletter):
+        from django.utils import timezone
+
+        NewsletterDeliveryService.start(newsletter)
+        NewsletterDeliveryService.fan_out(newsletter)
+        stale_newsletter_id, stale_ids, stale_token = mock_apply.call_args_list[0].kwargs['args']
+        # The lease expires and a resumed fan-out queues the rows again
+        NewsletterRecipient.objects.update(claimed_until=timezone.now() - timezone.timedelta(seconds=1))
+        NewsletterDeliveryService.fan_out(newsletter)
+
+        sent, failed = NewsletterDeliveryService.send_chunk(stale_newsletter_id, stale_ids, stale_token)
+
+        assert (sent, failed) == (0, 0)
+        assert not mail.outbox
+
+    def test_progress_saved_per_sub_batch(self, newsletter):
+        NewsletterDeliveryService.start(newsletter)
+        ids = _recipient_ids(newsletter)
+        saved_counts = []
+        original = NewsletterRecipient.objects.bulk_update
+
+        def record(objs, fields, *args, **kwargs):
+            saved_counts.append(len(objs))
+            return original(objs, fields, *args, **kwargs)
+
+        with patch.object(NewsletterDeliveryService, 'PROGRESS_BATCH', 1), \
+                patch.object(NewsletterRecipient.objects, 'bulk_update', side_effect=record):
+            NewsletterDeliveryService.send_chunk(str(newsletter.pk), ids)
+
+        assert saved_counts[:len(ids)] == [1] * len(ids)
+
+    def test_failures_are_recorded(self, newsletter):
+        NewsletterDeliveryService.start(newsletter)
+        ids = _recipient_ids(newsletter)
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages',
+                   side_effect=OSError('mailbox unavailable')):
+            sent, failed = NewsletterDeliveryService.send_chunk(str(newsletter.pk), ids)
+
+        assert (sent, failed) == (0, len(ids))
+        assert NewsletterRecipient.objects.filter(
+            newsletter=newsletter, failed=True, failure_reason='mailbox unavailable',
+        ).count() == len(ids)
+        newsletter.refresh_from_db()
+        assert newsletter.status == NewsletterStatus.FAILED
+
+
+class TestOpenTracking:
+    def test_pixel_buffers_open_without_touching_counters(self, client, newsletter):
+        from django.urls import reverse
+        from apps.communication.models import NewsletterOpen
+
+        NewsletterDeliveryService.start(newsletter)
+        recipient = newsletter.recipients.first()
+
+        response = client.get(
+            reverse('frontend:communication:newsletter_open', args=[recipient.pk])
+        )
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'image/gif'
+        assert NewsletterOpen.objects.filter(recipient_id=recipient.pk).count() == 1
+        recipient.refresh_from_db()
+        newsletter.refresh_from_db()
+        assert recipient.opened_at is None
+        assert newsletter.opened_count == 0
+
+    def test_pixel_ignores_unknown_recipient(self, client, newsletter):
+        import uuid
+        from django.urls import reverse
+        from apps.communication.models import NewsletterOpen
+
+        response = client.get(
+            reverse('frontend:communication:newsletter_open', args=[uuid.uuid4()])
+        )
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'image/gif'
+        assert not NewsletterOpen.all_objects.exists()
+
+    def test_flush_counts_first_opens_only(self, newsletter):
+        from apps.communication.models import NewsletterOpen
+        from apps.communication.services_newsletter import NewsletterOpenService
+
+        NewsletterDeliveryService.start(newsletter)
+        first, second = newsletter.recipients.all()[:2]
+        NewsletterOpenService.record(first.pk)
+        NewsletterOpenService.record(first.pk)
+        NewsletterOpenService.record(second.pk)
+
+        assert NewsletterOpenService.flush() == 2
+        newsletter.refresh_from_db()
+        first.refresh_from_db()
+        assert newsletter.opened_count == 2
+        assert first.opened_at is not None
+        assert NewsletterOpen.all_objects.count() == 0
+
+        NewsletterOpenService.record(first.pk)
+        assert NewsletterOpenService.flush() == 0
+        newsletter.refresh_from_db()
+        assert newsletter.opened_count == 2
+
+    def test_message_embeds_pixel_when_site_url_set(self, settings, newsletter):
+        settings.SITE_URL = 'https://eglise.example.com'
+        NewsletterDeliveryService.start(newsletter)
+        recipient = newsletter.recipients.first()
+
+        message = NewsletterDeliveryService.build_message(newsletter, recipient, None)
+
+        html = message.alternatives[0][0]
+        assert f'https://eglise.example.com/communication/newsletters/open/{recipient.pk}/' in html
+
@@ -1,4 +1,9 @@
 """Tests for push notification models, service, and views."""
+import base64
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -112,6 +117,100 @@ class TestWebPushService:
         assert service.is_configured is False
 
 
+def _b64(raw):
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _p256dh_key():
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+    public = ec.generate_private_key(ec.SECP256R1()).public_key()
+    return _b64(public.public_bytes(Encoding.X962, PublicFormat.UncompressedPoint))
+
+
+class _PushEndpoint(BaseHTTPRequestHandler):
+    """Stub push service: 201 for /ok/..., 410 for /gone/..."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.server.hits.append(self.path)
+        self.send_response(410 if self.path.startswith('/gone/') else 201)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def push_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _PushEndpoint)
+    server.hits = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def vapid(settings):
+    pytest.importorskip('pywebpush')
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    private = ec.generate_private_key(ec.SECP256R1())
+    settings.VAPID_PUBLIC_KEY = 'test-public-key'
+    settings.VAPID_PRIVATE_KEY = _b64(private.private_numbers().private_value.to_bytes(32, 'big'))
+    settings.PUSH_SEND_RATE = 0
+
+
+class TestWebPushFanOut:
+    def _subscription(self, server, path):
+        return PushSubscriptionFactory(
+            endpoint=f'http://127.0.0.1:{server.server_port}{path}',
+            p256dh_key=_p256dh_key(),
+            auth_key=_b64(os.urandom(16)),
+        )
+
+    def test_sends_over_http_and_deactivates_gone(self, vapid, push_server, django_assert_num_queries):
+        PushSubscription.objects.update(is_active=False)
+        for index in range(4):
+            self._subscription(push_server, f'/ok/{index}')
+        gone = self._subscription(push_server, '/gone/1')
+
+        with django_assert_num_queries(2):
+            count = WebPushService().send_to_all('Urgence', 'Culte annulé')
+
+        assert count == 4
+        assert sorted(push_server.hits) == ['/gone/1', '/ok/0', '/ok/1', '/ok/2', '/ok/3']
+        gone.refresh_from_db()
+        assert gone.is_active is False
+        assert PushSubscription.objects.filter(is_active=True).count() == 4
+
+    def test_claims_are_not_shared_between_sends(self, vapid, push_server):
+        service = WebPushService()
+        claims = dict(service.vapid_claims)
+        service.send_notification(self._subscription(push_server, '/ok/1'), 'A', 'B')
+        assert service.vapid_claims == claims
+
+    def test_sends_run_concurrently(self, settings):
+        settings.PUSH_FANOUT_WORKERS = 4
+        subscriptions = PushSubscriptionFactory.create_batch(4)
+        threads = set()
+        barrier = threading.Barrier(4, timeout=5)
+
+        def deliver(subscription, payload, webpush, session):
+            threads.add(threading.current_thread().name)
+            barrier.wait()
+            return WebPushService.SENT
+
+        service = WebPushService()
+        with patch.object(service, '_deliver', side_effect=deliver):
+            assert service.send_many(subscriptions, 'Titre', 'Corps') == 4
+        assert len(threads) == 4
+
+
 # ─── Frontend View Tests ─────────────────────────────────────────────────────────
 
 
@@ -124,6 +124,48 @@ class TestTwilioSMSService:
         assert service.is_configured is False
 
 
+class TestTwilioSMSBulkSend:
+    @pytest.fixture
+    def twilio(self, settings):
+        settings.TWILIO_ACCOUNT_SID = 'AC123'
+        settings.TWILIO_AUTH_TOKEN = 'token'
+        settings.TWILIO_PHONE_NUMBER = '+15550000000'
+        settings.SMS_SEND_RATE = 0
+        service = TwilioSMSService()
+        service._client = MagicMock()
+        service._client.messages.create.side_effect = (
+            lambda body, from_, to: MagicMock(sid=f'SM{to[-4:]}')
+        )
+        return service
+
+    def test_prefetches_opt_outs_and_writes_back_in_bulk(self, twilio, django_assert_num_queries):
+        msgs = [SMSMessageFactory(phone_number=f'+1555123000{i}') for i in range(4)]
+        SMSOptOutFactory(phone_number='+15551230002')
+
+        with django_assert_num_queries(2):
+            results = twilio.bulk_send(msgs)
+
+        assert twilio.client.messages.create.call_count == 3
+        by_number = {sms.phone_number: sms for sms in results}
+        assert by_number['+15551230002'].status == SMSStatus.FAILED
+        for sms in SMSMessage.objects.filter(pk__in=[m.pk for m in msgs]).exclude(
+            phone_number='+15551230002',
+        ):
+            assert sms.status == SMSStatus.SENT
+            assert sms.twilio_sid == f'SM{sms.phone_number[-4:]}'
+            assert sms.sent_at is not None
+
+    def test_provider_error_marks_message_failed(self, twilio):
+        twilio.client.messages.create.side_effect = RuntimeError('invalid number')
+        sms = SMSMessageFactory(phone_number='+15551230009')
+
+        twilio.send_sms(sms)
+
+        sms.refresh_from_db()
+        assert sms.status == SMSStatus.FAILED
+        assert sms.sent_at is None
+
+
 # ─── Frontend View Tests ─────────────────────────────────────────────────────────
 
 
@@ -0,0 +1,135 @@
+"""Tests for the scheduled member messaging tasks."""
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from apps.core.constants import NotificationType, SMSStatus
+from apps.members.models import Member
+from apps.members.tests.factories import MemberFactory
+from apps.communication.models import Notification, SMSMessage
+from apps.communication.tasks import (
+    send_anniversary_messages, send_birthday_messages, send_reengagement_messages,
+)
+from apps.communication.tests.factories import (
+    NotificationFactory, NotificationPreferenceFactory, PushSubscriptionFactory,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _today_is_not_feb_29():
+    today = timezone.now().date()
+    if (today.month, today.day) == (2, 29):
+        pytest.skip('Dates are shifted to years without February 29')
+
+
+def _birthday_member(**kwargs):
+    today = timezone.now().date()
+    return MemberFactory(birth_date=today.replace(year=1990), **kwargs)
+
+
+class TestBirthdayMessages:
+    def test_notifies_and_respects_channel_preferences(self):
+        sms_member = _birthday_member(phone='+15550001111')
+        NotificationPreferenceFactory(member=sms_member, sms_enabled=True, push_enabled=False)
+        push_member = _birthday_member()
+        NotificationPreferenceFactory(member=push_member, sms_enabled=False, push_enabled=True)
+        PushSubscriptionFactory(member=push_member)
+        quiet_member = _birthday_member()
+
+        with patch('apps.communication.services_push.WebPushService.send_many',
+                   return_value=1) as mock_push:
+            send_birthday_messages()
+
+        for member in (sms_member, push_member, quiet_member):
+            assert Notification.objects.filter(
+                member=member, notification_type=NotificationType.BIRTHDAY,
+            ).count() == 1
+        sms = SMSMessage.objects.get(recipient_member__in=[sms_member, push_member, quiet_member])
+        assert sms.recipient_member == sms_member
+        assert sms.status == SMSStatus.SENT
+        (subscriptions, title, _), _ = mock_push.call_args
+        assert [sub.member_id for sub in subscriptions] == [push_member.pk]
+        assert title == 'Joyeux anniversaire!'
+
+    def test_query_count_does_not_grow_with_members(self, django_assert_max_num_queries):
+        for index in range(10):
+            member = _birthday_member(phone=f'+1555000{index:04d}')
+            NotificationPreferenceFactory(member=member, sms_enabled=True)
+
+        with django_assert_max_num_queries(12):
+            send_birthday_messages()
+
+
+class TestAnniversaryMessages:
+    def test_counts_years_of_membership(self):
+        now = timezone.now()
+        member = MemberFactory()
+        Member.objects.filter(pk=member.pk).update(
+            registration_date=now.replace(year=now.year - 3),
+        )
+
+        send_anniversary_messages()
+
+        notification = Notification.objects.get(
+            member=member, title__contains='anniversaire de membre',
+        )
+        assert notification.title == 'Joyeux 3e anniversaire de membre!'
+
+
+class TestReengagementMessages:
+    def _stale_member(self):
+        member = MemberFactory()
+        Member.objects.filter(pk=member.pk).update(
+            updated_at=timezone.now() - timedelta(weeks=10),
+        )
+        return member
+
+    def test_sends_once_per_period(self):
+        member = self._stale_member()
+
+        send_reengagement_messages()
+        send_reengagement_messages()
+
+        assert Notification.objects.filter(
+            member=member, notification_type=NotificationType.REENGAGEMENT,
+        ).count() == 1
+
+    def test_dedupe_ignores_other_notifications_with_similar_titles(self):
+        member = self._stale_member()
+        NotificationFactory(member=member, title='Ne manquez pas le culte!')
+
+        send_reengagement_messages()
+
+        assert Notification.objects.filter(
+            member=member, notification_type=NotificationType.REENGAGEMENT,
+        ).exists()
+
+
+class TestDeliverNotificationChannels:
+    def test_sends_each_notification_by_preferred_channel(self):
+        from apps.communication.tasks import deliver_notification_channels
+
+        sms_member = MemberFactory(phone='+15550002222')
+        NotificationPreferenceFactory(member=sms_member, sms_enabled=True, push_enabled=False)
+        push_member = MemberFactory()
+        NotificationPreferenceFactory(member=push_member, sms_enabled=False, push_enabled=True)
+        subscription = PushSubscriptionFactory(member=push_member)
+        quiet_member = MemberFactory(phone='+15550003333')
+        notifications = [
+            NotificationFactory(member=member, title='Rappel', message=f'Pour {member.pk}', link='/x/')
+            for member in (sms_member, push_member, quiet_member)
+        ]
+
+        with patch('apps.communication.services_push.WebPushService.send_each',
+                   return_value=1) as mock_push:
+            deliver_notification_channels([str(n.pk) for n in notifications])
+
+        sms = SMSMessage.objects.get()
+        assert sms.recipient_member == sms_member
+        assert sms.body == f'Pour {sms_member.pk}'
+        (messages,), _ = mock_push.call_args
+        assert messages == [(subscription, 'Rappel', f'Pour {push_member.pk}', '/x/')]
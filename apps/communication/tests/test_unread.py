@@ -0,0 +1,102 @@
+"""Tests for the cached unread notification counter."""
+import pytest
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from apps.members.tests.factories import MemberFactory, MemberWithUserFactory
+from apps.communication.models import Notification
+from apps.communication.services_unread import UnreadCountService
+from apps.communication.tests.factories import NotificationFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestUnreadCountService:
+    def test_miss_counts_from_db_and_caches(self, django_assert_num_queries):
+        member = MemberFactory()
+        Notification.objects.filter(member=member).delete()
+        NotificationFactory.create_batch(2, member=member)
+        NotificationFactory(member=member, is_read=True)
+
+        assert UnreadCountService.get(member) == 2
+        with django_assert_num_queries(0):
+            assert UnreadCountService.get(member) == 2
+
+    def test_create_increments_cached_count(self, django_capture_on_commit_callbacks):
+        member = MemberFactory()
+        before = UnreadCountService.get(member)
+        with django_capture_on_commit_callbacks(execute=True):
+            NotificationFactory(member=member)
+        assert cache.get(UnreadCountService.cache_key(member.pk)) == before + 1
+
+    def test_bulk_create_increments_cached_count(self, django_capture_on_commit_callbacks):
+        member = MemberFactory()
+        before = UnreadCountService.get(member)
+        with django_capture_on_commit_callbacks(execute=True):
+            Notification.objects.bulk_create([
+                Notification(member=member, title='a', message='a'),
+                Notification(member=member, title='b', message='b'),
+                Notification(member=member, title='c', message='c', is_read=True),
+            ])
+        assert cache.get(UnreadCountService.cache_key(member.pk)) == before + 2
+
+    def test_mark_read_decrements_cached_count(self, django_capture_on_commit_callbacks):
+        member = MemberFactory()
+        first, second = NotificationFactory.create_batch(2, member=member)
+        before = UnreadCountService.get(member)
+        with django_capture_on_commit_callbacks(execute=True):
+            assert Notification.objects.mark_read(member, ids=[first.pk]) == 1
+        assert cache.get(UnreadCountService.cache_key(member.pk)) == before - 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Notification.objects.mark_read(member)
+        assert cache.get(UnreadCountService.cache_key(member.pk)) == 0
+
+    def test_saving_read_flag_decrements(self, django_capture_on_commit_callbacks):
+        member = MemberFactory()
+        notification = NotificationFactory(member=member)
+        before = UnreadCountService.get(member)
+        notification = Notification.objects.get(pk=notification.pk)
+        notification.is_read = True
+        with django_capture_on_commit_callbacks(execute=True):
+            notification.save()
+        assert cache.get(UnreadCountService.cache_key(member.pk)) == before - 1
+
+    def test_adjust_on_miss_recounts(self, django_capture_on_commit_callbacks):
+        member = MemberFactory()
+        NotificationFactory(member=member)
+        cache.delete(UnreadCountService.cache_key(member.pk))
+        with django_capture_on_commit_callbacks(execute=True):
+            UnreadCountService.adjust(member, 1)
+        assert UnreadCountService.get(member) == UnreadCountService.count_from_db(member.pk)
+
+    def test_negative_value_self_heals(self, django_capture_on_commit_callbacks):
+        member = MemberFactory()
+        cache.set(UnreadCountService.cache_key(member.pk), 0)
+        with django_capture_on_commit_callbacks(execute=True):
+            UnreadCountService.adjust(member, -3)
+        assert UnreadCountService.get(member) == UnreadCountService.count_from_db(member.pk)
+
+    @patch('apps.core.consumers.update_notification_count')
+    def test_pushes_new_count(self, mock_push, django_capture_on_commit_callbacks):
+        member = MemberWithUserFactory()
+        before = UnreadCountService.get(member)
+        with django_capture_on_commit_callbacks(execute=True):
+            NotificationFactory(member=member)
+        mock_push.assert_called_with(member.user_id, before + 1)
+
+
+class TestUnreadCountContextProcessor:
+    def test_cached_count_needs_no_query(self, django_assert_num_queries):
+        from custom_context_processor import dz_static
+
+        member = MemberWithUserFactory()
+        request = RequestFactory().get('/')
+        request.user = member.user
+        expected = UnreadCountService.get(member)
+
+        with django_assert_num_queries(0):
+            context = dz_static(request)
+        assert context['unread_notification_count'] == expected
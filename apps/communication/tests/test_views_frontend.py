@@ -578,8 +578,27 @@ class TestNewsletterSendView:
         )
         assert response.status_code == 302
         newsletter.refresh_from_db()
-        assert newsletter.status == NewsletterStatus.SENT
-        assert newsletter.sent_at is not None
+        assert newsletter.status == NewsletterStatus.SENDING
+        assert newsletter.recipients.count() == newsletter.recipients_count
+
+    def test_send_already_in_progress_is_not_reported_as_started(self, client, pastor_user):
+        from unittest.mock import patch
+        from django.contrib.messages import constants, get_messages
+
+        user, _ = pastor_user
+        client.force_login(user)
+        newsletter = NewsletterFactory(status=NewsletterStatus.DRAFT)
+        with patch(
+            "apps.communication.services_newsletter.NewsletterDeliveryService.start",
+            return_value=False,
+        ):
+            response = client.post(
+                reverse("frontend:communication:newsletter_send", kwargs={"pk": newsletter.pk}),
+                {"action": "send"},
+            )
+        assert response.status_code == 302
+        levels = [message.level for message in get_messages(response.wsgi_request)]
+        assert levels == [constants.INFO]
 
     def test_schedule_newsletter(self, client, pastor_user):
         user, _ = pastor_user
@@ -664,7 +683,7 @@ class TestNewsletterSendView:
         )
         assert response.status_code == 302
         newsletter.refresh_from_db()
-        assert newsletter.status == NewsletterStatus.SENT
+        assert newsletter.status == NewsletterStatus.SENDING
 
 
 
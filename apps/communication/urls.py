@@ -30,6 +30,7 @@ frontend_urlpatterns = [
     path('newsletters/<uuid:pk>/edit/', views_frontend.newsletter_edit, name='newsletter_edit'),
     path('newsletters/<uuid:pk>/delete/', views_frontend.newsletter_delete, name='newsletter_delete'),
     path('newsletters/<uuid:pk>/send/', views_frontend.newsletter_send, name='newsletter_send'),
+    path('newsletters/open/<uuid:pk>/', views_frontend.newsletter_open, name='newsletter_open'),
 
     # Notifications
     path('notifications/', views_frontend.notification_list, name='notification_list'),
@@ -23,6 +23,8 @@ from .serializers import (
     ABTestSerializer,
     DirectMessageSerializer, GroupChatSerializer, GroupChatMessageSerializer,
 )
+from .services_newsletter import NewsletterDeliveryService
+from .services_unread import UnreadCountService
 
 
 class NewsletterViewSet(viewsets.ModelViewSet):
@@ -55,8 +57,8 @@ class NewsletterViewSet(viewsets.ModelViewSet):
         if newsletter.status == NewsletterStatus.SENT:
             return Response({'error': 'D\u00e9j\u00e0 envoy\u00e9e'}, status=status.HTTP_400_BAD_REQUEST)
 
-        newsletter.status = NewsletterStatus.SENDING
-        newsletter.save()
+        if not NewsletterDeliveryService.start(newsletter):
+            return Response({'error': 'Envoi d\u00e9j\u00e0 en cours'}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({'message': 'Envoi en cours'})
 
@@ -91,14 +93,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Profil membre requis'}, status=status.HTTP_404_NOT_FOUND)
         member = request.user.member_profile
         ids = request.data.get('ids', [])
-        if ids:
-            Notification.objects.filter(id__in=ids, member=member).update(
-                is_read=True, read_at=timezone.now()
-            )
-        else:
-            Notification.objects.filter(member=member, is_read=False).update(
-                is_read=True, read_at=timezone.now()
-            )
+        Notification.objects.mark_read(member, ids=ids or None)
         return Response({'message': 'Marqu\u00e9es comme lues'})
 
     @action(detail=False, methods=['get'])
@@ -106,7 +101,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
         """Return count of unread notifications."""
         if not hasattr(request.user, 'member_profile'):
             return Response({'count': 0})
-        count = Notification.objects.filter(member=request.user.member_profile, is_read=False).count()
+        count = UnreadCountService.get(request.user.member_profile)
         return Response({'count': count})
 
 
@@ -286,6 +281,13 @@ class AutomationViewSet(viewsets.ModelViewSet):
         enrollments = service.trigger(automation.trigger_type, member)
         return Response({'enrolled': len(enrollments)})
 
+    @action(detail=False, methods=['get'])
+    def metrics(self, request):
+        """Backlog, lag and per-channel throughput of the step processor."""
+        from .services_automation import AutomationService
+
+        return Response(AutomationService().metrics())
+
 
 class AutomationStepViewSet(viewsets.ModelViewSet):
     queryset = AutomationStep.objects.all()
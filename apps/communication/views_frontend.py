@@ -210,6 +210,17 @@ def newsletter_delete(request, pk):
     return render(request, "communication/newsletter_delete.html", context)
 
 
+def newsletter_open(request, pk):
+    """Tracking pixel embedded in newsletters; buffers the open for a later flush."""
+    from django.http import HttpResponse
+    from .services_newsletter import NewsletterOpenService
+
+    NewsletterOpenService.record(pk)
+    response = HttpResponse(NewsletterOpenService.PIXEL, content_type="image/gif")
+    response["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+    return response
+
+
 @login_required
 def newsletter_send(request, pk):
     """Send or schedule a newsletter (staff only, POST)."""
@@ -238,22 +249,13 @@ def newsletter_send(request, pk):
         else:
             messages.error(request, _("Veuillez specifier une date de planification."))
     else:
-        # Send immediately
-        newsletter.status = NewsletterStatus.SENT
-        newsletter.sent_at = timezone.now()
-        # Count recipients
-        if newsletter.send_to_all:
-            newsletter.recipients_count = Member.objects.filter(
-                is_active=True, email__isnull=False
-            ).exclude(email="").count()
+        # Send immediately: recipients are resolved now, mail goes out in the background
+        from .services_newsletter import NewsletterDeliveryService
+
+        if NewsletterDeliveryService.start(newsletter):
+            messages.success(request, _("Envoi de l'infolettre en cours."))
         else:
-            newsletter.recipients_count = Member.objects.filter(
-                is_active=True,
-                group_memberships__group__in=newsletter.target_groups.all(),
-                email__isnull=False,
-            ).exclude(email="").distinct().count()
-        newsletter.save(update_fields=["status", "sent_at", "recipients_count", "updated_at"])
-        messages.success(request, _("Infolettre envoyee."))
+            messages.info(request, _("Un envoi de cette infolettre est deja en cours."))
 
     return redirect("frontend:communication:newsletter_detail", pk=newsletter.pk)
 
@@ -268,10 +270,7 @@ def mark_all_read(request):
         messages.error(request, _("Profil requis."))
         return redirect("/")
 
-    Notification.objects.filter(
-        member=request.user.member_profile,
-        is_read=False,
-    ).update(is_read=True, read_at=timezone.now())
+    Notification.objects.mark_read(request.user.member_profile)
 
     messages.success(request, _("Toutes les notifications ont ete marquees comme lues."))
     return redirect("/communication/notifications/")
@@ -69,7 +69,8 @@ class LoginAuditAdmin(admin.ModelAdmin):
 # ─── Extended Core Models ────────────────────────────────────────────────────
 
 from apps.core.models_extended import (
-    ChurchBranding, WebhookEndpoint, WebhookDelivery, AuditLog, Campus,
+    ChurchBranding, WebhookEndpoint, WebhookDelivery, AuditLog, Campus, ExportJob,
+    NumberSequence,
 )
 
 
@@ -133,3 +134,26 @@ class CampusAdmin(BaseModelAdmin):
     list_display = ['name', 'city', 'pastor', 'is_main', 'is_active', 'created_at']
     list_filter = ['is_main', 'is_active', 'province']
     search_fields = ['name', 'city']
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ['export_type', 'format', 'requested_by', 'status', 'rows_done', 'rows_total', 'created_at', 'expires_at']
+    list_filter = ['status', 'export_type', 'format', 'created_at']
+    search_fields = ['requested_by__username']
+    readonly_fields = [
+        'id', 'requested_by', 'export_type', 'format', 'params', 'status',
+        'rows_done', 'rows_total', 'file', 'error', 'started_at', 'completed_at',
+        'expires_at', 'created_at', 'updated_at',
+    ]
+    ordering = ['-created_at']
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(NumberSequence)
+class NumberSequenceAdmin(BaseModelAdmin):
+    list_display = ['prefix', 'period', 'last_value', 'updated_at']
+    search_fields = ['prefix', 'period']
+    ordering = ['prefix', '-period']
@@ -281,6 +281,7 @@ class NotificationType:
     HELP_REQUEST = 'help_request'
     DONATION = 'donation'
     GENERAL = 'general'
+    REENGAGEMENT = 'reengagement'
 
     CHOICES = [
         (BIRTHDAY, _('Anniversaire')),
@@ -289,6 +290,7 @@ class NotificationType:
         (HELP_REQUEST, _('Mise à jour de requête')),
         (DONATION, _('Reçu de don')),
         (GENERAL, _('Général')),
+        (REENGAGEMENT, _('Relance')),
     ]
 
 
@@ -1194,3 +1196,50 @@ class RehearsalAttendeeStatus:
         (CONFIRMED, _('Confirmé')),
         (DECLINED, _('Décliné')),
     ]
+
+
+class ExportJobStatus:
+    """Background export job states."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    EXPIRED = 'expired'
+
+    CHOICES = [
+        (PENDING, _('En attente')),
+        (RUNNING, _('En cours')),
+        (COMPLETED, _('Terminé')),
+        (FAILED, _('Échec')),
+        (EXPIRED, _('Expiré')),
+    ]
+
+
+class ExportJobType:
+    """Kinds of data a background export job can produce."""
+    MEMBERS = 'members'
+    DONATIONS = 'donations'
+    STATEMENTS = 'statements'
+    REPORT = 'report'
+
+    CHOICES = [
+        (MEMBERS, _('Membres')),
+        (DONATIONS, _('Dons')),
+        (STATEMENTS, _('Relevés de dons')),
+        (REPORT, _('Rapport')),
+    ]
+
+
+class ExportFormat:
+    """File formats produced by export jobs."""
+    CSV = 'csv'
+    XLSX = 'xlsx'
+    PDF = 'pdf'
+    ZIP = 'zip'
+
+    CHOICES = [
+        (CSV, _('CSV')),
+        (XLSX, _('Excel')),
+        (PDF, _('PDF')),
+        (ZIP, _('Archive ZIP')),
+    ]
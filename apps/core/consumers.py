@@ -15,6 +15,7 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
     - New notification alerts
     - Unread count updates
     - Toast messages for high-priority events
+    - Progress of background export jobs
     """
 
     async def connect(self):
@@ -87,6 +88,13 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
             'url': event.get('url', ''),
         })
 
+    async def export_progress(self, event):
+        """Handle export job progress broadcast."""
+        await self.send_json({
+            'type': 'export_progress',
+            'job': event.get('job', {}),
+        })
+
     async def send_unread_count(self):
         """Query and send current unread notification count."""
         from channels.db import database_sync_to_async
@@ -95,11 +103,8 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
         def get_count():
             if not hasattr(self.user, 'member_profile'):
                 return 0
-            from apps.communication.models import Notification
-            return Notification.objects.filter(
-                member=self.user.member_profile,
-                is_read=False,
-            ).count()
+            from apps.communication.services_unread import UnreadCountService
+            return UnreadCountService.get(self.user.member_profile)
 
         count = await get_count()
         await self.send_json({
@@ -116,10 +121,7 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
             if not hasattr(self.user, 'member_profile'):
                 return
             from apps.communication.models import Notification
-            Notification.objects.filter(
-                pk=nid,
-                member=self.user.member_profile,
-            ).update(is_read=True)
+            Notification.objects.mark_read(self.user.member_profile, ids=[nid])
 
         await do_mark_read(notification_id)
 
@@ -132,10 +134,7 @@ class NotificationConsumer(AsyncJsonWebsocketConsumer):
             if not hasattr(self.user, 'member_profile'):
                 return
             from apps.communication.models import Notification
-            Notification.objects.filter(
-                member=self.user.member_profile,
-                is_read=False,
-            ).update(is_read=True)
+            Notification.objects.mark_read(self.user.member_profile)
 
         await do_mark_all_read()
 
@@ -208,3 +207,26 @@ def update_notification_count(user_id, count):
             'count': count,
         }
     )
+
+
+def send_export_progress(user_id, job_data):
+    """
+    Send export job progress to a user's WebSocket.
+
+    Args:
+        user_id: The user's ID
+        job_data: dict with id, status, rows_done, rows_total, progress, download_url
+    """
+    from asgiref.sync import async_to_sync
+    from channels.layers import get_channel_layer
+
+    channel_layer = get_channel_layer()
+    group_name = f'notifications_{user_id}'
+
+    async_to_sync(channel_layer.group_send)(
+        group_name,
+        {
+            'type': 'export_progress',
+            'job': job_data,
+        }
+    )
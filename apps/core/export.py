@@ -1,8 +1,131 @@
 """Shared CSV and PDF export utilities."""
 import csv
 import io
+import tempfile
 
-from django.http import HttpResponse
+from django.core.exceptions import FieldDoesNotExist
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _header_row(fields, headers=None):
+    return headers or [f if isinstance(f, str) else f.__name__ for f in fields]
+
+
+def _resolve_path(model, path):
+    """
+    Walk a ``field__related`` lookup path.
+
+    Returns (model_field, relation_prefixes) where relation_prefixes are the
+    FK/one-to-one hops usable with select_related, or (None, []) when the
+    path does not resolve to a single-valued field.
+    """
+    parts = path.split('__')
+    prefixes = []
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None, []
+        if field.is_relation and not (field.many_to_one or field.one_to_one):
+            return None, []
+        if field.is_relation:
+            prefixes.append('__'.join(parts[:index + 1]))
+            if index < len(parts) - 1:
+                model = field.related_model
+        elif index < len(parts) - 1:
+            return None, []
+    return field, prefixes
+
+
+def _plan_export(queryset, fields):
+    """
+    Prepare an export queryset and a row builder.
+
+    When every field is a concrete, non-relational field path the rows are
+    read with ``values_list()`` (no model instances); otherwise related
+    lookups in the spec are turned into ``select_related`` so each row costs
+    no extra query.
+    """
+    if not hasattr(queryset, 'model'):
+        return queryset, lambda obj: [_field_value(obj, field) for field in fields]
+
+    resolved = {
+        field: _resolve_path(queryset.model, field)
+        for field in fields if isinstance(field, str)
+    }
+
+    if all(
+        isinstance(f, str) and resolved[f][0] is not None and not resolved[f][0].is_relation
+        for f in fields
+    ):
+        displays = []
+        for field in fields:
+            model_field = resolved[field][0]
+            use_display = '__' not in field and model_field.choices
+            displays.append(dict(model_field.flatchoices) if use_display else None)
+
+        def build(values):
+            return [
+                choices.get(value, value) if choices else value
+                for value, choices in zip(values, displays)
+            ]
+
+        return queryset.values_list(*fields), build
+
+    related = set()
+    for model_field, prefixes in resolved.values():
+        related.update(prefixes)
+    if related:
+        queryset = queryset.select_related(*sorted(related))
+
+    def build(obj):
+        return [_field_value(obj, field) for field in fields]
+
+    return queryset, build
+
+
+def _field_value(obj, field):
+    if callable(field):
+        return field(obj)
+    if '__' in field:
+        # Handle related field lookups
+        val = obj
+        for part in field.split('__'):
+            val = getattr(val, part, '') if val else ''
+        return val
+    val = getattr(obj, field, '')
+    # Use get_FOO_display() for choice fields if available
+    display_method = f'get_{field}_display'
+    if hasattr(obj, display_method):
+        val = getattr(obj, display_method)()
+    return val
+
+
+def iter_export_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one list of values per object, streaming from the database."""
+    queryset, build = _plan_export(queryset, fields)
+    if hasattr(queryset, 'iterator'):
+        rows = queryset.iterator(chunk_size=chunk_size)
+    else:
+        rows = queryset
+    for obj in rows:
+        yield build(obj)
+
+
+def _excel_value(val):
+    # Convert non-serializable types to string
+    if val is not None and not isinstance(val, (str, int, float, bool)):
+        val = str(val)
+    return val if val is not None else ''
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer streaming."""
+
+    def write(self, value):
+        return value
 
 
 def export_queryset_csv(queryset, fields, filename, headers=None):
@@ -23,36 +146,37 @@ def export_queryset_csv(queryset, fields, filename, headers=None):
     response.write('\ufeff')  # BOM for Excel UTF-8
 
     writer = csv.writer(response)
+    writer.writerow(_header_row(fields, headers))
 
-    if headers:
-        writer.writerow(headers)
-    else:
-        writer.writerow([f if isinstance(f, str) else f.__name__ for f in fields])
-
-    for obj in queryset:
-        row = []
-        for field in fields:
-            if callable(field):
-                row.append(field(obj))
-            elif '__' in field:
-                # Handle related field lookups
-                parts = field.split('__')
-                val = obj
-                for part in parts:
-                    val = getattr(val, part, '') if val else ''
-                row.append(val)
-            else:
-                val = getattr(obj, field, '')
-                # Use get_FOO_display() for choice fields if available
-                display_method = f'get_{field}_display'
-                if hasattr(obj, display_method):
-                    val = getattr(obj, display_method)()
-                row.append(val)
+    for row in iter_export_rows(queryset, fields):
         writer.writerow(row)
 
     return response
 
 
+def stream_queryset_csv(queryset, fields, filename, headers=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream a queryset as CSV in constant memory.
+
+    Same arguments as export_queryset_csv; rows are read with
+    ``queryset.iterator(chunk_size=...)`` and written as they are produced.
+
+    Returns:
+        StreamingHttpResponse with CSV content
+    """
+    writer = csv.writer(_Echo())
+
+    def generate():
+        yield '\ufeff'  # BOM for Excel UTF-8
+        yield writer.writerow(_header_row(fields, headers))
+        for row in iter_export_rows(queryset, fields, chunk_size):
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
 def export_queryset_excel(queryset, fields, filename, headers=None):
     """
     Export a queryset to Excel (.xlsx).
@@ -75,33 +199,9 @@ def export_queryset_excel(queryset, fields, filename, headers=None):
     ws = wb.active
     ws.title = filename[:31]  # Excel sheet names max 31 chars
 
-    # Write header row
-    if headers:
-        ws.append(headers)
-    else:
-        ws.append([f if isinstance(f, str) else f.__name__ for f in fields])
-
-    # Write data rows
-    for obj in queryset:
-        row = []
-        for field in fields:
-            if callable(field):
-                val = field(obj)
-            elif '__' in field:
-                parts = field.split('__')
-                val = obj
-                for part in parts:
-                    val = getattr(val, part, '') if val else ''
-            else:
-                val = getattr(obj, field, '')
-                display_method = f'get_{field}_display'
-                if hasattr(obj, display_method):
-                    val = getattr(obj, display_method)()
-            # Convert non-serializable types to string
-            if val is not None and not isinstance(val, (str, int, float, bool)):
-                val = str(val)
-            row.append(val if val is not None else '')
-        ws.append(row)
+    ws.append(_header_row(fields, headers))
+    for row in iter_export_rows(queryset, fields):
+        ws.append([_excel_value(val) for val in row])
 
     output = io.BytesIO()
     wb.save(output)
@@ -115,6 +215,40 @@ def export_queryset_excel(queryset, fields, filename, headers=None):
     return response
 
 
+def stream_queryset_excel(queryset, fields, filename, headers=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Export a queryset to Excel (.xlsx) in constant memory.
+
+    Uses openpyxl's write-only mode, spools the workbook to a temporary
+    file and streams that file back instead of buffering it in memory.
+
+    Returns:
+        FileResponse (a StreamingHttpResponse) with Excel content
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImportError("openpyxl is required for Excel export. Install with: pip install openpyxl")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=filename[:31])  # Excel sheet names max 31 chars
+
+    ws.append(_header_row(fields, headers))
+    for row in iter_export_rows(queryset, fields, chunk_size):
+        ws.append([_excel_value(val) for val in row])
+
+    output = tempfile.TemporaryFile()
+    wb.save(output)
+    output.seek(0)
+
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f'{filename}.xlsx',
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+
+
 def export_queryset_pdf(queryset, fields, filename, headers=None, template_string=None):
     """
     Export a queryset to PDF using xhtml2pdf.
@@ -138,24 +272,10 @@ def export_queryset_pdf(queryset, fields, filename, headers=None, template_strin
         headers = [f if isinstance(f, str) else f.__name__ for f in fields]
 
     # Build table rows
-    rows = []
-    for obj in queryset:
-        row = []
-        for field in fields:
-            if callable(field):
-                val = field(obj)
-            elif '__' in field:
-                parts = field.split('__')
-                val = obj
-                for part in parts:
-                    val = getattr(val, part, '') if val else ''
-            else:
-                val = getattr(obj, field, '')
-                display_method = f'get_{field}_display'
-                if hasattr(obj, display_method):
-                    val = getattr(obj, display_method)()
-            row.append(str(val) if val is not None else '')
-        rows.append(row)
+    rows = [
+        [str(val) if val is not None else '' for val in row]
+        for row in iter_export_rows(queryset, fields)
+    ]
 
     if template_string is None:
         header_cells = ''.join(f'<th style="padding:5px;border:1px solid #ccc;background:#f5f5f5;">{h}</th>' for h in headers)
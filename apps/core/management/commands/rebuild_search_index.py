@@ -0,0 +1,12 @@
+"""Rebuild the global search index from scratch."""
+from django.core.management.base import BaseCommand
+
+from apps.core.search_index import SearchIndex
+
+
+class Command(BaseCommand):
+    help = 'Re-index every member, event, group, help request and donation for global search.'
+
+    def handle(self, *args, **options):
+        written = SearchIndex.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{written} documents indexed.'))
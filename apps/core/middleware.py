@@ -11,12 +11,41 @@ TWO_FACTOR_EXEMPT_PATHS = [
     '/static/',
     '/media/',
     '/admin/',
+    '/communication/newsletters/open/',
 ]
 
 # The allauth MFA TOTP setup URL
 MFA_SETUP_URL = '/accounts/2fa/'
 
 
+class MemberProfileMiddleware:
+    """Load the user's member profile once per request.
+
+    The profile is fetched with its additional roles prefetched and stored
+    in ``request.user.member_profile``'s relation cache, so the access
+    middlewares below and the sidebar's repeated ``is_staff_member``
+    checks reuse it instead of querying again. Must sit after
+    AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            from apps.members.models import Member
+
+            member = (
+                Member.all_objects.filter(user_id=user.pk)
+                .prefetch_related('additional_roles')
+                .first()
+            )
+            Member._meta.get_field('user').remote_field.set_cached_value(user, member)
+
+        return self.get_response(request)
+
+
 class TwoFactorEnforcementMiddleware:
     """Force 2FA activation within deadline period.
 
@@ -63,6 +92,7 @@ class MembershipAccessMiddleware:
         '/audit/',
         '/settings/',
         '/search/',
+        '/communication/newsletters/open/',
     ]
 
     # Paths that require ACTIVE membership status
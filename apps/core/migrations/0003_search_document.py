@@ -0,0 +1,122 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:35
+
+import uuid
+from django.db import migrations, models
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE core_searchdocument_fts USING fts5("
+    "title, body, content='core_searchdocument')",
+    "CREATE TRIGGER core_searchdocument_fts_ai AFTER INSERT ON core_searchdocument BEGIN "
+    "INSERT INTO core_searchdocument_fts(rowid, title, body) "
+    "VALUES (new.rowid, new.title, new.body); END",
+    "CREATE TRIGGER core_searchdocument_fts_ad AFTER DELETE ON core_searchdocument BEGIN "
+    "INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, body) "
+    "VALUES ('delete', old.rowid, old.title, old.body); END",
+    "CREATE TRIGGER core_searchdocument_fts_au AFTER UPDATE ON core_searchdocument BEGIN "
+    "INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, body) "
+    "VALUES ('delete', old.rowid, old.title, old.body); "
+    "INSERT INTO core_searchdocument_fts(rowid, title, body) "
+    "VALUES (new.rowid, new.title, new.body); END",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS core_searchdocument_fts_au",
+    "DROP TRIGGER IF EXISTS core_searchdocument_fts_ad",
+    "DROP TRIGGER IF EXISTS core_searchdocument_fts_ai",
+    "DROP TABLE IF EXISTS core_searchdocument_fts",
+]
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX core_searchdocument_body_fts ON core_searchdocument "
+    "USING gin (to_tsvector('simple'::regconfig, COALESCE(body, '')))",
+    "CREATE INDEX core_searchdocument_body_trgm ON core_searchdocument "
+    "USING gin (body gin_trgm_ops)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS core_searchdocument_body_trgm",
+    "DROP INDEX IF EXISTS core_searchdocument_body_fts",
+]
+
+
+def _run_vendor_sql(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_churchbranding_campus_webhookendpoint_auditlog_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Indique si cet enregistrement est actif",
+                        verbose_name="Actif",
+                    ),
+                ),
+                ("category", models.CharField(max_length=30, verbose_name="Catégorie")),
+                (
+                    "object_id",
+                    models.CharField(max_length=64, verbose_name="ID de l'objet"),
+                ),
+                (
+                    "title",
+                    models.CharField(blank=True, max_length=255, verbose_name="Titre"),
+                ),
+                ("body", models.TextField(blank=True, verbose_name="Texte indexé")),
+            ],
+            options={
+                "verbose_name": "Document de recherche",
+                "verbose_name_plural": "Documents de recherche",
+                "ordering": ["category", "title"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("category", "object_id"), name="unique_search_document"
+                    )
+                ],
+            },
+        ),
+        # Full-text structures the search backends rely on. Any later
+        # migration that rebuilds core_searchdocument on SQLite must
+        # recreate the FTS5 table and triggers.
+        migrations.RunPython(
+            _run_vendor_sql({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run_vendor_sql({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
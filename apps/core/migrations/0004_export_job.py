@@ -0,0 +1,162 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:48
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_search_document"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExportJob",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Indique si cet enregistrement est actif",
+                        verbose_name="Actif",
+                    ),
+                ),
+                (
+                    "export_type",
+                    models.CharField(
+                        choices=[
+                            ("members", "Membres"),
+                            ("donations", "Dons"),
+                            ("statements", "Relevés de dons"),
+                            ("report", "Rapport"),
+                        ],
+                        max_length=30,
+                        verbose_name="Type d'export",
+                    ),
+                ),
+                (
+                    "format",
+                    models.CharField(
+                        choices=[
+                            ("csv", "CSV"),
+                            ("xlsx", "Excel"),
+                            ("pdf", "PDF"),
+                            ("zip", "Archive ZIP"),
+                        ],
+                        default="csv",
+                        max_length=10,
+                        verbose_name="Format",
+                    ),
+                ),
+                (
+                    "params",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Paramètres"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "En attente"),
+                            ("running", "En cours"),
+                            ("completed", "Terminé"),
+                            ("failed", "Échec"),
+                            ("expired", "Expiré"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                (
+                    "rows_done",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Lignes traitées"
+                    ),
+                ),
+                (
+                    "rows_total",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Lignes totales"
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        blank=True,
+                        null=True,
+                        upload_to="exports/%Y/%m/",
+                        verbose_name="Fichier",
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Erreur")),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Démarré le"
+                    ),
+                ),
+                (
+                    "completed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Terminé le"
+                    ),
+                ),
+                (
+                    "expires_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Expire le"
+                    ),
+                ),
+                (
+                    "requested_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="export_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Demandé par",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Export en arrière-plan",
+                "verbose_name_plural": "Exports en arrière-plan",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "expires_at"],
+                        name="core_export_status_ec2891_idx",
+                    )
+                ],
+            },
+        ),
+    ]
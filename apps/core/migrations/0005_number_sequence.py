@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:58
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_export_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NumberSequence",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Indique si cet enregistrement est actif",
+                        verbose_name="Actif",
+                    ),
+                ),
+                ("prefix", models.CharField(max_length=20, verbose_name="Préfixe")),
+                ("period", models.CharField(max_length=10, verbose_name="Période")),
+                (
+                    "last_value",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Dernière valeur"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Séquence de numérotation",
+                "verbose_name_plural": "Séquences de numérotation",
+                "ordering": ["prefix", "-period"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("prefix", "period"), name="unique_number_sequence"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:05
+
+from django.db import migrations
+
+
+def backfill_search_index(apps, schema_editor):
+    """Index the rows that existed before SearchDocument, so search works on deploy."""
+    from apps.core.search_index import SearchIndex
+
+    SearchIndex.rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_number_sequence"),
+        ("members", "0008_duplicatecandidate"),
+        ("events", "0004_roombooking_span_index"),
+        ("help_requests", "0003_benevolencefund_crisisprotocol_crisisresource_and_more"),
+        ("donations", "0005_alter_givinggoal_member_alter_givingstatement_member"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,17 @@
-"""Extended models for core app: branding, webhooks, audit logging, campus."""
+"""Extended models for core app: branding, webhooks, audit logging, campus, search index, export jobs."""
 import hashlib
 import hmac
 import json
+import time
 import uuid
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.validators import URLValidator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from .constants import ExportFormat, ExportJobStatus, ExportJobType
 from .models import BaseModel
 
 
@@ -86,10 +89,38 @@ class ChurchBranding(BaseModel):
     def __str__(self):
         return self.church_name
 
+    CACHE_PREFIX = 'core:branding'
+    _MISSING = object()
+
+    @classmethod
+    def _cache_key(cls):
+        # Saving or deleting a branding bumps the version, orphaning old entries.
+        # The initial version is time-based so an evicted counter never
+        # resurrects an entry cached under an earlier version. The counter
+        # lives in the shared Redis cache so every worker sees the bump.
+        version = cache.get_or_set(f'{cls.CACHE_PREFIX}:version', time.time_ns(), None)
+        return f'{cls.CACHE_PREFIX}:{version}'
+
     @classmethod
-    def get_current(cls):
+    def get_current(cls, use_cache=True):
         """Get the active branding config, or None."""
-        return cls.objects.first()
+        if not use_cache:
+            return cls.objects.first()
+
+        key = cls._cache_key()
+        brand = cache.get(key, cls._MISSING)
+        if brand is cls._MISSING:
+            brand = cls.objects.first()
+            cache.set(key, brand, getattr(settings, 'BRANDING_CACHE_TIMEOUT', 3600))
+        return brand
+
+    @classmethod
+    def invalidate_cache(cls):
+        """Make the next get_current() read the database again."""
+        try:
+            cache.incr(f'{cls.CACHE_PREFIX}:version')
+        except ValueError:
+            cache.set(f'{cls.CACHE_PREFIX}:version', time.time_ns(), None)
 
 
 class WebhookEndpoint(BaseModel):
@@ -388,3 +419,195 @@ class Campus(BaseModel):
         if self.is_main:
             Campus.objects.filter(is_main=True).exclude(pk=self.pk).update(is_main=False)
         super().save(*args, **kwargs)
+
+
+class SearchDocument(BaseModel):
+    """
+    Denormalized, accent-folded text of a searchable object.
+
+    Kept current by signals (see apps.core.search_index) and queried by the
+    configured search backend instead of scanning every source table.
+    """
+
+    category = models.CharField(
+        max_length=30,
+        verbose_name=_('Catégorie'),
+    )
+
+    object_id = models.CharField(
+        max_length=64,
+        verbose_name=_('ID de l\'objet'),
+    )
+
+    title = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('Titre'),
+    )
+
+    body = models.TextField(
+        blank=True,
+        verbose_name=_('Texte indexé'),
+    )
+
+    class Meta:
+        verbose_name = _('Document de recherche')
+        verbose_name_plural = _('Documents de recherche')
+        ordering = ['category', 'title']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['category', 'object_id'],
+                name='unique_search_document',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.category}: {self.title}'
+
+
+class ExportJob(BaseModel):
+    """
+    A queued export whose file is produced by a Celery worker.
+
+    The request parameters are snapshotted in ``params`` so the job can be
+    replayed outside the request; the artifact is removed once
+    ``expires_at`` has passed (see ExportJobService.purge_expired).
+    """
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='export_jobs',
+        verbose_name=_('Demandé par'),
+    )
+
+    export_type = models.CharField(
+        max_length=30,
+        choices=ExportJobType.CHOICES,
+        verbose_name=_('Type d\'export'),
+    )
+
+    format = models.CharField(
+        max_length=10,
+        choices=ExportFormat.CHOICES,
+        default=ExportFormat.CSV,
+        verbose_name=_('Format'),
+    )
+
+    params = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('Paramètres'),
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=ExportJobStatus.CHOICES,
+        default=ExportJobStatus.PENDING,
+        verbose_name=_('Statut'),
+    )
+
+    rows_done = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Lignes traitées'),
+    )
+
+    rows_total = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Lignes totales'),
+    )
+
+    file = models.FileField(
+        upload_to='exports/%Y/%m/',
+        blank=True,
+        null=True,
+        verbose_name=_('Fichier'),
+    )
+
+    error = models.TextField(
+        blank=True,
+        verbose_name=_('Erreur'),
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Démarré le'),
+    )
+
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Terminé le'),
+    )
+
+    expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Expire le'),
+    )
+
+    class Meta:
+        verbose_name = _('Export en arrière-plan')
+        verbose_name_plural = _('Exports en arrière-plan')
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'expires_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.get_export_type_display()} ({self.format}) - {self.get_status_display()}'
+
+    @property
+    def progress(self):
+        """Completion percentage (0-100)."""
+        if self.status == ExportJobStatus.COMPLETED:
+            return 100
+        if not self.rows_total:
+            return 0
+        return min(100, int(self.rows_done * 100 / self.rows_total))
+
+    @property
+    def is_downloadable(self):
+        return self.status == ExportJobStatus.COMPLETED and bool(self.file)
+
+
+class NumberSequence(BaseModel):
+    """
+    Counter behind a generated reference number (e.g. DON-202610-0042).
+
+    One row per prefix and period; apps.core.utils.reserve_sequence bumps
+    ``last_value`` with a single UPDATE, so numbers are handed out without
+    scanning the numbered table and are never reused.
+    """
+
+    prefix = models.CharField(
+        max_length=20,
+        verbose_name=_('Préfixe'),
+    )
+
+    period = models.CharField(
+        max_length=10,
+        verbose_name=_('Période'),
+    )
+
+    last_value = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name=_('Dernière valeur'),
+    )
+
+    class Meta:
+        verbose_name = _('Séquence de numérotation')
+        verbose_name_plural = _('Séquences de numérotation')
+        ordering = ['prefix', '-period']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['prefix', 'period'],
+                name='unique_number_sequence',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.prefix}-{self.period}: {self.last_value}'
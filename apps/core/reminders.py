@@ -1,70 +1,117 @@
 """Generic reminder utility for the 5j/3j/1j/J notification pattern."""
 import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
 
 from apps.communication.models import Notification
 
 logger = logging.getLogger(__name__)
 
+# (days before, flag field, label), loosest first
+REMINDER_BUCKETS = (
+    (5, 'reminder_5days_sent', '5 jours'),
+    (3, 'reminder_3days_sent', '3 jours'),
+    (1, 'reminder_1day_sent', 'demain'),
+    (0, 'reminder_sameday_sent', "aujourd'hui"),
+)
+
+
+def _windows():
+    """Yield (index, offset, flag, label, next_offset) for each bucket."""
+    for index, (offset, flag, label) in enumerate(REMINDER_BUCKETS):
+        next_offset = REMINDER_BUCKETS[index + 1][0] if index + 1 < len(REMINDER_BUCKETS) else None
+        yield index, offset, flag, label, next_offset
+
+
+def _flags_to_set(index, exact):
+    """A bucket's own flag, plus the looser ones it supersedes unless ``exact``."""
+    if exact:
+        return [REMINDER_BUCKETS[index][1]]
+    return [flag for _, flag, _ in REMINDER_BUCKETS[:index + 1]]
+
 
-def send_reminder_batch(items, get_date, get_member, make_message, link=''):
+def send_reminders(queryset, date_field, build, *, get_member=None,
+                   notification_type='general', link='', exact=False, mark=None,
+                   channels=True, today=None, batch_size=500):
     """
-    Generic 5-day/3-day/1-day/same-day reminder sender.
+    Send the 5-day/3-day/1-day/same-day reminders due for ``queryset``.
+
+    Each bucket is selected in SQL: rows whose ``date_field`` (any lookup
+    path, e.g. ``'section__service__date'`` or ``'scheduled_date__date'``)
+    falls in the bucket's window and whose flag is unset. Rows are claimed
+    ``batch_size`` at a time with ``SELECT ... FOR UPDATE SKIP LOCKED`` so
+    overlapping runs never double-send; each batch flips its flags with
+    one update() and writes its notifications with one bulk_create.
 
     Args:
-        items: queryset of items to check (must have reminder_*_sent fields)
-        get_date: callable(item) -> date to compare against today
-        get_member: callable(item) -> Member to notify
-        make_message: callable(item, days_label) -> str notification message
-        link: optional URL for the notification link
+        queryset: rows to consider (must have the reminder_*_sent fields);
+            add select_related for whatever ``build``/``get_member`` read
+        date_field: lookup path to the date the reminders count down to
+        build: callable(item, offset) -> (title, message)
+        get_member: callable(item) -> Member to notify (default ``item.member``)
+        exact: only remind on the exact day of each offset and set only that
+            bucket's flag; by default the window between offsets is covered
+            and sending a bucket also sets the looser buckets' flags
+        mark: extra field values to set on reminded rows
+        channels: also queue SMS/push delivery of the notifications
+        today: day the offsets count from (default ``timezone.localdate()``)
 
     Returns:
         int: number of reminders sent
     """
-    from django.utils import timezone
-    today = timezone.now().date()
+    get_member = get_member or (lambda item: item.member)
+    today = today or timezone.localdate()
+    model = queryset.model
     total_sent = 0
 
-    for item in items:
-        target_date = get_date(item)
-        if target_date is None:
-            continue
-
-        days_until = (target_date - today).days
-        sent = False
-        days_label = ''
-
-        if days_until <= 5 and not item.reminder_5days_sent:
-            item.reminder_5days_sent = True
-            sent = True
-            days_label = '5 jours'
-
-        elif days_until <= 3 and not item.reminder_3days_sent:
-            item.reminder_3days_sent = True
-            sent = True
-            days_label = '3 jours'
-
-        elif days_until <= 1 and not item.reminder_1day_sent:
-            item.reminder_1day_sent = True
-            sent = True
-            days_label = 'demain'
-
-        elif days_until == 0 and not item.reminder_sameday_sent:
-            item.reminder_sameday_sent = True
-            sent = True
-            days_label = "aujourd'hui"
-
-        if sent:
-            item.save()
-            member = get_member(item)
-            msg = make_message(item, days_label)
-
-            Notification.objects.create(
-                member=member,
-                title='Rappel',
-                message=msg,
-                notification_type='general',
-                link=link,
-            )
-            total_sent += 1
+    for index, offset, flag, _, next_offset in _windows():
+        if exact:
+            window = {date_field: today + timedelta(days=offset)}
+        else:
+            window = {f'{date_field}__lte': today + timedelta(days=offset)}
+            if next_offset is None:
+                window[f'{date_field}__gte'] = today
+            else:
+                window[f'{date_field}__gt'] = today + timedelta(days=next_offset)
+        due = queryset.filter(**{flag: False}, **window)
+        updates = dict.fromkeys(_flags_to_set(index, exact), True)
+        updates.update(mark or {})
+
+        while True:
+            with transaction.atomic():
+                ids = list(
+                    due.select_for_update(skip_locked=True, of=('self',))
+                    .values_list('pk', flat=True)[:batch_size]
+                )
+                if not ids:
+                    break
+                items = list(queryset.filter(pk__in=ids))
+                model._base_manager.filter(pk__in=ids).update(
+                    **updates, updated_at=timezone.now(),
+                )
+                notifications = []
+                for item in items:
+                    title, message = build(item, offset)
+                    notifications.append(Notification(
+                        member=get_member(item),
+                        title=title,
+                        message=message,
+                        notification_type=notification_type,
+                        link=link,
+                    ))
+                Notification.objects.bulk_create(notifications)
+                if channels:
+                    _queue_channels(notifications)
+            total_sent += len(items)
 
     return total_sent
+
+
+def _queue_channels(notifications):
+    from apps.communication.tasks import deliver_notification_channels
+
+    notification_ids = [str(notification.pk) for notification in notifications]
+    transaction.on_commit(lambda: deliver_notification_channels.delay(notification_ids))
+
@@ -0,0 +1,325 @@
+"""
+Search index maintenance and pluggable search backends.
+
+Searchable objects are mirrored into ``SearchDocument`` rows holding
+lower-cased, accent-folded text. Backends then match queries against that
+single table:
+
+- ``PostgresSearchBackend``: ``SearchVector`` ranking plus trigram-indexed
+  substring matching (indexes created in core migration 0003)
+- ``SQLiteFTSBackend``: the ``core_searchdocument_fts`` FTS5 table kept in
+  sync by triggers, ranked with bm25
+- ``DatabaseSearchBackend``: portable ``LIKE`` on the normalized text
+"""
+import logging
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_text(*parts):
+    """Lower-case, accent-fold and whitespace-collapse the given strings."""
+    text = ' '.join(str(p) for p in parts if p)
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.lower().split())
+
+
+# ----------------------------------------------------------------------
+# Document builders
+# ----------------------------------------------------------------------
+
+def _member_document(member):
+    # No model properties here: rebuild() also runs on historical models
+    return f'{member.first_name} {member.last_name}', normalize_text(
+        member.first_name, member.last_name, member.email, member.member_number,
+    )
+
+
+def _event_document(event):
+    return event.title, normalize_text(event.title, event.description)
+
+
+def _group_document(group):
+    return group.name, normalize_text(group.name)
+
+
+def _help_request_document(help_request):
+    return help_request.title, normalize_text(help_request.title, help_request.description)
+
+
+def _donation_document(donation):
+    member = donation.member
+    return donation.donation_number, normalize_text(
+        donation.donation_number,
+        member.first_name if member else '',
+        member.last_name if member else '',
+    )
+
+
+INDEXED_MODELS = {
+    'members.Member': ('members', _member_document),
+    'events.Event': ('events', _event_document),
+    'members.Group': ('groups', _group_document),
+    'help_requests.HelpRequest': ('help_requests', _help_request_document),
+    'donations.Donation': ('donations', _donation_document),
+}
+
+
+class SearchIndex:
+    """Keeps SearchDocument rows in sync with the indexed models."""
+
+    @staticmethod
+    def _entry(instance):
+        return INDEXED_MODELS.get(instance._meta.label)
+
+    @classmethod
+    def index_instance(cls, instance):
+        from .models_extended import SearchDocument
+
+        entry = cls._entry(instance)
+        if entry is None:
+            return
+        category, build = entry
+        title, body = build(instance)
+        documents = SearchDocument.all_objects.filter(category=category, object_id=str(instance.pk))
+        renamed = category == 'members' and documents.exclude(title=(title or '')[:255]).exists()
+        SearchDocument.all_objects.update_or_create(
+            category=category,
+            object_id=str(instance.pk),
+            defaults={
+                'title': (title or '')[:255],
+                'body': body,
+                'is_active': getattr(instance, 'is_active', True),
+            },
+        )
+        if renamed:
+            cls.reindex_member_donations(instance)
+
+    @classmethod
+    def index_many(cls, instances):
+        """
+        Index a batch of objects of one model with a single upsert.
+
+        For rows written with bulk_create, which sends no post_save.
+        Returns the number of documents written.
+        """
+        from django.db.models import prefetch_related_objects
+        from django.utils import timezone
+        from .models_extended import SearchDocument
+
+        instances = list(instances)
+        entry = cls._entry(instances[0]) if instances else None
+        if entry is None:
+            return 0
+        category, build = entry
+        if category == 'donations':
+            prefetch_related_objects(instances, 'member')
+
+        now = timezone.now()
+        documents = []
+        for instance in instances:
+            title, body = build(instance)
+            documents.append(SearchDocument(
+                category=category,
+                object_id=str(instance.pk),
+                title=(title or '')[:255],
+                body=body,
+                is_active=getattr(instance, 'is_active', True),
+                updated_at=now,
+            ))
+        SearchDocument.all_objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=['category', 'object_id'],
+            update_fields=['title', 'body', 'is_active', 'updated_at'],
+        )
+        return len(documents)
+
+    @classmethod
+    def reindex_member_donations(cls, member):
+        """Refresh the donation documents, which embed the donor's name."""
+        from django.utils import timezone
+        from apps.donations.models import Donation
+        from .models_extended import SearchDocument
+
+        category, build = INDEXED_MODELS['donations.Donation']
+        built = {}
+        for donation in Donation.all_objects.filter(member=member).only('id', 'donation_number', 'member_id'):
+            donation.member = member
+            built[str(donation.pk)] = build(donation)
+        if not built:
+            return
+        documents = list(SearchDocument.all_objects.filter(category=category, object_id__in=built))
+        now = timezone.now()
+        for document in documents:
+            title, document.body = built[document.object_id]
+            document.title = (title or '')[:255]
+            document.updated_at = now
+        SearchDocument.all_objects.bulk_update(documents, ['title', 'body', 'updated_at'])
+
+    @classmethod
+    def remove_instance(cls, instance):
+        from .models_extended import SearchDocument
+
+        entry = cls._entry(instance)
+        if entry is None:
+            return
+        SearchDocument.all_objects.filter(
+            category=entry[0], object_id=str(instance.pk),
+        ).delete()
+
+    @classmethod
+    def rebuild(cls, batch_size=500, apps=None):
+        """
+        Re-index every object of every indexed model. Returns documents written.
+
+        ``apps`` is the app registry to load models from; data migrations
+        pass their historical one.
+        """
+        if apps is None:
+            from django.apps import apps
+
+        # _base_manager: every row, on live and historical models alike
+        documents = apps.get_model('core', 'SearchDocument')._base_manager
+        written = 0
+        for label, (category, build) in INDEXED_MODELS.items():
+            model = apps.get_model(label)
+            queryset = model._base_manager.all()
+            if label == 'donations.Donation':
+                queryset = queryset.select_related('member')
+
+            documents.filter(category=category).delete()
+            batch = []
+            for instance in queryset.iterator(chunk_size=batch_size):
+                title, body = build(instance)
+                batch.append(documents.model(
+                    category=category,
+                    object_id=str(instance.pk),
+                    title=(title or '')[:255],
+                    body=body,
+                    is_active=getattr(instance, 'is_active', True),
+                ))
+                if len(batch) >= batch_size:
+                    documents.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                documents.bulk_create(batch)
+                written += len(batch)
+        logger.info('Search index rebuilt with %d documents', written)
+        return written
+
+
+# ----------------------------------------------------------------------
+# Backends
+# ----------------------------------------------------------------------
+
+class DatabaseSearchBackend:
+    """Portable backend: substring match on the normalized text."""
+
+    def search(self, category, query, limit):
+        """Return object ids of ``category`` matching ``query``, best first."""
+        from .models_extended import SearchDocument
+
+        terms = TOKEN_RE.findall(normalize_text(query))
+        if not terms:
+            return []
+        condition = Q()
+        for term in terms:
+            condition &= Q(body__contains=term)
+        title_prefix = normalize_text(query)
+        return list(
+            SearchDocument.objects.filter(condition, category=category)
+            .annotate(prefix=Case(
+                When(title__istartswith=title_prefix, then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField(),
+            ))
+            .order_by('prefix', 'title')
+            .values_list('object_id', flat=True)[:limit]
+        )
+
+
+class SQLiteFTSBackend(DatabaseSearchBackend):
+    """SQLite backend using the FTS5 table maintained by triggers."""
+
+    TABLE = 'core_searchdocument_fts'
+
+    def search(self, category, query, limit):
+        terms = TOKEN_RE.findall(normalize_text(query))
+        if not terms:
+            return []
+        match = ' '.join(f'"{term}"*' for term in terms)
+        sql = (
+            f'SELECT d.object_id FROM {self.TABLE} f '
+            'JOIN core_searchdocument d ON d.rowid = f.rowid '
+            f'WHERE {self.TABLE} MATCH %s AND d.category = %s AND d.is_active '
+            f'ORDER BY bm25({self.TABLE}, 10.0, 1.0) LIMIT %s'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [match, category, limit])
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(DatabaseSearchBackend):
+    """PostgreSQL backend: ranked tsvector match plus trigram substring match."""
+
+    def search(self, category, query, limit):
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, SearchVector, TrigramSimilarity,
+        )
+        from .models_extended import SearchDocument
+
+        normalized = normalize_text(query)
+        terms = TOKEN_RE.findall(normalized)
+        if not terms:
+            return []
+        ts_query = SearchQuery(
+            ' & '.join(f'{term}:*' for term in terms), search_type='raw', config='simple',
+        )
+        vector = SearchVector('body', config='simple')
+        return list(
+            SearchDocument.objects.filter(category=category)
+            .annotate(document=vector)
+            .filter(Q(document=ts_query) | Q(body__contains=normalized))
+            .annotate(
+                rank=SearchRank(vector, ts_query),
+                similarity=TrigramSimilarity('body', normalized),
+            )
+            .order_by('-rank', '-similarity', 'title')
+            .values_list('object_id', flat=True)[:limit]
+        )
+
+
+_backend_cache = {}
+
+
+def get_search_backend():
+    """
+    Return the configured backend. ``SEARCH_BACKEND`` may name a class by
+    dotted path; by default the backend is chosen from the database vendor.
+    """
+    path = getattr(settings, 'SEARCH_BACKEND', '')
+    if path:
+        if path not in _backend_cache:
+            from django.utils.module_loading import import_string
+            _backend_cache[path] = import_string(path)()
+        return _backend_cache[path]
+
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    if connection.vendor == 'sqlite':
+        key = ('sqlite-fts', connection.settings_dict['NAME'])
+        if key not in _backend_cache:
+            has_fts = SQLiteFTSBackend.TABLE in connection.introspection.table_names()
+            _backend_cache[key] = SQLiteFTSBackend() if has_fts else DatabaseSearchBackend()
+        return _backend_cache[key]
+    return DatabaseSearchBackend()
@@ -0,0 +1,328 @@
+"""
+Background export jobs.
+
+Heavy exports are queued as ``ExportJob`` rows and produced by the
+``run_export_job`` Celery task: rows are streamed from the database into a
+temporary file, progress is pushed to the requester's notification
+WebSocket every chunk, and the finished file is saved to the default
+storage until ``EXPORT_JOB_EXPIRY_DAYS`` have passed.
+"""
+import csv
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+
+from .constants import ExportFormat, ExportJobStatus, ExportJobType
+from .export import EXPORT_CHUNK_SIZE, _excel_value, _header_row, iter_export_rows
+
+logger = logging.getLogger(__name__)
+
+# Request parameters that never influence what is exported
+IGNORED_PARAMS = {'format', 'page', 'csrfmiddlewaretoken'}
+
+
+# ----------------------------------------------------------------------
+# Row sources: params -> (rows, fields, headers, title)
+# ----------------------------------------------------------------------
+
+def _member_source(params):
+    from apps.members.models import Member
+    from apps.members.views_frontend import MEMBER_EXPORT_FIELDS, MEMBER_EXPORT_HEADERS
+
+    members = Member.objects.filter(is_active=True).order_by('last_name', 'first_name')
+    return members, MEMBER_EXPORT_FIELDS, MEMBER_EXPORT_HEADERS, 'membres'
+
+
+def _donation_source(params):
+    from apps.donations.views_frontend import (
+        DONATION_EXPORT_FIELDS, DONATION_EXPORT_HEADERS, filter_donations,
+    )
+
+    return filter_donations(params), DONATION_EXPORT_FIELDS, DONATION_EXPORT_HEADERS, 'dons_export'
+
+
+def _flatten(data, prefix=''):
+    """Yield (key, value) pairs for a nested report dict."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _flatten(value, f'{prefix}.{key}' if prefix else str(key))
+    elif isinstance(data, (list, tuple)):
+        for index, value in enumerate(data):
+            yield from _flatten(value, f'{prefix}[{index}]')
+    else:
+        yield prefix, data
+
+
+def _report_source(params):
+    from apps.reports.tasks import _generate_report_for_type
+
+    report_type = params.get('report_type') or 'dashboard'
+    data = _generate_report_for_type(report_type, params.get('filters'))
+    rows = list(_flatten(data))
+    fields = [lambda row: row[0], lambda row: row[1]]
+    return rows, fields, ['Indicateur', 'Valeur'], f'rapport_{report_type}'
+
+
+ROW_SOURCES = {
+    ExportJobType.MEMBERS: _member_source,
+    ExportJobType.DONATIONS: _donation_source,
+    ExportJobType.REPORT: _report_source,
+}
+
+
+# ----------------------------------------------------------------------
+# File writers: each consumes the row iterator exactly once
+# ----------------------------------------------------------------------
+
+def _write_csv(path, rows, headers, title):
+    with open(path, 'w', newline='', encoding='utf-8-sig') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+
+
+def _write_excel(path, rows, headers, title):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title[:31])  # Excel sheet names max 31 chars
+    ws.append(headers)
+    for row in rows:
+        ws.append([_excel_value(val) for val in row])
+    wb.save(path)
+
+
+def _write_pdf(path, rows, headers, title):
+    from xhtml2pdf import pisa
+
+    html_path = f'{path}.html'
+    cell = 'padding:5px;border:1px solid #ccc;'
+    with open(html_path, 'w', encoding='utf-8') as fh:
+        fh.write(
+            '<html><head><meta charset="utf-8"></head>'
+            '<body style="font-family:sans-serif;font-size:10px;">'
+            f'<h2>{escape(title)}</h2>'
+            '<table style="width:100%;border-collapse:collapse;"><thead><tr>'
+        )
+        fh.write(''.join(
+            f'<th style="{cell}background:#f5f5f5;">{escape(h)}</th>' for h in headers
+        ))
+        fh.write('</tr></thead><tbody>')
+        for row in rows:
+            cells = ''.join(
+                f'<td style="{cell}">{escape(val) if val is not None else ""}</td>'
+                for val in row
+            )
+            fh.write(f'<tr>{cells}</tr>')
+        fh.write('</tbody></table></body></html>')
+
+    with open(html_path, encoding='utf-8') as src, open(path, 'wb') as dest:
+        status = pisa.CreatePDF(src, dest=dest)
+    if status.err:
+        raise RuntimeError('PDF rendering failed')
+
+
+WRITERS = {
+    ExportFormat.CSV: _write_csv,
+    ExportFormat.XLSX: _write_excel,
+    ExportFormat.PDF: _write_pdf,
+}
+
+
+class ExportJobService:
+    """Queue, run, report on and expire background export jobs."""
+
+    PROGRESS_EVERY = EXPORT_CHUNK_SIZE
+
+    @staticmethod
+    def snapshot_params(params):
+        """Freeze request parameters (QueryDict or dict) into a JSON-safe dict."""
+        if params is None:
+            return {}
+        if hasattr(params, 'dict'):
+            params = params.dict()
+        return {
+            key: value for key, value in params.items()
+            if key not in IGNORED_PARAMS and value not in ('', None)
+        }
+
+    @classmethod
+    def create(cls, user, export_type, export_format, params=None):
+        """Create a pending job without queueing it."""
+        from .models_extended import ExportJob
+
+        if export_type == ExportJobType.STATEMENTS:
+            export_format = ExportFormat.ZIP
+        return ExportJob.objects.create(
+            requested_by=user if user is not None and user.is_authenticated else None,
+            export_type=export_type,
+            format=export_format,
+            params=cls.snapshot_params(params),
+        )
+
+    @classmethod
+    def enqueue(cls, user, export_type, export_format, params=None):
+        """Create a job and hand it to a worker once the transaction commits."""
+        from .tasks import run_export_job
+
+        job = cls.create(user, export_type, export_format, params)
+        transaction.on_commit(lambda: run_export_job.delay(str(job.pk)))
+        return job
+
+    @classmethod
+    def run(cls, job_id):
+        """
+        Produce the file for a pending job.
+
+        The job is claimed with a conditional UPDATE so a redelivered task
+        never runs it twice. Returns the job, or None if it was not pending.
+        """
+        from .models_extended import ExportJob
+
+        claimed = ExportJob.objects.filter(
+            pk=job_id, status=ExportJobStatus.PENDING,
+        ).update(status=ExportJobStatus.RUNNING, started_at=timezone.now())
+        if not claimed:
+            return None
+        job = ExportJob.objects.get(pk=job_id)
+        cls.notify(job)
+
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                if job.export_type == ExportJobType.STATEMENTS:
+                    title = cls._write_statements(job, tmpdir)
+                else:
+                    title = cls._write_rows(job, tmpdir)
+                path = os.path.join(tmpdir, 'export')
+                filename = f'{title}_{timezone.localtime():%Y%m%d_%H%M%S}.{job.format}'
+                with open(path, 'rb') as fh:
+                    job.file.save(filename, File(fh), save=False)
+
+            now = timezone.now()
+            job.status = ExportJobStatus.COMPLETED
+            job.completed_at = now
+            job.expires_at = now + timedelta(days=settings.EXPORT_JOB_EXPIRY_DAYS)
+            job.save(update_fields=[
+                'file', 'status', 'rows_done', 'rows_total',
+                'completed_at', 'expires_at', 'updated_at',
+            ])
+        except Exception as exc:
+            logger.exception('Export job %s failed', job.pk)
+            job.status = ExportJobStatus.FAILED
+            job.error = str(exc)[:2000]
+            job.completed_at = timezone.now()
+            job.save(update_fields=['status', 'error', 'completed_at', 'updated_at'])
+
+        cls.notify(job)
+        return job
+
+    @classmethod
+    def _write_rows(cls, job, tmpdir):
+        source, fields, headers, title = ROW_SOURCES[job.export_type](job.params)
+        total = source.count() if hasattr(source, 'model') else len(source)
+        cls.set_progress(job, 0, total)
+        rows = cls._tracked(job, iter_export_rows(source, fields), total)
+        WRITERS[job.format](
+            os.path.join(tmpdir, 'export'), rows, _header_row(fields, headers), title,
+        )
+        return title
+
+    @classmethod
+    def _tracked(cls, job, rows, total):
+        """Pass rows through, reporting progress once per chunk."""
+        done = 0
+        for row in rows:
+            yield row
+            done += 1
+            if done % cls.PROGRESS_EVERY == 0:
+                cls.set_progress(job, done, total)
+        cls.set_progress(job, done, total)
+
+    @classmethod
+    def _write_statements(cls, job, tmpdir):
+        """Generate giving statements and bundle their PDFs into a ZIP."""
+        from apps.donations.services_statement import StatementService
+
+        year = int(job.params.get('year', timezone.localdate().year))
+        period = job.params.get('period', 'annual')
+        statements = StatementService.bulk_generate(
+            year, period,
+            progress=lambda done, total: cls.set_progress(job, done, total),
+        )
+
+        with zipfile.ZipFile(os.path.join(tmpdir, 'export'), 'w', zipfile.ZIP_DEFLATED) as archive:
+            for statement in statements:
+                if not statement.pdf_file:
+                    continue
+                name = os.path.basename(statement.pdf_file.name)
+                with statement.pdf_file.open('rb') as src, archive.open(name, 'w') as dest:
+                    shutil.copyfileobj(src, dest)
+        return f'releves_{year}_{period}'
+
+    @classmethod
+    def set_progress(cls, job, done, total):
+        from .models_extended import ExportJob
+
+        job.rows_done, job.rows_total = done, total
+        ExportJob.objects.filter(pk=job.pk).update(
+            rows_done=done, rows_total=total, updated_at=timezone.now(),
+        )
+        cls.notify(job)
+
+    @staticmethod
+    def serialize(job):
+        return {
+            'id': str(job.pk),
+            'export_type': job.export_type,
+            'format': job.format,
+            'status': job.status,
+            'rows_done': job.rows_done,
+            'rows_total': job.rows_total,
+            'progress': job.progress,
+            'error': job.error,
+            'download_url': (
+                reverse('settings:export_job_download', args=[job.pk])
+                if job.is_downloadable else ''
+            ),
+        }
+
+    @classmethod
+    def notify(cls, job):
+        """Push the job state to the requester's notification WebSocket."""
+        if not job.requested_by_id:
+            return
+        from .consumers import send_export_progress
+
+        try:
+            send_export_progress(job.requested_by_id, cls.serialize(job))
+        except Exception:
+            logger.warning('Could not push progress for export job %s', job.pk, exc_info=True)
+
+    @staticmethod
+    def purge_expired(now=None):
+        """Delete the files of expired jobs and mark them expired. Returns the count."""
+        from .models_extended import ExportJob
+
+        now = now or timezone.now()
+        expired = ExportJob.objects.filter(
+            status=ExportJobStatus.COMPLETED, expires_at__lte=now,
+        )
+        count = 0
+        for job in expired.iterator():
+            if job.file:
+                job.file.delete(save=False)
+            job.status = ExportJobStatus.EXPIRED
+            job.save(update_fields=['file', 'status', 'updated_at'])
+            count += 1
+        return count
@@ -0,0 +1,112 @@
+"""Parallel HTML-to-PDF rendering for bulk document runs."""
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def html_to_pdf(html):
+    """Render an HTML string with xhtml2pdf. Returns the PDF bytes, or None on error."""
+    from xhtml2pdf import pisa
+
+    output = io.BytesIO()
+    if pisa.CreatePDF(io.StringIO(html), dest=output).err:
+        return None
+    return output.getvalue()
+
+
+class BulkPDFRenderer:
+    """
+    Render many HTML documents to PDF across a pool of processes.
+
+    xhtml2pdf is pure Python and CPU bound, so processes are what scale.
+    ``render`` consumes ``(key, html)`` pairs lazily and yields
+    ``(key, pdf_bytes_or_None)`` as each document finishes, with at most
+    two documents per worker in flight; callers can therefore build HTML
+    and store finished files while the pool keeps rendering.
+
+    Workers are spawned rather than forked so they never inherit the
+    parent's database connections. With one worker, or inside a daemonic
+    process (e.g. a Celery prefork child, which may not have children),
+    documents are rendered in-process; export jobs are therefore routed to
+    the ``exports`` queue, served by a threads-pool worker.
+    """
+
+    def __init__(self, workers=None):
+        if workers is None:
+            workers = getattr(settings, 'PDF_RENDER_WORKERS', 0) or os.cpu_count() or 1
+        self.workers = max(int(workers), 1)
+        self.rendered = 0
+        self.failed = 0
+        self._started = None
+
+    @staticmethod
+    def available():
+        try:
+            import xhtml2pdf  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _tally(self, key, pdf):
+        if pdf:
+            self.rendered += 1
+        else:
+            self.failed += 1
+            logger.error('PDF rendering failed for %s', key)
+        return key, pdf
+
+    def render(self, documents):
+        self._started = time.monotonic()
+        if self.workers == 1 or multiprocessing.current_process().daemon:
+            if self.workers > 1:
+                logger.warning(
+                    'Rendering PDFs in-process: %s is daemonic and cannot start %d workers '
+                    '(run bulk jobs on the threads-pool "exports" worker)',
+                    multiprocessing.current_process().name, self.workers,
+                )
+            for key, html in documents:
+                yield self._tally(key, html_to_pdf(html))
+            return
+
+        documents = iter(documents)
+        pending = {}
+        exhausted = False
+        with ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+        ) as pool:
+            while True:
+                while not exhausted and len(pending) < self.workers * 2:
+                    try:
+                        key, html = next(documents)
+                    except StopIteration:
+                        exhausted = True
+                    else:
+                        pending[pool.submit(html_to_pdf, html)] = key
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    try:
+                        pdf = future.result()
+                    except Exception:
+                        logger.exception('PDF worker crashed on %s', key)
+                        pdf = None
+                    yield self._tally(key, pdf)
+
+    def throughput(self):
+        """Documents rendered, failures, elapsed seconds and documents per second."""
+        elapsed = time.monotonic() - self._started if self._started else 0
+        return {
+            'rendered': self.rendered,
+            'failed': self.failed,
+            'seconds': round(elapsed, 1),
+            'per_second': round(self.rendered / elapsed, 2) if elapsed else 0,
+        }
@@ -1,8 +1,9 @@
 """Global search service for cross-app searching with role-based filtering."""
-from django.db.models import Q, Value, CharField
+from django.db.models import Case, IntegerField, Q, Value, When
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.constants import Roles
+from apps.core.search_index import get_search_backend
 
 
 class GlobalSearchService:
@@ -13,11 +14,13 @@ class GlobalSearchService:
 
     MIN_QUERY_LENGTH = 2
     MAX_RESULTS_PER_CATEGORY = 10
+    CANDIDATE_MULTIPLIER = 5
 
-    def __init__(self, user):
+    def __init__(self, user, backend=None):
         self.user = user
         self.member = getattr(user, 'member_profile', None)
         self.is_staff = self._check_staff()
+        self.backend = backend or get_search_backend()
 
     def _check_staff(self) -> bool:
         """Check if user has staff-level access."""
@@ -64,70 +67,75 @@ class GlobalSearchService:
         """
         Quick autocomplete search returning simplified results for AJAX.
         Returns list of dicts with {label, url, category, icon}.
+
+        Categories are queried in order and only until ``limit`` suggestions
+        have been collected.
         """
         if not query or len(query) < self.MIN_QUERY_LENGTH:
             return []
 
-        suggestions = []
-
-        # Members
-        members = self._search_members(query)
-        if members is not None:
-            for m in members[:3]:
-                suggestions.append({
-                    'label': m.full_name,
-                    'url': f'/members/{m.pk}/',
-                    'category': 'Membre',
-                    'icon': 'fa-user',
-                })
-
-        # Events
-        events = self._search_events(query)
-        if events is not None:
-            for e in events[:2]:
-                suggestions.append({
-                    'label': e.title,
-                    'url': f'/events/{e.pk}/',
-                    'category': 'Événement',
-                    'icon': 'fa-calendar',
-                })
-
-        # Groups
-        groups = self._search_groups(query)
-        if groups is not None:
-            for g in groups[:2]:
-                suggestions.append({
-                    'label': g.name,
-                    'url': f'/members/groups/{g.pk}/',
-                    'category': 'Groupe',
-                    'icon': 'fa-layer-group',
-                })
-
-        # Help Requests (staff only)
+        sources = [
+            (self._search_members, 3, lambda m: {
+                'label': m.full_name,
+                'url': f'/members/{m.pk}/',
+                'category': 'Membre',
+                'icon': 'fa-user',
+            }),
+            (self._search_events, 2, lambda e: {
+                'label': e.title,
+                'url': f'/events/{e.pk}/',
+                'category': 'Événement',
+                'icon': 'fa-calendar',
+            }),
+            (self._search_groups, 2, lambda g: {
+                'label': g.name,
+                'url': f'/members/groups/{g.pk}/',
+                'category': 'Groupe',
+                'icon': 'fa-layer-group',
+            }),
+        ]
         if self.is_staff:
-            help_requests = self._search_help_requests(query)
-            if help_requests is not None:
-                for hr in help_requests[:1]:
-                    suggestions.append({
-                        'label': hr.title,
-                        'url': f'/help-requests/{hr.pk}/',
-                        'category': 'Demande d\'aide',
-                        'icon': 'fa-question-circle',
-                    })
+            sources.append((self._search_help_requests, 1, lambda hr: {
+                'label': hr.title,
+                'url': f'/help-requests/{hr.pk}/',
+                'category': 'Demande d\'aide',
+                'icon': 'fa-question-circle',
+            }))
+
+        suggestions = []
+        for search, cap, to_suggestion in sources:
+            remaining = limit - len(suggestions)
+            if remaining <= 0:
+                break
+            results = search(query, limit=min(cap, remaining))
+            if results is not None:
+                suggestions.extend(to_suggestion(obj) for obj in results)
 
         return suggestions[:limit]
 
-    def _search_members(self, query: str):
+    def _ranked(self, category: str, queryset, query: str, limit=None):
+        """
+        Restrict ``queryset`` to the index matches for ``query``, keeping
+        the backend's ranking. Extra candidates are fetched so role filters
+        applied by the caller's queryset do not starve the category cap.
+        """
+        limit = limit or self.MAX_RESULTS_PER_CATEGORY
+        ids = self.backend.search(
+            category, query, limit * self.CANDIDATE_MULTIPLIER,
+        )
+        if not ids:
+            return queryset.none()
+        ordering = Case(
+            *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pk__in=ids).order_by(ordering)[:limit]
+
+    def _search_members(self, query: str, limit=None):
         """Search members by name, email, or member number."""
         from apps.members.models import Member
 
-        qs = Member.objects.filter(
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query) |
-            Q(email__icontains=query) |
-            Q(member_number__icontains=query),
-            is_active=True,
-        )
+        qs = Member.objects.filter(is_active=True)
 
         if not self.is_staff and self.member:
             qs = qs.filter(
@@ -135,45 +143,33 @@ class GlobalSearchService:
                 Q(pk=self.member.pk)
             )
 
-        return qs[:self.MAX_RESULTS_PER_CATEGORY]
+        return self._ranked('members', qs, query, limit)
 
-    def _search_events(self, query: str):
+    def _search_events(self, query: str, limit=None):
         """Search events by title or description."""
         from apps.events.models import Event
 
-        return Event.objects.filter(
-            Q(title__icontains=query) |
-            Q(description__icontains=query),
-            is_active=True,
-        )[:self.MAX_RESULTS_PER_CATEGORY]
+        return self._ranked('events', Event.objects.filter(is_active=True), query, limit)
 
-    def _search_groups(self, query: str):
+    def _search_groups(self, query: str, limit=None):
         """Search groups by name."""
         from apps.members.models import Group
 
-        return Group.objects.filter(
-            Q(name__icontains=query),
-            is_active=True,
-        )[:self.MAX_RESULTS_PER_CATEGORY]
+        return self._ranked('groups', Group.objects.filter(is_active=True), query, limit)
 
-    def _search_help_requests(self, query: str):
+    def _search_help_requests(self, query: str, limit=None):
         """Search help requests (staff only)."""
         from apps.help_requests.models import HelpRequest
 
-        return HelpRequest.objects.filter(
-            Q(title__icontains=query) |
-            Q(description__icontains=query),
-        )[:self.MAX_RESULTS_PER_CATEGORY]
+        return self._ranked('help_requests', HelpRequest.objects.all(), query, limit)
 
-    def _search_donations(self, query: str):
+    def _search_donations(self, query: str, limit=None):
         """Search donations by number or donor name (staff only)."""
         from apps.donations.models import Donation
 
-        return Donation.objects.filter(
-            Q(donation_number__icontains=query) |
-            Q(member__first_name__icontains=query) |
-            Q(member__last_name__icontains=query),
-        ).select_related('member')[:self.MAX_RESULTS_PER_CATEGORY]
+        return self._ranked(
+            'donations', Donation.objects.select_related('member'), query, limit,
+        )
 
     @staticmethod
     def get_total_count(results: dict) -> int:
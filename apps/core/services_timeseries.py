@@ -0,0 +1,136 @@
+"""Calendar-aligned, gap-filled time series built from a single GROUP BY query."""
+from datetime import datetime, time
+
+from dateutil.relativedelta import relativedelta
+from django.db.models import Count, DateTimeField
+from django.db.models.functions import (
+    TruncDay, TruncWeek, TruncMonth, TruncQuarter, TruncYear,
+)
+from django.utils import timezone
+
+
+class TimeSeriesService:
+    """
+    Buckets rows of a model (or queryset) by calendar period.
+
+    One query groups the rows with a ``Trunc*`` expression; missing periods
+    are filled in Python so charts always receive one point per bucket.
+    """
+
+    TRUNCATORS = {
+        'day': TruncDay,
+        'week': TruncWeek,
+        'month': TruncMonth,
+        'quarter': TruncQuarter,
+        'year': TruncYear,
+    }
+
+    STEPS = {
+        'day': relativedelta(days=1),
+        'week': relativedelta(weeks=1),
+        'month': relativedelta(months=1),
+        'quarter': relativedelta(months=3),
+        'year': relativedelta(years=1),
+    }
+
+    @classmethod
+    def period_start(cls, value, granularity='month'):
+        """Return the first day of the period containing ``value``."""
+        if isinstance(value, datetime):
+            value = timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+        if granularity == 'day':
+            return value
+        if granularity == 'week':
+            return value - relativedelta(days=value.weekday())
+        if granularity == 'month':
+            return value.replace(day=1)
+        if granularity == 'quarter':
+            return value.replace(month=(value.month - 1) // 3 * 3 + 1, day=1)
+        if granularity == 'year':
+            return value.replace(month=1, day=1)
+        raise ValueError(f'Unknown granularity: {granularity}')
+
+    @classmethod
+    def last_periods(cls, count, granularity='month', today=None):
+        """Return the (start, end) date range covering the last ``count`` periods."""
+        today = today or timezone.localdate()
+        current = cls.period_start(today, granularity)
+        return current - cls.STEPS[granularity] * (count - 1), today
+
+    @classmethod
+    def periods(cls, start, end, granularity='month'):
+        """List every period start between ``start`` and ``end`` inclusive."""
+        step = cls.STEPS[granularity]
+        current = cls.period_start(start, granularity)
+        result = []
+        while current <= end:
+            result.append(current)
+            current = current + step
+        return result
+
+    @classmethod
+    def series(cls, source, date_field, measure=None, granularity='month',
+               start=None, end=None, default=0):
+        """
+        Aggregate ``measure`` per calendar period over [start, end].
+
+        Args:
+            source: a model class or queryset
+            date_field: name of the DateField/DateTimeField to bucket on
+            measure: aggregate expression (defaults to ``Count('pk')``)
+            granularity: 'day', 'week', 'month', 'quarter' or 'year'
+            start, end: inclusive date bounds (defaults to the last 12 periods)
+            default: value used for periods without rows
+
+        Returns:
+            list of dicts with 'period' (date) and 'value', one per period
+        """
+        if granularity not in cls.TRUNCATORS:
+            raise ValueError(f'Unknown granularity: {granularity}')
+
+        queryset = source.objects.all() if isinstance(source, type) else source
+        measure = measure if measure is not None else Count('pk')
+        if start is None or end is None:
+            default_start, default_end = cls.last_periods(12, granularity)
+            start = start or default_start
+            end = end or default_end
+        start = cls.period_start(start, granularity)
+
+        field = queryset.model._meta.get_field(date_field)
+        if isinstance(field, DateTimeField):
+            tz = timezone.get_current_timezone()
+            lower = timezone.make_aware(datetime.combine(start, time.min), tz)
+            upper = timezone.make_aware(
+                datetime.combine(end + relativedelta(days=1), time.min), tz
+            )
+        else:
+            lower, upper = start, end + relativedelta(days=1)
+
+        rows = (
+            queryset.filter(**{f'{date_field}__gte': lower, f'{date_field}__lt': upper})
+            .annotate(_bucket=cls.TRUNCATORS[granularity](date_field))
+            .values('_bucket')
+            .annotate(_value=measure)
+            .order_by('_bucket')
+        )
+
+        values = {}
+        for row in rows:
+            bucket = row['_bucket']
+            if isinstance(bucket, datetime):
+                bucket = cls.period_start(bucket, granularity)
+            values[bucket] = row['_value'] if row['_value'] is not None else default
+
+        return [
+            {'period': period, 'value': values.get(period, default)}
+            for period in cls.periods(start, end, granularity)
+        ]
+
+    @staticmethod
+    def label(period, granularity='month'):
+        """Human-readable chart label for a period start."""
+        if granularity in ('day', 'week'):
+            return period.strftime('%d %b %Y')
+        if granularity == 'year':
+            return period.strftime('%Y')
+        return period.strftime('%b %Y')
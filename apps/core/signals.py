@@ -1,9 +1,12 @@
-"""Signals for login auditing."""
+"""Signals for login auditing, search index maintenance and branding cache invalidation."""
 import logging
 
 from django.contrib.auth.signals import user_logged_in, user_login_failed
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from .search_index import INDEXED_MODELS, SearchIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,3 +57,27 @@ def log_failed_login(sender, credentials, request, **kwargs):
             success=False,
             failure_reason='invalid_credentials',
         )
+
+
+def update_search_document(sender, instance, **kwargs):
+    """Mirror a saved searchable object into the search index."""
+    SearchIndex.index_instance(instance)
+
+
+def delete_search_document(sender, instance, **kwargs):
+    """Drop a deleted searchable object from the search index."""
+    SearchIndex.remove_instance(instance)
+
+
+for _label in INDEXED_MODELS:
+    post_save.connect(update_search_document, sender=_label, dispatch_uid=f'search-save-{_label}')
+    post_delete.connect(delete_search_document, sender=_label, dispatch_uid=f'search-delete-{_label}')
+
+
+@receiver(post_save, sender='core.ChurchBranding')
+@receiver(post_delete, sender='core.ChurchBranding')
+def invalidate_branding_cache(sender, **kwargs):
+    """Drop the cached branding whenever it changes."""
+    from .models_extended import ChurchBranding
+
+    ChurchBranding.invalidate_cache()
@@ -60,3 +60,21 @@ def cleanup_old_webhook_deliveries(days: int = 90):
     cutoff = timezone.now() - timedelta(days=days)
     count, _ = WebhookDelivery.objects.filter(created_at__lt=cutoff).delete()
     logger.info(f'Cleaned up {count} webhook delivery records older than {days} days')
+
+
+@shared_task
+def run_export_job(job_id: str):
+    """Produce the file for a queued ExportJob."""
+    from apps.core.services_export_jobs import ExportJobService
+
+    job = ExportJobService.run(job_id)
+    return job.status if job else 'skipped'
+
+
+@shared_task
+def purge_expired_exports():
+    """Periodic task: delete export files past their expiry date."""
+    from apps.core.services_export_jobs import ExportJobService
+
+    count = ExportJobService.purge_expired()
+    logger.info(f'Purged {count} expired export files')
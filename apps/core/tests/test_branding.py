@@ -152,3 +152,30 @@ class TestBrandingSettingsView:
         assert response.status_code == 302
         brand = ChurchBranding.get_current()
         assert brand.church_name == 'New Church Name'
+
+
+@pytest.mark.django_db
+class TestBrandingCache:
+    def test_get_current_is_cached(self, django_assert_num_queries):
+        ChurchBranding.objects.create(church_name='Cached Church')
+        ChurchBranding.get_current()
+        with django_assert_num_queries(0):
+            assert ChurchBranding.get_current().church_name == 'Cached Church'
+
+    def test_missing_branding_is_cached(self, django_assert_num_queries):
+        assert ChurchBranding.get_current() is None
+        with django_assert_num_queries(0):
+            assert ChurchBranding.get_current() is None
+
+    def test_save_invalidates_cache(self):
+        brand = ChurchBranding.objects.create(church_name='Before')
+        assert ChurchBranding.get_current().church_name == 'Before'
+        brand.church_name = 'After'
+        brand.save()
+        assert ChurchBranding.get_current().church_name == 'After'
+
+    def test_delete_invalidates_cache(self):
+        brand = ChurchBranding.objects.create(church_name='Gone')
+        assert ChurchBranding.get_current() is not None
+        brand.delete()
+        assert ChurchBranding.get_current() is None
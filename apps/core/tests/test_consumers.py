@@ -5,6 +5,7 @@ from unittest.mock import patch, MagicMock, AsyncMock
 from apps.core.consumers import (
     NotificationConsumer,
     send_notification_to_user,
+    send_export_progress,
     send_toast_to_user,
     update_notification_count,
 )
@@ -54,6 +55,19 @@ class TestNotificationConsumerHelpers:
         update_notification_count(user_id=1, count=5)
         mock_async.assert_called_once()
 
+    @patch('channels.layers.get_channel_layer')
+    @patch('asgiref.sync.async_to_sync')
+    def test_send_export_progress(self, mock_async, mock_get_layer):
+        mock_get_layer.return_value = MagicMock()
+        mock_send = MagicMock()
+        mock_async.return_value = mock_send
+
+        send_export_progress(user_id=1, job_data={'id': 'abc', 'progress': 50})
+        mock_send.assert_called_once_with(
+            'notifications_1',
+            {'type': 'export_progress', 'job': {'id': 'abc', 'progress': 50}},
+        )
+
     def test_group_name_format(self):
         """Verify the notification group naming convention."""
         user_id = 42
@@ -73,6 +87,7 @@ class TestNotificationConsumerUnit:
         assert hasattr(NotificationConsumer, 'notification_message')
         assert hasattr(NotificationConsumer, 'notification_count')
         assert hasattr(NotificationConsumer, 'notification_toast')
+        assert hasattr(NotificationConsumer, 'export_progress')
         assert hasattr(NotificationConsumer, 'send_unread_count')
         assert hasattr(NotificationConsumer, 'mark_notification_read')
         assert hasattr(NotificationConsumer, 'mark_all_read')
@@ -53,3 +53,75 @@ class TestExportQuerysetCSV:
         content = response.content.decode('utf-8')
         assert 'Jean' in content
         assert 'Test' in content
+
+
+@pytest.mark.django_db
+class TestStreamingExports:
+    def _stream_text(self, response):
+        return b''.join(
+            chunk if isinstance(chunk, bytes) else chunk.encode('utf-8')
+            for chunk in response.streaming_content
+        ).decode('utf-8-sig')
+
+    def test_stream_csv(self):
+        from django.http import StreamingHttpResponse
+        from apps.core.export import stream_queryset_csv
+        from apps.members.models import Member
+        from apps.members.tests.factories import MemberFactory
+
+        MemberFactory(first_name='Jean', last_name='Streaming')
+        response = stream_queryset_csv(
+            Member.objects.all(), ['first_name', 'last_name'], 'members',
+            headers=['Prénom', 'Nom'],
+        )
+
+        assert isinstance(response, StreamingHttpResponse)
+        assert 'members.csv' in response['Content-Disposition']
+        content = self._stream_text(response)
+        assert content.splitlines()[0] == 'Prénom,Nom'
+        assert 'Jean,Streaming' in content
+
+    def test_plain_fields_use_values_and_choice_labels(self, django_assert_num_queries):
+        from apps.core.export import iter_export_rows
+        from apps.donations.models import Donation
+        from apps.donations.tests.factories import DonationFactory
+
+        DonationFactory.create_batch(3)
+        with django_assert_num_queries(1):
+            rows = list(iter_export_rows(
+                Donation.objects.all(), ['donation_number', 'payment_method', 'member__last_name'],
+            ))
+        assert len(rows) == 3
+        donation = Donation.objects.first()
+        assert [donation.get_payment_method_display()] == list({str(r[1]) for r in rows})
+
+    def test_related_paths_are_select_related(self, django_assert_num_queries):
+        from apps.core.export import iter_export_rows
+        from apps.donations.models import Donation
+        from apps.donations.tests.factories import DonationFactory
+
+        DonationFactory.create_batch(3)
+        with django_assert_num_queries(1):
+            rows = list(iter_export_rows(
+                Donation.objects.all(),
+                [lambda d: d.donation_number, 'member__first_name', 'member'],
+            ))
+        assert len(rows) == 3
+
+    def test_stream_excel(self):
+        import io
+        from openpyxl import load_workbook
+        from apps.core.export import stream_queryset_excel
+        from apps.members.models import Member
+        from apps.members.tests.factories import MemberFactory
+
+        MemberFactory(first_name='Excel', last_name='Stream')
+        response = stream_queryset_excel(
+            Member.objects.all(), ['first_name', 'last_name', 'role'], 'membres',
+        )
+
+        assert 'membres.xlsx' in response['Content-Disposition']
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        rows = list(workbook.active.values)
+        assert rows[0] == ('first_name', 'last_name', 'role')
+        assert rows[1][:2] == ('Excel', 'Stream')
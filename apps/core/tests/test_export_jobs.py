@@ -0,0 +1,216 @@
+"""Tests for background export jobs."""
+import csv
+import io
+import zipfile
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+
+from apps.core.constants import ExportFormat, ExportJobStatus, ExportJobType, Roles
+from apps.core.models_extended import ExportJob
+from apps.core.services_export_jobs import ExportJobService
+from apps.members.tests.factories import MemberFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def _media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def _read_file(job):
+    with job.file.open('rb') as fh:
+        return fh.read()
+
+
+@pytest.mark.django_db
+class TestExportJobService:
+
+    def test_snapshot_drops_pagination_and_empty_values(self):
+        params = ExportJobService.snapshot_params(
+            {'format': 'pdf', 'page': '2', 'donation_type': 'tithe', 'member': ''},
+        )
+        assert params == {'donation_type': 'tithe'}
+
+    def test_enqueue_dispatches_after_commit(self, django_capture_on_commit_callbacks):
+        user = UserFactory()
+        with patch('apps.core.tasks.run_export_job.delay') as mock_delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                job = ExportJobService.enqueue(user, ExportJobType.MEMBERS, ExportFormat.CSV)
+        mock_delay.assert_called_once_with(str(job.pk))
+        assert job.status == ExportJobStatus.PENDING
+        assert job.requested_by == user
+
+    def test_statements_are_always_zipped(self):
+        job = ExportJobService.create(None, ExportJobType.STATEMENTS, ExportFormat.PDF)
+        assert job.format == ExportFormat.ZIP
+
+    def test_run_members_csv(self):
+        MemberFactory(first_name='Alice', last_name='Zed')
+        MemberFactory(first_name='Bruno', last_name='Abel')
+        job = ExportJobService.create(None, ExportJobType.MEMBERS, ExportFormat.CSV)
+
+        job = ExportJobService.run(job.pk)
+
+        assert job.status == ExportJobStatus.COMPLETED
+        assert job.rows_total == job.rows_done == 2
+        assert job.progress == 100
+        assert job.expires_at > timezone.now()
+        rows = list(csv.reader(io.StringIO(_read_file(job).decode('utf-8-sig'))))
+        assert rows[0][0] == 'Numéro de membre'
+        assert [row[1] for row in rows[1:]] == ['Bruno', 'Alice']
+
+    def test_run_donations_excel_applies_snapshot_filters(self):
+        from openpyxl import load_workbook
+        from apps.donations.tests.factories import DonationFactory
+
+        DonationFactory(date=date(2026, 1, 10))
+        DonationFactory(date=date(2025, 6, 1))
+        job = ExportJobService.create(
+            None, ExportJobType.DONATIONS, ExportFormat.XLSX, {'date_from': '2026-01-01'},
+        )
+
+        job = ExportJobService.run(job.pk)
+
+        assert job.status == ExportJobStatus.COMPLETED
+        sheet = load_workbook(io.BytesIO(_read_file(job))).active
+        assert sheet.max_row == 2
+
+    def test_run_report(self):
+        job = ExportJobService.create(
+            None, ExportJobType.REPORT, ExportFormat.CSV, {'report_type': 'member_stats'},
+        )
+        job = ExportJobService.run(job.pk)
+
+        assert job.status == ExportJobStatus.COMPLETED
+        assert b'Indicateur' in _read_file(job)
+
+    def test_run_statements_zip(self):
+        from apps.donations.tests.factories import DonationFactory
+
+        DonationFactory(date=date(2025, 3, 1))
+        job = ExportJobService.create(
+            None, ExportJobType.STATEMENTS, ExportFormat.ZIP, {'year': 2025, 'period': 'annual'},
+        )
+        job = ExportJobService.run(job.pk)
+
+        assert job.status == ExportJobStatus.COMPLETED
+        assert job.rows_done == job.rows_total == 1
+        archive = zipfile.ZipFile(io.BytesIO(_read_file(job)))
+        assert len(archive.namelist()) == 1
+
+    def test_run_is_claimed_once(self):
+        job = ExportJobService.create(None, ExportJobType.MEMBERS, ExportFormat.CSV)
+        assert ExportJobService.run(job.pk) is not None
+        assert ExportJobService.run(job.pk) is None
+
+    def test_failure_is_recorded(self):
+        job = ExportJobService.create(None, ExportJobType.MEMBERS, 'docx')
+        job = ExportJobService.run(job.pk)
+
+        assert job.status == ExportJobStatus.FAILED
+        assert job.error
+        assert not job.file
+
+    def test_progress_is_pushed_per_chunk(self):
+        user = UserFactory()
+        MemberFactory.create_batch(5)
+        job = ExportJobService.create(user, ExportJobType.MEMBERS, ExportFormat.CSV)
+
+        with patch.object(ExportJobService, 'PROGRESS_EVERY', 2), \
+                patch('apps.core.consumers.send_export_progress') as mock_send:
+            ExportJobService.run(job.pk)
+
+        payloads = [call.args[1] for call in mock_send.call_args_list]
+        assert all(call.args[0] == user.pk for call in mock_send.call_args_list)
+        assert [p['rows_done'] for p in payloads if p['status'] == ExportJobStatus.RUNNING] == [0, 0, 2, 4, 5]
+        assert payloads[-1]['status'] == ExportJobStatus.COMPLETED
+        assert payloads[-1]['download_url'] == f'/settings/exports/{job.pk}/download/'
+
+    def test_purge_expired(self):
+        job = ExportJobService.run(
+            ExportJobService.create(None, ExportJobType.MEMBERS, ExportFormat.CSV).pk,
+        )
+        storage, name = job.file.storage, job.file.name
+        fresh = ExportJobService.run(
+            ExportJobService.create(None, ExportJobType.MEMBERS, ExportFormat.CSV).pk,
+        )
+        ExportJob.objects.filter(pk=job.pk).update(expires_at=timezone.now() - timedelta(days=1))
+
+        assert ExportJobService.purge_expired() == 1
+
+        job.refresh_from_db()
+        fresh.refresh_from_db()
+        assert job.status == ExportJobStatus.EXPIRED
+        assert not storage.exists(name)
+        assert fresh.status == ExportJobStatus.COMPLETED
+
+
+@pytest.mark.django_db
+class TestExportJobViews:
+
+    def _client(self, role=Roles.MEMBER):
+        user = UserFactory()
+        MemberFactory(user=user, role=role)
+        client = Client()
+        client.force_login(user)
+        return user, client
+
+    def test_list_shows_only_own_jobs(self):
+        user, client = self._client()
+        own = ExportJobService.create(user, ExportJobType.MEMBERS, ExportFormat.CSV)
+        other = ExportJobService.create(UserFactory(), ExportJobType.MEMBERS, ExportFormat.CSV)
+
+        response = client.get('/settings/exports/')
+
+        assert response.status_code == 200
+        assert list(response.context['jobs']) == [own]
+        assert other not in response.context['jobs']
+
+    def test_status_json(self):
+        user, client = self._client()
+        job = ExportJobService.create(user, ExportJobType.MEMBERS, ExportFormat.CSV)
+
+        response = client.get(f'/settings/exports/{job.pk}/status/')
+
+        assert response.status_code == 200
+        assert response.json()['status'] == ExportJobStatus.PENDING
+
+    def test_status_of_other_users_job_is_404(self):
+        user, client = self._client()
+        job = ExportJobService.create(UserFactory(), ExportJobType.MEMBERS, ExportFormat.CSV)
+
+        response = client.get(f'/settings/exports/{job.pk}/status/')
+        assert response.status_code == 404
+
+    def test_download_completed_job(self):
+        user, client = self._client()
+        job = ExportJobService.run(
+            ExportJobService.create(user, ExportJobType.MEMBERS, ExportFormat.CSV).pk,
+        )
+
+        response = client.get(f'/settings/exports/{job.pk}/download/')
+
+        assert response.status_code == 200
+        assert 'attachment' in response['Content-Disposition']
+
+    def test_download_pending_job_redirects(self):
+        user, client = self._client()
+        job = ExportJobService.create(user, ExportJobType.MEMBERS, ExportFormat.CSV)
+
+        response = client.get(f'/settings/exports/{job.pk}/download/')
+        assert response.status_code == 302
+
+    def test_donation_pdf_export_is_queued(self):
+        user, client = self._client(role=Roles.TREASURER)
+
+        with patch('apps.core.tasks.run_export_job.delay'):
+            response = client.get('/donations/admin/export/pdf/?donation_type=tithe')
+
+        assert response.status_code == 302
+        job = ExportJob.objects.get(requested_by=user)
+        assert job.export_type == ExportJobType.DONATIONS
+        assert job.format == ExportFormat.PDF
+        assert job.params == {'donation_type': 'tithe'}
@@ -1,4 +1,4 @@
-"""Tests for TwoFactorEnforcementMiddleware and MembershipAccessMiddleware."""
+"""Tests for MemberProfileMiddleware, TwoFactorEnforcementMiddleware and MembershipAccessMiddleware."""
 import pytest
 from datetime import timedelta
 from django.http import HttpResponse
@@ -6,14 +6,19 @@ from django.test import RequestFactory
 from django.contrib.auth.models import AnonymousUser
 from django.utils import timezone
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from apps.core.middleware import (
+    MemberProfileMiddleware,
     TwoFactorEnforcementMiddleware,
     MembershipAccessMiddleware,
     TWO_FACTOR_EXEMPT_PATHS,
     MFA_SETUP_URL,
 )
 from apps.core.constants import Roles, MembershipStatus
-from apps.members.tests.factories import MemberFactory, UserFactory
+from apps.members.models import MemberRole
+from apps.members.tests.factories import MemberFactory, MemberWithUserFactory, UserFactory
 
 
 def ok_response(request):
@@ -502,3 +507,67 @@ class TestMembershipAccessMiddleware:
             request = self._make_request(path, user)
             response = self.middleware(request)
             assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestMemberProfileMiddleware:
+    """Tests for the MemberProfileMiddleware."""
+
+    def setup_method(self):
+        self.factory = RequestFactory()
+
+    def test_profile_loaded_once_with_roles(self, django_assert_num_queries):
+        member = MemberWithUserFactory(role=Roles.MEMBER)
+        MemberRole.objects.create(member=member, role=Roles.PASTOR)
+        user = type(member.user).objects.get(pk=member.user.pk)
+        request = self.factory.get('/')
+        request.user = user
+
+        MemberProfileMiddleware(ok_response)(request)
+
+        with django_assert_num_queries(0):
+            profile = request.user.member_profile
+            assert profile.pk == member.pk
+            assert profile.is_staff_member
+            assert profile.is_staff_member
+
+    def test_user_without_profile_cached_as_missing(self, django_assert_num_queries):
+        user = UserFactory()
+        request = self.factory.get('/')
+        request.user = user
+
+        MemberProfileMiddleware(ok_response)(request)
+
+        with django_assert_num_queries(0):
+            assert getattr(request.user, 'member_profile', None) is None
+
+    def test_anonymous_user_passes_through(self, django_assert_num_queries):
+        request = self.factory.get('/')
+        request.user = AnonymousUser()
+        with django_assert_num_queries(0):
+            response = MemberProfileMiddleware(ok_response)(request)
+        assert response.status_code == 200
+
+
+@pytest.mark.django_db
+class TestPageBaselineQueries:
+    """Per-page queries for profile, roles and branding do not repeat."""
+
+    def test_typical_page(self, client):
+        from apps.core.models_extended import ChurchBranding
+
+        ChurchBranding.objects.create(church_name='Query Church')
+        member = MemberWithUserFactory(role=Roles.ADMIN, membership_status=MembershipStatus.ACTIVE)
+        client.force_login(member.user)
+        client.get('/members/my-profile/')  # warm the branding and unread caches
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/members/my-profile/')
+        assert response.status_code == 200
+
+        def count(table):
+            return sum(f'"{table}"' in q['sql'] for q in ctx.captured_queries)
+
+        assert count(ChurchBranding._meta.db_table) == 0
+        assert count(MemberRole._meta.db_table) == 1
+        assert count('communication_notification') == 0
@@ -0,0 +1,26 @@
+"""Tests for the bulk PDF renderer."""
+import pytest
+
+from apps.core.services_pdf import BulkPDFRenderer
+
+
+class TestBulkPDFRenderer:
+    def test_renders_every_document_on_a_pool(self):
+        pytest.importorskip('xhtml2pdf')
+        renderer = BulkPDFRenderer(workers=2)
+        documents = ((index, f'<p>Relevé {index}</p>') for index in range(5))
+
+        results = dict(renderer.render(documents))
+
+        assert sorted(results) == list(range(5))
+        assert all(pdf.startswith(b'%PDF') for pdf in results.values())
+        stats = renderer.throughput()
+        assert stats['rendered'] == 5
+        assert stats['failed'] == 0
+
+    def test_single_worker_renders_in_process(self, monkeypatch):
+        monkeypatch.setattr('apps.core.services_pdf.html_to_pdf', lambda html: None)
+        renderer = BulkPDFRenderer(workers=1)
+
+        assert list(renderer.render([('a', '<p></p>')])) == [('a', None)]
+        assert renderer.throughput()['failed'] == 1
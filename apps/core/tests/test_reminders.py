@@ -1,146 +1,92 @@
 """Tests for the generic reminder utility."""
 import pytest
 from datetime import timedelta
-from unittest.mock import MagicMock
+from unittest.mock import patch
 
 from django.utils import timezone
 
 from apps.communication.models import Notification
-from apps.core.reminders import send_reminder_batch
-from apps.members.tests.factories import MemberFactory
 
 
-class FakeItem:
-    """Fake item with reminder fields for testing send_reminder_batch."""
+@pytest.mark.django_db
+class TestSendReminders:
+    """Tests for the queryset reminder engine."""
+
+    def _schedule(self, days_from_now, **overrides):
+        from apps.volunteers.tests.factories import VolunteerScheduleFactory
+
+        defaults = {
+            'date': timezone.localdate() + timedelta(days=days_from_now),
+            'reminder_5days_sent': False,
+            'reminder_3days_sent': False,
+            'reminder_1day_sent': False,
+            'reminder_sameday_sent': False,
+        }
+        defaults.update(overrides)
+        return VolunteerScheduleFactory(**defaults)
+
+    def _run(self, **kwargs):
+        from apps.core.reminders import send_reminders
+        from apps.volunteers.models import VolunteerSchedule
+
+        return send_reminders(
+            VolunteerSchedule.objects.select_related('member'),
+            'date',
+            lambda schedule, offset: ('Rappel', f'J-{offset}'),
+            **kwargs,
+        )
 
-    def __init__(self, target_date, member):
-        self.target_date = target_date
-        self.member = member
-        self.reminder_5days_sent = False
-        self.reminder_3days_sent = False
-        self.reminder_1day_sent = False
-        self.reminder_sameday_sent = False
-        self.saved = False
+    def test_tightest_window_wins_and_sets_looser_flags(self):
+        schedule = self._schedule(2)
 
-    def save(self):
-        self.saved = True
+        assert self._run() == 1
 
+        schedule.refresh_from_db()
+        assert schedule.reminder_5days_sent is True
+        assert schedule.reminder_3days_sent is True
+        assert schedule.reminder_1day_sent is False
+        assert Notification.objects.get(member=schedule.member).message == 'J-3'
+        assert self._run() == 0
 
-@pytest.mark.django_db
-class TestSendReminderBatch:
-    """Tests for the generic send_reminder_batch utility."""
-
-    def _make_item(self, days_from_now, **overrides):
-        member = MemberFactory()
-        target_date = timezone.now().date() + timedelta(days=days_from_now)
-        item = FakeItem(target_date=target_date, member=member)
-        for k, v in overrides.items():
-            setattr(item, k, v)
-        return item
-
-    def _run(self, items, link='/test/'):
-        return send_reminder_batch(
-            items=items,
-            get_date=lambda it: it.target_date,
-            get_member=lambda it: it.member,
-            make_message=lambda it, label: f'Rappel {label}',
-            link=link,
-        )
+    def test_exact_mode_skips_days_between_offsets(self):
+        self._schedule(2)
+        schedule = self._schedule(3)
 
-    def test_5_day_reminder(self):
-        """Item 5 days away gets 5-day reminder."""
-        item = self._make_item(5)
-        result = self._run([item])
-
-        assert result == 1
-        assert item.reminder_5days_sent is True
-        assert item.saved is True
-        notif = Notification.objects.get(member=item.member)
-        assert '5 jours' in notif.message
-
-    def test_3_day_reminder(self):
-        """Item 3 days away (with 5-day already sent) gets 3-day reminder."""
-        item = self._make_item(3, reminder_5days_sent=True)
-        result = self._run([item])
-
-        assert result == 1
-        assert item.reminder_3days_sent is True
-
-    def test_1_day_reminder(self):
-        """Item 1 day away (with 5/3 already sent) gets 1-day reminder."""
-        item = self._make_item(1, reminder_5days_sent=True, reminder_3days_sent=True)
-        result = self._run([item])
-
-        assert result == 1
-        assert item.reminder_1day_sent is True
-
-    def test_same_day_reminder(self):
-        """Item today (with 5/3/1 already sent) gets same-day reminder."""
-        item = self._make_item(
-            0,
-            reminder_5days_sent=True,
-            reminder_3days_sent=True,
-            reminder_1day_sent=True,
-        )
-        result = self._run([item])
-
-        assert result == 1
-        assert item.reminder_sameday_sent is True
-
-    def test_no_duplicate(self):
-        """All flags already set → no notification sent."""
-        item = self._make_item(
-            0,
-            reminder_5days_sent=True,
-            reminder_3days_sent=True,
-            reminder_1day_sent=True,
-            reminder_sameday_sent=True,
-        )
-        result = self._run([item])
-
-        assert result == 0
-        assert Notification.objects.filter(member=item.member).count() == 0
-
-    def test_6_days_away_no_reminder(self):
-        """Item more than 5 days away gets no reminder."""
-        item = self._make_item(6)
-        result = self._run([item])
-
-        assert result == 0
-        assert item.saved is False
-
-    def test_none_date_skipped(self):
-        """Item with None target_date is skipped."""
-        item = self._make_item(5)
-        item.target_date = None
-        result = self._run([item])
-
-        assert result == 0
-        assert item.saved is False
-
-    def test_notification_link(self):
-        """Notification uses the provided link."""
-        item = self._make_item(5)
-        self._run([item], link='/my-link/')
-
-        notif = Notification.objects.get(member=item.member)
-        assert notif.link == '/my-link/'
-
-    def test_multiple_items(self):
-        """Multiple items all get processed."""
-        items = [
-            self._make_item(5),
-            self._make_item(3, reminder_5days_sent=True),
-            self._make_item(0, reminder_5days_sent=True, reminder_3days_sent=True, reminder_1day_sent=True),
-        ]
-        result = self._run(items)
-
-        assert result == 3
-        assert items[0].reminder_5days_sent is True
-        assert items[1].reminder_3days_sent is True
-        assert items[2].reminder_sameday_sent is True
-
-    def test_empty_items(self):
-        """Empty list returns 0."""
-        result = self._run([])
-        assert result == 0
+        assert self._run(exact=True) == 1
+
+        schedule.refresh_from_db()
+        assert schedule.reminder_3days_sent is True
+        assert schedule.reminder_5days_sent is False
+
+    def test_past_and_far_dates_ignored(self):
+        self._schedule(-1)
+        self._schedule(6)
+
+        assert self._run() == 0
+
+    def test_mark_sets_extra_fields(self):
+        schedule = self._schedule(5)
+
+        self._run(mark={'reminder_sent': True})
+
+        schedule.refresh_from_db()
+        assert schedule.reminder_sent is True
+
+    def test_query_count_does_not_grow_with_rows(self, django_assert_max_num_queries):
+        for days in (5, 5, 3, 3, 1, 1, 0, 0, 2, 4):
+            self._schedule(days)
+
+        # Per bucket, whatever the row count: one batch (claim, load, flag
+        # update, notification insert) and a final empty claim, each in a savepoint
+        with django_assert_max_num_queries(36):
+            assert self._run(channels=False) == 10
+
+    def test_channels_queued_after_commit(self, django_capture_on_commit_callbacks):
+        schedule = self._schedule(1)
+
+        with patch('apps.communication.tasks.deliver_notification_channels.delay') as mock_delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                self._run()
+
+        notification = Notification.objects.get(member=schedule.member)
+        mock_delay.assert_called_once_with([str(notification.pk)])
@@ -158,3 +158,119 @@ class TestGlobalSearchService:
         results = service.search('UniqueGroupSearch')
         assert 'groups' in results
         assert len(results['groups']) >= 1
+
+
+@pytest.mark.django_db
+class TestSearchIndex:
+    """Tests for the normalized search index and its backends."""
+
+    def test_normalize_text_folds_accents(self):
+        from apps.core.search_index import normalize_text
+
+        assert normalize_text('  Élise  ', 'GAGNÉ') == 'elise gagne'
+
+    def test_member_indexed_on_save(self):
+        from apps.core.models_extended import SearchDocument
+
+        member = MemberFactory(first_name='Hélène', last_name='Bérubé')
+        doc = SearchDocument.objects.get(category='members', object_id=str(member.pk))
+        assert 'helene' in doc.body
+        assert 'berube' in doc.body
+
+    def test_deleted_object_removed_from_index(self):
+        from apps.core.models_extended import SearchDocument
+
+        group = GroupFactory(name='Chorale')
+        group.delete()
+        assert not SearchDocument.all_objects.filter(object_id=str(group.pk)).exists()
+
+    def test_accent_insensitive_search(self):
+        admin = MemberWithUserFactory(role=Roles.ADMIN)
+        MemberFactory(first_name='Françoise', last_name='Lévesque')
+        service = GlobalSearchService(admin.user)
+        results = service.search('levesque')
+        assert [m.last_name for m in results['members']] == ['Lévesque']
+
+    def test_database_backend_ranks_title_prefix_first(self):
+        from apps.core.search_index import DatabaseSearchBackend
+
+        later = GroupFactory(name='Jeunes adultes')
+        first = GroupFactory(name='Adultes')
+        ids = DatabaseSearchBackend().search('groups', 'adultes', 10)
+        assert ids == [str(first.pk), str(later.pk)]
+
+    def test_sqlite_fts_backend(self):
+        from django.db import connection
+        from apps.core.search_index import SQLiteFTSBackend
+
+        if SQLiteFTSBackend.TABLE not in connection.introspection.table_names():
+            pytest.skip('FTS5 table is created by migrations')
+        group = GroupFactory(name='Louange et adoration')
+        assert SQLiteFTSBackend().search('groups', 'ador', 10) == [str(group.pk)]
+
+    def test_rebuild(self):
+        from apps.core.models_extended import SearchDocument
+        from apps.core.search_index import SearchIndex
+
+        MemberFactory.create_batch(2)
+        GroupFactory()
+        indexed = SearchDocument.all_objects.count()
+        SearchDocument.all_objects.all().delete()
+        assert SearchIndex.rebuild() == indexed
+        assert SearchDocument.objects.filter(category='groups').count() == 1
+
+    def test_rebuild_from_historical_models(self):
+        from django.db import connection
+        from django.db.migrations.executor import MigrationExecutor
+        from apps.core.models_extended import SearchDocument
+        from apps.core.search_index import SearchIndex
+
+        MemberFactory(first_name='Historique')
+        SearchDocument.all_objects.all().delete()
+        state = MigrationExecutor(connection).loader.project_state()
+        SearchIndex.rebuild(apps=state.apps)
+        assert SearchDocument.objects.filter(category='members', body__contains='historique').exists()
+
+    def test_member_rename_reindexes_donations(self):
+        from apps.core.models_extended import SearchDocument
+        from apps.donations.tests.factories import DonationFactory
+
+        member = MemberFactory(first_name='Ancien', last_name='Nom')
+        donation = DonationFactory(member=member)
+        member.last_name = 'Nouveau'
+        member.save()
+        doc = SearchDocument.objects.get(category='donations', object_id=str(donation.pk))
+        assert 'nouveau' in doc.body
+        assert ' nom' not in doc.body
+
+    def test_index_many_upserts_in_one_statement(self, django_assert_num_queries):
+        from apps.core.models_extended import SearchDocument
+        from apps.core.search_index import SearchIndex
+
+        groups = [GroupFactory(name=f'Cellule {index}') for index in range(3)]
+        groups[0].name = 'Cellule renommee'
+
+        with django_assert_num_queries(1):
+            assert SearchIndex.index_many(groups) == 3
+
+        doc = SearchDocument.objects.get(category='groups', object_id=str(groups[0].pk))
+        assert doc.title == 'Cellule renommee'
+        assert SearchDocument.objects.filter(category='groups').count() == 3
+
+    def test_member_privacy_still_applied(self):
+        viewer = MemberWithUserFactory(role=Roles.MEMBER)
+        hidden = MemberFactory(first_name='Cachee', last_name='Privee')
+        hidden.privacy_settings.visibility = 'private'
+        hidden.privacy_settings.save()
+        service = GlobalSearchService(viewer.user)
+        results = service.search('Cachee')
+        assert len(results['members']) == 0
+
+    def test_autocomplete_stops_when_limit_reached(self, django_assert_num_queries):
+        admin = MemberWithUserFactory(role=Roles.ADMIN)
+        MemberFactory(first_name='Zebulon')
+        service = GlobalSearchService(admin.user)
+        # One index lookup plus one fetch for members only
+        with django_assert_num_queries(2):
+            suggestions = service.search_autocomplete('Zebulon', limit=1)
+        assert len(suggestions) == 1
@@ -150,6 +150,8 @@ from django.utils import timezone
 from apps.core.utils import (
     generate_member_number,
     generate_donation_number,
+    reserve_donation_numbers,
+    reserve_sequence,
     generate_request_number,
     generate_receipt_number,
     get_week_birthdays,
@@ -157,14 +159,52 @@ from apps.core.utils import (
     get_month_birthdays,
     get_today_birthdays,
 )
+from apps.core.models_extended import NumberSequence
 from apps.members.tests.factories import MemberFactory
 from apps.donations.tests.factories import DonationFactory, TaxReceiptFactory
 from apps.help_requests.tests.factories import HelpRequestFactory
 
 
+def _forget_sequences():
+    """Drop the sequence rows so the next number is seeded from existing data."""
+    NumberSequence.all_objects.all().delete()
+
+
+@pytest.mark.django_db
+class TestReserveSequence:
+    """Tests for the NumberSequence counter behind generated numbers."""
+
+    def test_first_reservation_uses_seed(self):
+        assert list(reserve_sequence('TST', '2026', 3, seed=lambda: 41)) == [42, 43, 44]
+
+    def test_seed_is_only_read_once(self):
+        reserve_sequence('TST', '2026', seed=lambda: 5)
+
+        assert list(reserve_sequence('TST', '2026', 2, seed=lambda: 100)) == [7, 8]
+
+    def test_periods_are_counted_separately(self):
+        reserve_sequence('TST', '202601', 5)
+
+        assert list(reserve_sequence('TST', '202602')) == [1]
+
+    def test_numbers_are_not_reused_after_delete(self):
+        donation = DonationFactory()
+        number = donation.donation_number
+        donation.delete()
+
+        assert generate_donation_number() != number
+
+    def test_generators_do_not_scan_numbered_table(self, django_assert_num_queries):
+        DonationFactory()
+
+        # UPDATE + SELECT of the sequence row, inside a savepoint
+        with django_assert_num_queries(4):
+            generate_donation_number()
+
+
 @pytest.mark.django_db
 class TestGenerateMemberNumberEdgeCases:
-    """Tests for generate_member_number ValueError/IndexError fallback."""
+    """Tests for seeding the member number sequence from existing numbers."""
 
     def test_member_number_invalid_sequence_resets_to_one(self):
         """When existing member_number has non-numeric suffix, reset to 0001."""
@@ -173,6 +213,7 @@ class TestGenerateMemberNumberEdgeCases:
         member.member_number = f'MBR-{year}-INVALID'
         member.save(update_fields=['member_number'])
 
+        _forget_sequences()
         result = generate_member_number()
         assert result == f'MBR-{year}-0001'
 
@@ -183,6 +224,7 @@ class TestGenerateMemberNumberEdgeCases:
         member.member_number = f'MBR-{year}-0005'
         member.save(update_fields=['member_number'])
 
+        _forget_sequences()
         result = generate_member_number()
         assert result == f'MBR-{year}-0006'
 
@@ -195,13 +237,14 @@ class TestGenerateMemberNumberEdgeCases:
             member_number__startswith=f'MBR-{year}'
         ).update(member_number='CLEARED')
 
+        _forget_sequences()
         result = generate_member_number()
         assert result == f'MBR-{year}-0001'
 
 
 @pytest.mark.django_db
 class TestGenerateDonationNumberEdgeCases:
-    """Tests for generate_donation_number ValueError/IndexError fallback."""
+    """Tests for seeding the donation number sequence from existing numbers."""
 
     def test_donation_number_invalid_sequence_resets_to_one(self):
         """When existing donation_number has non-numeric suffix, reset to 0001."""
@@ -211,6 +254,7 @@ class TestGenerateDonationNumberEdgeCases:
         donation.donation_number = f'{base}-BADVAL'
         donation.save(update_fields=['donation_number'])
 
+        _forget_sequences()
         result = generate_donation_number()
         assert result == f'{base}-0001'
 
@@ -222,13 +266,36 @@ class TestGenerateDonationNumberEdgeCases:
         donation.donation_number = f'{base}-0010'
         donation.save(update_fields=['donation_number'])
 
+        _forget_sequences()
         result = generate_donation_number()
         assert result == f'{base}-0011'
 
+    def test_reserve_returns_consecutive_range(self):
+        """A reserved range continues from the highest existing number."""
+        donation = DonationFactory()
+        base = f'DON-{timezone.now().strftime("%Y%m")}'
+        donation.donation_number = f'{base}-0010'
+        donation.save(update_fields=['donation_number'])
+
+        _forget_sequences()
+        result = reserve_donation_numbers(3)
+        assert result == [f'{base}-0011', f'{base}-0012', f'{base}-0013']
+
+    def test_sequence_continues_past_four_digits(self):
+        """Numbers past 9999 sort after 9999 rather than before it."""
+        base = f'DON-{timezone.now().strftime("%Y%m")}'
+        for number in ('9999', '10000'):
+            donation = DonationFactory()
+            donation.donation_number = f'{base}-{number}'
+            donation.save(update_fields=['donation_number'])
+
+        _forget_sequences()
+        assert generate_donation_number() == f'{base}-10001'
+
 
 @pytest.mark.django_db
 class TestGenerateRequestNumberEdgeCases:
-    """Tests for generate_request_number ValueError/IndexError fallback."""
+    """Tests for seeding the help request number sequence from existing numbers."""
 
     def test_request_number_invalid_sequence_resets_to_one(self):
         """When existing request_number has non-numeric suffix, reset to 0001."""
@@ -238,6 +305,7 @@ class TestGenerateRequestNumberEdgeCases:
         help_request.request_number = f'{base}-CORRUPT'
         help_request.save(update_fields=['request_number'])
 
+        _forget_sequences()
         result = generate_request_number()
         assert result == f'{base}-0001'
 
@@ -249,13 +317,14 @@ class TestGenerateRequestNumberEdgeCases:
         help_request.request_number = f'{base}-0003'
         help_request.save(update_fields=['request_number'])
 
+        _forget_sequences()
         result = generate_request_number()
         assert result == f'{base}-0004'
 
 
 @pytest.mark.django_db
 class TestGenerateReceiptNumberEdgeCases:
-    """Tests for generate_receipt_number ValueError/IndexError fallback."""
+    """Tests for seeding the tax receipt number sequence from existing numbers."""
 
     def test_receipt_number_invalid_sequence_resets_to_one(self):
         """When existing receipt_number has non-numeric suffix, reset to 0001."""
@@ -264,6 +333,7 @@ class TestGenerateReceiptNumberEdgeCases:
         receipt.receipt_number = f'REC-{year}-BROKEN'
         receipt.save(update_fields=['receipt_number'])
 
+        _forget_sequences()
         result = generate_receipt_number()
         assert result == f'REC-{year}-0001'
 
@@ -274,6 +344,7 @@ class TestGenerateReceiptNumberEdgeCases:
         receipt.receipt_number = f'REC-{year}-0020'
         receipt.save(update_fields=['receipt_number'])
 
+        _forget_sequences()
         result = generate_receipt_number()
         assert result == f'REC-{year}-0021'
 
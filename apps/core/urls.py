@@ -1,7 +1,7 @@
-"""URL patterns for core app: search, settings, branding, webhooks, audit."""
+"""URL patterns for core app: search, settings, branding, webhooks, audit, exports."""
 from django.urls import path
 
-from . import views_frontend, views_frontend_search
+from . import views_frontend, views_frontend_exports, views_frontend_search
 
 app_name = 'core'
 
@@ -30,6 +30,11 @@ frontend_urlpatterns = [
     # Campus
     path('campus/', views_frontend.campus_list, name='campus_list'),
 
+    # Background exports
+    path('exports/', views_frontend_exports.export_job_list, name='export_job_list'),
+    path('exports/<uuid:pk>/status/', views_frontend_exports.export_job_status, name='export_job_status'),
+    path('exports/<uuid:pk>/download/', views_frontend_exports.export_job_download, name='export_job_download'),
+
     # Language
     path('set-language/', views_frontend.set_language, name='set_language'),
 ]
@@ -1,144 +1,108 @@
 """Utility functions for number generation, birthday queries, date ranges, and formatting."""
 from __future__ import annotations
 
+import re
 from datetime import date, timedelta
-from typing import Optional
+from typing import Callable, Optional
 
 from django.conf import settings
 from django.db.models import QuerySet
 from django.utils import timezone
 
 
-def generate_member_number() -> str:
+def reserve_sequence(prefix: str, period: str, count: int = 1,
+                     seed: Optional[Callable[[], int]] = None) -> range:
     """
-    Generate unique member number (MBR-YYYY-XXXX).
-    Uses select_for_update to prevent race conditions in concurrent requests.
+    Reserve ``count`` consecutive values of the (prefix, period) sequence.
+
+    The counter is one NumberSequence row bumped with a single UPDATE, so
+    concurrent callers queue on that row instead of scanning the numbered
+    table, and a value is never handed out twice even when the caller
+    inserts later. ``seed`` is called once, when the row is first created,
+    and returns the last value already in use.
     """
     from django.db import transaction
+    from django.db.models import F
+    from apps.core.models_extended import NumberSequence
+
+    sequences = NumberSequence.all_objects.filter(prefix=prefix, period=period)
+    with transaction.atomic():
+        bump = {'last_value': F('last_value') + count, 'updated_at': timezone.now()}
+        if not sequences.update(**bump):
+            _sequence, created = NumberSequence.all_objects.get_or_create(
+                prefix=prefix,
+                period=period,
+                defaults={'last_value': (seed() if seed else 0) + count},
+            )
+            if not created:
+                sequences.update(**bump)
+        last = sequences.values_list('last_value', flat=True).get()
+
+    return range(last - count + 1, last + 1)
+
+
+def _last_used_number(queryset: QuerySet, field: str, base: str) -> int:
+    """Highest numeric suffix already used under ``base``; seeds a new sequence."""
+    from django.db.models.functions import Length
+
+    last = (
+        queryset
+        .filter(**{f'{field}__regex': rf'^{re.escape(base)}-[0-9]+$'})
+        .order_by(Length(field).desc(), f'-{field}')
+        .values_list(field, flat=True)
+        .first()
+    )
+    return int(last.rsplit('-', 1)[-1]) if last else 0
+
+
+def _reserve_numbers(queryset: QuerySet, field: str, prefix: str, period: str,
+                     count: int = 1) -> list[str]:
+    base = f'{prefix}-{period}'
+    values = reserve_sequence(
+        prefix, period, count, seed=lambda: _last_used_number(queryset, field, base),
+    )
+    return [f'{base}-{value:04d}' for value in values]
+
+
+def generate_member_number() -> str:
+    """Generate unique member number (MBR-YYYY-XXXX)."""
     from apps.members.models import Member
 
     prefix = getattr(settings, 'MEMBER_NUMBER_PREFIX', 'MBR')
     year = timezone.now().year
-    base = f'{prefix}-{year}'
-
-    with transaction.atomic():
-        last_member = (
-            Member.all_objects
-            .select_for_update()
-            .filter(member_number__startswith=base)
-            .order_by('-member_number')
-            .first()
-        )
+    return _reserve_numbers(Member.all_objects, 'member_number', prefix, str(year))[0]
 
-        if last_member:
-            try:
-                last_seq = int(last_member.member_number.split('-')[-1])
-                next_seq = last_seq + 1
-            except (ValueError, IndexError):
-                next_seq = 1
-        else:
-            next_seq = 1
 
-    return f'{base}-{next_seq:04d}'
+def generate_donation_number() -> str:
+    """Generate unique donation number (DON-YYYYMM-XXXX)."""
+    return reserve_donation_numbers(1)[0]
 
 
-def generate_donation_number() -> str:
-    """
-    Generate unique donation number (DON-YYYYMM-XXXX).
-    Uses select_for_update to prevent race conditions.
-    """
-    from django.db import transaction
+def reserve_donation_numbers(count: int) -> list[str]:
+    """Reserve ``count`` consecutive donation numbers (DON-YYYYMM-XXXX) for bulk inserts."""
     from apps.donations.models import Donation
 
     prefix = getattr(settings, 'DONATION_NUMBER_PREFIX', 'DON')
-    now = timezone.now()
-    base = f'{prefix}-{now.strftime("%Y%m")}'
-
-    with transaction.atomic():
-        last_donation = (
-            Donation.all_objects
-            .select_for_update()
-            .filter(donation_number__startswith=base)
-            .order_by('-donation_number')
-            .first()
-        )
-
-        if last_donation:
-            try:
-                last_seq = int(last_donation.donation_number.split('-')[-1])
-                next_seq = last_seq + 1
-            except (ValueError, IndexError):
-                next_seq = 1
-        else:
-            next_seq = 1
-
-    return f'{base}-{next_seq:04d}'
+    period = timezone.now().strftime('%Y%m')
+    return _reserve_numbers(Donation.all_objects, 'donation_number', prefix, period, count)
 
 
 def generate_request_number() -> str:
-    """
-    Generate unique help request number (HR-YYYYMM-XXXX).
-    Uses select_for_update to prevent race conditions.
-    """
-    from django.db import transaction
+    """Generate unique help request number (HR-YYYYMM-XXXX)."""
     from apps.help_requests.models import HelpRequest
 
     prefix = getattr(settings, 'HELP_REQUEST_NUMBER_PREFIX', 'HR')
-    now = timezone.now()
-    base = f'{prefix}-{now.strftime("%Y%m")}'
-
-    with transaction.atomic():
-        last_request = (
-            HelpRequest.all_objects
-            .select_for_update()
-            .filter(request_number__startswith=base)
-            .order_by('-request_number')
-            .first()
-        )
-
-        if last_request:
-            try:
-                last_seq = int(last_request.request_number.split('-')[-1])
-                next_seq = last_seq + 1
-            except (ValueError, IndexError):
-                next_seq = 1
-        else:
-            next_seq = 1
-
-    return f'{base}-{next_seq:04d}'
+    period = timezone.now().strftime('%Y%m')
+    return _reserve_numbers(HelpRequest.all_objects, 'request_number', prefix, period)[0]
 
 
 def generate_receipt_number(year: Optional[int] = None) -> str:
-    """
-    Generate unique tax receipt number (REC-YYYY-XXXX).
-    Uses select_for_update to prevent race conditions.
-    """
-    from django.db import transaction
+    """Generate unique tax receipt number (REC-YYYY-XXXX)."""
     from apps.donations.models import TaxReceipt
 
     prefix = getattr(settings, 'TAX_RECEIPT_NUMBER_PREFIX', 'REC')
     year = year or timezone.now().year
-    base = f'{prefix}-{year}'
-
-    with transaction.atomic():
-        last_receipt = (
-            TaxReceipt.all_objects
-            .select_for_update()
-            .filter(receipt_number__startswith=base)
-            .order_by('-receipt_number')
-            .first()
-        )
-
-        if last_receipt:
-            try:
-                last_seq = int(last_receipt.receipt_number.split('-')[-1])
-                next_seq = last_seq + 1
-            except (ValueError, IndexError):
-                next_seq = 1
-        else:
-            next_seq = 1
-
-    return f'{base}-{next_seq:04d}'
+    return _reserve_numbers(TaxReceipt.all_objects, 'receipt_number', prefix, str(year))[0]
 
 
 def get_today_birthdays() -> QuerySet:
@@ -35,7 +35,7 @@ def branding_settings(request):
     if not _is_admin(request):
         return redirect('/')
 
-    branding = ChurchBranding.get_current()
+    branding = ChurchBranding.get_current(use_cache=False)
 
     if request.method == 'POST':
         form = ChurchBrandingForm(request.POST, request.FILES, instance=branding)
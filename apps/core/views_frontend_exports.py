@@ -0,0 +1,56 @@
+"""Frontend views for background export jobs: list, status polling, download."""
+import os
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.models_extended import ExportJob
+from apps.core.services_export_jobs import ExportJobService
+from apps.core.views_frontend import _is_admin
+
+
+def _get_job(request, pk):
+    """Return the job if the user requested it or is an admin, else 404."""
+    job = get_object_or_404(ExportJob, pk=pk)
+    if job.requested_by_id != request.user.pk and not _is_admin(request):
+        raise Http404
+    return job
+
+
+@login_required
+def export_job_list(request):
+    """List the user's export jobs (all jobs for admins)."""
+    jobs = ExportJob.objects.select_related('requested_by')
+    if not _is_admin(request):
+        jobs = jobs.filter(requested_by=request.user)
+
+    context = {
+        'jobs': jobs[:100],
+        'page_title': _('Mes exports'),
+    }
+    return render(request, 'core/export_job_list.html', context)
+
+
+@login_required
+def export_job_status(request, pk):
+    """JSON status for polling clients without a WebSocket."""
+    job = _get_job(request, pk)
+    return JsonResponse(ExportJobService.serialize(job))
+
+
+@login_required
+def export_job_download(request, pk):
+    """Download a finished export file."""
+    job = _get_job(request, pk)
+    if not job.is_downloadable:
+        messages.error(request, _('Ce fichier n\'est pas disponible.'))
+        return redirect('/settings/exports/')
+
+    return FileResponse(
+        job.file.open('rb'),
+        as_attachment=True,
+        filename=os.path.basename(job.file.name),
+    )
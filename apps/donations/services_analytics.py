@@ -14,19 +14,27 @@ class GivingAnalyticsService:
     """Analytics service for donation trends, retention, and comparisons."""
 
     @classmethod
-    def giving_trends(cls, period='monthly', year=None):
+    def giving_trends(cls, period='monthly', year=None, use_rollups=False):
         """
         Get giving totals grouped by period.
 
         Args:
             period: 'monthly', 'quarterly', or 'yearly'
             year: optional year filter
+            use_rollups: read closed days from the daily rollup table and
+                only scan raw donations after the rollup watermark
 
         Returns:
             list of dicts with 'period', 'total', 'count'
         """
         from .models import Donation
 
+        if use_rollups:
+            from apps.reports.services_rollup import RollupService
+
+            granularity = {'monthly': 'month', 'quarterly': 'quarter'}.get(period, 'year')
+            return RollupService.donation_trends(granularity, year)
+
         queryset = Donation.objects.filter(is_active=True)
         if year:
             queryset = queryset.filter(date__year=year)
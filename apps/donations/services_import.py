@@ -1,12 +1,17 @@
 """Donation import service for CSV/OFX files."""
+import codecs
 import csv
-import io
 import json
 import logging
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
+from functools import partial
+from itertools import islice
 
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.constants import DonationType, PaymentMethod
@@ -25,139 +30,171 @@ class DonationImportService:
         """
         Parse the uploaded file and create import rows.
 
+        Rows are streamed from the file and inserted with bulk_create in
+        batches; a file that fails part way leaves no rows behind.
+
         Returns (row_count, errors).
         """
         from .models import DonationImportRow
 
         filename = donation_import.file.name.lower()
+        if filename.endswith('.csv'):
+            parser = cls._parse_csv
+        elif filename.endswith('.ofx'):
+            parser = cls._parse_ofx
+        else:
+            return 0, ['Format de fichier non supporté.']
+
+        row_count = 0
         try:
-            if filename.endswith('.csv'):
-                rows, errors = cls._parse_csv(donation_import)
-            elif filename.endswith('.ofx'):
-                rows, errors = cls._parse_ofx(donation_import)
-            else:
-                return 0, ['Format de fichier non supporté.']
+            with transaction.atomic():
+                rows, errors = parser(donation_import)
+                for chunk in cls._chunks(rows, cls._batch_size()):
+                    DonationImportRow.objects.bulk_create([
+                        DonationImportRow(
+                            donation_import=donation_import,
+                            row_number=row_count + i,
+                            data_json=row_data,
+                            status='pending',
+                        )
+                        for i, row_data in enumerate(chunk, start=1)
+                    ])
+                    row_count += len(chunk)
         except Exception as e:
             logger.error(f'Error parsing import file: {e}')
             return 0, [f'Erreur de lecture du fichier: {str(e)}']
 
-        # Create import rows
-        for i, row_data in enumerate(rows, start=1):
-            DonationImportRow.objects.create(
-                donation_import=donation_import,
-                row_number=i,
-                data_json=row_data,
-                status='pending',
-            )
-
-        donation_import.total_rows = len(rows)
+        donation_import.total_rows = row_count
         donation_import.save(update_fields=['total_rows', 'updated_at'])
 
-        return len(rows), errors
+        return row_count, errors
 
     @classmethod
     def validate_rows(cls, donation_import):
-        """Validate all pending rows and mark them valid/invalid."""
-        from .models import DonationImportRow
-        from apps.members.models import Member
+        """
+        Validate all pending rows and mark them valid/invalid.
+
+        Each batch of rows costs one member lookup, one duplicate query
+        and one bulk_update, whatever its size.
+        """
+        from .models import Donation, DonationImportRow
 
-        rows = donation_import.rows.filter(status='pending')
         valid_count = 0
         invalid_count = 0
 
-        for row in rows:
-            errors = []
-            data = row.data_json
-
-            # Validate member
-            member_number = data.get('member_number', '').strip()
-            if not member_number:
-                errors.append('Numero de membre manquant.')
-            else:
-                if not Member.objects.filter(member_number=member_number, is_active=True).exists():
-                    errors.append(f'Membre {member_number} introuvable.')
+        pks = list(
+            donation_import.rows.filter(status='pending')
+            .order_by('row_number').values_list('pk', flat=True)
+        )
+        for chunk_pks in cls._chunks(pks, cls._batch_size()):
+            rows = list(DonationImportRow.objects.filter(pk__in=chunk_pks).order_by('row_number'))
+            members = cls._members_by_number(row.data_json for row in rows)
+
+            checked = [(row, *cls._check_row(row.data_json, members)) for row in rows]
+
+            # Check for duplicates: one keyed query for the whole batch
+            keys = [key for _row, errors, key in checked if not errors]
+            existing = set()
+            if keys:
+                existing = set(
+                    Donation.objects.filter(
+                        member_id__in={member_id for member_id, _amount, _date in keys},
+                        date__in={donation_date for _member_id, _amount, donation_date in keys},
+                    ).values_list('member_id', 'amount', 'date')
+                )
 
-            # Validate amount
-            try:
-                amount = Decimal(str(data.get('amount', '0')))
-                if amount <= 0:
-                    errors.append('Le montant doit etre positif.')
-            except (InvalidOperation, ValueError):
-                errors.append('Montant invalide.')
-
-            # Validate date
-            date_str = data.get('date', '')
-            if not date_str:
-                errors.append('Date manquante.')
-            else:
-                try:
-                    cls._parse_date(date_str)
-                except ValueError:
-                    errors.append('Format de date invalide.')
-
-            # Check for duplicates
-            if not errors:
-                duplicate = cls._check_duplicate(data)
-                if duplicate:
+            now = timezone.now()
+            for row, errors, key in checked:
+                row.updated_at = now
+                if errors:
+                    row.status = 'invalid'
+                    row.error_message = ' | '.join(errors)
+                    invalid_count += 1
+                elif key in existing:
                     row.status = 'duplicate'
                     row.error_message = 'Doublon detecte.'
-                    row.save(update_fields=['status', 'error_message', 'updated_at'])
                     invalid_count += 1
-                    continue
-
-            if errors:
-                row.status = 'invalid'
-                row.error_message = ' | '.join(errors)
-                invalid_count += 1
-            else:
-                row.status = 'valid'
-                valid_count += 1
+                else:
+                    row.status = 'valid'
+                    valid_count += 1
 
-            row.save(update_fields=['status', 'error_message', 'updated_at'])
+            DonationImportRow.objects.bulk_update(rows, ['status', 'error_message', 'updated_at'])
 
         return valid_count, invalid_count
 
     @classmethod
     def import_rows(cls, donation_import):
-        """Import all valid rows, creating Donation objects."""
-        from .models import Donation, DonationImportRow, DonationCampaign
-        from apps.members.models import Member
+        """
+        Import all valid rows, creating Donation objects.
+
+        Rows are imported in batches. Each batch reserves a range of
+        donation numbers up front, then inserts its donations with
+        bulk_create and marks its rows in one transaction.
+        """
+        from .models import DonationImportRow, DonationCampaign
 
-        rows = donation_import.rows.filter(status='valid')
         imported = 0
         skipped = 0
 
+        campaigns = {}
+        for campaign in DonationCampaign.objects.filter(is_active=True):
+            campaigns.setdefault(campaign.name.lower(), campaign)
+
+        pks = list(
+            donation_import.rows.filter(status='valid')
+            .order_by('row_number').values_list('pk', flat=True)
+        )
+        for chunk_pks in cls._chunks(pks, cls._batch_size()):
+            rows = list(DonationImportRow.objects.filter(pk__in=chunk_pks).order_by('row_number'))
+            batch_imported = cls._import_batch(rows, campaigns)
+            imported += batch_imported
+            skipped += len(rows) - batch_imported
+
+        donation_import.imported_count = imported
+        donation_import.skipped_count = skipped
+        donation_import.status = 'completed'
+        donation_import.save(update_fields=[
+            'imported_count', 'skipped_count', 'status', 'updated_at'
+        ])
+
+        return imported, skipped
+
+    @classmethod
+    def _import_batch(cls, rows, campaigns):
+        """Create the donations for one batch of valid rows. Returns the number imported."""
+        from apps.core.search_index import SearchIndex
+        from apps.core.utils import reserve_donation_numbers
+        from .models import Donation, DonationImportRow
+
+        members = cls._members_by_number(row.data_json for row in rows)
+        valid_types = {c[0] for c in DonationType.CHOICES}
+        valid_methods = {c[0] for c in PaymentMethod.CHOICES}
+
+        pending = []
         for row in rows:
             data = row.data_json
 
             try:
-                member = Member.objects.get(
-                    member_number=data['member_number'].strip(),
-                    is_active=True,
-                )
+                member_number = data['member_number'].strip()
+                member_id = members.get(member_number)
+                if member_id is None:
+                    raise ValueError(f'Membre {member_number} introuvable.')
                 amount = Decimal(str(data['amount']))
                 donation_date = cls._parse_date(data['date'])
                 donation_type = data.get('donation_type', DonationType.OFFERING)
                 payment_method = data.get('payment_method', PaymentMethod.OTHER)
 
                 # Validate donation_type and payment_method
-                valid_types = [c[0] for c in DonationType.CHOICES]
                 if donation_type not in valid_types:
                     donation_type = DonationType.OFFERING
-
-                valid_methods = [c[0] for c in PaymentMethod.CHOICES]
                 if payment_method not in valid_methods:
                     payment_method = PaymentMethod.OTHER
 
-                campaign = None
                 campaign_name = data.get('campaign', '').strip()
-                if campaign_name:
-                    campaign = DonationCampaign.objects.filter(
-                        name__iexact=campaign_name, is_active=True
-                    ).first()
+                campaign = campaigns.get(campaign_name.lower()) if campaign_name else None
 
-                donation = Donation.objects.create(
-                    member=member,
+                pending.append((row, Donation(
+                    member_id=member_id,
                     amount=amount,
                     date=donation_date,
                     donation_type=donation_type,
@@ -165,27 +202,35 @@ class DonationImportService:
                     campaign=campaign,
                     notes=data.get('notes', ''),
                     check_number=data.get('check_number', ''),
-                )
-
-                row.donation = donation
-                row.status = 'imported'
-                row.save(update_fields=['donation', 'status', 'updated_at'])
-                imported += 1
+                )))
 
             except Exception as e:
                 row.status = 'invalid'
                 row.error_message = f'Erreur: {str(e)}'
-                row.save(update_fields=['status', 'error_message', 'updated_at'])
-                skipped += 1
 
-        donation_import.imported_count = imported
-        donation_import.skipped_count = skipped
-        donation_import.status = 'completed'
-        donation_import.save(update_fields=[
-            'imported_count', 'skipped_count', 'status', 'updated_at'
-        ])
+        numbers = reserve_donation_numbers(len(pending)) if pending else []
+        for (row, donation), number in zip(pending, numbers):
+            donation.donation_number = number
+            row.donation = donation
+            row.status = 'imported'
+
+        now = timezone.now()
+        with transaction.atomic():
+            if pending:
+                donations = Donation.objects.bulk_create([donation for _row, donation in pending])
+                # bulk_create skips the post_save rollup refresh and search
+                # indexing; do them once per day and once per batch
+                transaction.on_commit(partial(
+                    cls._refresh_rollups, {donation.date for donation in donations},
+                ))
+                transaction.on_commit(partial(SearchIndex.index_many, donations))
+            for row in rows:
+                row.updated_at = now
+            DonationImportRow.objects.bulk_update(
+                rows, ['donation', 'status', 'error_message', 'updated_at'],
+            )
 
-        return imported, skipped
+        return len(pending)
 
     @classmethod
     def get_preview(cls, donation_import, limit=20):
@@ -200,17 +245,15 @@ class DonationImportService:
 
     @classmethod
     def _parse_csv(cls, donation_import):
-        """Parse a CSV file into row dicts."""
-        rows = []
+        """Parse a CSV file into row dicts, read lazily as the rows are consumed."""
         errors = []
 
         donation_import.file.seek(0)
-        content = donation_import.file.read().decode('utf-8-sig')
-        reader = csv.DictReader(io.StringIO(content))
+        reader = csv.DictReader(codecs.iterdecode(donation_import.file, 'utf-8-sig'))
 
         if not reader.fieldnames:
             errors.append('Fichier CSV vide ou mal formate.')
-            return rows, errors
+            return [], errors
 
         # Check required columns
         field_names_lower = [f.lower().strip() for f in reader.fieldnames]
@@ -219,16 +262,18 @@ class DonationImportService:
                 errors.append(f'Colonne requise manquante: {col}')
 
         if errors:
-            return rows, errors
+            return [], errors
 
-        # Normalize field names
-        for row in reader:
-            normalized = {}
-            for key, value in row.items():
-                normalized[key.lower().strip()] = (value or '').strip()
-            rows.append(normalized)
+        return cls._normalized_rows(reader), errors
 
-        return rows, errors
+    @staticmethod
+    def _normalized_rows(reader):
+        """Yield CSV rows with lower-cased, stripped field names and values."""
+        for row in reader:
+            yield {
+                key.lower().strip(): (value or '').strip()
+                for key, value in row.items() if key is not None
+            }
 
     @classmethod
     def _parse_ofx(cls, donation_import):
@@ -290,23 +335,71 @@ class DonationImportService:
         raise ValueError(f'Cannot parse date: {date_str}')
 
     @classmethod
-    def _check_duplicate(cls, data):
-        """Check if this import row is a duplicate of an existing donation."""
-        from .models import Donation
-        from apps.members.models import Member
+    def _check_row(cls, data, members):
+        """
+        Validate one row against the batch's member lookup.
 
+        Returns (errors, key) where key is (member_id, amount, date), the
+        fields a duplicate donation would share.
+        """
+        errors = []
+        member_id = amount = donation_date = None
+
+        # Validate member
+        member_number = data.get('member_number', '').strip()
+        if not member_number:
+            errors.append('Numero de membre manquant.')
+        else:
+            member_id = members.get(member_number)
+            if member_id is None:
+                errors.append(f'Membre {member_number} introuvable.')
+
+        # Validate amount
         try:
-            member = Member.objects.get(
-                member_number=data.get('member_number', '').strip(),
-                is_active=True,
-            )
             amount = Decimal(str(data.get('amount', '0')))
-            donation_date = cls._parse_date(data.get('date', ''))
-
-            return Donation.objects.filter(
-                member=member,
-                amount=amount,
-                date=donation_date,
-            ).exists()
-        except Exception:
-            return False
+            if amount <= 0:
+                errors.append('Le montant doit etre positif.')
+        except (InvalidOperation, ValueError):
+            errors.append('Montant invalide.')
+
+        # Validate date
+        date_str = data.get('date', '')
+        if not date_str:
+            errors.append('Date manquante.')
+        else:
+            try:
+                donation_date = cls._parse_date(date_str)
+            except ValueError:
+                errors.append('Format de date invalide.')
+
+        return errors, (member_id, amount, donation_date)
+
+    @staticmethod
+    def _members_by_number(rows_data):
+        """Map the member numbers found in ``rows_data`` to active member pks in one query."""
+        from apps.members.models import Member
+
+        numbers = {(data.get('member_number') or '').strip() for data in rows_data}
+        numbers.discard('')
+        return dict(
+            Member.objects.filter(member_number__in=numbers, is_active=True)
+            .values_list('member_number', 'pk')
+        )
+
+    @staticmethod
+    def _refresh_rollups(days):
+        from apps.reports.services_rollup import RollupService
+
+        for day in sorted(days):
+            RollupService.refresh_day_if_closed(day)
+
+    @staticmethod
+    def _batch_size():
+        return getattr(settings, 'DONATION_IMPORT_BATCH_SIZE', 1000)
+
+    @staticmethod
+    def _chunks(iterable, size):
+        """Yield lists of up to ``size`` items from ``iterable``."""
+        iterator = iter(iterable)
+        while chunk := list(islice(iterator, size)):
+            yield chunk
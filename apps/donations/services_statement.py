@@ -1,5 +1,4 @@
 """Giving statement generation and delivery service."""
-import io
 import logging
 from datetime import date
 from decimal import Decimal
@@ -18,6 +17,8 @@ logger = logging.getLogger(__name__)
 class StatementService:
     """Service for generating, storing, and emailing giving statements."""
 
+    SAVE_BATCH_SIZE = 50
+
     @staticmethod
     def get_period_dates(year, period):
         """Return (start_date, end_date) for a given period."""
@@ -67,34 +68,111 @@ class StatementService:
         try:
             pdf_content = cls._generate_pdf(statement, donations)
             if pdf_content:
-                filename = f'releve_{member.pk}_{year}_{period}.pdf'
-                statement.pdf_file.save(filename, ContentFile(pdf_content), save=True)
+                statement.pdf_file.save(cls._filename(statement), ContentFile(pdf_content), save=True)
         except Exception as e:
             logger.error(f'Failed to generate PDF for statement {statement.pk}: {e}')
 
         return statement
 
     @classmethod
-    def bulk_generate(cls, year, period):
-        """Generate statements for all members with donations in the period."""
-        from apps.members.models import Member
-        from .models import Donation
+    def bulk_generate(cls, year, period, progress=None, workers=None):
+        """
+        Generate statements for all members with donations in the period.
 
-        start_date, end_date = cls.get_period_dates(year, period)
+        Every donation in the period is loaded with one ordered query and
+        grouped per member in memory; missing statements are created with
+        one bulk_create. PDFs are rendered on a process pool
+        (BulkPDFRenderer) and written to storage as they finish.
+
+        Statements that already have a PDF are left alone, so a run that
+        died part way resumes with the members it had not reached.
 
-        members_with_donations = Member.objects.filter(
-            donations__date__gte=start_date,
-            donations__date__lte=end_date,
-            donations__is_active=True,
-        ).distinct()
+        ``progress``, if given, is called as ``progress(done, total)`` as
+        members are completed so long runs (see ExportJobService) can
+        report back.
+        """
+        from apps.core.services_pdf import BulkPDFRenderer
+        from .models import Donation, GivingStatement
 
-        generated = []
-        for member in members_with_donations:
-            statement = cls.generate_statement(member, year, period)
-            if statement:
-                generated.append(statement)
+        start_date, end_date = cls.get_period_dates(year, period)
 
-        return generated
+        donations_by_member = {}
+        members = {}
+        donations = Donation.objects.filter(
+            date__gte=start_date,
+            date__lte=end_date,
+            is_active=True,
+            member__deleted_at__isnull=True,
+        ).select_related('member').order_by('member_id', 'date', 'pk')
+        for donation in donations.iterator(chunk_size=2000):
+            donations_by_member.setdefault(donation.member_id, []).append(donation)
+            members[donation.member_id] = donation.member
+
+        totals = {
+            member_id: sum((d.amount for d in rows), Decimal('0.00'))
+            for member_id, rows in donations_by_member.items()
+        }
+        existing = set(
+            GivingStatement.objects.filter(
+                year=year, period=period, member_id__in=members,
+            ).values_list('member_id', flat=True)
+        )
+        GivingStatement.objects.bulk_create([
+            GivingStatement(
+                member_id=member_id,
+                year=year,
+                period=period,
+                start_date=start_date,
+                end_date=end_date,
+                total_amount=totals[member_id],
+            )
+            for member_id in members if member_id not in existing
+        ], ignore_conflicts=True)
+
+        statements = list(
+            GivingStatement.objects.filter(year=year, period=period, member_id__in=members)
+            .order_by('member_id')
+        )
+        for statement in statements:
+            statement.member = members[statement.member_id]
+        pending = {s.pk: s for s in statements if not s.pdf_file}
+
+        total = len(statements)
+        done = total - len(pending)
+        if progress:
+            progress(done, total)
+
+        renderer = BulkPDFRenderer(workers)
+        if pending and not renderer.available():
+            logger.error('xhtml2pdf not installed, cannot generate statement PDFs.')
+            pending = {}
+
+        documents = (
+            (pk, cls._render_html(statement, donations_by_member[statement.member_id]))
+            for pk, statement in pending.items()
+        )
+        finished = []
+        for pk, pdf in renderer.render(documents):
+            statement = pending[pk]
+            if pdf:
+                statement.pdf_file.save(cls._filename(statement), ContentFile(pdf), save=False)
+                statement.updated_at = timezone.now()
+                finished.append(statement)
+            done += 1
+            if len(finished) >= cls.SAVE_BATCH_SIZE:
+                GivingStatement.objects.bulk_update(finished, ['pdf_file', 'updated_at'])
+                finished = []
+                if progress:
+                    progress(done, total)
+        GivingStatement.objects.bulk_update(finished, ['pdf_file', 'updated_at'])
+        if progress:
+            progress(done, total)
+
+        logger.info(
+            'Statements %s %s: %d members, %d already done, %s',
+            year, period, total, total - len(pending), renderer.throughput(),
+        )
+        return statements
 
     @classmethod
     def email_statement(cls, statement):
@@ -142,33 +220,31 @@ class StatementService:
                 sent += 1
         return sent
 
-    @classmethod
-    def _generate_pdf(cls, statement, donations):
-        """Generate PDF content for a giving statement."""
-        try:
-            from xhtml2pdf import pisa
-        except ImportError:
-            logger.error('xhtml2pdf not installed, cannot generate statement PDF.')
-            return None
-
-        church_name = getattr(settings, 'CHURCH_NAME', 'EgliseConnect')
-        church_address = getattr(settings, 'CHURCH_ADDRESS', '')
-        church_registration = getattr(settings, 'CHURCH_REGISTRATION', '')
+    @staticmethod
+    def _filename(statement):
+        return f'releve_{statement.member_id}_{statement.year}_{statement.period}.pdf'
 
-        html_string = render_to_string('donations/statement_pdf.html', {
+    @classmethod
+    def _render_html(cls, statement, donations):
+        return render_to_string('donations/statement_pdf.html', {
             'statement': statement,
             'donations': donations,
             'member': statement.member,
-            'church_name': church_name,
-            'church_address': church_address,
-            'church_registration': church_registration,
+            'church_name': getattr(settings, 'CHURCH_NAME', 'EgliseConnect'),
+            'church_address': getattr(settings, 'CHURCH_ADDRESS', ''),
+            'church_registration': getattr(settings, 'CHURCH_REGISTRATION', ''),
         })
 
-        output = io.BytesIO()
-        pisa_status = pisa.CreatePDF(io.StringIO(html_string), dest=output)
+    @classmethod
+    def _generate_pdf(cls, statement, donations):
+        """Generate PDF content for a giving statement."""
+        from apps.core.services_pdf import BulkPDFRenderer, html_to_pdf
 
-        if pisa_status.err:
-            logger.error(f'PDF generation error for statement {statement.pk}')
+        if not BulkPDFRenderer.available():
+            logger.error('xhtml2pdf not installed, cannot generate statement PDF.')
             return None
 
-        return output.getvalue()
+        pdf = html_to_pdf(cls._render_html(statement, donations))
+        if pdf is None:
+            logger.error(f'PDF generation error for statement {statement.pk}')
+        return pdf
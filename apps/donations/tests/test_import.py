@@ -1,4 +1,5 @@
 """Tests for donation import wizard (P2-2)."""
+from datetime import date
 from decimal import Decimal
 
 import pytest
@@ -11,6 +12,8 @@ from apps.donations.models import DonationImport, DonationImportRow, Donation
 from apps.members.tests.factories import MemberFactory, UserFactory
 
 from .factories import (
+    DonationCampaignFactory,
+    DonationFactory,
     DonationImportFactory,
     CompletedImportFactory,
     DonationImportRowFactory,
@@ -158,6 +161,96 @@ class TestDonationImportService:
         assert imp.imported_count >= 0  # depends on implementation details
 
 
+@pytest.mark.django_db
+class TestBulkImportEngine:
+    """Batched parse / validate / import of large files."""
+
+    def _import(self, content):
+        return DonationImportFactory(
+            file=SimpleUploadedFile('banque.csv', content, content_type='text/csv'),
+        )
+
+    def test_full_run_flags_rows_and_numbers_donations_consecutively(self, settings):
+        from apps.donations.services_import import DonationImportService
+
+        settings.DONATION_IMPORT_BATCH_SIZE = 2
+        member = MemberFactory(member_number='M001')
+        DonationFactory(member=member, amount=Decimal('75.00'), date=date(2026, 1, 10))
+        campaign = DonationCampaignFactory(name='Toiture')
+        imp = self._import(
+            '\ufeffMember_Number,Amount,Date,Campaign\n'
+            'M001,100.00,2026-01-15,toiture\n'
+            'M001,75,2026-01-10,\n'
+            'M404,20.00,2026-01-15,\n'
+            'M001,40.00,15/01/2026,\n'.encode('utf-8')
+        )
+
+        assert DonationImportService.parse_file(imp) == (4, [])
+        assert DonationImportService.validate_rows(imp) == (2, 2)
+        statuses = list(imp.rows.order_by('row_number').values_list('status', flat=True))
+        assert statuses == ['valid', 'duplicate', 'invalid', 'valid']
+
+        assert DonationImportService.import_rows(imp) == (2, 0)
+        donations = list(
+            Donation.objects.filter(import_rows__donation_import=imp).order_by('donation_number')
+        )
+        assert [d.amount for d in donations] == [Decimal('100.00'), Decimal('40.00')]
+        assert donations[0].campaign == campaign
+        first, second = (int(d.donation_number.split('-')[-1]) for d in donations)
+        assert second == first + 1
+
+    def test_imported_donations_are_searchable(self, django_capture_on_commit_callbacks):
+        from apps.core.models_extended import SearchDocument
+        from apps.donations.services_import import DonationImportService
+
+        MemberFactory(member_number='M001', first_name='Importe', last_name='Donateur')
+        imp = self._import(b'member_number,amount,date\nM001,10.00,2026-01-15\nM001,20.00,2026-01-16\n')
+        DonationImportService.parse_file(imp)
+        DonationImportService.validate_rows(imp)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            DonationImportService.import_rows(imp)
+
+        donation_ids = [
+            str(pk) for pk in
+            Donation.objects.filter(import_rows__donation_import=imp).values_list('pk', flat=True)
+        ]
+        documents = SearchDocument.objects.filter(category='donations', object_id__in=donation_ids)
+        assert documents.count() == 2
+        assert all('donateur' in document.body for document in documents)
+
+    def test_query_count_does_not_grow_with_rows(self, django_assert_max_num_queries):
+        from apps.core.utils import reserve_donation_numbers
+        from apps.donations.services_import import DonationImportService
+
+        # Create the month's number sequence up front; its one-off seeding
+        # (regex scan + insert) is not part of the per-import cost
+        reserve_donation_numbers(1)
+        for index in range(3):
+            MemberFactory(member_number=f'M{index:03d}')
+        lines = ''.join(f'M{index % 3:03d},{10 + index}.00,2026-01-15\n' for index in range(30))
+        imp = self._import(f'member_number,amount,date\n{lines}'.encode())
+        DonationImportService.parse_file(imp)
+
+        with django_assert_max_num_queries(6):
+            DonationImportService.validate_rows(imp)
+        with django_assert_max_num_queries(15):
+            DonationImportService.import_rows(imp)
+
+        assert Donation.objects.filter(import_rows__donation_import=imp).count() == 30
+
+    def test_unreadable_file_leaves_no_rows(self):
+        from apps.donations.services_import import DonationImportService
+
+        imp = self._import(b'member_number,amount,date\nM001,10,2026-01-15\n\xff\xfe\n')
+
+        row_count, errors = DonationImportService.parse_file(imp)
+
+        assert row_count == 0
+        assert errors
+        assert not imp.rows.exists()
+
+
 # ==============================================================================
 # View Tests
 # ==============================================================================
@@ -135,6 +135,54 @@ class TestStatementService:
         statements = StatementService.bulk_generate(2026, 'annual')
         assert len(statements) >= 2
 
+    def test_bulk_generate_groups_donations_per_member(self, settings, tmp_path):
+        """bulk_generate totals and renders each donor from one donation query."""
+        from unittest.mock import patch
+        from apps.donations.services_statement import StatementService
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        member1 = MemberFactory()
+        member2 = MemberFactory()
+        DonationFactory(member=member1, date=date(2026, 3, 15), amount=Decimal('100.00'))
+        DonationFactory(member=member1, date=date(2026, 4, 15), amount=Decimal('25.00'))
+        DonationFactory(member=member2, date=date(2026, 5, 20), amount=Decimal('40.00'))
+
+        with patch('apps.core.services_pdf.BulkPDFRenderer.available', return_value=True), \
+                patch('apps.core.services_pdf.html_to_pdf', return_value=b'%PDF-1.4') as mock_pdf:
+            statements = StatementService.bulk_generate(2026, 'annual', workers=1)
+
+        assert mock_pdf.call_count == 2
+        totals = {s.member_id: s.total_amount for s in GivingStatement.objects.filter(year=2026)}
+        assert totals == {member1.pk: Decimal('125.00'), member2.pk: Decimal('40.00')}
+        assert all(s.pdf_file for s in GivingStatement.objects.filter(year=2026))
+        assert len(statements) == 2
+
+    def test_bulk_generate_resumes_where_it_stopped(self, settings, tmp_path):
+        """Statements that already have a PDF are not rendered again."""
+        from unittest.mock import patch
+        from apps.donations.services_statement import StatementService
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        done_member = MemberFactory()
+        todo_member = MemberFactory()
+        DonationFactory(member=done_member, date=date(2026, 3, 15))
+        DonationFactory(member=todo_member, date=date(2026, 3, 15))
+        GivingStatementFactory(
+            member=done_member, year=2026, period='annual', pdf_file='statements/done.pdf',
+        )
+        progress = []
+
+        with patch('apps.core.services_pdf.BulkPDFRenderer.available', return_value=True), \
+                patch('apps.core.services_pdf.html_to_pdf', return_value=b'%PDF-1.4') as mock_pdf:
+            StatementService.bulk_generate(
+                2026, 'annual', workers=1,
+                progress=lambda done, total: progress.append((done, total)),
+            )
+
+        assert mock_pdf.call_count == 1
+        assert progress[0] == (1, 2)
+        assert progress[-1] == (2, 2)
+
 
 # ==============================================================================
 # View Tests
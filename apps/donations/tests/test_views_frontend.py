@@ -429,6 +429,9 @@ class TestDonationExportCSV:
 
     url = '/donations/admin/export/'
 
+    def _content(self, response):
+        return b''.join(response.streaming_content).decode('utf-8-sig')
+
     def test_login_required(self):
         client = Client()
         response = client.get(self.url)
@@ -476,7 +479,7 @@ class TestDonationExportCSV:
         DonationFactory()
         client = make_logged_in_client(user)
         response = client.get(self.url)
-        content = response.content.decode('utf-8-sig')
+        content = self._content(response)
         assert 'Numéro' in content
         assert 'Membre' in content
         assert 'Montant' in content
@@ -486,7 +489,7 @@ class TestDonationExportCSV:
         donation = DonationFactory(amount=Decimal('123.45'))
         client = make_logged_in_client(user)
         response = client.get(self.url)
-        content = response.content.decode('utf-8-sig')
+        content = self._content(response)
         assert donation.donation_number in content
         assert '123.45' in content
 
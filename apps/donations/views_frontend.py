@@ -1,5 +1,4 @@
 """Template-based views for donation management."""
-import csv
 import io
 from decimal import Decimal
 
@@ -15,7 +14,7 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.constants import Roles, PaymentMethod, PledgeStatus
-from apps.core.export import export_queryset_csv, export_queryset_excel, export_queryset_pdf
+from apps.core.export import stream_queryset_csv, stream_queryset_excel
 
 from .models import (
     Donation, DonationCampaign, TaxReceipt, FinanceDelegation,
@@ -299,54 +298,13 @@ def donation_export_csv(request):
         messages.error(request, _("Vous n'avez pas accès à cette page."))
         return redirect('/')
 
-    form = DonationFilterForm(request.GET)
-    donations = Donation.objects.all().select_related('member', 'campaign')
-
-    if form.is_valid():
-        if form.cleaned_data.get('date_from'):
-            donations = donations.filter(date__gte=form.cleaned_data['date_from'])
-        if form.cleaned_data.get('date_to'):
-            donations = donations.filter(date__lte=form.cleaned_data['date_to'])
-        if form.cleaned_data.get('donation_type'):
-            donations = donations.filter(donation_type=form.cleaned_data['donation_type'])
-        if form.cleaned_data.get('payment_method'):
-            donations = donations.filter(payment_method=form.cleaned_data['payment_method'])
-        if form.cleaned_data.get('campaign'):
-            donations = donations.filter(campaign=form.cleaned_data['campaign'])
-        if form.cleaned_data.get('member'):
-            search = form.cleaned_data['member']
-            donations = donations.filter(
-                Q(member__first_name__icontains=search) |
-                Q(member__last_name__icontains=search) |
-                Q(member__member_number__icontains=search)
-            )
-
-    donations = donations.order_by('-date', '-created_at')
-
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="dons_export.csv"'
-    response.write('\ufeff')  # BOM for Excel
-
-    writer = csv.writer(response)
-    writer.writerow([
-        'Numéro', 'Membre', 'Date', 'Montant', 'Type', 'Mode de paiement',
-        'Campagne', 'Notes', 'Reçu envoyé',
-    ])
-
-    for donation in donations:
-        writer.writerow([
-            donation.donation_number,
-            donation.member.full_name,
-            donation.date.isoformat(),
-            str(donation.amount),
-            donation.get_donation_type_display(),
-            donation.get_payment_method_display(),
-            donation.campaign.name if donation.campaign else '',
-            donation.notes,
-            'Oui' if donation.receipt_sent else 'Non',
-        ])
-
-    return response
+    donations = _get_filtered_donations(request)
+    return stream_queryset_csv(
+        donations,
+        DONATION_CSV_FIELDS,
+        'dons_export',
+        headers=DONATION_CSV_HEADERS,
+    )
 
 
 @login_required
@@ -884,10 +842,24 @@ DONATION_EXPORT_HEADERS = [
     'Mode de paiement', 'Campagne', 'Notes',
 ]
 
+DONATION_CSV_FIELDS = DONATION_EXPORT_FIELDS + [
+    lambda d: 'Oui' if d.receipt_sent else 'Non',
+]
+
+DONATION_CSV_HEADERS = [
+    'Numéro', 'Membre', 'Date', 'Montant', 'Type', 'Mode de paiement',
+    'Campagne', 'Notes', 'Reçu envoyé',
+]
+
 
 def _get_filtered_donations(request):
     """Apply filters from DonationFilterForm to donations queryset."""
-    form = DonationFilterForm(request.GET)
+    return filter_donations(request.GET)
+
+
+def filter_donations(data):
+    """Apply DonationFilterForm filters from a GET-style dict (also used by export jobs)."""
+    form = DonationFilterForm(data)
     donations = Donation.objects.all().select_related('member', 'campaign')
 
     if form.is_valid():
@@ -920,7 +892,7 @@ def donation_export_excel(request):
         return redirect('/')
 
     donations = _get_filtered_donations(request)
-    return export_queryset_excel(
+    return stream_queryset_excel(
         donations,
         DONATION_EXPORT_FIELDS,
         'dons_export',
@@ -935,13 +907,12 @@ def donation_export_pdf(request):
         messages.error(request, _("Vous n'avez pas acces a cette page."))
         return redirect('/')
 
-    donations = _get_filtered_donations(request)
-    return export_queryset_pdf(
-        donations,
-        DONATION_EXPORT_FIELDS,
-        'dons_export',
-        headers=DONATION_EXPORT_HEADERS,
-    )
+    from apps.core.constants import ExportFormat, ExportJobType
+    from apps.core.services_export_jobs import ExportJobService
+
+    ExportJobService.enqueue(request.user, ExportJobType.DONATIONS, ExportFormat.PDF, request.GET)
+    messages.success(request, _('Export lance. Le fichier sera disponible dans « Mes exports ».'))
+    return redirect('/settings/exports/')
 
 
 # ==============================================================================
@@ -1156,10 +1127,16 @@ def statement_generate(request):
                 except Member.DoesNotExist:
                     messages.error(request, _('Membre introuvable.'))
             else:
-                generated = StatementService.bulk_generate(year, period)
+                from apps.core.constants import ExportFormat, ExportJobType
+                from apps.core.services_export_jobs import ExportJobService
+
+                ExportJobService.enqueue(
+                    request.user, ExportJobType.STATEMENTS, ExportFormat.ZIP,
+                    {'year': year, 'period': period},
+                )
                 messages.success(
                     request,
-                    _('%(count)d releve(s) genere(s).') % {'count': len(generated)}
+                    _('Generation des releves lancee. L\'archive sera disponible dans « Mes exports ».')
                 )
 
             return redirect('/donations/statements/')
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:10
+
+from django.db import migrations
+
+
+# GiST index over (room, [start, end)) for active bookings, matching the
+# tstzrange overlap test in services_facility.overlapping. Other backends
+# keep using the plain column comparisons.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    "CREATE INDEX events_roombooking_active_span ON events_roombooking "
+    "USING gist (room_id, tstzrange(start_datetime, end_datetime, '[)')) "
+    "WHERE status IN ('pending', 'confirmed')",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS events_roombooking_active_span",
+]
+
+
+def _run_vendor_sql(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0003_eventtemplate_room_event_campus_event_is_hybrid_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run_vendor_sql({'postgresql': POSTGRES_FORWARD}),
+            _run_vendor_sql({'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
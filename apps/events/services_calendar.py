@@ -1,10 +1,15 @@
 """Calendar service — iCal generation, Google/Apple/Outlook calendar links."""
-from datetime import datetime, timezone as dt_timezone
+import hashlib
+from datetime import datetime, time, timedelta, timezone as dt_timezone
 from urllib.parse import quote
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
 from django.utils import timezone
 
+from apps.core.constants import EventType
+
 try:
     from icalendar import Calendar, Event as ICalEvent, vDatetime
 except ImportError:
@@ -12,21 +17,43 @@ except ImportError:
     ICalEvent = None
     vDatetime = None
 
+# Color map for calendar event type coding
+EVENT_TYPE_COLORS = {
+    EventType.WORSHIP: "#6a5acd",    # Violet
+    EventType.GROUP: "#28a745",      # Vert
+    EventType.MEAL: "#fd7e14",       # Orange
+    EventType.SPECIAL: "#dc3545",    # Rouge
+    EventType.MEETING: "#17a2b8",    # Cyan
+    EventType.TRAINING: "#007bff",   # Bleu
+    EventType.OUTREACH: "#ffc107",   # Jaune
+    EventType.OTHER: "#6c757d",      # Gris
+}
+
 
 class CalendarService:
     """Generate iCal data and external calendar URLs for events."""
 
     @staticmethod
-    def generate_ical_event(event):
-        """Generate an iCal VEVENT component for a single Event instance."""
-        if ICalEvent is None:
-            raise ImportError("icalendar library is required for calendar export.")
-
+    def _calendar(name=None):
         cal = Calendar()
         cal.add('prodid', '-//EgliseConnect//FR')
         cal.add('version', '2.0')
         cal.add('calscale', 'GREGORIAN')
         cal.add('method', 'PUBLISH')
+        if name:
+            cal.add('x-wr-calname', name)
+        return cal
+
+    @staticmethod
+    def build_vevent(event):
+        """
+        Build the VEVENT component for an Event.
+
+        DTSTAMP is the event's last modification rather than the current
+        time, so the same event version always serializes to the same bytes.
+        """
+        if ICalEvent is None:
+            raise ImportError("icalendar library is required for calendar export.")
 
         vevent = ICalEvent()
         vevent.add('uid', f'{event.pk}@egliseconnect')
@@ -42,45 +69,40 @@ class CalendarService:
             location_parts.append(event.location_address)
         if location_parts:
             vevent.add('location', ', '.join(location_parts))
-        vevent.add('dtstamp', timezone.now())
+        vevent.add('dtstamp', event.updated_at or timezone.now())
         if event.updated_at:
             vevent.add('last-modified', event.updated_at)
+        return vevent
+
+    @classmethod
+    def generate_ical_event(cls, event):
+        """Generate an iCal VEVENT component for a single Event instance."""
+        if ICalEvent is None:
+            raise ImportError("icalendar library is required for calendar export.")
 
-        cal.add_component(vevent)
+        cal = cls._calendar()
+        cal.add_component(cls.build_vevent(event))
         return cal.to_ical()
 
-    @staticmethod
-    def generate_ical_feed(events):
+    @classmethod
+    def generate_ical_feed(cls, events, name='EgliseConnect'):
         """Generate a full iCal feed for multiple events."""
         if Calendar is None:
             raise ImportError("icalendar library is required for calendar export.")
 
-        cal = Calendar()
-        cal.add('prodid', '-//EgliseConnect//FR')
-        cal.add('version', '2.0')
-        cal.add('calscale', 'GREGORIAN')
-        cal.add('method', 'PUBLISH')
-        cal.add('x-wr-calname', 'EgliseConnect')
-
-        for event in events:
-            vevent = ICalEvent()
-            vevent.add('uid', f'{event.pk}@egliseconnect')
-            vevent.add('dtstart', event.start_datetime)
-            vevent.add('dtend', event.end_datetime)
-            vevent.add('summary', event.title)
-            if event.description:
-                vevent.add('description', event.description)
-            location_parts = []
-            if event.location:
-                location_parts.append(event.location)
-            if event.location_address:
-                location_parts.append(event.location_address)
-            if location_parts:
-                vevent.add('location', ', '.join(location_parts))
-            vevent.add('dtstamp', timezone.now())
-            cal.add_component(vevent)
+        return cls.assemble_feed(
+            [cls.build_vevent(event).to_ical() for event in events], name,
+        )
 
-        return cal.to_ical()
+    @classmethod
+    def assemble_feed(cls, vevents, name='EgliseConnect'):
+        """Wrap already-serialized VEVENTs (bytes) in a VCALENDAR."""
+        if Calendar is None:
+            raise ImportError("icalendar library is required for calendar export.")
+
+        header = cls._calendar(name).to_ical()
+        footer = b'END:VCALENDAR\r\n'
+        return header[:-len(footer)] + b''.join(vevents) + footer
 
     @staticmethod
     def google_calendar_url(event):
@@ -142,3 +164,189 @@ class CalendarService:
 
         query = '&'.join(f'{k}={quote(str(v))}' for k, v in params.items())
         return f'https://outlook.live.com/calendar/0/deeplink/compose?{query}'
+
+
+class CalendarFeedService:
+    """
+    Subscription feed assembled from per-event cached VEVENTs.
+
+    Each event's serialized VEVENT is cached under its pk and
+    ``updated_at``, so an edit simply makes the old entry unreachable and
+    only new or changed events are serialized on a poll. The feed covers
+    ``ICAL_FEED_PAST_DAYS`` before today to ``ICAL_FEED_FUTURE_DAYS``
+    after, optionally for one campus and/or event type.
+
+    ``etag`` reads only (pk, updated_at) pairs, so a client whose ETag
+    still matches can be answered with a 304 before any VEVENT is looked
+    at. No Last-Modified is offered: cancelling, unpublishing, deleting or
+    moving an event out of the window drops it from the feed without
+    leaving a newer timestamp behind.
+    """
+
+    CACHE_PREFIX = 'events:ical'
+
+    def __init__(self, campus='', event_type=''):
+        self.campus = campus
+        self.event_type = event_type
+        today = timezone.localdate()
+        past = getattr(settings, 'ICAL_FEED_PAST_DAYS', 30)
+        future = getattr(settings, 'ICAL_FEED_FUTURE_DAYS', 365)
+        self.start = timezone.make_aware(datetime.combine(today - timedelta(days=past), time.min))
+        self.end = timezone.make_aware(datetime.combine(today + timedelta(days=future + 1), time.min))
+        self._versions = None
+
+    @staticmethod
+    def _timeout():
+        return getattr(settings, 'ICAL_FEED_CACHE_TIMEOUT', 604800)
+
+    @property
+    def name(self):
+        return ' - '.join(part for part in ('EgliseConnect', self.campus) if part)
+
+    def events(self):
+        from .models import Event
+
+        events = Event.objects.filter(
+            is_published=True,
+            is_cancelled=False,
+            end_datetime__gte=self.start,
+            start_datetime__lt=self.end,
+        )
+        if self.campus:
+            events = events.filter(campus=self.campus)
+        if self.event_type:
+            events = events.filter(event_type=self.event_type)
+        return events.order_by('start_datetime', 'pk')
+
+    def versions(self):
+        """(pk, updated_at) of every event in the feed, in feed order."""
+        if self._versions is None:
+            self._versions = list(self.events().values_list('pk', 'updated_at'))
+        return self._versions
+
+    def etag(self):
+        """Strong ETag for the current feed contents."""
+        digest = hashlib.md5(usedforsecurity=False)
+        digest.update(f'{self.start:%Y%m%d}|{self.end:%Y%m%d}|{self.campus}|{self.event_type}'.encode())
+        for pk, updated_at in self.versions():
+            digest.update(f'|{pk}:{updated_at.timestamp()}'.encode())
+        return f'"{digest.hexdigest()}"'
+
+    def _key(self, pk, updated_at):
+        return f'{self.CACHE_PREFIX}:{pk}:{updated_at.timestamp()}'
+
+    def render(self):
+        """The feed as bytes; only events missing from the cache are serialized."""
+        from .models import Event
+
+        keys = {pk: self._key(pk, updated_at) for pk, updated_at in self.versions()}
+        pieces = cache.get_many(list(keys.values()))
+        missing = [pk for pk, key in keys.items() if key not in pieces]
+        if missing:
+            fresh = {}
+            for event in Event.objects.filter(pk__in=missing):
+                piece = CalendarService.build_vevent(event).to_ical()
+                # Cache under the loaded version, which may be newer than the etag's
+                fresh[self._key(event.pk, event.updated_at)] = piece
+                pieces[keys[event.pk]] = piece
+            cache.set_many(fresh, self._timeout())
+        return CalendarService.assemble_feed(
+            [pieces[key] for key in keys.values() if key in pieces], self.name,
+        )
+
+
+class CalendarRangeService:
+    """
+    Compact event payloads for a bounded calendar window (FullCalendar).
+
+    Stored events are read with values() only, and recurring parents are
+    expanded on the fly, so occurrences beyond the materialized instances
+    (see RecurrenceService.extend_series) still show. Each window's
+    payload is cached under the events table's latest ``updated_at`` and
+    row count, read from the database on every request, so a change made
+    by any process (a web worker, a Celery task, a bulk_create) orphans
+    every cached window at once.
+    """
+
+    CACHE_PREFIX = 'events:calendar'
+    FIELDS = ('pk', 'title', 'start_datetime', 'end_datetime', 'event_type', 'parent_event_id')
+
+    @staticmethod
+    def max_window_days():
+        return getattr(settings, 'CALENDAR_MAX_WINDOW_DAYS', 92)
+
+    @staticmethod
+    def _version():
+        """Latest updated_at and row count of all events, as a cache key part."""
+        from .models import Event
+
+        # Every row counts: edits anywhere, cancellations and parents outside
+        # the window all change it; the count catches hard deletes
+        state = Event.all_objects.aggregate(last=Max('updated_at'), count=Count('pk'))
+        last = state['last'].timestamp() if state['last'] else 0
+        return f'{last}:{state["count"]}'
+
+    @staticmethod
+    def _entry(pk, title, start, end, event_type):
+        return {
+            'id': str(pk),
+            'title': title,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'color': EVENT_TYPE_COLORS.get(event_type, EVENT_TYPE_COLORS[EventType.OTHER]),
+        }
+
+    @classmethod
+    def events(cls, start, end):
+        """Published, non-cancelled events overlapping [start, end), by start time."""
+        key = f'{cls.CACHE_PREFIX}:{cls._version()}:{start.isoformat()}:{end.isoformat()}'
+        payload = cache.get(key)
+        if payload is None:
+            payload = cls._build(start, end)
+            cache.set(key, payload, getattr(settings, 'CALENDAR_CACHE_TIMEOUT', 3600))
+        return payload
+
+    @classmethod
+    def _build(cls, start, end):
+        from .models import Event
+        from .services_recurrence import RecurrenceService
+
+        rows = Event.objects.filter(
+            is_published=True, start_datetime__lt=end, end_datetime__gt=start,
+        ).values_list(*cls.FIELDS, 'is_cancelled')
+        entries = []
+        materialized = set()
+        for pk, title, row_start, row_end, event_type, parent_id, is_cancelled in rows:
+            if parent_id:
+                # Skipped (cancelled) instances must not come back as virtual ones
+                materialized.add((parent_id, row_start))
+            if not is_cancelled:
+                entries.append(cls._entry(pk, title, row_start, row_end, event_type))
+
+        parents = Event.objects.filter(
+            is_published=True,
+            is_cancelled=False,
+            is_recurring=True,
+            parent_event__isnull=True,
+            start_datetime__lt=end,
+        ).exclude(
+            recurrence_frequency='', recurrence_rule='',
+        ).exclude(
+            recurrence_end_date__lt=timezone.localdate(start),
+        ).only(
+            'pk', 'title', 'start_datetime', 'end_datetime', 'event_type',
+            'recurrence_frequency', 'recurrence_rule', 'recurrence_end_date',
+        )
+        for parent in parents:
+            duration = parent.end_datetime - parent.start_datetime
+            for occurrence in RecurrenceService.occurrences(parent, until=timezone.localdate(end)):
+                if occurrence >= end:
+                    break
+                if occurrence + duration <= start or (parent.pk, occurrence) in materialized:
+                    continue
+                entries.append(cls._entry(
+                    parent.pk, parent.title, occurrence, occurrence + duration, parent.event_type,
+                ))
+
+        entries.sort(key=lambda entry: entry['start'])
+        return entries
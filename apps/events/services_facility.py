@@ -1,10 +1,156 @@
 """Facility / room booking service — availability checks and conflict detection."""
-from django.db.models import Q
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import F, Func, Q, Value
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.constants import BookingStatus
 from .models import Room, RoomBooking
 
+ACTIVE_STATUSES = [BookingStatus.PENDING, BookingStatus.CONFIRMED]
+
+
+def overlapping(bookings, start_datetime, end_datetime):
+    """
+    Narrow ``bookings`` to those overlapping [start, end).
+
+    On PostgreSQL the test is written as a tstzrange overlap so it can use
+    the GiST index on active bookings (migration 0004).
+    """
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.fields import DateTimeRangeField
+
+        return bookings.annotate(
+            span=Func(
+                F('start_datetime'), F('end_datetime'), Value('[)'),
+                function='TSTZRANGE', output_field=DateTimeRangeField(),
+            ),
+        ).filter(span__overlap=(start_datetime, end_datetime))
+    # Overlap: existing.start < new.end AND existing.end > new.start
+    return bookings.filter(Q(start_datetime__lt=end_datetime) & Q(end_datetime__gt=start_datetime))
+
+
+class RoomAvailability:
+    """
+    In-memory availability index for a set of rooms over a time window.
+
+    The window's active bookings are loaded with one query. Each room gets
+    its bookings sorted by start, with a running maximum of end times, so
+    an overlap lookup is a bisect plus a backward scan over the matches
+    only. Free-slot searches, conflict matrices and recurring-booking
+    checks then run without further queries.
+
+    Intervals are half-open [start, end), as in detect_conflicts. Asking
+    about time outside the window raises ValueError, since bookings there
+    were not loaded.
+    """
+
+    def __init__(self, rooms, start_datetime, end_datetime, exclude_booking_ids=()):
+        self.rooms = list(rooms)
+        self.start = start_datetime
+        self.end = end_datetime
+        bookings = overlapping(
+            RoomBooking.objects.filter(
+                room_id__in=[room.pk for room in self.rooms],
+                status__in=ACTIVE_STATUSES,
+            ),
+            start_datetime, end_datetime,
+        ).exclude(pk__in=list(exclude_booking_ids)).order_by('start_datetime', 'end_datetime')
+
+        self._bookings = {room.pk: [] for room in self.rooms}
+        for booking in bookings:
+            self._bookings[booking.room_id].append(booking)
+        self._starts = {}
+        self._max_ends = {}
+        for room_id, room_bookings in self._bookings.items():
+            self._starts[room_id] = [b.start_datetime for b in room_bookings]
+            max_ends, latest = [], None
+            for booking in room_bookings:
+                latest = booking.end_datetime if latest is None else max(latest, booking.end_datetime)
+                max_ends.append(latest)
+            self._max_ends[room_id] = max_ends
+
+    def _check_window(self, start_datetime, end_datetime):
+        if start_datetime < self.start or end_datetime > self.end:
+            raise ValueError('Interval outside the loaded availability window.')
+
+    def conflicts(self, room, start_datetime, end_datetime):
+        """Bookings of ``room`` overlapping [start, end), by start time."""
+        self._check_window(start_datetime, end_datetime)
+        room_id = getattr(room, 'pk', room)
+        bookings = self._bookings[room_id]
+        max_ends = self._max_ends[room_id]
+        # Bookings from index ``i`` on start at or after end_datetime
+        i = bisect_left(self._starts[room_id], end_datetime)
+        found = []
+        while i > 0 and max_ends[i - 1] > start_datetime:
+            i -= 1
+            if bookings[i].end_datetime > start_datetime:
+                found.append(bookings[i])
+        found.reverse()
+        return found
+
+    def is_free(self, room, start_datetime, end_datetime):
+        return not self.conflicts(room, start_datetime, end_datetime)
+
+    def free_rooms(self, start_datetime, end_datetime):
+        """Rooms with no booking overlapping [start, end)."""
+        return [room for room in self.rooms if self.is_free(room, start_datetime, end_datetime)]
+
+    def busy(self, room):
+        """Merged (start, end) busy intervals of ``room``, clipped to the window."""
+        merged = []
+        for booking in self._bookings[getattr(room, 'pk', room)]:
+            start = max(booking.start_datetime, self.start)
+            end = min(booking.end_datetime, self.end)
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def free_slots(self, room, duration=None):
+        """Free (start, end) gaps of ``room`` in the window, at least ``duration`` long."""
+        slots = []
+        cursor = self.start
+        for start, end in self.busy(room) + [(self.end, self.end)]:
+            if start > cursor and (duration is None or start - cursor >= duration):
+                slots.append((cursor, start))
+            cursor = max(cursor, end)
+        return slots
+
+    def next_free_slot(self, duration, after=None):
+        """Earliest (room, start) with ``duration`` free from ``after`` on, or None."""
+        after = after or self.start
+        best = None
+        for room in self.rooms:
+            for start, end in self.free_slots(room, duration):
+                start = max(start, after)
+                if end - start >= duration:
+                    if best is None or start < best[1]:
+                        best = (room, start)
+                    break
+        return best
+
+    def conflict_matrix(self, intervals):
+        """{room pk: [conflicting bookings for each (start, end) in ``intervals``]}."""
+        intervals = list(intervals)
+        return {
+            room.pk: [self.conflicts(room, start, end) for start, end in intervals]
+            for room in self.rooms
+        }
+
+    def recurring_conflicts(self, room, starts, duration):
+        """{occurrence start: conflicting bookings} for the occurrences of ``room`` that clash."""
+        clashes = {}
+        for start in starts:
+            found = self.conflicts(room, start, start + duration)
+            if found:
+                clashes[start] = found
+        return clashes
+
 
 class FacilityService:
     """Business logic for room availability and booking."""
@@ -20,12 +166,9 @@ class FacilityService:
     @staticmethod
     def detect_conflicts(room, start_datetime, end_datetime, exclude_booking_id=None):
         """Return queryset of overlapping confirmed/pending bookings."""
-        qs = RoomBooking.objects.filter(
-            room=room,
-            status__in=[BookingStatus.PENDING, BookingStatus.CONFIRMED],
-        ).filter(
-            # Overlap: existing.start < new.end AND existing.end > new.start
-            Q(start_datetime__lt=end_datetime) & Q(end_datetime__gt=start_datetime),
+        qs = overlapping(
+            RoomBooking.objects.filter(room=room, status__in=ACTIVE_STATUSES),
+            start_datetime, end_datetime,
         )
         if exclude_booking_id:
             qs = qs.exclude(pk=exclude_booking_id)
@@ -93,3 +236,32 @@ class FacilityService:
         if end_date:
             qs = qs.filter(end_datetime__date__lte=end_date)
         return qs
+
+    @staticmethod
+    def availability(start_datetime, end_datetime, rooms=None, exclude_booking_ids=()):
+        """RoomAvailability for ``rooms`` (default: every active room) over the window."""
+        if rooms is None:
+            rooms = Room.objects.all()
+        return RoomAvailability(rooms, start_datetime, end_datetime, exclude_booking_ids)
+
+    @staticmethod
+    def find_free_rooms(start_datetime, end_datetime, rooms=None):
+        """Rooms free for the whole of [start, end), in two queries."""
+        return FacilityService.availability(start_datetime, end_datetime, rooms).free_rooms(
+            start_datetime, end_datetime,
+        )
+
+    @staticmethod
+    def find_next_free_slot(duration, after, rooms=None, search_days=14):
+        """Earliest (room, start) with ``duration`` free in the next ``search_days``, or None."""
+        index = FacilityService.availability(after, after + timedelta(days=search_days), rooms)
+        return index.next_free_slot(duration)
+
+    @staticmethod
+    def check_recurring_availability(room, starts, duration):
+        """{occurrence start: conflicting bookings} for a series of bookings of ``room``."""
+        starts = sorted(starts)
+        if not starts:
+            return {}
+        index = RoomAvailability([room], starts[0], starts[-1] + duration)
+        return index.recurring_conflicts(room, starts, duration)
@@ -1,127 +1,187 @@
 """Recurrence service — generate recurring event instances and handle exceptions."""
 from datetime import timedelta
+from functools import partial
+from itertools import islice
 
-from dateutil.relativedelta import relativedelta
+from dateutil import rrule
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from apps.core.constants import RecurrenceFrequency
+from apps.core.search_index import SearchIndex
 from .models import Event
 
 
 class RecurrenceService:
     """Generate and manage recurring event instances."""
 
-    FREQUENCY_DELTAS = {
-        RecurrenceFrequency.DAILY: timedelta(days=1),
-        RecurrenceFrequency.WEEKLY: timedelta(weeks=1),
-        RecurrenceFrequency.BIWEEKLY: timedelta(weeks=2),
-        RecurrenceFrequency.MONTHLY: None,  # use relativedelta
-        RecurrenceFrequency.YEARLY: None,   # use relativedelta
+    RRULE_FREQUENCIES = {
+        RecurrenceFrequency.DAILY: (rrule.DAILY, 1),
+        RecurrenceFrequency.WEEKLY: (rrule.WEEKLY, 1),
+        RecurrenceFrequency.BIWEEKLY: (rrule.WEEKLY, 2),
+        RecurrenceFrequency.MONTHLY: (rrule.MONTHLY, 1),
+        RecurrenceFrequency.YEARLY: (rrule.YEARLY, 1),
     }
 
+    # Copied from the parent to each generated instance
+    INHERITED_FIELDS = (
+        'title', 'description', 'event_type', 'all_day', 'location',
+        'location_address', 'is_online', 'online_link', 'organizer',
+        'max_attendees', 'requires_rsvp', 'is_published', 'virtual_url',
+        'virtual_platform', 'is_hybrid', 'campus', 'kiosk_mode_enabled',
+    )
+
+    MAX_INSTANCES = 365  # safety limit per call
+
     @staticmethod
-    def generate_instances(parent_event, count=None):
+    def horizon_days():
+        return getattr(settings, 'EVENT_RECURRENCE_HORIZON_DAYS', 90)
+
+    @classmethod
+    def occurrences(cls, parent_event, until=None, after=None):
+        """
+        Start datetimes of the series after the parent's own, lazily.
+
+        ``recurrence_rule`` (an iCal RRULE, with optional EXDATE/RDATE
+        lines) overrides ``recurrence_frequency``. Occurrences are computed
+        in local wall time, so a 9:00 series stays at 9:00 across DST
+        changes. With ``after`` (a datetime), the rule is entered just
+        after that moment instead of being walked from the series start.
+        Stops after ``until`` (a date) and recurrence_end_date.
+        """
+        tz = timezone.get_current_timezone()
+        start = timezone.localtime(parent_event.start_datetime, tz)
+        # rrule works to the second; the parent's microseconds are put back below
+        dtstart = start.replace(tzinfo=None, microsecond=0)
+
+        if parent_event.recurrence_rule:
+            rule = rrule.rrulestr(parent_event.recurrence_rule, dtstart=dtstart, forceset=True)
+        elif parent_event.recurrence_frequency in cls.RRULE_FREQUENCIES:
+            freq, interval = cls.RRULE_FREQUENCIES[parent_event.recurrence_frequency]
+            rule = rrule.rrule(freq, interval=interval, dtstart=dtstart)
+        else:
+            return
+
+        ends = [d for d in (parent_event.recurrence_end_date, until) if d]
+        last_day = min(ends) if ends else None
+        after = after and timezone.localtime(after, tz).replace(tzinfo=None, microsecond=0)
+        pending = rule.xafter(after) if after and after > dtstart else iter(rule)
+        for occurrence in pending:
+            if last_day and occurrence.date() > last_day:
+                return
+            if occurrence > dtstart:
+                yield timezone.make_aware(occurrence.replace(microsecond=start.microsecond), tz)
+
+    @classmethod
+    def generate_instances(cls, parent_event, count=None, until=None):
         """
         Generate recurring event instances from a parent event.
         Returns list of created Event instances.
 
         If count is None, generates until recurrence_end_date.
         If neither count nor recurrence_end_date is set, generates 12 instances.
+        With ``until`` (a date), the series is materialized up to that day
+        only (see extend_series).
+
+        Occurrences are computed in memory, existing instances are read
+        with one query, and the missing Events and their
+        AttendanceSessions are written with one bulk_create each; the
+        instances are indexed for search with one upsert on commit.
         """
-        if not parent_event.is_recurring or not parent_event.recurrence_frequency:
+        if not parent_event.is_recurring or not (
+            parent_event.recurrence_frequency or parent_event.recurrence_rule
+        ):
             return []
 
-        freq = parent_event.recurrence_frequency
-        end_date = parent_event.recurrence_end_date
-        max_count = count or (52 if not end_date else 365)  # safety limit
+        if count is None and until is None and not parent_event.recurrence_end_date:
+            count = 12
+        existing = set(
+            Event.all_objects.filter(parent_event=parent_event)
+            .values_list('start_datetime', flat=True)
+        )
+        if count is not None:
+            # The first ``count`` occurrences of the series, existing ones included
+            starts = islice(cls.occurrences(parent_event, until), min(count, cls.MAX_INSTANCES))
+            starts = [start for start in starts if start not in existing]
+        else:
+            # Pick up after the latest instance (and, when rolling, after now)
+            # so the cap only ever counts new occurrences
+            after = max(existing, default=None)
+            if until is not None:
+                after = max(filter(None, (after, timezone.now())))
+            starts = (
+                start for start in cls.occurrences(parent_event, until, after=after)
+                if start not in existing
+            )
+            starts = list(islice(starts, cls.MAX_INSTANCES))
+        if not starts:
+            return []
 
-        # Calculate event duration
         duration = parent_event.end_datetime - parent_event.start_datetime
-
-        instances = []
-        current_start = parent_event.start_datetime
-        generated = 0
-
-        while generated < max_count:
-            # Advance to next occurrence
-            current_start = RecurrenceService._next_occurrence(current_start, freq)
-            current_end = current_start + duration
-
-            # Check end_date
-            if end_date and current_start.date() > end_date:
-                break
-
-            # Check count limit (default 12 if no end date)
-            if not end_date and count is None and generated >= 12:
-                break
-
-            # Check if this instance already exists (by start_datetime)
-            if Event.all_objects.filter(
-                parent_event=parent_event,
-                start_datetime=current_start,
-            ).exists():
-                generated += 1
-                continue
-
-            instance = Event.objects.create(
-                title=parent_event.title,
-                description=parent_event.description,
-                event_type=parent_event.event_type,
-                start_datetime=current_start,
-                end_datetime=current_end,
-                all_day=parent_event.all_day,
-                location=parent_event.location,
-                location_address=parent_event.location_address,
-                is_online=parent_event.is_online,
-                online_link=parent_event.online_link,
-                organizer=parent_event.organizer,
-                max_attendees=parent_event.max_attendees,
-                requires_rsvp=parent_event.requires_rsvp,
-                is_published=parent_event.is_published,
+        inherited = {field: getattr(parent_event, field) for field in cls.INHERITED_FIELDS}
+        instances = [
+            Event(
+                **inherited,
+                start_datetime=start,
+                end_datetime=start + duration,
                 is_recurring=False,
                 parent_event=parent_event,
-                virtual_url=parent_event.virtual_url,
-                virtual_platform=parent_event.virtual_platform,
-                is_hybrid=parent_event.is_hybrid,
-                campus=parent_event.campus,
-                kiosk_mode_enabled=parent_event.kiosk_mode_enabled,
-            )
-            # Auto-create attendance session for child event
-            from apps.attendance.models import AttendanceSession
-            from apps.core.constants import AttendanceSessionType, EventType
-            session_type_map = {
-                EventType.WORSHIP: AttendanceSessionType.WORSHIP,
-                EventType.TRAINING: AttendanceSessionType.LESSON,
-            }
-            AttendanceSession.objects.create(
-                name=instance.title,
-                session_type=session_type_map.get(instance.event_type, AttendanceSessionType.EVENT),
-                date=current_start.date(),
-                start_time=current_start.time(),
-                end_time=current_end.time() if current_end else None,
-                event=instance,
-                opened_by=parent_event.organizer,
             )
-            instances.append(instance)
-            generated += 1
-
+            for start in starts
+        ]
+
+        # Auto-create attendance session for each child event
+        from apps.attendance.models import AttendanceSession
+        from apps.core.constants import AttendanceSessionType, EventType
+        session_type_map = {
+            EventType.WORSHIP: AttendanceSessionType.WORSHIP,
+            EventType.TRAINING: AttendanceSessionType.LESSON,
+        }
+        with transaction.atomic():
+            Event.objects.bulk_create(instances)
+            AttendanceSession.objects.bulk_create([
+                AttendanceSession(
+                    name=instance.title,
+                    session_type=session_type_map.get(instance.event_type, AttendanceSessionType.EVENT),
+                    date=timezone.localdate(instance.start_datetime),
+                    start_time=timezone.localtime(instance.start_datetime).time(),
+                    end_time=timezone.localtime(instance.end_datetime).time(),
+                    event=instance,
+                    opened_by=parent_event.organizer,
+                )
+                for instance in instances
+            ])
+            # bulk_create sends no post_save, so index the new instances here
+            transaction.on_commit(partial(SearchIndex.index_many, instances))
         return instances
 
-    @staticmethod
-    def _next_occurrence(current_dt, frequency):
-        """Calculate the next occurrence datetime."""
-        if frequency == RecurrenceFrequency.DAILY:
-            return current_dt + timedelta(days=1)
-        elif frequency == RecurrenceFrequency.WEEKLY:
-            return current_dt + timedelta(weeks=1)
-        elif frequency == RecurrenceFrequency.BIWEEKLY:
-            return current_dt + timedelta(weeks=2)
-        elif frequency == RecurrenceFrequency.MONTHLY:
-            return current_dt + relativedelta(months=1)
-        elif frequency == RecurrenceFrequency.YEARLY:
-            return current_dt + relativedelta(years=1)
-        else:
-            return current_dt + timedelta(weeks=1)
+    @classmethod
+    def extend_series(cls, parent_event, horizon_days=None):
+        """
+        Materialize a series up to ``horizon_days`` (EVENT_RECURRENCE_HORIZON_DAYS) from today.
+
+        Rolling-horizon mode: instead of creating a year of instances up
+        front, the extend_recurring_events beat task calls this daily so
+        each series always reaches the same distance ahead.
+        """
+        if horizon_days is None:
+            horizon_days = cls.horizon_days()
+        until = timezone.localdate() + timedelta(days=horizon_days)
+        return cls.generate_instances(parent_event, until=until)
+
+    @classmethod
+    def extend_all(cls, horizon_days=None):
+        """Extend every ongoing recurring series. Returns the number of instances created."""
+        parents = Event.objects.filter(
+            is_recurring=True, parent_event__isnull=True, is_cancelled=False,
+        ).exclude(
+            recurrence_frequency='', recurrence_rule='',
+        ).filter(
+            Q(recurrence_end_date__isnull=True) | Q(recurrence_end_date__gte=timezone.localdate()),
+        )
+        return sum(len(cls.extend_series(parent, horizon_days)) for parent in parents)
 
     @staticmethod
     def handle_exception(instance, skip=False, **overrides):
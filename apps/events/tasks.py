@@ -104,3 +104,13 @@ def send_waitlist_promotion_notification(waitlist_entry_id):
         link=f'/events/{entry.event.pk}/',
     )
     logger.info(f'Waitlist promotion notification sent to {entry.member.full_name}')
+
+
+@shared_task
+def extend_recurring_events():
+    """Run daily: materialize recurring series up to the rolling horizon."""
+    from .services_recurrence import RecurrenceService
+
+    created = RecurrenceService.extend_all()
+    logger.info(f'{created} recurring event instances created.')
+    return created
@@ -3,7 +3,11 @@ import pytest
 from datetime import timedelta
 from django.utils import timezone
 
-from apps.events.services_calendar import CalendarService
+from apps.core.constants import EventType, RecurrenceFrequency
+from apps.events.services_calendar import (
+    CalendarFeedService, CalendarRangeService, CalendarService,
+)
+from apps.events.services_recurrence import RecurrenceService
 from apps.events.tests.factories import EventFactory
 
 
@@ -56,6 +60,113 @@ class TestGenerateICalFeed:
         assert b'BEGIN:VEVENT' not in ical
 
 
+    def test_output_is_byte_stable(self):
+        EventFactory.create_batch(2)
+        from apps.events.models import Event
+
+        first = CalendarService.generate_ical_feed(Event.objects.order_by('pk'))
+        assert CalendarService.generate_ical_feed(Event.objects.order_by('pk')) == first
+
+
+class TestCalendarFeedService:
+    def test_window_campus_and_type_filters(self):
+        included = EventFactory(campus='Nord', event_type=EventType.GROUP)
+        EventFactory(campus='Sud', event_type=EventType.GROUP)
+        EventFactory(campus='Nord', event_type=EventType.MEAL)
+        EventFactory(
+            campus='Nord', event_type=EventType.GROUP,
+            start_datetime=timezone.now() - timedelta(days=400),
+            end_datetime=timezone.now() - timedelta(days=400, hours=-2),
+        )
+
+        feed = CalendarFeedService(campus='Nord', event_type=EventType.GROUP)
+
+        assert [pk for pk, _ in feed.versions()] == [included.pk]
+        assert feed.render().count(b'BEGIN:VEVENT') == 1
+
+    def test_unchanged_events_are_served_from_cache(self, django_assert_num_queries):
+        EventFactory.create_batch(3)
+        CalendarFeedService().render()
+
+        with django_assert_num_queries(1):
+            ical = CalendarFeedService().render()
+
+        assert ical.count(b'BEGIN:VEVENT') == 3
+
+    def test_edit_changes_etag_and_content(self):
+        event = EventFactory(title='Avant')
+        feed = CalendarFeedService()
+        etag = feed.etag()
+        feed.render()
+
+        event.title = 'Apres'
+        event.save()
+        feed = CalendarFeedService()
+
+        assert feed.etag() != etag
+        assert b'Apres' in feed.render()
+
+
+
+class TestCalendarRangeService:
+    def _window(self, days=21):
+        start = timezone.now()
+        return start, start + timedelta(days=days)
+
+    def _weekly(self, **kwargs):
+        start = timezone.now() + timedelta(hours=1)
+        return EventFactory(
+            is_recurring=True,
+            recurrence_frequency=RecurrenceFrequency.WEEKLY,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=2),
+            **kwargs,
+        )
+
+    def test_expands_recurring_parents_without_children(self):
+        parent = self._weekly()
+
+        entries = CalendarRangeService.events(*self._window())
+
+        assert [entry['id'] for entry in entries] == [str(parent.pk)] * 3
+
+    def test_materialized_and_skipped_instances_are_not_duplicated(self):
+        parent = self._weekly()
+        first, second = RecurrenceService.generate_instances(parent, count=2)
+        RecurrenceService.handle_exception(second, skip=True)
+
+        entries = CalendarRangeService.events(*self._window())
+
+        assert [entry['id'] for entry in entries] == [str(parent.pk), str(first.pk)]
+
+    def test_windows_are_cached_until_an_event_changes(self, django_assert_num_queries):
+        event = EventFactory(title='Avant')
+        window = self._window()
+        CalendarRangeService.events(*window)
+
+        # Only the events table's version is read
+        with django_assert_num_queries(1):
+            CalendarRangeService.events(*window)
+
+        event.title = 'Apres'
+        event.save()
+        assert CalendarRangeService.events(*window)[0]['title'] == 'Apres'
+
+    def test_changes_without_signals_invalidate_windows(self):
+        """Writes from other processes or bulk operations are seen by every worker."""
+        from apps.events.models import Event
+
+        event = EventFactory(title='Avant')
+        window = self._window()
+        CalendarRangeService.events(*window)
+
+        Event.objects.filter(pk=event.pk).update(title='Apres', updated_at=timezone.now())
+        assert CalendarRangeService.events(*window)[0]['title'] == 'Apres'
+
+        Event.objects.filter(pk=event.pk).delete()
+        assert CalendarRangeService.events(*window) == []
+
+
 class TestGoogleCalendarUrl:
     def test_returns_valid_url(self):
         event = EventFactory(title='Test Event')
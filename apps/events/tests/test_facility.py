@@ -171,6 +171,78 @@ class TestFacilityServiceGetRoomBookings:
         assert bookings.count() == 1
 
 
+class TestRoomAvailability:
+    def _base(self):
+        return (timezone.now() + timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)
+
+    def _book(self, room, start, hours, status=BookingStatus.CONFIRMED):
+        return RoomBookingFactory(
+            room=room, start_datetime=start, end_datetime=start + timedelta(hours=hours), status=status,
+        )
+
+    def test_free_rooms_loads_window_once(self, django_assert_num_queries):
+        base = self._base()
+        busy, free, freed = RoomFactory(), RoomFactory(), RoomFactory()
+        self._book(busy, base + timedelta(hours=1), 2)
+        self._book(freed, base + timedelta(hours=1), 2, status=BookingStatus.CANCELLED)
+
+        with django_assert_num_queries(2):
+            rooms = FacilityService.find_free_rooms(base, base + timedelta(hours=4))
+
+        assert set(rooms) == {free, freed}
+
+    def test_conflicts_handle_nested_and_touching_bookings(self):
+        base = self._base()
+        room = RoomFactory()
+        long = self._book(room, base, 6)
+        self._book(room, base + timedelta(hours=1), 1)
+        self._book(room, base + timedelta(hours=7), 1)
+        index = FacilityService.availability(base, base + timedelta(hours=10), rooms=[room])
+
+        # A slot starting where the last booking ends does not conflict
+        assert index.conflicts(room, base + timedelta(hours=8), base + timedelta(hours=9)) == []
+        assert index.conflicts(room, base + timedelta(hours=5), base + timedelta(hours=7)) == [long]
+
+    def test_free_slots_and_next_free_slot(self):
+        base = self._base()
+        first, second = RoomFactory(), RoomFactory()
+        self._book(first, base, 3)
+        self._book(second, base, 1)
+        self._book(second, base + timedelta(hours=2), 3)
+        index = FacilityService.availability(base, base + timedelta(hours=8), rooms=[first, second])
+
+        assert index.free_slots(second, timedelta(hours=1)) == [
+            (base + timedelta(hours=1), base + timedelta(hours=2)),
+            (base + timedelta(hours=5), base + timedelta(hours=8)),
+        ]
+        assert index.next_free_slot(timedelta(hours=2)) == (first, base + timedelta(hours=3))
+
+    def test_conflict_matrix(self):
+        base = self._base()
+        room_a, room_b = RoomFactory(), RoomFactory()
+        booking = self._book(room_a, base, 2)
+        slots = [(base, base + timedelta(hours=1)), (base + timedelta(hours=3), base + timedelta(hours=4))]
+        index = FacilityService.availability(base, base + timedelta(hours=4), rooms=[room_a, room_b])
+
+        assert index.conflict_matrix(slots) == {room_a.pk: [[booking], []], room_b.pk: [[], []]}
+
+    def test_recurring_availability(self):
+        base = self._base()
+        room = RoomFactory()
+        clash = self._book(room, base + timedelta(weeks=2), 1)
+        starts = [base + timedelta(weeks=week) for week in range(4)]
+
+        assert FacilityService.check_recurring_availability(room, starts, timedelta(hours=2)) == {
+            starts[2]: [clash],
+        }
+
+    def test_outside_window_raises(self):
+        base = self._base()
+        index = FacilityService.availability(base, base + timedelta(hours=2), rooms=[RoomFactory()])
+        with pytest.raises(ValueError):
+            index.free_rooms(base, base + timedelta(hours=3))
+
+
 # ── Room Model Tests ──
 
 class TestRoomModel:
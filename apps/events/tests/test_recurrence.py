@@ -93,6 +93,95 @@ class TestRecurrenceServiceGenerateInstances:
         assert abs(delta.days - 14) <= 1
 
 
+    def test_generates_series_in_constant_queries(self, django_assert_max_num_queries):
+        event = self._make_recurring_event(RecurrenceFrequency.DAILY)
+        # Existing starts, then one insert each for events and sessions in a savepoint
+        with django_assert_max_num_queries(5):
+            instances = RecurrenceService.generate_instances(event, count=30)
+        assert len(instances) == 30
+
+    def test_each_instance_gets_an_attendance_session(self):
+        from apps.attendance.models import AttendanceSession
+        event = self._make_recurring_event(RecurrenceFrequency.WEEKLY)
+        instances = RecurrenceService.generate_instances(event, count=3)
+        sessions = AttendanceSession.objects.filter(event__in=instances)
+        assert sessions.count() == 3
+
+    def test_generated_instances_are_searchable(self, django_capture_on_commit_callbacks):
+        from apps.core.models_extended import SearchDocument
+        event = self._make_recurring_event(RecurrenceFrequency.WEEKLY)
+        with django_capture_on_commit_callbacks(execute=True):
+            instances = RecurrenceService.generate_instances(event, count=3)
+        documents = SearchDocument.objects.filter(
+            category='events', object_id__in=[str(instance.pk) for instance in instances],
+        )
+        assert documents.count() == 3
+        assert all(document.title == event.title for document in documents)
+
+    def test_recurrence_rule_with_byday_and_exdate(self):
+        from datetime import datetime
+        tz = timezone.get_current_timezone()
+        start = timezone.make_aware(datetime(2030, 1, 6, 10, 0), tz)  # Sunday
+        event = EventFactory(
+            is_recurring=True,
+            recurrence_rule='RRULE:FREQ=WEEKLY;BYDAY=SU,WE\nEXDATE:20300109T100000',
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+        )
+        instances = RecurrenceService.generate_instances(event, count=3)
+        assert [timezone.localtime(i.start_datetime).date().isoformat() for i in instances] == [
+            '2030-01-13', '2030-01-16', '2030-01-20',
+        ]
+
+
+class TestRecurrenceServiceExtendSeries:
+    def test_materializes_only_up_to_horizon(self):
+        start = timezone.now() + timedelta(days=1)
+        event = EventFactory(
+            is_recurring=True,
+            recurrence_frequency=RecurrenceFrequency.DAILY,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+        )
+        instances = RecurrenceService.extend_series(event, horizon_days=10)
+        last_day = timezone.localdate() + timedelta(days=10)
+        assert instances
+        assert all(timezone.localdate(i.start_datetime) <= last_day for i in instances)
+
+    def test_beat_task_extends_ongoing_series_without_duplicates(self, settings):
+        from apps.events.tasks import extend_recurring_events
+        settings.EVENT_RECURRENCE_HORIZON_DAYS = 30
+        start = timezone.now() + timedelta(days=1)
+        event = EventFactory(
+            is_recurring=True,
+            recurrence_frequency=RecurrenceFrequency.WEEKLY,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+        )
+        RecurrenceService.extend_series(event, horizon_days=7)
+        before = Event.objects.filter(parent_event=event).count()
+
+        created = extend_recurring_events()
+
+        total = Event.objects.filter(parent_event=event).count()
+        assert created == total - before > 0
+        assert extend_recurring_events() == 0
+
+    def test_long_running_series_reaches_the_horizon(self):
+        start = timezone.now() - timedelta(days=400)
+        event = EventFactory(
+            is_recurring=True,
+            recurrence_frequency=RecurrenceFrequency.DAILY,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=1),
+        )
+        instances = RecurrenceService.extend_series(event, horizon_days=10)
+        days = [timezone.localdate(i.start_datetime) for i in instances]
+        assert min(days) >= timezone.localdate()
+        assert max(days) == timezone.localdate() + timedelta(days=10)
+        assert RecurrenceService.extend_series(event, horizon_days=10) == []
+
+
 class TestRecurrenceServiceHandleException:
     def test_skip_cancels_instance(self):
         parent = EventFactory(is_recurring=True, recurrence_frequency=RecurrenceFrequency.WEEKLY)
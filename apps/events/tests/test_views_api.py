@@ -298,40 +298,42 @@ class TestEventUpcoming:
 
 class TestEventCalendar:
 
+    def _window(self, days_before=1, days_after=10):
+        now = timezone.now()
+        return {
+            'start': (now - timedelta(days=days_before)).isoformat(),
+            'end': (now + timedelta(days=days_after)).isoformat(),
+        }
+
     def test_calendar_returns_published_only(self, api_client, member_user):
         api_client.force_authenticate(user=member_user)
         EventFactory(is_published=True)
         EventFactory(is_published=False)
-        response = api_client.get('/api/v1/events/events/calendar/')
+        response = api_client.get('/api/v1/events/events/calendar/', self._window())
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 1
 
-    def test_calendar_with_start_param(self, api_client, member_user):
+    def test_calendar_requires_start(self, api_client, member_user):
         api_client.force_authenticate(user=member_user)
-        now = timezone.now()
-        EventFactory(start_datetime=now - timedelta(days=10), is_published=True)
-        EventFactory(start_datetime=now + timedelta(days=5), is_published=True)
-        start = (now - timedelta(days=1)).isoformat()
-        response = api_client.get('/api/v1/events/events/calendar/', {'start': start})
-        assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
+        end = (timezone.now() + timedelta(days=10)).isoformat()
+        response = api_client.get('/api/v1/events/events/calendar/', {'end': end})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    def test_calendar_with_end_param(self, api_client, member_user):
+    def test_calendar_requires_end(self, api_client, member_user):
         api_client.force_authenticate(user=member_user)
-        now = timezone.now()
-        EventFactory(start_datetime=now + timedelta(days=2), is_published=True)
-        EventFactory(start_datetime=now + timedelta(days=30), is_published=True)
-        end = (now + timedelta(days=10)).isoformat()
-        response = api_client.get('/api/v1/events/events/calendar/', {'end': end})
-        assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
+        start = (timezone.now() - timedelta(days=1)).isoformat()
+        response = api_client.get('/api/v1/events/events/calendar/', {'start': start})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     def test_calendar_with_start_and_end(self, api_client, member_user):
         api_client.force_authenticate(user=member_user)
         now = timezone.now()
-        EventFactory(start_datetime=now + timedelta(days=5), is_published=True)
-        EventFactory(start_datetime=now + timedelta(days=50), is_published=True)
-        EventFactory(start_datetime=now - timedelta(days=50), is_published=True)
+        for days in (5, 50, -50):
+            EventFactory(
+                start_datetime=now + timedelta(days=days),
+                end_datetime=now + timedelta(days=days, hours=2),
+                is_published=True,
+            )
         start = (now + timedelta(days=1)).isoformat()
         end = (now + timedelta(days=10)).isoformat()
         response = api_client.get(
@@ -340,13 +342,56 @@ class TestEventCalendar:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 1
 
+    def test_calendar_includes_events_overlapping_the_window(self, api_client, member_user):
+        api_client.force_authenticate(user=member_user)
+        now = timezone.now()
+        EventFactory(
+            start_datetime=now - timedelta(days=3),
+            end_datetime=now + timedelta(days=3),
+            is_published=True,
+        )
+        response = api_client.get('/api/v1/events/events/calendar/', {
+            'start': (now + timedelta(days=1)).isoformat(),
+            'end': (now + timedelta(days=10)).isoformat(),
+        })
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 1
+
     def test_calendar_no_params(self, api_client, member_user):
         api_client.force_authenticate(user=member_user)
         EventFactory(is_published=True)
-        EventFactory(is_published=True)
         response = api_client.get('/api/v1/events/events/calendar/')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_calendar_window_is_bounded(self, api_client, member_user, settings):
+        api_client.force_authenticate(user=member_user)
+        settings.CALENDAR_MAX_WINDOW_DAYS = 31
+        response = api_client.get(
+            '/api/v1/events/events/calendar/', self._window(days_before=0, days_after=40),
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_calendar_accepts_plain_dates(self, api_client, member_user):
+        api_client.force_authenticate(user=member_user)
+        today = timezone.localdate()
+        EventFactory(is_published=True)
+        response = api_client.get('/api/v1/events/events/calendar/', {
+            'start': today.isoformat(), 'end': (today + timedelta(days=14)).isoformat(),
+        })
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 2
+        assert len(response.data) == 1
+
+    def test_calendar_compact_payload(self, api_client, member_user):
+        api_client.force_authenticate(user=member_user)
+        event = EventFactory(is_published=True, event_type=EventType.MEAL)
+        response = api_client.get('/api/v1/events/events/calendar/', self._window())
+        assert response.data == [{
+            'id': str(event.pk),
+            'title': event.title,
+            'start': event.start_datetime.isoformat(),
+            'end': event.end_datetime.isoformat(),
+            'color': '#fd7e14',
+        }]
 
 
 class TestEventRSVP:
@@ -529,3 +529,53 @@ class TestEventKioskAttendanceRecord:
         assert event.rsvps.filter(member=member).exists()
         # AttendanceRecord should also exist
         assert AttendanceRecord.objects.filter(session=session, member=member).exists()
+
+
+class TestEventIcsFeed:
+
+    def test_feed_returns_calendar_with_etag(self, client, member_user):
+        client.force_login(member_user)
+        EventFactory(title='Culte du soir')
+
+        response = client.get('/events/feed.ics')
+
+        assert response.status_code == 200
+        assert b'Culte du soir' in response.content
+        assert response['ETag']
+        assert not response.has_header('Last-Modified')
+
+    def test_unchanged_feed_returns_304(self, client, member_user):
+        client.force_login(member_user)
+        EventFactory()
+        etag = client.get('/events/feed.ics')['ETag']
+
+        response = client.get('/events/feed.ics', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response.content == b''
+
+    def test_cancelled_event_is_dropped_for_conditional_clients(self, client, member_user):
+        client.force_login(member_user)
+        event = EventFactory(title='Annulé bientôt')
+        first = client.get('/events/feed.ics')
+        event.is_cancelled = True
+        event.save()
+
+        response = client.get(
+            '/events/feed.ics',
+            HTTP_IF_NONE_MATCH=first['ETag'],
+            HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT',
+        )
+
+        assert response.status_code == 200
+        assert 'Annulé bientôt'.encode() not in response.content
+
+    def test_campus_feed(self, client, member_user):
+        client.force_login(member_user)
+        EventFactory(title='Nord', campus='Nord')
+        EventFactory(title='Sud', campus='Sud')
+
+        response = client.get('/events/feed.ics', {'campus': 'Nord'})
+
+        assert b'SUMMARY:Nord' in response.content
+        assert b'SUMMARY:Sud' not in response.content
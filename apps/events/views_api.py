@@ -1,6 +1,9 @@
 """Events API views — events, rooms, bookings, templates, waitlist,
 volunteer needs, photos, surveys."""
+from datetime import datetime, time, timedelta
+
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -23,6 +26,23 @@ from .serializers import (
     EventVolunteerSignupSerializer, EventPhotoSerializer,
     EventSurveySerializer, SurveyResponseSerializer,
 )
+from .services_calendar import CalendarRangeService
+
+
+def _parse_bound(value):
+    """Aware datetime from an ISO date or datetime query parameter, or None."""
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = datetime.combine(day, time.min) if day else None
+    except ValueError:
+        return None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
 
 
 class EventViewSet(viewsets.ModelViewSet):
@@ -58,16 +78,28 @@ class EventViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def calendar(self, request):
-        """Return events within optional start/end date range."""
-        start = request.query_params.get('start')
-        end = request.query_params.get('end')
-        queryset = self.queryset.filter(is_published=True)
-        if start:
-            queryset = queryset.filter(start_datetime__gte=start)
-        if end:
-            queryset = queryset.filter(start_datetime__lte=end)
-        serializer = EventListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        """
+        Return compact events (id, title, start, end, color) for a window.
+
+        ``start`` and ``end`` (ISO dates or datetimes, as sent by
+        FullCalendar) are required and may span at most
+        CALENDAR_MAX_WINDOW_DAYS. Recurring series are expanded beyond
+        their materialized instances.
+        """
+        start = _parse_bound(request.query_params.get('start'))
+        end = _parse_bound(request.query_params.get('end'))
+        if start is None or end is None:
+            return Response(
+                {'error': 'Les paramètres start et end (dates ISO) sont requis.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        max_days = CalendarRangeService.max_window_days()
+        if end <= start or end - start > timedelta(days=max_days):
+            return Response(
+                {'error': f'La période doit être positive et couvrir au plus {max_days} jours.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(CalendarRangeService.events(start, end))
 
     @action(detail=True, methods=['post'])
     def rsvp(self, request, pk=None):
@@ -7,6 +7,7 @@ from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.csrf import csrf_exempt
 
@@ -24,26 +25,13 @@ from .forms import (
     EventPhotoForm, EventSurveyForm,
 )
 from .services_facility import FacilityService
-from .services_calendar import CalendarService
+from .services_calendar import EVENT_TYPE_COLORS, CalendarFeedService, CalendarService
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────────────────────
 
-# Color map for calendar event type coding
-EVENT_TYPE_COLORS = {
-    EventType.WORSHIP: "#6a5acd",    # Violet
-    EventType.GROUP: "#28a745",      # Vert
-    EventType.MEAL: "#fd7e14",       # Orange
-    EventType.SPECIAL: "#dc3545",    # Rouge
-    EventType.MEETING: "#17a2b8",    # Cyan
-    EventType.TRAINING: "#007bff",   # Bleu
-    EventType.OUTREACH: "#ffc107",   # Jaune
-    EventType.OTHER: "#6c757d",      # Gris
-}
-
-
 def _is_staff(request):
     """Check if the current user is admin or pastor."""
     if not hasattr(request.user, 'member_profile'):
@@ -278,10 +266,10 @@ def event_create(request):
                 event=event,
                 opened_by=getattr(request.user, 'member_profile', None),
             )
-            # Generate recurring instances if applicable
+            # Generate recurring instances up to the rolling horizon, if applicable
             if event.is_recurring and event.recurrence_frequency:
                 from .services_recurrence import RecurrenceService
-                RecurrenceService.generate_instances(event)
+                RecurrenceService.extend_series(event)
             messages.success(request, _('Événement créé avec succès.'))
             return redirect('/events/')
     else:
@@ -357,11 +345,23 @@ def event_ics_download(request, pk):
 
 @login_required
 def event_ics_feed(request):
-    """Full iCal feed of published events for calendar subscription."""
-    events = Event.objects.filter(is_published=True, is_cancelled=False).order_by('start_datetime')
-    ical_data = CalendarService.generate_ical_feed(events)
-    response = HttpResponse(ical_data, content_type='text/calendar; charset=utf-8')
-    response['Content-Disposition'] = 'inline; filename="egliseconnect.ics"'
+    """
+    iCal feed of published events for calendar subscription.
+
+    ``?campus=`` and ``?type=`` narrow the feed. Responses carry an ETag
+    and unchanged polls (If-None-Match) get a 304.
+    """
+    feed = CalendarFeedService(
+        campus=request.GET.get('campus', ''),
+        event_type=request.GET.get('type', ''),
+    )
+    etag = feed.etag()
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(feed.render(), content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = 'inline; filename="egliseconnect.ics"'
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
     return response
 
 
@@ -505,6 +505,8 @@ def booking_create(request):
             )
             if error:
                 messages.error(request, error)
+                if end > start:
+                    _suggest_free_rooms(request, room, start, end)
             else:
                 messages.success(request, _('Réservation créée avec succès.'))
                 return redirect('/events/bookings/')
@@ -518,6 +520,21 @@ def booking_create(request):
     return render(request, 'events/booking_form.html', context)
 
 
+def _suggest_free_rooms(request, room, start, end):
+    """After a conflict, point to rooms free for the slot and the room's next free slot."""
+    free = FacilityService.find_free_rooms(start, end)
+    if free:
+        messages.info(request, _('Salles libres sur ce créneau : %(rooms)s') % {
+            'rooms': ', '.join(r.name for r in free),
+        })
+    slot = FacilityService.find_next_free_slot(end - start, start, rooms=[room])
+    if slot:
+        messages.info(request, _('Prochain créneau libre pour %(room)s : %(start)s') % {
+            'room': room.name,
+            'start': timezone.localtime(slot[1]).strftime('%d/%m/%Y %H:%M'),
+        })
+
+
 @login_required
 def booking_action(request, pk, action):
     """Approve, reject, or cancel a booking (staff only)."""
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:59
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("members", "0007_customfield_group_lifecycle_stage_backgroundcheck_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DuplicateCandidate",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Indique si cet enregistrement est actif",
+                        verbose_name="Actif",
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="Score")),
+                ("reasons", models.JSONField(default=list, verbose_name="Raisons")),
+                (
+                    "member_a",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="members.member",
+                        verbose_name="Membre A",
+                    ),
+                ),
+                (
+                    "member_b",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="members.member",
+                        verbose_name="Membre B",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Doublon potentiel",
+                "verbose_name_plural": "Doublons potentiels",
+                "ordering": ["-score"],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:12
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("members", "0008_duplicatecandidate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DuplicateScan",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Indique si cet enregistrement est actif",
+                        verbose_name="Actif",
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Terminée le"
+                    ),
+                ),
+                (
+                    "found",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Doublons trouvés"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Recherche de doublons",
+                "verbose_name_plural": "Recherches de doublons",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
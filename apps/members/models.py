@@ -364,6 +364,10 @@ class Member(SoftDeleteModel):
     def all_roles(self):
         """Returns set of all roles including primary and additional."""
         roles = {self.role}
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('additional_roles')
+        if prefetched is not None:
+            roles.update(extra.role for extra in prefetched)
+            return roles
         try:
             roles.update(self.additional_roles.values_list('role', flat=True))
         except (AttributeError, ValueError, TypeError):
@@ -1163,6 +1167,74 @@ class MemberMergeLog(BaseModel):
         return f'Fusion vers {primary}'
 
 
+class DuplicateCandidate(BaseModel):
+    """
+    A likely duplicate pair found by the last background scan.
+
+    Rows are replaced wholesale by MemberMergeService.refresh_candidates so
+    the merge page reads stored results instead of scanning on request.
+    """
+
+    member_a = models.ForeignKey(
+        Member,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('Membre A')
+    )
+
+    member_b = models.ForeignKey(
+        Member,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('Membre B')
+    )
+
+    score = models.FloatField(
+        verbose_name=_('Score')
+    )
+
+    reasons = models.JSONField(
+        default=list,
+        verbose_name=_('Raisons')
+    )
+
+    class Meta:
+        verbose_name = _('Doublon potentiel')
+        verbose_name_plural = _('Doublons potentiels')
+        ordering = ['-score']
+
+    def __str__(self):
+        return f'{self.member_a_id} / {self.member_b_id} ({self.score:.2f})'
+
+
+class DuplicateScan(BaseModel):
+    """
+    One duplicate scan, requested from the merge page or run by the beat task.
+
+    Kept in the database so web and Celery processes agree on whether a
+    scan is pending and when the stored candidates were last refreshed.
+    """
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Terminée le')
+    )
+
+    found = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Doublons trouvés')
+    )
+
+    class Meta:
+        verbose_name = _('Recherche de doublons')
+        verbose_name_plural = _('Recherches de doublons')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'{self.created_at:%Y-%m-%d %H:%M} ({self.found})'
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Custom Member Fields
 # ═══════════════════════════════════════════════════════════════════════════════
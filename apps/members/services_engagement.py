@@ -16,6 +16,14 @@ class EngagementScoreService:
         'group': 20,
     }
 
+    # Look-back window for attendance, giving and volunteering activity
+    WINDOW_DAYS = 90
+
+    UPDATE_FIELDS = [
+        'attendance_score', 'giving_score', 'volunteering_score',
+        'group_score', 'total_score', 'calculated_at', 'updated_at',
+    ]
+
     @classmethod
     def calculate_for_member(cls, member):
         """
@@ -24,105 +32,162 @@ class EngagementScoreService:
         Returns:
             MemberEngagementScore instance
         """
-        from .models import MemberEngagementScore
+        from .models import Member, MemberEngagementScore
 
-        attendance = cls._attendance_score(member)
-        giving = cls._giving_score(member)
-        volunteering = cls._volunteering_score(member)
-        group = cls._group_score(member)
-
-        total = (
-            attendance * cls.WEIGHTS['attendance'] / 100 +
-            giving * cls.WEIGHTS['giving'] / 100 +
-            volunteering * cls.WEIGHTS['volunteering'] / 100 +
-            group * cls.WEIGHTS['group'] / 100
-        )
+        now = timezone.now()
+        counts = cls._component_counts(Member.all_objects.filter(pk=member.pk), now)
+        values = cls._score_values(member.pk, counts, now)
 
         score, created = MemberEngagementScore.objects.update_or_create(
             member=member,
-            defaults={
-                'attendance_score': round(attendance, 1),
-                'giving_score': round(giving, 1),
-                'volunteering_score': round(volunteering, 1),
-                'group_score': round(group, 1),
-                'total_score': round(total, 1),
-                'calculated_at': timezone.now(),
-            }
+            defaults=values,
         )
 
         return score
 
     @classmethod
-    def calculate_for_all(cls):
-        """Calculate engagement scores for all active members."""
-        from .models import Member
+    def calculate_for_all(cls, incremental=False, batch_size=500):
+        """
+        Calculate engagement scores for all active members.
+
+        Each component is computed with one grouped query for the whole
+        population and the scores are upserted in batches. With
+        ``incremental=True`` only members without a score, or whose
+        attendance, donations, volunteer schedules or group memberships
+        changed since the last run, are rescored; records ageing out of the
+        90-day window are only picked up by a full run.
+        """
+        from .models import Member, MemberEngagementScore
 
+        now = timezone.now()
         members = Member.objects.filter(is_active=True)
-        scores = []
-        for member in members:
-            score = cls.calculate_for_member(member)
-            scores.append(score)
-        return scores
+        if incremental:
+            members = cls._changed_members(members)
+
+        member_ids = list(members.values_list('pk', flat=True))
+        if not member_ids:
+            return []
+
+        counts = cls._component_counts(members, now)
+        scores = [
+            MemberEngagementScore(member_id=member_id, **cls._score_values(member_id, counts, now))
+            for member_id in member_ids
+        ]
+        return MemberEngagementScore.objects.bulk_create(
+            scores,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['member'],
+            update_fields=cls.UPDATE_FIELDS,
+        )
 
     @classmethod
-    def _attendance_score(cls, member):
-        """
-        Calculate attendance score (0-100) based on last 90 days.
-        Uses events app check-in data if available.
-        """
-        try:
-            from apps.events.models import Attendance
-            cutoff = timezone.now() - timedelta(days=90)
-            total_services = 13  # ~1/week for 90 days
-            attended = Attendance.objects.filter(
-                member=member,
-                checked_in_at__gte=cutoff,
-            ).count()
-            return min(100, (attended / max(total_services, 1)) * 100)
-        except (ImportError, Exception):
-            return 0
+    def _changed_members(cls, members):
+        """Narrow ``members`` to those needing a rescore since the last run."""
+        from django.db.models import Max, Q
+
+        from apps.attendance.models import AttendanceRecord
+        from apps.donations.models import Donation
+        from apps.volunteers.models import VolunteerSchedule
+        from .models import GroupMembership, MemberEngagementScore
+
+        since = MemberEngagementScore.all_objects.aggregate(
+            last=Max('calculated_at'),
+        )['last']
+        if since is None:
+            return members
+
+        changed = Q(engagement_score__isnull=True)
+        for model in (AttendanceRecord, Donation, VolunteerSchedule, GroupMembership):
+            changed |= Q(pk__in=model.all_objects.filter(
+                updated_at__gte=since,
+            ).values('member_id'))
+        return members.filter(changed)
 
     @classmethod
-    def _giving_score(cls, member):
-        """
-        Calculate giving score (0-100) based on donation regularity over 90 days.
+    def _component_counts(cls, members, now):
         """
-        try:
-            from apps.donations.models import Donation
-            cutoff = timezone.now() - timedelta(days=90)
-            donations = Donation.objects.filter(
-                member=member,
-                date__gte=cutoff.date(),
-            ).count()
-            # Regular giving: at least once per month = 100
-            return min(100, (donations / 3) * 100)
-        except (ImportError, Exception):
-            return 0
+        Count each member's activity per component, one grouped query each.
 
-    @classmethod
-    def _volunteering_score(cls, member):
-        """
-        Calculate volunteering score (0-100) based on volunteer activity.
+        Returns:
+            dict mapping component name to {member_id: count}
         """
-        try:
-            from apps.volunteers.models import VolunteerSchedule
-            cutoff = timezone.now() - timedelta(days=90)
-            shifts = VolunteerSchedule.objects.filter(
-                volunteer__member=member,
+        from django.db.models import Count
+
+        from apps.attendance.models import AttendanceRecord
+        from apps.core.constants import ScheduleStatus
+        from apps.donations.models import Donation
+        from apps.volunteers.models import VolunteerSchedule
+        from .models import GroupMembership
+
+        cutoff = now - timedelta(days=cls.WINDOW_DAYS)
+        sources = {
+            'attendance': AttendanceRecord.objects.filter(
+                checked_in_at__gte=cutoff,
+            ),
+            'giving': Donation.objects.filter(
+                date__gte=cutoff.date(),
+            ),
+            'volunteering': VolunteerSchedule.objects.filter(
                 date__gte=cutoff.date(),
-                status='completed',
-            ).count()
-            return min(100, (shifts / 6) * 100)  # ~2/month = 100
-        except (ImportError, Exception):
-            return 0
+                status=ScheduleStatus.COMPLETED,
+            ),
+            'group': GroupMembership.objects.all(),
+        }
+
+        counts = {}
+        for component, queryset in sources.items():
+            rows = (
+                queryset.filter(member__in=members.values('pk'))
+                .order_by()
+                .values('member_id')
+                .annotate(n=Count('pk'))
+            )
+            counts[component] = {row['member_id']: row['n'] for row in rows}
+        return counts
 
     @classmethod
-    def _group_score(cls, member):
-        """
-        Calculate group participation score (0-100).
-        Based on active group memberships.
-        """
-        active_groups = member.group_memberships.filter(is_active=True).count()
+    def _score_values(cls, member_id, counts, now):
+        """Build the MemberEngagementScore field values for one member."""
+        components = {
+            'attendance': cls._attendance_score(counts['attendance'].get(member_id, 0)),
+            'giving': cls._giving_score(counts['giving'].get(member_id, 0)),
+            'volunteering': cls._volunteering_score(counts['volunteering'].get(member_id, 0)),
+            'group': cls._group_score(counts['group'].get(member_id, 0)),
+        }
+        total = sum(
+            value * cls.WEIGHTS[name] / 100 for name, value in components.items()
+        )
+
+        return {
+            'attendance_score': round(components['attendance'], 1),
+            'giving_score': round(components['giving'], 1),
+            'volunteering_score': round(components['volunteering'], 1),
+            'group_score': round(components['group'], 1),
+            'total_score': round(total, 1),
+            'calculated_at': now,
+        }
+
+    @staticmethod
+    def _attendance_score(attended):
+        """Attendance score (0-100): check-ins over the last 90 days."""
+        total_services = 13  # ~1/week for 90 days
+        return min(100, (attended / total_services) * 100)
+
+    @staticmethod
+    def _giving_score(donations):
+        """Giving score (0-100): donation regularity over the last 90 days."""
+        # Regular giving: at least once per month = 100
+        return min(100, (donations / 3) * 100)
+
+    @staticmethod
+    def _volunteering_score(shifts):
+        """Volunteering score (0-100): completed shifts over the last 90 days."""
+        return min(100, (shifts / 6) * 100)  # ~2/month = 100
+
+    @staticmethod
+    def _group_score(active_groups):
+        """Group participation score (0-100) from active group memberships."""
         if active_groups >= 2:
             return 100
         elif active_groups == 1:
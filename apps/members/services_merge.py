@@ -1,89 +1,245 @@
 """Member merge and duplicate detection service."""
-from django.db.models import Q
+import math
+from collections import Counter, defaultdict, namedtuple
+from datetime import timedelta
+from itertools import combinations
+
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+# Per-member values compared when scoring a pair, computed once per scan
+_Profile = namedtuple('_Profile', ['name', 'email', 'phone', 'trigrams'])
+
 
 class MemberMergeService:
     """Detects duplicate members and merges records."""
 
+    SIMILAR_NAME = 0.6  # trigram Jaccard above which two names count as similar
+    SIMILAR_NAME_WEIGHT = 0.3
+
+    SCAN_PENDING_TIMEOUT = 900  # seconds before an unfinished scan is assumed lost
+
     @classmethod
     def find_duplicates(cls, threshold=0.7):
         """
         Find potential duplicate members using fuzzy matching on name, email, phone.
 
+        Members are only compared when they share a block: the same full
+        name, email or phone, or (when similar names alone can reach the
+        threshold) a rare name trigram. Each member's trigrams are computed
+        once.
+
         Returns:
             list of tuples: [(member_a, member_b, score, reason)]
         """
         from .models import Member
 
         members = list(Member.objects.filter(is_active=True).order_by('last_name', 'first_name'))
+        profiles = [cls._profile(member) for member in members]
         duplicates = []
 
-        for i, a in enumerate(members):
-            for b in members[i + 1:]:
-                score, reasons = cls._compute_similarity(a, b)
-                if score >= threshold:
-                    duplicates.append((a, b, score, reasons))
+        for i, j in sorted(cls._candidate_pairs(profiles, threshold)):
+            score, reasons = cls._score(profiles[i], profiles[j])
+            if score >= threshold:
+                duplicates.append((members[i], members[j], score, reasons))
 
         # Sort by score descending
         duplicates.sort(key=lambda x: x[2], reverse=True)
         return duplicates
 
     @classmethod
-    def _compute_similarity(cls, a, b):
+    def refresh_candidates(cls, threshold=0.7):
         """
-        Compute similarity score between two members.
+        Rescan and replace the stored DuplicateCandidate rows. Returns the number found.
 
-        Returns:
-            tuple: (score: float 0-1, reasons: list[str])
+        Scans requested before this run started are marked finished; a run
+        nobody requested (the nightly beat) records its own DuplicateScan.
         """
+        from .models import DuplicateCandidate, DuplicateScan
+
+        started_at = timezone.now()
+        duplicates = cls.find_duplicates(threshold)
+        with transaction.atomic():
+            DuplicateCandidate.all_objects.all().delete()
+            DuplicateCandidate.objects.bulk_create([
+                DuplicateCandidate(
+                    member_a=a,
+                    member_b=b,
+                    score=score,
+                    reasons=[str(reason) for reason in reasons],
+                )
+                for a, b, score, reasons in duplicates
+            ], batch_size=500)
+
+            now = timezone.now()
+            finished = DuplicateScan.objects.filter(
+                finished_at__isnull=True, created_at__lte=started_at,
+            ).update(finished_at=now, found=len(duplicates), updated_at=now)
+            if not finished:
+                DuplicateScan.objects.create(finished_at=now, found=len(duplicates))
+            # Only the latest finished scan is ever read
+            DuplicateScan.all_objects.filter(finished_at__lt=now).delete()
+        return len(duplicates)
+
+    @classmethod
+    def stored_duplicates(cls):
+        """Duplicates from the last scan, in find_duplicates' format, skipping merged members."""
+        from .models import DuplicateCandidate
+
+        candidates = DuplicateCandidate.objects.filter(
+            member_a__is_active=True,
+            member_a__deleted_at__isnull=True,
+            member_b__is_active=True,
+            member_b__deleted_at__isnull=True,
+        ).select_related('member_a', 'member_b').order_by(
+            '-score', 'member_a__last_name', 'member_a__first_name',
+        )
+        return [(c.member_a, c.member_b, c.score, c.reasons) for c in candidates]
+
+    @classmethod
+    def last_scanned_at(cls):
+        from .models import DuplicateScan
+
+        return DuplicateScan.objects.aggregate(last=Max('finished_at'))['last']
+
+    @classmethod
+    def scan_pending(cls):
+        from .models import DuplicateScan
+
+        return cls._pending_scans(DuplicateScan.objects.all()).exists()
+
+    @classmethod
+    def schedule_scan(cls):
+        """Queue a background rescan unless one is already pending. Returns True if queued."""
+        from .models import DuplicateScan
+        from .tasks import find_duplicate_members
+
+        if cls._pending_scans(DuplicateScan.objects.all()).exists():
+            return False
+        DuplicateScan.objects.create()
+        transaction.on_commit(lambda: find_duplicate_members.delay())
+        return True
+
+    @classmethod
+    def _pending_scans(cls, scans):
+        cutoff = timezone.now() - timedelta(seconds=cls.SCAN_PENDING_TIMEOUT)
+        return scans.filter(finished_at__isnull=True, created_at__gte=cutoff)
+
+    @classmethod
+    def _profile(cls, member):
+        return _Profile(
+            name=(member.first_name.lower(), member.last_name.lower()),
+            email=(member.email or '').lower(),
+            phone=cls._normalize_phone(member.phone),
+            trigrams=cls._trigrams(f'{member.first_name} {member.last_name}'.lower()),
+        )
+
+    @classmethod
+    def _candidate_pairs(cls, profiles, threshold):
+        """Index pairs (i < j) that share a block and so may score above zero."""
+        if threshold <= 0:
+            return set(combinations(range(len(profiles)), 2))
+
+        pairs = set()
+        for field in ('name', 'email', 'phone'):
+            buckets = defaultdict(list)
+            for i, profile in enumerate(profiles):
+                value = getattr(profile, field)
+                if value:
+                    buckets[value].append(i)
+            for bucket in buckets.values():
+                pairs.update(combinations(bucket, 2))
+
+        # Without a shared name, email or phone a pair scores at most the similar-name weight
+        if threshold <= cls.SIMILAR_NAME_WEIGHT:
+            pairs.update(cls._similar_name_pairs(profiles))
+        return pairs
+
+    @classmethod
+    def _similar_name_pairs(cls, profiles):
+        """
+        Index pairs whose name trigram Jaccard exceeds SIMILAR_NAME.
+
+        Trigrams are ordered rarest first and only each name's prefix is
+        indexed: two sets this similar always share a trigram in their
+        prefixes, so common trigrams never produce candidates on their own.
+        """
+        frequency = Counter(t for profile in profiles for t in profile.trigrams)
+        index = defaultdict(list)
+        pairs = set()
+
+        for i, profile in enumerate(profiles):
+            tokens = sorted(profile.trigrams, key=lambda t: (frequency[t], t))
+            prefix = len(tokens) - math.ceil(cls.SIMILAR_NAME * len(tokens) - 1e-9) + 1
+            seen = set()
+            for token in tokens[:prefix]:
+                seen.update(index[token])
+                index[token].append(i)
+            for j in seen:
+                if cls._jaccard(profiles[j].trigrams, profile.trigrams) > cls.SIMILAR_NAME:
+                    pairs.add((j, i))
+        return pairs
+
+    @classmethod
+    def _score(cls, a, b):
+        """Score two member profiles. Returns (score: float 0-1, reasons: list[str])."""
         score = 0.0
         reasons = []
 
         # Exact name match (high confidence)
-        if a.first_name.lower() == b.first_name.lower() and a.last_name.lower() == b.last_name.lower():
+        if a.name == b.name:
             score += 0.7
             reasons.append(_('Même nom complet'))
         else:
             # Partial name match
-            name_sim = cls._name_similarity(a, b)
-            if name_sim > 0.6:
-                score += name_sim * 0.3
+            name_sim = cls._jaccard(a.trigrams, b.trigrams)
+            if name_sim > cls.SIMILAR_NAME:
+                score += name_sim * cls.SIMILAR_NAME_WEIGHT
                 reasons.append(_('Noms similaires'))
 
         # Email match
-        if a.email and b.email and a.email.lower() == b.email.lower():
+        if a.email and a.email == b.email:
             score += 0.7
             reasons.append(_('Même courriel'))
 
         # Phone match
-        phone_a = cls._normalize_phone(a.phone)
-        phone_b = cls._normalize_phone(b.phone)
-        if phone_a and phone_b and phone_a == phone_b:
+        if a.phone and a.phone == b.phone:
             score += 0.2
             reasons.append(_('Même téléphone'))
 
         return min(score, 1.0), reasons
 
+    @classmethod
+    def _compute_similarity(cls, a, b):
+        """
+        Compute similarity score between two members.
+
+        Returns:
+            tuple: (score: float 0-1, reasons: list[str])
+        """
+        return cls._score(cls._profile(a), cls._profile(b))
+
     @classmethod
     def _name_similarity(cls, a, b):
         """Simple name similarity using character overlap."""
-        name_a = f'{a.first_name} {a.last_name}'.lower()
-        name_b = f'{b.first_name} {b.last_name}'.lower()
-
-        if not name_a or not name_b:
-            return 0.0
+        return cls._jaccard(
+            cls._trigrams(f'{a.first_name} {a.last_name}'.lower()),
+            cls._trigrams(f'{b.first_name} {b.last_name}'.lower()),
+        )
 
-        # Jaccard similarity on character trigrams
-        trigrams_a = set(name_a[i:i+3] for i in range(len(name_a) - 2))
-        trigrams_b = set(name_b[i:i+3] for i in range(len(name_b) - 2))
+    @staticmethod
+    def _trigrams(name):
+        return frozenset(name[i:i+3] for i in range(len(name) - 2))
 
+    @staticmethod
+    def _jaccard(trigrams_a, trigrams_b):
+        """Jaccard similarity of two trigram sets (0 when either is empty)."""
         if not trigrams_a or not trigrams_b:
             return 0.0
-
-        intersection = trigrams_a & trigrams_b
-        union = trigrams_a | trigrams_b
-        return len(intersection) / len(union)
+        intersection = len(trigrams_a & trigrams_b)
+        return intersection / (len(trigrams_a) + len(trigrams_b) - intersection)
 
     @classmethod
     def _normalize_phone(cls, phone):
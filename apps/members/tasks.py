@@ -97,12 +97,25 @@ def check_background_check_expiry():
 
 
 @shared_task
-def calculate_all_engagement_scores():
+def calculate_all_engagement_scores(incremental=False):
     """
     Recalculate engagement scores for all active members.
-    Should run weekly.
+    Should run weekly; ``incremental=True`` can run more often and only
+    rescores members whose activity changed since the last run.
     """
     from apps.members.services_engagement import EngagementScoreService
 
-    scores = EngagementScoreService.calculate_for_all()
+    scores = EngagementScoreService.calculate_for_all(incremental=incremental)
     return f'{len(scores)} scores calculés'
+
+
+@shared_task
+def find_duplicate_members():
+    """
+    Rescan active members for likely duplicates and store the pairs.
+    Queued from the merge page; the page shows the stored results.
+    """
+    from apps.members.services_merge import MemberMergeService
+
+    count = MemberMergeService.refresh_candidates()
+    return f'{count} doublons potentiels'
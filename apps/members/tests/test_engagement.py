@@ -92,6 +92,50 @@ class TestEngagementScoreService:
         score_with = EngagementScoreService.calculate_for_member(member_with_groups)
         assert score_with.group_score >= score_no.group_score
 
+    def test_calculate_for_all_upserts_existing_scores(self):
+        """A second full run updates rows in place instead of duplicating them."""
+        from apps.members.services_engagement import EngagementScoreService
+        member = MemberFactory()
+        EngagementScoreService.calculate_for_all()
+        GroupMembershipFactory(member=member)
+        EngagementScoreService.calculate_for_all()
+        assert MemberEngagementScore.objects.filter(member=member).count() == 1
+        assert MemberEngagementScore.objects.get(member=member).group_score == 60
+
+    def test_calculate_for_all_query_count(self, django_assert_max_num_queries):
+        """Query count does not grow with the number of members."""
+        from apps.members.services_engagement import EngagementScoreService
+        for _ in range(5):
+            GroupMembershipFactory(member=MemberFactory())
+        with django_assert_max_num_queries(6):
+            scores = EngagementScoreService.calculate_for_all()
+        assert len(scores) >= 5
+
+    def test_attendance_component(self):
+        """Check-ins from the attendance app count towards the score."""
+        from apps.attendance.tests.factories import AttendanceRecordFactory
+        from apps.members.services_engagement import EngagementScoreService
+        member = MemberFactory()
+        AttendanceRecordFactory(member=member)
+        score = EngagementScoreService.calculate_for_member(member)
+        assert score.attendance_score > 0
+
+    def test_incremental_only_rescores_changed_members(self):
+        """Incremental mode skips members with no new activity."""
+        from apps.members.services_engagement import EngagementScoreService
+        unchanged = MemberFactory()
+        changed = MemberFactory()
+        EngagementScoreService.calculate_for_all()
+        GroupMembershipFactory(member=changed)
+        newcomer = MemberFactory()
+
+        scores = EngagementScoreService.calculate_for_all(incremental=True)
+
+        rescored = {score.member_id for score in scores}
+        assert changed.pk in rescored
+        assert newcomer.pk in rescored
+        assert unchanged.pk not in rescored
+
 
 @pytest.fixture(autouse=True)
 def _setup_templates(settings, tmp_path):
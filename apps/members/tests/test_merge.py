@@ -101,6 +101,110 @@ class TestMemberMergeService:
         assert primary.address == '123 Rue Test'
 
 
+@pytest.mark.django_db
+class TestDuplicateBlocking:
+    """find_duplicates only compares members sharing a block."""
+
+    def _brute_force(self, threshold):
+        from itertools import combinations
+        from apps.members.services_merge import MemberMergeService
+
+        members = list(Member.objects.filter(is_active=True).order_by('last_name', 'first_name'))
+        return {
+            frozenset((a.pk, b.pk))
+            for a, b in combinations(members, 2)
+            if MemberMergeService._compute_similarity(a, b)[0] >= threshold
+        }
+
+    @pytest.mark.parametrize('threshold', [0.15, 0.5, 0.7])
+    def test_matches_all_pairs_comparison(self, threshold):
+        from apps.members.services_merge import MemberMergeService
+
+        MemberFactory(first_name='Jean', last_name='Dupont', email='jd1@test.com')
+        MemberFactory(first_name='Jean', last_name='Dupond', email='jd2@test.com')
+        MemberFactory(first_name='Jean', last_name='Dupont', email='jd3@test.com')
+        MemberFactory(first_name='Marie', last_name='Tremblay', email='mt@test.com', phone='514-555-0101')
+        MemberFactory(first_name='Mary', last_name='Tremblay', email='MT@test.com', phone='(514) 555-0101')
+        MemberFactory(first_name='Luc', last_name='Gagnon', email='lg@test.com', phone='514-555-0102')
+        MemberFactory(first_name='Paul', last_name='Roy', email='pr@test.com', phone='5145550102')
+
+        found = {
+            frozenset((a.pk, b.pk))
+            for a, b, score, reasons in MemberMergeService.find_duplicates(threshold)
+        }
+
+        assert found == self._brute_force(threshold)
+
+    def test_similar_names_need_low_threshold(self):
+        from apps.members.services_merge import MemberMergeService
+
+        MemberFactory(first_name='Jean', last_name='Dupont', email='jd1@test.com')
+        MemberFactory(first_name='Jean', last_name='Dupond', email='jd2@test.com')
+
+        assert MemberMergeService.find_duplicates() == []
+        (_a, _b, score, reasons), = MemberMergeService.find_duplicates(threshold=0.1)
+        assert 0 < score <= 0.3
+        assert [str(r) for r in reasons] == ['Noms similaires']
+
+
+@pytest.mark.django_db
+class TestStoredDuplicates:
+    """Background scan results read by the merge page."""
+
+    def test_refresh_replaces_rows_and_skips_merged_members(self):
+        from apps.members.models import DuplicateCandidate
+        from apps.members.services_merge import MemberMergeService
+
+        m1 = MemberFactory(first_name='Jean', last_name='Dupont', email='jd1@test.com')
+        m2 = MemberFactory(first_name='Jean', last_name='Dupont', email='jd2@test.com')
+
+        assert MemberMergeService.refresh_candidates() == 1
+        assert MemberMergeService.refresh_candidates() == 1
+        assert DuplicateCandidate.objects.count() == 1
+        assert MemberMergeService.last_scanned_at() is not None
+        (a, b, score, reasons), = MemberMergeService.stored_duplicates()
+        assert {a.pk, b.pk} == {m1.pk, m2.pk}
+        assert reasons == ['Même nom complet']
+
+        MemberMergeService.merge_members(m1, m2)
+
+        assert MemberMergeService.stored_duplicates() == []
+
+    def test_schedule_scan_queues_once(self, django_capture_on_commit_callbacks):
+        from unittest.mock import patch
+        from apps.members.services_merge import MemberMergeService
+
+        with patch('apps.members.tasks.find_duplicate_members.delay') as mock_delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                assert MemberMergeService.schedule_scan()
+                assert not MemberMergeService.schedule_scan()
+
+        mock_delay.assert_called_once_with()
+        assert MemberMergeService.scan_pending()
+
+    def test_scan_state_is_stored_in_database(self, django_capture_on_commit_callbacks):
+        """A scan queued by one process is seen as finished by another."""
+        from unittest.mock import patch
+        from django.core.cache import cache
+        from apps.members.models import DuplicateScan
+        from apps.members.services_merge import MemberMergeService
+
+        with patch('apps.members.tasks.find_duplicate_members.delay'):
+            with django_capture_on_commit_callbacks(execute=True):
+                MemberMergeService.schedule_scan()
+        cache.clear()
+
+        assert MemberMergeService.scan_pending()
+        assert MemberMergeService.last_scanned_at() is None
+
+        MemberMergeService.refresh_candidates()
+        cache.clear()
+
+        assert not MemberMergeService.scan_pending()
+        assert MemberMergeService.last_scanned_at() is not None
+        assert DuplicateScan.objects.count() == 1
+
+
 @pytest.fixture(autouse=True)
 def _setup_templates(settings, tmp_path):
     """Create minimal template stubs."""
@@ -150,6 +254,33 @@ class TestMergeViews:
         response = client.get('/members/merge/')
         assert response.status_code == 200
 
+    def test_find_duplicates_view_reads_stored_results(self, client, admin_user):
+        """The page lists the last scan without rescanning."""
+        from unittest.mock import patch
+        from apps.members.services_merge import MemberMergeService
+
+        user, member = admin_user
+        MemberMergeService.refresh_candidates()
+        client.force_login(user)
+        with patch.object(MemberMergeService, 'find_duplicates') as mock_find, \
+                patch.object(MemberMergeService, 'schedule_scan') as mock_schedule:
+            response = client.get('/members/merge/')
+        assert response.status_code == 200
+        mock_find.assert_not_called()
+        mock_schedule.assert_not_called()
+
+    def test_find_duplicates_view_post_queues_scan(self, client, admin_user):
+        """Posting to the page queues a background rescan."""
+        from unittest.mock import patch
+
+        user, member = admin_user
+        client.force_login(user)
+        with patch('apps.members.services_merge.MemberMergeService.schedule_scan',
+                   return_value=True) as mock_schedule:
+            response = client.post('/members/merge/')
+        assert response.status_code == 302
+        mock_schedule.assert_called_once_with()
+
     def test_find_duplicates_denied_regular(self, client, regular_user):
         """Non-admin redirected from merge."""
         user, member = regular_user
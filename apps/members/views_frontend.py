@@ -22,7 +22,9 @@ from apps.core.utils import (
     get_month_birthdays,
 )
 
-from apps.core.export import export_queryset_csv, export_queryset_excel, export_queryset_pdf
+from apps.core.export import (
+    export_queryset_pdf, stream_queryset_csv, stream_queryset_excel,
+)
 from apps.core.constants import ApprovalStatus, CareStatus
 
 from .models import (
@@ -1199,6 +1201,41 @@ def modification_request_list(request):
     return render(request, 'members/modification_request_list.html', context)
 
 
+MEMBER_EXPORT_FIELDS = [
+    'member_number',
+    'first_name',
+    'last_name',
+    'email',
+    'phone',
+    'birth_date',
+    'role',
+    'family_status',
+    'address',
+    'city',
+    'province',
+    'postal_code',
+    'joined_date',
+    'membership_status',
+]
+
+MEMBER_EXPORT_HEADERS = [
+    'Numéro de membre',
+    'Prénom',
+    'Nom',
+    'Courriel',
+    'Téléphone',
+    'Date de naissance',
+    'Rôle',
+    'État civil',
+    'Adresse',
+    'Ville',
+    'Province',
+    'Code postal',
+    "Date d'adhésion",
+    'Statut',
+]
+
+
 @login_required
 def member_list_export(request):
     """Export member list to CSV/Excel/PDF (pastor/admin only)."""
@@ -1209,48 +1246,23 @@ def member_list_export(request):
 
     members = Member.objects.filter(is_active=True).order_by('last_name', 'first_name')
 
-    fields = [
-        'member_number',
-        'first_name',
-        'last_name',
-        'email',
-        'phone',
-        'birth_date',
-        'role',
-        'family_status',
-        'address',
-        'city',
-        'province',
-        'postal_code',
-        'joined_date',
-        'membership_status',
-    ]
-
-    headers = [
-        'Numéro de membre',
-        'Prénom',
-        'Nom',
-        'Courriel',
-        'Téléphone',
-        'Date de naissance',
-        'Rôle',
-        'État civil',
-        'Adresse',
-        'Ville',
-        'Province',
-        'Code postal',
-        "Date d'adhésion",
-        'Statut',
-    ]
+    fields = MEMBER_EXPORT_FIELDS
+    headers = MEMBER_EXPORT_HEADERS
 
     export_format = request.GET.get('format', 'csv')
 
     if export_format == 'excel':
-        return export_queryset_excel(members, fields, 'membres', headers=headers)
+        return stream_queryset_excel(members, fields, 'membres', headers=headers)
     elif export_format == 'pdf':
-        return export_queryset_pdf(members, fields, 'membres', headers=headers)
+        # PDF rendering is not streamable; build it in the background
+        from apps.core.constants import ExportFormat, ExportJobType
+        from apps.core.services_export_jobs import ExportJobService
+
+        ExportJobService.enqueue(request.user, ExportJobType.MEMBERS, ExportFormat.PDF, request.GET)
+        messages.success(request, _('Export lancé. Le fichier sera disponible dans « Mes exports ».'))
+        return redirect('/settings/exports/')
 
-    return export_queryset_csv(members, fields, 'membres', headers=headers)
+    return stream_queryset_csv(members, fields, 'membres', headers=headers)
 
 
 # ==============================================================================
@@ -1748,10 +1760,23 @@ def merge_find_duplicates(request):
         return redirect('/members/')
 
     from .services_merge import MemberMergeService
-    duplicates = MemberMergeService.find_duplicates()
+
+    if request.method == 'POST':
+        if MemberMergeService.schedule_scan():
+            messages.info(request, _('Recherche des doublons lancée. Actualisez la page dans quelques instants.'))
+        else:
+            messages.info(request, _('Une recherche des doublons est déjà en cours.'))
+        return redirect('/members/merge/')
+
+    # Results come from the last background scan; the first visit starts one
+    scanned_at = MemberMergeService.last_scanned_at()
+    if scanned_at is None:
+        MemberMergeService.schedule_scan()
 
     context = {
-        'duplicates': duplicates,
+        'duplicates': MemberMergeService.stored_duplicates(),
+        'scanned_at': scanned_at,
+        'scan_pending': MemberMergeService.scan_pending(),
         'page_title': _('Doublons potentiels'),
     }
     return render(request, 'members/merge_duplicates.html', context)
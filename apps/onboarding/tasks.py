@@ -53,188 +53,85 @@ def send_form_deadline_reminders():
 
 @shared_task
 def send_lesson_reminders():
-    """Run daily: send lesson reminders at J-3, J-1, and same day."""
+    """Run daily: send lesson reminders at J-5, J-3, J-1, and same day."""
+    from apps.core.reminders import send_reminders
     from .models import ScheduledLesson
 
-    today = timezone.localdate()
-
-    # 5 days before
-    lessons_5d = ScheduledLesson.objects.filter(
-        scheduled_date__date=today + timedelta(days=5),
-        status=LessonStatus.UPCOMING,
-        reminder_5days_sent=False,
-    )
-    for sl in lessons_5d:
-        Notification.objects.create(
-            member=sl.training.member,
-            title='Rappel: Lecon dans 5 jours',
-            message=(
-                f'Lecon "{sl.lesson.title}" prevue le '
-                f'{sl.scheduled_date:%d/%m/%Y a %H:%M}. Presence obligatoire.'
-            ),
-            notification_type='event',
-            link='/onboarding/training/',
-        )
-        sl.reminder_5days_sent = True
-        sl.save(update_fields=['reminder_5days_sent', 'updated_at'])
-
-    # 3 days before
-    lessons_3d = ScheduledLesson.objects.filter(
-        scheduled_date__date=today + timedelta(days=3),
-        status=LessonStatus.UPCOMING,
-        reminder_3days_sent=False,
+    titles = {
+        5: 'Rappel: Lecon dans 5 jours',
+        3: 'Rappel: Lecon dans 3 jours',
+        1: 'Rappel: Lecon DEMAIN',
+        0: "Rappel: Lecon AUJOURD'HUI",
+    }
+
+    def build(sl, offset):
+        if offset == 1:
+            when = f'demain a {sl.scheduled_date:%H:%M}'
+        elif offset == 0:
+            when = f"aujourd'hui a {sl.scheduled_date:%H:%M}"
+        else:
+            when = f'prevue le {sl.scheduled_date:%d/%m/%Y a %H:%M}'
+        return titles[offset], f'Lecon "{sl.lesson.title}" {when}. Presence obligatoire.'
+
+    count = send_reminders(
+        ScheduledLesson.objects.filter(
+            status=LessonStatus.UPCOMING,
+        ).select_related('training__member', 'lesson'),
+        'scheduled_date__date',
+        build,
+        get_member=lambda sl: sl.training.member,
+        notification_type='event',
+        link='/onboarding/training/',
+        exact=True,
     )
-    for sl in lessons_3d:
-        Notification.objects.create(
-            member=sl.training.member,
-            title=f'Rappel: Lecon dans 3 jours',
-            message=(
-                f'Lecon "{sl.lesson.title}" prevue le '
-                f'{sl.scheduled_date:%d/%m/%Y a %H:%M}. Presence obligatoire.'
-            ),
-            notification_type='event',
-            link='/onboarding/training/',
-        )
-        sl.reminder_3days_sent = True
-        sl.save(update_fields=['reminder_3days_sent', 'updated_at'])
-
-    # 1 day before
-    lessons_1d = ScheduledLesson.objects.filter(
-        scheduled_date__date=today + timedelta(days=1),
-        status=LessonStatus.UPCOMING,
-        reminder_1day_sent=False,
-    )
-    for sl in lessons_1d:
-        Notification.objects.create(
-            member=sl.training.member,
-            title='Rappel: Lecon DEMAIN',
-            message=(
-                f'Lecon "{sl.lesson.title}" demain a '
-                f'{sl.scheduled_date:%H:%M}. Presence obligatoire.'
-            ),
-            notification_type='event',
-            link='/onboarding/training/',
-        )
-        sl.reminder_1day_sent = True
-        sl.save(update_fields=['reminder_1day_sent', 'updated_at'])
-
-    # Same day
-    lessons_today = ScheduledLesson.objects.filter(
-        scheduled_date__date=today,
-        status=LessonStatus.UPCOMING,
-        reminder_sameday_sent=False,
-    )
-    for sl in lessons_today:
-        Notification.objects.create(
-            member=sl.training.member,
-            title="Rappel: Lecon AUJOURD'HUI",
-            message=(
-                f'Lecon "{sl.lesson.title}" aujourd\'hui a '
-                f'{sl.scheduled_date:%H:%M}. Presence obligatoire.'
-            ),
-            notification_type='event',
-            link='/onboarding/training/',
-        )
-        sl.reminder_sameday_sent = True
-        sl.save(update_fields=['reminder_sameday_sent', 'updated_at'])
+    logger.info(f'{count} lesson reminders sent')
+    return count
 
 
 @shared_task
 def send_interview_reminders():
-    """Run daily: send interview reminders at J-3, J-1, and same day."""
+    """Run daily: send interview reminders at J-5, J-3, J-1, and same day."""
+    from apps.core.reminders import send_reminders
     from .models import Interview
 
-    today = timezone.localdate()
-
-    active_statuses = [InterviewStatus.CONFIRMED, InterviewStatus.ACCEPTED]
-
-    # 5 days before
-    interviews_5d = Interview.objects.filter(
-        status__in=active_statuses,
-        reminder_5days_sent=False,
-    ).exclude(confirmed_date__isnull=True).filter(
-        confirmed_date__date=today + timedelta(days=5)
-    )
-    for iv in interviews_5d:
-        Notification.objects.create(
-            member=iv.member,
-            title='Rappel: Interview dans 5 jours',
-            message=(
-                f'Votre interview finale est le '
-                f'{iv.final_date:%d/%m/%Y a %H:%M}. '
+    titles = {
+        5: 'Rappel: Interview dans 5 jours',
+        3: 'Rappel: Interview dans 3 jours',
+        1: 'Rappel: Interview DEMAIN',
+        0: "Rappel: Interview AUJOURD'HUI",
+    }
+
+    def build(iv, offset):
+        if offset == 1:
+            msg = (
+                f'Votre interview finale est DEMAIN a {iv.final_date:%H:%M}. '
                 'Presence obligatoire - pas de deuxieme chance.'
-            ),
-            notification_type='event',
-            link='/onboarding/interview/',
-        )
-        iv.reminder_5days_sent = True
-        iv.save(update_fields=['reminder_5days_sent', 'updated_at'])
-
-    # 3 days before
-    interviews_3d = Interview.objects.filter(
-        status__in=active_statuses,
-        reminder_3days_sent=False,
-    ).exclude(confirmed_date__isnull=True).filter(
-        confirmed_date__date=today + timedelta(days=3)
-    )
-    for iv in interviews_3d:
-        Notification.objects.create(
-            member=iv.member,
-            title='Rappel: Interview dans 3 jours',
-            message=(
-                f'Votre interview finale est le '
-                f'{iv.final_date:%d/%m/%Y a %H:%M}. '
-                'Presence obligatoire - pas de deuxieme chance.'
-            ),
-            notification_type='event',
-            link='/onboarding/interview/',
-        )
-        iv.reminder_3days_sent = True
-        iv.save(update_fields=['reminder_3days_sent', 'updated_at'])
-
-    # 1 day before
-    interviews_1d = Interview.objects.filter(
-        status__in=active_statuses,
-        reminder_1day_sent=False,
-    ).exclude(confirmed_date__isnull=True).filter(
-        confirmed_date__date=today + timedelta(days=1)
-    )
-    for iv in interviews_1d:
-        Notification.objects.create(
-            member=iv.member,
-            title='Rappel: Interview DEMAIN',
-            message=(
-                f'Votre interview finale est DEMAIN a '
-                f'{iv.final_date:%H:%M}. '
+            )
+        elif offset == 0:
+            msg = (
+                f"Votre interview finale est AUJOURD'HUI a {iv.final_date:%H:%M}. "
+                'Presence obligatoire.'
+            )
+        else:
+            msg = (
+                f'Votre interview finale est le {iv.final_date:%d/%m/%Y a %H:%M}. '
                 'Presence obligatoire - pas de deuxieme chance.'
-            ),
-            notification_type='event',
-            link='/onboarding/interview/',
-        )
-        iv.reminder_1day_sent = True
-        iv.save(update_fields=['reminder_1day_sent', 'updated_at'])
-
-    # Same day
-    interviews_today = Interview.objects.filter(
-        status__in=active_statuses,
-        reminder_sameday_sent=False,
-    ).exclude(confirmed_date__isnull=True).filter(
-        confirmed_date__date=today
+            )
+        return titles[offset], msg
+
+    count = send_reminders(
+        Interview.objects.filter(
+            status__in=[InterviewStatus.CONFIRMED, InterviewStatus.ACCEPTED],
+            confirmed_date__isnull=False,
+        ).select_related('member'),
+        'confirmed_date__date',
+        build,
+        notification_type='event',
+        link='/onboarding/interview/',
+        exact=True,
     )
-    for iv in interviews_today:
-        Notification.objects.create(
-            member=iv.member,
-            title="Rappel: Interview AUJOURD'HUI",
-            message=(
-                f"Votre interview finale est AUJOURD'HUI a "
-                f'{iv.final_date:%H:%M}. '
-                'Presence obligatoire.'
-            ),
-            notification_type='event',
-            link='/onboarding/interview/',
-        )
-        iv.reminder_sameday_sent = True
-        iv.save(update_fields=['reminder_sameday_sent', 'updated_at'])
+    logger.info(f'{count} interview reminders sent')
+    return count
 
 
 # ─── P1: Welcome Sequence Processing (item 13) ──────────────────────────────
@@ -1,6 +1,6 @@
 """Stripe payment service layer, statement generation, goal tracking, ACH, crypto, kiosk, SMS."""
-import io
 import logging
+from datetime import datetime
 from decimal import Decimal
 
 from django.conf import settings
@@ -253,38 +253,73 @@ class PaymentService:
     # ─── Giving Goal Tracking ────────────────────────────────────────────────
 
     @staticmethod
-    def calculate_giving_goal_progress(member, year):
-        """Calculate giving goal progress: sum of succeeded payments in year vs target."""
-        from .models import GivingGoal, OnlinePayment, PaymentStatus
+    def period_bounds(year, month=None):
+        """Return aware (start, end) datetimes covering a year, or one month of it."""
+        if month is None:
+            start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+        else:
+            start = datetime(year, month, 1)
+            end = datetime(year + (month == 12), month % 12 + 1, 1)
+        return timezone.make_aware(start), timezone.make_aware(end)
 
-        try:
-            goal = GivingGoal.objects.get(member=member, year=year)
-        except GivingGoal.DoesNotExist:
-            return None
+    @staticmethod
+    def donor_totals(start, end, member_ids=None):
+        """
+        Succeeded online giving per member for ``start <= created_at < end``.
 
-        total_given = OnlinePayment.objects.filter(
-            member=member,
+        One grouped query; returns ``{member_id: total}`` for members who
+        gave in the period, leaving out soft-deleted members. Pass
+        ``member_ids`` to restrict the result to those members.
+        """
+        from .models import OnlinePayment, PaymentStatus
+
+        payments = OnlinePayment.objects.filter(
             status=PaymentStatus.SUCCEEDED,
-            created_at__year=year,
+            created_at__gte=start,
+            created_at__lt=end,
             is_active=True,
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
+            member__deleted_at__isnull=True,
+        )
+        if member_ids is not None:
+            payments = payments.filter(member_id__in=member_ids)
+        return dict(
+            payments.order_by().values('member').annotate(total=Sum('amount'))
+            .values_list('member', 'total')
+        )
 
+    @staticmethod
+    def goal_progress(target, given):
+        """Progress dict for a giving goal of ``target`` with ``given`` received so far."""
         return {
-            'target': goal.target_amount,
-            'given': total_given,
-            'remaining': max(Decimal('0.00'), goal.target_amount - total_given),
-            'percentage': min(100, int((total_given / goal.target_amount) * 100)) if goal.target_amount > 0 else 0,
+            'target': target,
+            'given': given,
+            'remaining': max(Decimal('0.00'), target - given),
+            'percentage': min(100, int((given / target) * 100)) if target > 0 else 0,
         }
 
-    @staticmethod
-    def get_giving_goal_summary():
+    @classmethod
+    def calculate_giving_goal_progress(cls, member, year):
+        """Calculate giving goal progress: sum of succeeded payments in year vs target."""
+        from .models import GivingGoal
+
+        try:
+            goal = GivingGoal.objects.get(member=member, year=year)
+        except GivingGoal.DoesNotExist:
+            return None
+
+        totals = cls.donor_totals(*cls.period_bounds(year), member_ids=[member.pk])
+        return cls.goal_progress(goal.target_amount, totals.get(member.pk, Decimal('0.00')))
+
+    @classmethod
+    def get_giving_goal_summary(cls):
         """Get summary for finance staff: total pledged vs received across all members."""
         from .models import GivingGoal, OnlinePayment, PaymentStatus
 
         current_year = timezone.now().year
         goals = GivingGoal.objects.filter(year=current_year, is_active=True)
+        targets = dict(goals.values_list('member_id', 'target_amount'))
 
-        total_pledged = goals.aggregate(total=Sum('target_amount'))['total'] or Decimal('0.00')
+        total_pledged = sum(targets.values(), Decimal('0.00'))
 
         total_received = OnlinePayment.objects.filter(
             status=PaymentStatus.SUCCEEDED,
@@ -292,121 +327,171 @@ class PaymentService:
             is_active=True,
         ).aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
 
+        given = cls.donor_totals(*cls.period_bounds(current_year), member_ids=list(targets))
+        goals_met = sum(
+            1 for member_id, target in targets.items()
+            if target > 0 and given.get(member_id, Decimal('0.00')) >= target
+        )
+
         return {
             'total_pledged': total_pledged,
             'total_received': total_received,
-            'goal_count': goals.count(),
+            'goal_count': len(targets),
+            'goals_met': goals_met,
             'percentage': min(100, int((total_received / total_pledged) * 100)) if total_pledged > 0 else 0,
         }
 
     # ─── Statement Generation ────────────────────────────────────────────────
 
+    STATEMENT_SAVE_BATCH_SIZE = 50
+
+    @staticmethod
+    def _statement_html(statement, payments, total):
+        from django.template.loader import render_to_string
+
+        return render_to_string('payments/statement_pdf.html', {
+            'statement': statement,
+            'payments': payments,
+            'total': total,
+            'church_name': getattr(settings, 'CHURCH_NAME', 'ÉgliseConnect'),
+            'church_address': getattr(settings, 'CHURCH_ADDRESS', ''),
+            'church_reg': getattr(settings, 'CHURCH_REGISTRATION_NUMBER', ''),
+        })
+
+    @staticmethod
+    def _statement_filename(statement):
+        return f'statement_{statement.member_id}_{statement.period_start}_{statement.period_end}.pdf'
+
     @staticmethod
     def generate_statement_pdf(statement):
         """Generate a giving statement PDF using xhtml2pdf."""
+        from django.core.files.base import ContentFile
+        from apps.core.services_pdf import BulkPDFRenderer, html_to_pdf
         from .models import OnlinePayment, PaymentStatus
 
-        try:
-            from xhtml2pdf import pisa
-        except ImportError:
+        if not BulkPDFRenderer.available():
             logger.warning("xhtml2pdf not installed, skipping PDF generation")
             return None
 
-        church_name = getattr(settings, 'CHURCH_NAME', 'ÉgliseConnect')
-        church_address = getattr(settings, 'CHURCH_ADDRESS', '')
-        church_reg = getattr(settings, 'CHURCH_REGISTRATION_NUMBER', '')
-
-        payments = OnlinePayment.objects.filter(
+        payments = list(OnlinePayment.objects.filter(
             member=statement.member,
             status=PaymentStatus.SUCCEEDED,
             created_at__date__gte=statement.period_start,
             created_at__date__lte=statement.period_end,
             is_active=True,
-        ).order_by('created_at')
-
-        total = payments.aggregate(total=Sum('amount'))['total'] or Decimal('0.00')
-
-        rows_html = ''
-        for p in payments:
-            rows_html += f'''<tr>
-                <td style="padding:5px;border:1px solid #ccc;">{p.created_at.strftime("%d/%m/%Y")}</td>
-                <td style="padding:5px;border:1px solid #ccc;">{p.get_donation_type_display()}</td>
-                <td style="padding:5px;border:1px solid #ccc;text-align:right;">{p.amount:.2f} {p.currency}</td>
-            </tr>'''
-
-        html = f"""
-        <html>
-        <head><meta charset="utf-8"></head>
-        <body style="font-family:sans-serif;font-size:11px;margin:30px;">
-            <div style="text-align:center;margin-bottom:20px;">
-                <h1 style="margin:0;">{church_name}</h1>
-                <p style="margin:5px 0;">{church_address}</p>
-                {('<p style="margin:5px 0;">No. enregistrement: ' + church_reg + '</p>') if church_reg else ''}
-            </div>
-            <hr/>
-            <h2>Relevé de dons - {statement.get_statement_type_display()}</h2>
-            <p><strong>Membre:</strong> {statement.member.full_name}</p>
-            <p><strong>Période:</strong> {statement.period_start.strftime("%d/%m/%Y")} au {statement.period_end.strftime("%d/%m/%Y")}</p>
-            <table style="width:100%;border-collapse:collapse;margin-top:15px;">
-                <thead>
-                    <tr>
-                        <th style="padding:5px;border:1px solid #ccc;background:#f5f5f5;text-align:left;">Date</th>
-                        <th style="padding:5px;border:1px solid #ccc;background:#f5f5f5;text-align:left;">Type</th>
-                        <th style="padding:5px;border:1px solid #ccc;background:#f5f5f5;text-align:right;">Montant</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {rows_html}
-                    <tr>
-                        <td colspan="2" style="padding:5px;border:1px solid #ccc;font-weight:bold;">Total</td>
-                        <td style="padding:5px;border:1px solid #ccc;text-align:right;font-weight:bold;">{total:.2f} CAD</td>
-                    </tr>
-                </tbody>
-            </table>
-            <p style="margin-top:30px;font-size:9px;color:#666;">
-                Ce relevé est émis à des fins fiscales. Veuillez le conserver pour votre déclaration de revenus.
-            </p>
-        </body>
-        </html>
-        """
+        ).order_by('created_at'))
+        total = sum((p.amount for p in payments), Decimal('0.00'))
 
-        output = io.BytesIO()
-        pisa.CreatePDF(io.StringIO(html), dest=output)
-        output.seek(0)
+        pdf = html_to_pdf(PaymentService._statement_html(statement, payments, total))
 
         # Update statement
         statement.total_amount = total
-        from django.core.files.base import ContentFile
-        filename = f'statement_{statement.member.pk}_{statement.period_start}_{statement.period_end}.pdf'
-        statement.pdf_file.save(filename, ContentFile(output.read()), save=False)
+        if pdf:
+            statement.pdf_file.save(
+                PaymentService._statement_filename(statement), ContentFile(pdf), save=False,
+            )
         statement.save(update_fields=['total_amount', 'pdf_file', 'updated_at'])
 
         return statement
 
     @staticmethod
-    def generate_bulk_statements(period_start, period_end, statement_type):
-        """Generate statements for all donors in the period."""
+    def generate_bulk_statements(period_start, period_end, statement_type, progress=None, workers=None):
+        """
+        Generate statements for all donors in the period.
+
+        All succeeded payments of the period are loaded with one ordered
+        query and grouped per member in memory; missing statements are
+        created with one bulk_create. PDFs are rendered on a process pool
+        (BulkPDFRenderer) and streamed to storage as they finish.
+
+        A statement whose PDF exists and whose total still matches is
+        skipped, so an interrupted run resumes with the remaining members
+        and late payments still trigger a re-render.
+        ``progress(done, total)`` is called as members are completed.
+        """
+        from django.core.files.base import ContentFile
+        from apps.core.services_pdf import BulkPDFRenderer
         from .models import GivingStatement, OnlinePayment, PaymentStatus
 
-        # Find all members with payments in the period
-        member_ids = OnlinePayment.objects.filter(
+        payments_by_member = {}
+        members = {}
+        payments = OnlinePayment.objects.filter(
             status=PaymentStatus.SUCCEEDED,
             created_at__date__gte=period_start,
             created_at__date__lte=period_end,
             is_active=True,
-        ).values_list('member_id', flat=True).distinct()
-
-        statements = []
-        for member_id in member_ids:
-            statement, created = GivingStatement.objects.get_or_create(
-                member_id=member_id,
-                period_start=period_start,
-                period_end=period_end,
-                statement_type=statement_type,
-            )
-            PaymentService.generate_statement_pdf(statement)
-            statements.append(statement)
+        ).select_related('member').order_by('member_id', 'created_at', 'pk')
+        for payment in payments.iterator(chunk_size=2000):
+            payments_by_member.setdefault(payment.member_id, []).append(payment)
+            members[payment.member_id] = payment.member
+        totals = {
+            member_id: sum((p.amount for p in rows), Decimal('0.00'))
+            for member_id, rows in payments_by_member.items()
+        }
+
+        period = {
+            'period_start': period_start,
+            'period_end': period_end,
+            'statement_type': statement_type,
+        }
+        existing = set(
+            GivingStatement.objects.filter(member_id__in=members, **period)
+            .values_list('member_id', flat=True)
+        )
+        GivingStatement.objects.bulk_create([
+            GivingStatement(member_id=member_id, **period)
+            for member_id in members if member_id not in existing
+        ], ignore_conflicts=True)
 
+        statements = list(
+            GivingStatement.objects.filter(member_id__in=members, **period).order_by('member_id')
+        )
+        pending = {}
+        for statement in statements:
+            statement.member = members[statement.member_id]
+            if not statement.pdf_file or statement.total_amount != totals[statement.member_id]:
+                pending[statement.pk] = statement
+
+        total = len(statements)
+        done = total - len(pending)
+        if progress:
+            progress(done, total)
+
+        renderer = BulkPDFRenderer(workers)
+        if pending and not renderer.available():
+            logger.warning("xhtml2pdf not installed, skipping PDF generation")
+            pending = {}
+
+        documents = (
+            (pk, PaymentService._statement_html(
+                statement, payments_by_member[statement.member_id], totals[statement.member_id],
+            ))
+            for pk, statement in pending.items()
+        )
+        finished = []
+        for pk, pdf in renderer.render(documents):
+            statement = pending[pk]
+            statement.total_amount = totals[statement.member_id]
+            if pdf:
+                statement.pdf_file.save(
+                    PaymentService._statement_filename(statement), ContentFile(pdf), save=False,
+                )
+            statement.updated_at = timezone.now()
+            finished.append(statement)
+            done += 1
+            if len(finished) >= PaymentService.STATEMENT_SAVE_BATCH_SIZE:
+                GivingStatement.objects.bulk_update(finished, ['total_amount', 'pdf_file', 'updated_at'])
+                finished = []
+                if progress:
+                    progress(done, total)
+        GivingStatement.objects.bulk_update(finished, ['total_amount', 'pdf_file', 'updated_at'])
+        if progress:
+            progress(done, total)
+
+        logger.info(
+            "Payment statements %s..%s: %d members, %d already done, %s",
+            period_start, period_end, total, total - len(pending), renderer.throughput(),
+        )
         return statements
 
     # ─── ACH / Bank Transfer ─────────────────────────────────────────────────
@@ -61,32 +61,46 @@ def check_giving_goal_completion():
     from apps.payments.models import GivingGoal
     from apps.payments.services import PaymentService
     from apps.communication.models import Notification
+    from apps.members.models import Member
     from django.utils import timezone
 
     current_year = timezone.now().year
-    goals = GivingGoal.objects.filter(year=current_year, is_active=True)
-
-    for goal in goals:
-        progress = PaymentService.calculate_giving_goal_progress(goal.member, current_year)
-        if progress and progress['percentage'] >= 100:
-            # Check if notification already sent
-            existing = Notification.objects.filter(
-                member=goal.member,
-                title='Objectif de don atteint!',
-                created_at__year=current_year,
-            ).exists()
-            if not existing:
-                Notification.objects.create(
-                    member=goal.member,
-                    title='Objectif de don atteint!',
-                    message=(
-                        f'Félicitations! Vous avez atteint votre objectif de don de '
-                        f'{goal.target_amount:.2f} CAD pour {current_year}.'
-                    ),
-                    notification_type='donation',
-                    link='/payments/history/',
-                )
-                logger.info(f'Goal completion notification sent to {goal.member.full_name}')
+    targets = dict(
+        GivingGoal.objects.filter(year=current_year, is_active=True)
+        .values_list('member_id', 'target_amount')
+    )
+    totals = PaymentService.donor_totals(
+        *PaymentService.period_bounds(current_year), member_ids=list(targets),
+    )
+    reached = {
+        member_id: target for member_id, target in targets.items()
+        if member_id in totals
+        and PaymentService.goal_progress(target, totals[member_id])['percentage'] >= 100
+    }
+
+    # Skip members already congratulated this year
+    notified = set(
+        Notification.objects.filter(
+            member_id__in=list(reached),
+            title='Objectif de don atteint!',
+            created_at__year=current_year,
+        ).values_list('member_id', flat=True)
+    )
+    members = Member.objects.in_bulk([pk for pk in reached if pk not in notified])
+    created = Notification.objects.bulk_create([
+        Notification(
+            member=member,
+            title='Objectif de don atteint!',
+            message=(
+                f'Félicitations! Vous avez atteint votre objectif de don de '
+                f'{reached[member.pk]:.2f} CAD pour {current_year}.'
+            ),
+            notification_type='donation',
+            link='/payments/history/',
+        )
+        for member in members.values()
+    ], batch_size=500)
+    logger.info(f'Goal completion notifications sent to {len(created)} members')
 
 
 @shared_task
@@ -146,95 +160,60 @@ def tax_deadline_reminder():
 @shared_task
 def year_end_giving_summary():
     """Send year-end giving summary email to each member."""
-    from apps.payments.models import OnlinePayment, PaymentStatus
+    from apps.payments.services import PaymentService
     from apps.communication.models import Notification
-    from django.db.models import Sum
+    from apps.members.models import Member
     from django.utils import timezone
 
     current_year = timezone.now().year
+    totals = PaymentService.donor_totals(*PaymentService.period_bounds(current_year))
+    members = Member.objects.in_bulk(list(totals))
 
-    # Get all members who donated this year
-    member_ids = OnlinePayment.objects.filter(
-        status=PaymentStatus.SUCCEEDED,
-        created_at__year=current_year,
-        is_active=True,
-    ).values_list('member_id', flat=True).distinct()
-
-    from apps.members.models import Member
-
-    for member_id in member_ids:
-        member = Member.objects.filter(pk=member_id).first()
-        if not member:
-            continue
-
-        total = OnlinePayment.objects.filter(
-            member=member,
-            status=PaymentStatus.SUCCEEDED,
-            created_at__year=current_year,
-            is_active=True,
-        ).aggregate(total=Sum('amount'))['total']
-
-        Notification.objects.create(
+    Notification.objects.bulk_create([
+        Notification(
             member=member,
             title=f'Résumé de vos dons {current_year}',
             message=(
                 f'Merci pour votre générosité en {current_year}! '
-                f'Votre total de dons cette année: {total:.2f} CAD. '
+                f'Votre total de dons cette année: {totals[member.pk]:.2f} CAD. '
                 f'Votre relevé fiscal sera bientôt disponible.'
             ),
             notification_type='donation',
             link='/payments/history/',
         )
+        for member in members.values()
+    ], batch_size=500)
 
-    logger.info(f'Year-end summaries sent to {len(set(member_ids))} members')
+    logger.info(f'Year-end summaries sent to {len(members)} members')
 
 
 @shared_task
 def monthly_giving_summary():
     """Send monthly giving summary notification to each active donor."""
-    from apps.payments.models import OnlinePayment, PaymentStatus
+    from apps.payments.services import PaymentService
     from apps.communication.models import Notification
-    from django.db.models import Sum
-    from django.utils import timezone
-    from datetime import timedelta
-
-    now = timezone.now()
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    prev_month_end = month_start - timedelta(seconds=1)
-    prev_month_start = prev_month_end.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-    member_ids = OnlinePayment.objects.filter(
-        status=PaymentStatus.SUCCEEDED,
-        created_at__gte=prev_month_start,
-        created_at__lte=prev_month_end,
-        is_active=True,
-    ).values_list('member_id', flat=True).distinct()
-
     from apps.members.models import Member
+    from django.utils import timezone
 
-    for member_id in member_ids:
-        member = Member.objects.filter(pk=member_id).first()
-        if not member:
-            continue
-
-        total = OnlinePayment.objects.filter(
-            member=member,
-            status=PaymentStatus.SUCCEEDED,
-            created_at__gte=prev_month_start,
-            created_at__lte=prev_month_end,
-            is_active=True,
-        ).aggregate(total=Sum('amount'))['total']
+    today = timezone.localdate()
+    year, month = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+    prev_month_start, prev_month_end = PaymentService.period_bounds(year, month)
+    totals = PaymentService.donor_totals(prev_month_start, prev_month_end)
+    members = Member.objects.in_bulk(list(totals))
 
-        month_name = prev_month_start.strftime('%B %Y')
-        Notification.objects.create(
+    month_name = prev_month_start.strftime('%B %Y')
+    Notification.objects.bulk_create([
+        Notification(
             member=member,
             title=f'Résumé mensuel - {month_name}',
             message=(
-                f'Votre total de dons pour {month_name}: {total:.2f} CAD. '
+                f'Votre total de dons pour {month_name}: {totals[member.pk]:.2f} CAD. '
                 f'Merci pour votre fidélité!'
             ),
             notification_type='donation',
             link='/payments/history/',
         )
+        for member in members.values()
+    ], batch_size=500)
 
-    logger.info(f'Monthly summaries sent to {len(set(member_ids))} members')
+    logger.info(f'Monthly summaries sent to {len(members)} members')
@@ -11,6 +11,7 @@ from apps.payments.models import (
     OnlinePayment,
     RecurringDonation,
     PaymentStatus,
+    GivingStatement,
 )
 from apps.members.tests.factories import MemberFactory
 from apps.payments.tests.factories import (
@@ -564,3 +565,49 @@ class TestCancelRecurringDonation:
 
         recurring.refresh_from_db()
         assert recurring.is_active_subscription is False
+
+
+@pytest.mark.django_db
+class TestGenerateBulkStatements:
+    """Tests for PaymentService.generate_bulk_statements."""
+
+    def _run(self, **kwargs):
+        from datetime import date
+
+        with patch('apps.core.services_pdf.BulkPDFRenderer.available', return_value=True), \
+                patch('apps.core.services_pdf.html_to_pdf', return_value=b'%PDF-1.4') as mock_pdf:
+            statements = PaymentService.generate_bulk_statements(
+                date(2000, 1, 1), date(2100, 12, 31), 'annual', workers=1, **kwargs,
+            )
+        return statements, mock_pdf
+
+    def test_renders_one_statement_per_donor(self, settings, tmp_path, django_assert_max_num_queries):
+        settings.MEDIA_ROOT = str(tmp_path)
+        member = MemberFactory()
+        SucceededPaymentFactory(member=member, amount=Decimal('10.00'))
+        SucceededPaymentFactory(member=member, amount=Decimal('15.00'))
+        SucceededPaymentFactory(amount=Decimal('20.00'))
+
+        with django_assert_max_num_queries(6):
+            statements, mock_pdf = self._run()
+
+        assert len(statements) == 2
+        assert mock_pdf.call_count == 2
+        statement = GivingStatement.objects.get(member=member)
+        assert statement.total_amount == Decimal('25.00')
+        assert statement.pdf_file
+
+    def test_skips_unchanged_statements_and_rerenders_changed_ones(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        member = MemberFactory()
+        SucceededPaymentFactory(member=member, amount=Decimal('10.00'))
+        SucceededPaymentFactory(amount=Decimal('20.00'))
+        self._run()
+
+        _, mock_pdf = self._run()
+        assert mock_pdf.call_count == 0
+
+        SucceededPaymentFactory(member=member, amount=Decimal('5.00'))
+        _, mock_pdf = self._run()
+        assert mock_pdf.call_count == 1
+        assert GivingStatement.objects.get(member=member).total_amount == Decimal('15.00')
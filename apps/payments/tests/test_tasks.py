@@ -0,0 +1,118 @@
+"""Tests for the scheduled giving summary tasks."""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from apps.communication.models import Notification
+from apps.members.tests.factories import MemberFactory
+from apps.payments.models import GivingGoal, OnlinePayment
+from apps.payments.services import PaymentService
+from apps.payments.tasks import (
+    check_giving_goal_completion, monthly_giving_summary, year_end_giving_summary,
+)
+from apps.payments.tests.factories import FailedPaymentFactory, SucceededPaymentFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _last_month():
+    return timezone.localtime().replace(day=1, hour=12) - timedelta(days=1)
+
+
+class TestDonorTotals:
+    def test_groups_succeeded_payments_per_member(self, django_assert_num_queries):
+        member = MemberFactory()
+        SucceededPaymentFactory(member=member, amount=Decimal('40.00'))
+        SucceededPaymentFactory(member=member, amount=Decimal('60.00'))
+        FailedPaymentFactory(member=member, amount=Decimal('500.00'))
+        other = SucceededPaymentFactory(amount=Decimal('25.00')).member
+
+        with django_assert_num_queries(1):
+            totals = PaymentService.donor_totals(
+                *PaymentService.period_bounds(timezone.now().year),
+            )
+
+        assert totals == {member.pk: Decimal('100.00'), other.pk: Decimal('25.00')}
+
+    def test_leaves_out_soft_deleted_members(self):
+        payment = SucceededPaymentFactory()
+        payment.member.deleted_at = timezone.now()
+        payment.member.save()
+
+        assert PaymentService.donor_totals(
+            *PaymentService.period_bounds(timezone.now().year),
+        ) == {}
+
+    def test_month_bounds_wrap_december(self):
+        start, end = PaymentService.period_bounds(2025, 12)
+
+        assert (start.year, start.month, end.year, end.month) == (2025, 12, 2026, 1)
+
+
+class TestYearEndGivingSummary:
+    def test_one_notification_per_donor_with_total(self):
+        member = MemberFactory()
+        SucceededPaymentFactory(member=member, amount=Decimal('40.00'))
+        SucceededPaymentFactory(member=member, amount=Decimal('60.00'))
+
+        year_end_giving_summary()
+
+        notification = Notification.objects.get(member=member)
+        assert '100.00 CAD' in notification.message
+
+    def test_query_count_does_not_grow_with_donors(self, django_assert_max_num_queries):
+        for _ in range(10):
+            SucceededPaymentFactory()
+
+        with django_assert_max_num_queries(4):
+            year_end_giving_summary()
+
+        assert Notification.objects.count() == 10
+
+
+class TestMonthlyGivingSummary:
+    def test_counts_only_last_month(self):
+        member = MemberFactory()
+        old = SucceededPaymentFactory(member=member, amount=Decimal('30.00'))
+        SucceededPaymentFactory(member=member, amount=Decimal('99.00'))
+        OnlinePayment.objects.filter(pk=old.pk).update(created_at=_last_month())
+
+        monthly_giving_summary()
+
+        notification = Notification.objects.get(member=member)
+        assert notification.title.startswith('Résumé mensuel')
+        assert '30.00 CAD' in notification.message
+
+
+class TestGivingGoalCompletion:
+    def test_notifies_members_who_reached_their_goal_once(self):
+        year = timezone.now().year
+        reached = MemberFactory()
+        GivingGoal.objects.create(member=reached, year=year, target_amount=Decimal('100.00'))
+        SucceededPaymentFactory(member=reached, amount=Decimal('120.00'))
+        behind = MemberFactory()
+        GivingGoal.objects.create(member=behind, year=year, target_amount=Decimal('100.00'))
+        SucceededPaymentFactory(member=behind, amount=Decimal('20.00'))
+
+        check_giving_goal_completion()
+        check_giving_goal_completion()
+
+        assert list(
+            Notification.objects.filter(title='Objectif de don atteint!')
+            .values_list('member_id', flat=True)
+        ) == [reached.pk]
+
+    def test_goal_summary_counts_goals_met(self):
+        year = timezone.now().year
+        reached = MemberFactory()
+        GivingGoal.objects.create(member=reached, year=year, target_amount=Decimal('50.00'))
+        SucceededPaymentFactory(member=reached, amount=Decimal('50.00'))
+        GivingGoal.objects.create(member=MemberFactory(), year=year, target_amount=Decimal('50.00'))
+
+        summary = PaymentService.get_giving_goal_summary()
+
+        assert summary['goal_count'] == 2
+        assert summary['goals_met'] == 1
+        assert summary['total_pledged'] == Decimal('100.00')
@@ -1,6 +1,9 @@
 """Reports admin configuration."""
 from django.contrib import admin
-from .models import ReportSchedule, SavedReport
+from .models import (
+    ReportSchedule, SavedReport,
+    DailyDonationRollup, DailyAttendanceRollup, DailyMembershipRollup,
+)
 
 
 @admin.register(ReportSchedule)
@@ -19,3 +22,23 @@ class SavedReportAdmin(admin.ModelAdmin):
     search_fields = ['name']
     filter_horizontal = ['shared_with']
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(DailyDonationRollup)
+class DailyDonationRollupAdmin(admin.ModelAdmin):
+    list_display = ['date', 'donation_type', 'payment_method', 'total_amount', 'donation_count']
+    list_filter = ['donation_type', 'payment_method']
+    date_hierarchy = 'date'
+
+
+@admin.register(DailyAttendanceRollup)
+class DailyAttendanceRollupAdmin(admin.ModelAdmin):
+    list_display = ['date', 'session_type', 'campus', 'session_count', 'checkin_count']
+    list_filter = ['session_type', 'campus']
+    date_hierarchy = 'date'
+
+
+@admin.register(DailyMembershipRollup)
+class DailyMembershipRollupAdmin(admin.ModelAdmin):
+    list_display = ['date', 'new_members', 'total_members', 'active_members']
+    date_hierarchy = 'date'
@@ -6,3 +6,6 @@ class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.reports'
     verbose_name = 'Reports'
+
+    def ready(self):
+        import apps.reports.signals  # noqa: F401
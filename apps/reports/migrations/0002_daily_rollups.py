@@ -0,0 +1,206 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:30
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyMembershipRollup",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Indique si cet enregistrement est actif",
+                        verbose_name="Actif",
+                    ),
+                ),
+                ("date", models.DateField(unique=True, verbose_name="Date")),
+                (
+                    "new_members",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Nouveaux membres"
+                    ),
+                ),
+                (
+                    "total_members",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Total des membres"
+                    ),
+                ),
+                (
+                    "active_members",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Membres actifs"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Cumul quotidien des membres",
+                "verbose_name_plural": "Cumuls quotidiens des membres",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyAttendanceRollup",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Indique si cet enregistrement est actif",
+                        verbose_name="Actif",
+                    ),
+                ),
+                ("date", models.DateField(db_index=True, verbose_name="Date")),
+                (
+                    "session_type",
+                    models.CharField(max_length=30, verbose_name="Type de session"),
+                ),
+                (
+                    "campus",
+                    models.CharField(blank=True, max_length=100, verbose_name="Campus"),
+                ),
+                (
+                    "session_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Sessions"),
+                ),
+                (
+                    "checkin_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Presences"),
+                ),
+            ],
+            options={
+                "verbose_name": "Cumul quotidien des presences",
+                "verbose_name_plural": "Cumuls quotidiens des presences",
+                "ordering": ["-date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "session_type", "campus"),
+                        name="unique_daily_attendance_rollup",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyDonationRollup",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Date de modification"
+                    ),
+                ),
+                (
+                    "is_active",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Indique si cet enregistrement est actif",
+                        verbose_name="Actif",
+                    ),
+                ),
+                ("date", models.DateField(db_index=True, verbose_name="Date")),
+                (
+                    "donation_type",
+                    models.CharField(max_length=20, verbose_name="Type de don"),
+                ),
+                (
+                    "payment_method",
+                    models.CharField(max_length=20, verbose_name="Mode de paiement"),
+                ),
+                (
+                    "total_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Montant total",
+                    ),
+                ),
+                (
+                    "donation_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Nombre de dons"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Cumul quotidien des dons",
+                "verbose_name_plural": "Cumuls quotidiens des dons",
+                "ordering": ["-date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "donation_type", "payment_method"),
+                        name="unique_daily_donation_rollup",
+                    )
+                ],
+            },
+        ),
+    ]
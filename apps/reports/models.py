@@ -105,3 +105,70 @@ class SavedReport(BaseModel):
 
     def __str__(self):
         return f'{self.name} ({self.get_report_type_display()})'
+
+
+class DailyDonationRollup(BaseModel):
+    """Per-day donation totals by type and payment method."""
+    date = models.DateField(db_index=True, verbose_name=_('Date'))
+    donation_type = models.CharField(max_length=20, verbose_name=_('Type de don'))
+    payment_method = models.CharField(max_length=20, verbose_name=_('Mode de paiement'))
+    total_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, verbose_name=_('Montant total'),
+    )
+    donation_count = models.PositiveIntegerField(default=0, verbose_name=_('Nombre de dons'))
+
+    class Meta:
+        verbose_name = _('Cumul quotidien des dons')
+        verbose_name_plural = _('Cumuls quotidiens des dons')
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'donation_type', 'payment_method'],
+                name='unique_daily_donation_rollup',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.date} {self.donation_type}/{self.payment_method}: {self.total_amount}'
+
+
+class DailyAttendanceRollup(BaseModel):
+    """Per-day session and check-in counts by session type and campus."""
+    date = models.DateField(db_index=True, verbose_name=_('Date'))
+    session_type = models.CharField(max_length=30, verbose_name=_('Type de session'))
+    campus = models.CharField(max_length=100, blank=True, verbose_name=_('Campus'))
+    session_count = models.PositiveIntegerField(default=0, verbose_name=_('Sessions'))
+    checkin_count = models.PositiveIntegerField(default=0, verbose_name=_('Presences'))
+
+    class Meta:
+        verbose_name = _('Cumul quotidien des presences')
+        verbose_name_plural = _('Cumuls quotidiens des presences')
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'session_type', 'campus'],
+                name='unique_daily_attendance_rollup',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.date} {self.session_type}: {self.checkin_count}'
+
+
+class DailyMembershipRollup(BaseModel):
+    """
+    Per-day membership counts. One row exists for every rolled-up day,
+    so the latest date doubles as the rollup watermark.
+    """
+    date = models.DateField(unique=True, verbose_name=_('Date'))
+    new_members = models.PositiveIntegerField(default=0, verbose_name=_('Nouveaux membres'))
+    total_members = models.PositiveIntegerField(default=0, verbose_name=_('Total des membres'))
+    active_members = models.PositiveIntegerField(default=0, verbose_name=_('Membres actifs'))
+
+    class Meta:
+        verbose_name = _('Cumul quotidien des membres')
+        verbose_name_plural = _('Cumuls quotidiens des membres')
+        ordering = ['-date']
+
+    def __str__(self):
+        return f'{self.date}: +{self.new_members} ({self.total_members})'
@@ -1,51 +1,62 @@
 """Reports services."""
 from datetime import date, timedelta
 from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Count, Sum, Avg, Q
 from django.db.models.functions import TruncMonth, TruncYear, ExtractMonth
 from django.utils import timezone
 
 
 class DashboardService:
-    """Aggregates statistics for the admin dashboard."""
+    """Aggregates statistics for the admin dashboard.
+
+    Each widget is computed with a handful of conditional aggregates
+    (``Count(filter=Q(...))``) instead of one COUNT per figure, and
+    ``get_dashboard_summary`` memoizes every section in the cache for
+    ``DASHBOARD_CACHE_TIMEOUT`` seconds.
+    """
+
+    CACHE_PREFIX = 'reports:dashboard'
+    SECTIONS = ('members', 'donations', 'events', 'volunteers', 'help_requests')
 
     @staticmethod
-    def get_member_stats():
+    def get_member_stats(now=None):
         from apps.members.models import Member
 
-        total = Member.objects.count()
-        active = Member.objects.filter(is_active=True).count()
-        new_this_month = Member.objects.filter(
-            created_at__month=timezone.now().month,
-            created_at__year=timezone.now().year
-        ).count()
-        new_this_year = Member.objects.filter(
-            created_at__year=timezone.now().year
-        ).count()
+        now = now or timezone.now()
+        counts = Member.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+            new_this_month=Count('id', filter=Q(
+                created_at__year=now.year, created_at__month=now.month,
+            )),
+            new_this_year=Count('id', filter=Q(created_at__year=now.year)),
+        )
 
         role_breakdown = Member.objects.values('role').annotate(
             count=Count('id')
         ).order_by('role')
 
         return {
-            'total': total,
-            'active': active,
-            'inactive': total - active,
-            'new_this_month': new_this_month,
-            'new_this_year': new_this_year,
+            'total': counts['total'],
+            'active': counts['active'],
+            'inactive': counts['total'] - counts['active'],
+            'new_this_month': counts['new_this_month'],
+            'new_this_year': counts['new_this_year'],
             'role_breakdown': list(role_breakdown),
         }
 
     @staticmethod
-    def get_donation_stats(year=None):
+    def get_donation_stats(year=None, now=None):
         from apps.donations.models import Donation
 
-        year = year or timezone.now().year
+        year = year or (now or timezone.now()).year
         donations = Donation.objects.filter(date__year=year)
 
-        total_amount = donations.aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        total_count = donations.count()
-        average_amount = donations.aggregate(avg=Avg('amount'))['avg'] or Decimal('0')
+        totals = donations.aggregate(
+            total=Sum('amount'), count=Count('id'), avg=Avg('amount'),
+        )
 
         monthly = donations.annotate(
             month=TruncMonth('date')
@@ -66,54 +77,57 @@ class DashboardService:
 
         return {
             'year': year,
-            'total_amount': total_amount,
-            'total_count': total_count,
-            'average_amount': average_amount,
+            'total_amount': totals['total'] or Decimal('0'),
+            'total_count': totals['count'],
+            'average_amount': totals['avg'] or Decimal('0'),
             'monthly_breakdown': list(monthly),
             'by_type': list(by_type),
             'by_payment_method': list(by_method),
         }
 
     @staticmethod
-    def get_event_stats(year=None):
+    def get_event_stats(year=None, now=None):
         from apps.events.models import Event, EventRSVP
 
-        year = year or timezone.now().year
-        events = Event.objects.filter(start_datetime__year=year)
+        now = now or timezone.now()
+        year = year or now.year
+        in_year = Q(start_datetime__year=year)
 
-        total_events = events.count()
-        upcoming = Event.objects.filter(
-            start_datetime__gte=timezone.now(),
-            is_cancelled=False
-        ).count()
-        cancelled = events.filter(is_cancelled=True).count()
+        counts = Event.objects.aggregate(
+            total_events=Count('id', filter=in_year),
+            upcoming=Count('id', filter=Q(start_datetime__gte=now, is_cancelled=False)),
+            cancelled=Count('id', filter=in_year & Q(is_cancelled=True)),
+        )
 
-        by_type = events.values('event_type').annotate(
+        by_type = Event.objects.filter(in_year).values('event_type').annotate(
             count=Count('id')
         ).order_by('-count')
 
-        rsvps = EventRSVP.objects.filter(event__start_datetime__year=year)
-        total_rsvps = rsvps.count()
-        confirmed_rsvps = rsvps.filter(status='confirmed').count()
+        rsvps = EventRSVP.objects.filter(event__start_datetime__year=year).aggregate(
+            total=Count('id'),
+            confirmed=Count('id', filter=Q(status='confirmed')),
+        )
 
         return {
             'year': year,
-            'total_events': total_events,
-            'upcoming': upcoming,
-            'cancelled': cancelled,
+            'total_events': counts['total_events'],
+            'upcoming': counts['upcoming'],
+            'cancelled': counts['cancelled'],
             'by_type': list(by_type),
-            'total_rsvps': total_rsvps,
-            'confirmed_rsvps': confirmed_rsvps,
+            'total_rsvps': rsvps['total'],
+            'confirmed_rsvps': rsvps['confirmed'],
         }
 
     @staticmethod
-    def get_volunteer_stats():
+    def get_volunteer_stats(now=None):
         from apps.volunteers.models import (
             VolunteerPosition, VolunteerSchedule, VolunteerAvailability
         )
 
-        positions = VolunteerPosition.objects.filter(is_active=True)
-        total_positions = positions.count()
+        now = now or timezone.now()
+        today = date.today()
+
+        total_positions = VolunteerPosition.objects.filter(is_active=True).count()
 
         availability = VolunteerAvailability.objects.filter(
             is_available=True
@@ -121,42 +135,42 @@ class DashboardService:
             count=Count('member', distinct=True)
         ).order_by('-count')
 
-        upcoming_schedules = VolunteerSchedule.objects.filter(
-            date__gte=date.today(),
-            date__lte=date.today() + timedelta(days=30)
-        ).count()
-
-        this_month = VolunteerSchedule.objects.filter(
-            date__month=timezone.now().month,
-            date__year=timezone.now().year
+        this_month = Q(date__year=now.year, date__month=now.month)
+        schedules = VolunteerSchedule.objects.aggregate(
+            upcoming=Count('id', filter=Q(
+                date__gte=today, date__lte=today + timedelta(days=30),
+            )),
+            confirmed=Count('id', filter=this_month & Q(status='confirmed')),
+            pending=Count('id', filter=this_month & Q(status='scheduled')),
         )
-        confirmed = this_month.filter(status='confirmed').count()
-        pending = this_month.filter(status='scheduled').count()
 
         return {
             'total_positions': total_positions,
             'volunteers_by_position': list(availability),
-            'upcoming_schedules': upcoming_schedules,
-            'confirmed_this_month': confirmed,
-            'pending_this_month': pending,
+            'upcoming_schedules': schedules['upcoming'],
+            'confirmed_this_month': schedules['confirmed'],
+            'pending_this_month': schedules['pending'],
         }
 
     @staticmethod
-    def get_help_request_stats():
+    def get_help_request_stats(now=None):
         from apps.help_requests.models import HelpRequest
 
-        total = HelpRequest.objects.count()
-        open_requests = HelpRequest.objects.filter(
-            status__in=['new', 'in_progress']
-        ).count()
-        resolved_this_month = HelpRequest.objects.filter(
-            status='resolved',
-            resolved_at__month=timezone.now().month,
-            resolved_at__year=timezone.now().year
-        ).count()
+        now = now or timezone.now()
+        open_statuses = ['new', 'in_progress']
+
+        counts = HelpRequest.objects.aggregate(
+            total=Count('id'),
+            open=Count('id', filter=Q(status__in=open_statuses)),
+            resolved_this_month=Count('id', filter=Q(
+                status='resolved',
+                resolved_at__year=now.year,
+                resolved_at__month=now.month,
+            )),
+        )
 
         by_urgency = HelpRequest.objects.filter(
-            status__in=['new', 'in_progress']
+            status__in=open_statuses
         ).values('urgency').annotate(
             count=Count('id')
         ).order_by('urgency')
@@ -168,9 +182,9 @@ class DashboardService:
         ).order_by('-count')
 
         return {
-            'total': total,
-            'open': open_requests,
-            'resolved_this_month': resolved_this_month,
+            'total': counts['total'],
+            'open': counts['open'],
+            'resolved_this_month': counts['resolved_this_month'],
             'by_urgency': list(by_urgency),
             'by_category': list(by_category),
         }
@@ -192,16 +206,39 @@ class DashboardService:
         ]
 
     @staticmethod
-    def get_dashboard_summary():
-        return {
-            'members': DashboardService.get_member_stats(),
-            'donations': DashboardService.get_donation_stats(),
-            'events': DashboardService.get_event_stats(),
-            'volunteers': DashboardService.get_volunteer_stats(),
-            'help_requests': DashboardService.get_help_request_stats(),
-            'upcoming_birthdays': DashboardService.get_upcoming_birthdays(),
-            'generated_at': timezone.now().isoformat(),
+    def _cached_section(name, compute, use_cache=True):
+        """Return a dashboard section from the cache, computing it on a miss."""
+        if not use_cache:
+            return compute()
+        key = f'{DashboardService.CACHE_PREFIX}:{name}'
+        timeout = getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 60)
+        return cache.get_or_set(key, compute, timeout)
+
+    @staticmethod
+    def invalidate_cache():
+        """Drop every memoized dashboard section."""
+        cache.delete_many([
+            f'{DashboardService.CACHE_PREFIX}:{name}'
+            for name in DashboardService.SECTIONS
+        ])
+
+    @staticmethod
+    def get_dashboard_summary(use_cache=True):
+        now = timezone.now()
+        computers = {
+            'members': lambda: DashboardService.get_member_stats(now=now),
+            'donations': lambda: DashboardService.get_donation_stats(now=now),
+            'events': lambda: DashboardService.get_event_stats(now=now),
+            'volunteers': lambda: DashboardService.get_volunteer_stats(now=now),
+            'help_requests': lambda: DashboardService.get_help_request_stats(now=now),
         }
+        summary = {
+            name: DashboardService._cached_section(name, compute, use_cache)
+            for name, compute in computers.items()
+        }
+        summary['upcoming_birthdays'] = DashboardService.get_upcoming_birthdays()
+        summary['generated_at'] = now.isoformat()
+        return summary
 
     @staticmethod
     def get_onboarding_pipeline_stats():
@@ -209,51 +246,39 @@ class DashboardService:
         from apps.members.models import Member
         from apps.core.constants import MembershipStatus
 
-        return {
-            'registered': Member.objects.filter(
+        counts = Member.objects.aggregate(
+            registered=Count('id', filter=Q(
                 membership_status=MembershipStatus.REGISTERED
-            ).count(),
-            'form_submitted': Member.objects.filter(
+            )),
+            form_submitted=Count('id', filter=Q(
                 membership_status=MembershipStatus.FORM_SUBMITTED
-            ).count(),
-            'in_training': Member.objects.filter(
+            )),
+            in_training=Count('id', filter=Q(
                 membership_status=MembershipStatus.IN_TRAINING
-            ).count(),
-            'interview_scheduled': Member.objects.filter(
+            )),
+            interview_scheduled=Count('id', filter=Q(
                 membership_status=MembershipStatus.INTERVIEW_SCHEDULED
-            ).count(),
-            'total_in_process': Member.objects.filter(
+            )),
+            total_in_process=Count('id', filter=Q(
                 membership_status__in=MembershipStatus.IN_PROCESS
-            ).count(),
-        }
+            )),
+        )
+        return counts
 
     @staticmethod
     def get_financial_summary():
         """Monthly giving trend for dashboard financial widget."""
+        from apps.core.services_timeseries import TimeSeriesService
         from apps.donations.models import Donation
 
-        now = timezone.now()
-        months_data = []
-        for i in range(5, -1, -1):
-            month_start = (now - timedelta(days=30 * i)).replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
-            )
-            if i > 0:
-                month_end = (now - timedelta(days=30 * (i - 1))).replace(
-                    day=1, hour=0, minute=0, second=0, microsecond=0
-                )
-            else:
-                month_end = now
-
-            total = Donation.objects.filter(
-                date__gte=month_start.date(),
-                date__lt=month_end.date() if i > 0 else (now.date() + timedelta(days=1)),
-            ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-
-            months_data.append({
-                'month': month_start.strftime('%b %Y'),
-                'total': float(total),
-            })
+        start, end = TimeSeriesService.last_periods(6, 'month')
+        series = TimeSeriesService.series(
+            Donation, 'date', Sum('amount'), 'month', start, end,
+        )
+        months_data = [
+            {'month': TimeSeriesService.label(point['period']), 'total': float(point['value'])}
+            for point in series
+        ]
 
         return {
             'monthly_trend': months_data,
@@ -262,35 +287,24 @@ class DashboardService:
         }
 
     @staticmethod
-    def get_member_growth_trend():
+    def get_member_growth_trend(use_rollups=False):
         """Monthly member registrations for the last 12 months."""
+        from apps.core.services_timeseries import TimeSeriesService
         from apps.members.models import Member
 
-        now = timezone.now()
-        labels = []
-        counts = []
-        for i in range(11, -1, -1):
-            month_start = (now - timedelta(days=30 * i)).replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
-            )
-            if i > 0:
-                month_end = (now - timedelta(days=30 * (i - 1))).replace(
-                    day=1, hour=0, minute=0, second=0, microsecond=0
-                )
-            else:
-                month_end = now
-
-            count = Member.objects.filter(
-                created_at__gte=month_start,
-                created_at__lt=month_end if i > 0 else (now + timedelta(days=1)),
-            ).count()
+        start, end = TimeSeriesService.last_periods(12, 'month')
+        if use_rollups:
+            from apps.reports.services_rollup import RollupService
 
-            labels.append(month_start.strftime('%b %Y'))
-            counts.append(count)
+            series = RollupService.member_growth(start, end, 'month')
+        else:
+            series = TimeSeriesService.series(
+                Member, 'created_at', Count('id'), 'month', start, end,
+            )
 
         return {
-            'labels': labels,
-            'counts': counts,
+            'labels': [TimeSeriesService.label(point['period']) for point in series],
+            'counts': [point['value'] for point in series],
         }
 
 
@@ -463,31 +477,36 @@ class ReportService:
 
     @staticmethod
     def get_communication_stats():
-        """Get newsletter/communication analytics for Chart.js."""
-        from apps.communication.models import Newsletter, NewsletterRecipient
-
-        newsletters = Newsletter.objects.filter(status='sent').order_by('sent_at')
-
-        monthly_sends = {}
-        monthly_opens = {}
-        for nl in newsletters:
-            if nl.sent_at:
-                key = nl.sent_at.strftime('%b %Y')
-                monthly_sends[key] = monthly_sends.get(key, 0) + 1
-                monthly_opens[key] = monthly_opens.get(key, 0) + nl.opened_count
-
-        labels = list(monthly_sends.keys())[-12:]
-        sends = [monthly_sends.get(l, 0) for l in labels]
-        opens = [monthly_opens.get(l, 0) for l in labels]
-
-        total_sent = Newsletter.objects.filter(status='sent').count()
-        total_recipients = NewsletterRecipient.objects.filter(
-            newsletter__status='sent'
-        ).count()
-        total_opened = NewsletterRecipient.objects.filter(
-            newsletter__status='sent',
-            opened_at__isnull=False,
-        ).count()
+        """Get newsletter/communication analytics for Chart.js.
+
+        Reads the per-newsletter ``recipients_count``/``opened_count``
+        counters (kept up to date by the delivery pipeline and the open
+        flush) instead of scanning NewsletterRecipient.
+        """
+        from apps.communication.models import Newsletter
+
+        sent = Newsletter.objects.filter(status='sent')
+
+        monthly = list(
+            sent.filter(sent_at__isnull=False)
+            .annotate(month=TruncMonth('sent_at'))
+            .values('month')
+            .annotate(sends=Count('id'), opens=Sum('opened_count'))
+            .order_by('month')
+        )[-12:]
+
+        labels = [row['month'].strftime('%b %Y') for row in monthly]
+        sends = [row['sends'] for row in monthly]
+        opens = [row['opens'] or 0 for row in monthly]
+
+        totals = sent.aggregate(
+            total_sent=Count('id'),
+            total_recipients=Sum('recipients_count'),
+            total_opened=Sum('opened_count'),
+        )
+        total_sent = totals['total_sent']
+        total_recipients = totals['total_recipients'] or 0
+        total_opened = totals['total_opened'] or 0
         open_rate = round(total_opened / total_recipients * 100, 1) if total_recipients > 0 else 0
 
         return {
@@ -580,6 +599,7 @@ class ReportService:
     @staticmethod
     def get_giving_trends():
         """Donor retention, avg gift size trend, lapsed donors, frequency."""
+        from apps.core.services_timeseries import TimeSeriesService
         from apps.donations.models import Donation
 
         now = timezone.now()
@@ -603,26 +623,12 @@ class ReportService:
         lapsed_count = len(lapsed)
 
         # Average gift size per month (last 12 months)
-        avg_labels = []
-        avg_values = []
-        for i in range(11, -1, -1):
-            month_start = (now - timedelta(days=30 * i)).replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
-            )
-            if i > 0:
-                month_end = (now - timedelta(days=30 * (i - 1))).replace(
-                    day=1, hour=0, minute=0, second=0, microsecond=0
-                )
-            else:
-                month_end = now + timedelta(days=1)
-
-            avg = Donation.objects.filter(
-                date__gte=month_start.date(),
-                date__lt=month_end.date(),
-            ).aggregate(avg=Avg('amount'))['avg'] or Decimal('0')
-
-            avg_labels.append(month_start.strftime('%b %Y'))
-            avg_values.append(float(avg))
+        start, end = TimeSeriesService.last_periods(12, 'month')
+        avg_series = TimeSeriesService.series(
+            Donation, 'date', Avg('amount'), 'month', start, end,
+        )
+        avg_labels = [TimeSeriesService.label(point['period']) for point in avg_series]
+        avg_values = [float(point['value']) for point in avg_series]
 
         # Giving frequency distribution
         from django.db.models import Count as DjCount
@@ -663,38 +669,21 @@ class ReportService:
     @staticmethod
     def get_predictive_analytics():
         """Forecast giving and membership growth using simple linear regression."""
+        from apps.core.services_timeseries import TimeSeriesService
         from apps.donations.models import Donation
         from apps.members.models import Member
 
-        now = timezone.now()
-
         # Collect monthly totals for last 12 months
-        donation_values = []
-        member_values = []
-        labels = []
-        for i in range(11, -1, -1):
-            month_start = (now - timedelta(days=30 * i)).replace(
-                day=1, hour=0, minute=0, second=0, microsecond=0
-            )
-            if i > 0:
-                month_end = (now - timedelta(days=30 * (i - 1))).replace(
-                    day=1, hour=0, minute=0, second=0, microsecond=0
-                )
-            else:
-                month_end = now + timedelta(days=1)
-
-            total = Donation.objects.filter(
-                date__gte=month_start.date(),
-                date__lt=month_end.date(),
-            ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-            donation_values.append(float(total))
-
-            member_count = Member.objects.filter(
-                created_at__gte=month_start,
-                created_at__lt=month_end,
-            ).count()
-            member_values.append(member_count)
-            labels.append(month_start.strftime('%b %Y'))
+        start, end = TimeSeriesService.last_periods(12, 'month')
+        donation_series = TimeSeriesService.series(
+            Donation, 'date', Sum('amount'), 'month', start, end,
+        )
+        member_series = TimeSeriesService.series(
+            Member, 'created_at', Count('id'), 'month', start, end,
+        )
+        donation_values = [float(point['value']) for point in donation_series]
+        member_values = [point['value'] for point in member_series]
+        labels = [TimeSeriesService.label(point['period']) for point in donation_series]
 
         def _linear_forecast(values, periods=3):
             """Simple linear regression forecast."""
@@ -724,10 +713,11 @@ class ReportService:
         member_forecast = _linear_forecast(member_values, 3)
 
         # Generate future labels
-        forecast_labels = []
-        for j in range(1, 4):
-            future = now + timedelta(days=30 * j)
-            forecast_labels.append(future.strftime('%b %Y'))
+        step = TimeSeriesService.STEPS['month']
+        last_period = donation_series[-1]['period']
+        forecast_labels = [
+            TimeSeriesService.label(last_period + step * j) for j in range(1, 4)
+        ]
 
         return {
             'historical_labels': labels,
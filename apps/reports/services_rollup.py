@@ -0,0 +1,327 @@
+"""Daily rollup maintenance and rollup-backed analytics queries."""
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class RollupService:
+    """
+    Maintains the Daily*Rollup tables and answers analytics queries from them.
+
+    Closed days (up to the watermark) are read from the rollups; anything
+    after the watermark, typically today, is read from the raw tables.
+    """
+
+    CHUNK_DAYS = 31
+    WATERMARK_CACHE_KEY = 'reports:rollup:watermark'
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def watermark(cls):
+        """Return the last rolled-up day, or None if no rollup exists yet."""
+        from .models import DailyMembershipRollup
+
+        cached = cache.get(cls.WATERMARK_CACHE_KEY)
+        if cached is not None:
+            return date.fromisoformat(cached) if cached else None
+        last = DailyMembershipRollup.objects.aggregate(last=Max('date'))['last']
+        cache.set(cls.WATERMARK_CACHE_KEY, last.isoformat() if last else '', None)
+        return last
+
+    @staticmethod
+    def _earliest_data_date():
+        from apps.attendance.models import AttendanceSession
+        from apps.donations.models import Donation
+        from apps.members.models import Member
+
+        candidates = [
+            Donation.objects.aggregate(first=Min('date'))['first'],
+            AttendanceSession.objects.aggregate(first=Min('date'))['first'],
+        ]
+        first_member = Member.objects.aggregate(first=Min('created_at'))['first']
+        if first_member:
+            candidates.append(timezone.localtime(first_member).date())
+        candidates = [c for c in candidates if c]
+        return min(candidates) if candidates else None
+
+    @classmethod
+    def refresh(cls, until=None):
+        """
+        Incrementally roll up every closed day after the watermark.
+
+        Returns the number of days rolled up.
+        """
+        until = until or timezone.localdate() - timedelta(days=1)
+        last = cls.watermark()
+        start = last + timedelta(days=1) if last else cls._earliest_data_date()
+        if start is None or start > until:
+            return 0
+
+        days = 0
+        chunk_start = start
+        while chunk_start <= until:
+            chunk_end = min(chunk_start + timedelta(days=cls.CHUNK_DAYS - 1), until)
+            cls.rebuild_range(chunk_start, chunk_end)
+            days += (chunk_end - chunk_start).days + 1
+            chunk_start = chunk_end + timedelta(days=1)
+        logger.info('Rolled up %d day(s) from %s to %s', days, start, until)
+        return days
+
+    @classmethod
+    def rebuild_range(cls, start, end):
+        """Recompute every rollup for [start, end] with one grouped query per table."""
+        with transaction.atomic():
+            cls._rebuild_donations(start, end)
+            cls._rebuild_attendance(start, end)
+            cls._rebuild_membership(start, end)
+        cache.delete(cls.WATERMARK_CACHE_KEY)
+
+    @classmethod
+    def rebuild_day(cls, day):
+        cls.rebuild_range(day, day)
+
+    @staticmethod
+    def _rebuild_donations(start, end):
+        from apps.donations.models import Donation
+        from .models import DailyDonationRollup
+
+        rows = (
+            Donation.objects.filter(date__gte=start, date__lte=end, is_active=True)
+            .values('date', 'donation_type', 'payment_method')
+            .annotate(total=Sum('amount'), count=Count('id'))
+        )
+        DailyDonationRollup.all_objects.filter(date__gte=start, date__lte=end).delete()
+        DailyDonationRollup.objects.bulk_create([
+            DailyDonationRollup(
+                date=row['date'],
+                donation_type=row['donation_type'],
+                payment_method=row['payment_method'],
+                total_amount=row['total'] or Decimal('0'),
+                donation_count=row['count'],
+            )
+            for row in rows
+        ])
+
+    @staticmethod
+    def _rebuild_attendance(start, end):
+        from apps.attendance.models import AttendanceRecord, AttendanceSession
+        from .models import DailyAttendanceRollup
+
+        buckets = defaultdict(lambda: {'session_count': 0, 'checkin_count': 0})
+        sessions = (
+            AttendanceSession.objects.filter(date__gte=start, date__lte=end)
+            .values('date', 'session_type', 'event__campus')
+            .annotate(count=Count('id'))
+        )
+        for row in sessions:
+            key = (row['date'], row['session_type'], row['event__campus'] or '')
+            buckets[key]['session_count'] += row['count']
+
+        checkins = (
+            AttendanceRecord.objects.filter(session__date__gte=start, session__date__lte=end)
+            .values('session__date', 'session__session_type', 'session__event__campus')
+            .annotate(count=Count('id'))
+        )
+        for row in checkins:
+            key = (
+                row['session__date'],
+                row['session__session_type'],
+                row['session__event__campus'] or '',
+            )
+            buckets[key]['checkin_count'] += row['count']
+
+        DailyAttendanceRollup.all_objects.filter(date__gte=start, date__lte=end).delete()
+        DailyAttendanceRollup.objects.bulk_create([
+            DailyAttendanceRollup(
+                date=day, session_type=session_type, campus=campus, **counts
+            )
+            for (day, session_type, campus), counts in buckets.items()
+        ])
+
+    @staticmethod
+    def _rebuild_membership(start, end):
+        from apps.members.models import Member
+        from .models import DailyMembershipRollup
+
+        tz = timezone.get_current_timezone()
+        lower = timezone.make_aware(datetime.combine(start, time.min), tz)
+        upper = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+
+        base = Member.objects.filter(created_at__lt=lower).aggregate(
+            total=Count('id'), active=Count('id', filter=Q(is_active=True)),
+        )
+        per_day = {
+            row['day']: row
+            for row in Member.objects.filter(created_at__gte=lower, created_at__lt=upper)
+            .annotate(day=TruncDate('created_at'))
+            .values('day')
+            .annotate(new=Count('id'), active=Count('id', filter=Q(is_active=True)))
+        }
+
+        total, active = base['total'], base['active']
+        rollups = []
+        day = start
+        while day <= end:
+            row = per_day.get(day)
+            new = row['new'] if row else 0
+            total += new
+            active += row['active'] if row else 0
+            rollups.append(DailyMembershipRollup(
+                date=day, new_members=new, total_members=total, active_members=active,
+            ))
+            day += timedelta(days=1)
+
+        DailyMembershipRollup.all_objects.filter(date__gte=start, date__lte=end).delete()
+        DailyMembershipRollup.objects.bulk_create(rollups)
+
+    @classmethod
+    def refresh_day_if_closed(cls, day):
+        """Rebuild a day whose raw rows changed after it was rolled up."""
+        if day is None:
+            return False
+        if day >= timezone.localdate():
+            return False
+        last = cls.watermark()
+        if last is None or day > last:
+            return False
+        cls.rebuild_day(day)
+        return True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _merge(*row_sets, keys):
+        """Sum numeric columns of several grouped result sets by 'period'."""
+        merged = {}
+        for rows in row_sets:
+            for row in rows:
+                bucket = merged.setdefault(row['period'], {key: 0 for key in keys})
+                for key in keys:
+                    bucket[key] += row[key] or 0
+        return [
+            {'period': period, **merged[period]}
+            for period in sorted(merged)
+        ]
+
+    @classmethod
+    def donation_trends(cls, granularity='month', year=None):
+        """
+        Donation totals per period; same shape as GivingAnalyticsService.giving_trends.
+        """
+        from apps.core.services_timeseries import TimeSeriesService
+        from apps.donations.models import Donation
+        from .models import DailyDonationRollup
+
+        trunc = TimeSeriesService.TRUNCATORS[granularity]
+        last = cls.watermark()
+
+        closed = DailyDonationRollup.objects.all()
+        raw = Donation.objects.filter(is_active=True)
+        if year:
+            closed = closed.filter(date__year=year)
+            raw = raw.filter(date__year=year)
+        if last:
+            closed = closed.filter(date__lte=last)
+            raw = raw.filter(date__gt=last)
+        else:
+            closed = closed.none()
+
+        closed_rows = closed.annotate(period=trunc('date')).values('period').annotate(
+            total=Sum('total_amount'), count=Sum('donation_count'),
+        ).order_by()
+        raw_rows = raw.annotate(period=trunc('date')).values('period').annotate(
+            total=Sum('amount'), count=Count('id'),
+        ).order_by()
+
+        results = cls._merge(closed_rows, raw_rows, keys=('total', 'count'))
+        for row in results:
+            row['avg'] = row['total'] / row['count'] if row['count'] else Decimal('0')
+        return results
+
+    @classmethod
+    def attendance_trends(cls, granularity='week', start_date=None):
+        """Check-in counts per period since ``start_date``."""
+        from apps.attendance.models import AttendanceRecord
+        from apps.core.services_timeseries import TimeSeriesService
+        from .models import DailyAttendanceRollup
+
+        trunc = TimeSeriesService.TRUNCATORS[granularity]
+        last = cls.watermark()
+
+        closed = DailyAttendanceRollup.objects.all()
+        raw = AttendanceRecord.objects.all()
+        if start_date:
+            closed = closed.filter(date__gte=start_date)
+            raw = raw.filter(session__date__gte=start_date)
+        if last:
+            closed = closed.filter(date__lte=last)
+            raw = raw.filter(session__date__gt=last)
+        else:
+            closed = closed.none()
+
+        closed_rows = closed.annotate(period=trunc('date')).values('period').annotate(
+            count=Sum('checkin_count'),
+        ).order_by()
+        raw_rows = raw.annotate(period=trunc('session__date')).values('period').annotate(
+            count=Count('id'),
+        ).order_by()
+
+        return cls._merge(closed_rows, raw_rows, keys=('count',))
+
+    @classmethod
+    def member_growth(cls, start, end, granularity='month'):
+        """New member counts per period over [start, end], gap-filled."""
+        from apps.core.services_timeseries import TimeSeriesService
+        from apps.members.models import Member
+        from .models import DailyMembershipRollup
+
+        trunc = TimeSeriesService.TRUNCATORS[granularity]
+        last = cls.watermark()
+        start = TimeSeriesService.period_start(start, granularity)
+
+        closed_rows = []
+        raw_start = start
+        if last and last >= start:
+            closed_rows = DailyMembershipRollup.objects.filter(
+                date__gte=start, date__lte=min(last, end),
+            ).annotate(period=trunc('date')).values('period').annotate(
+                count=Sum('new_members'),
+            ).order_by()
+            raw_start = last + timedelta(days=1)
+
+        raw_rows = []
+        if raw_start <= end:
+            tz = timezone.get_current_timezone()
+            lower = timezone.make_aware(datetime.combine(raw_start, time.min), tz)
+            upper = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz)
+            raw_rows = [
+                {
+                    'period': TimeSeriesService.period_start(row['period'], granularity),
+                    'count': row['count'],
+                }
+                for row in Member.objects.filter(created_at__gte=lower, created_at__lt=upper)
+                .annotate(period=trunc('created_at')).values('period')
+                .annotate(count=Count('id')).order_by()
+            ]
+
+        counts = {row['period']: row['count'] for row in cls._merge(
+            closed_rows, raw_rows, keys=('count',),
+        )}
+        return [
+            {'period': period, 'value': counts.get(period, 0)}
+            for period in TimeSeriesService.periods(start, end, granularity)
+        ]
@@ -0,0 +1,47 @@
+"""Signals keeping the daily rollups in sync with corrections to closed days."""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.attendance.models import AttendanceRecord
+from apps.donations.models import Donation
+
+
+def _refresh_days(*days):
+    from .services_rollup import RollupService
+
+    for day in sorted({d for d in days if d}):
+        RollupService.refresh_day_if_closed(day)
+
+
+@receiver(post_init, sender=Donation)
+def remember_donation_date(sender, instance, **kwargs):
+    """Keep the loaded date so a moved donation also refreshes its old day."""
+    instance._rollup_original_date = instance.__dict__.get('date')
+
+
+@receiver(post_save, sender=Donation)
+@receiver(post_delete, sender=Donation)
+def refresh_donation_rollup(sender, instance, **kwargs):
+    days = (instance.date, getattr(instance, '_rollup_original_date', None))
+    transaction.on_commit(lambda: _refresh_days(*days))
+    instance._rollup_original_date = instance.date
+
+
+@receiver(post_save, sender=AttendanceRecord)
+@receiver(post_delete, sender=AttendanceRecord)
+def refresh_attendance_rollup(sender, instance, **kwargs):
+    session_id = instance.session_id
+
+    def _refresh():
+        from apps.attendance.models import AttendanceSession
+        from .services_rollup import RollupService
+
+        if RollupService.watermark() is None:
+            return
+        day = AttendanceSession.all_objects.filter(pk=session_id).values_list(
+            'date', flat=True
+        ).first()
+        _refresh_days(day)
+
+    transaction.on_commit(_refresh)
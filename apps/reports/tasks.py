@@ -74,16 +74,38 @@ def send_scheduled_reports():
 
 
 @shared_task(name='reports.generate_report_pdf')
-def generate_report_pdf(report_type, filters=None):
+def generate_report_pdf(report_type, filters=None, user_id=None):
     """
-    Generate a PDF for a specific report type.
-    Returns the PDF content as bytes (for chaining or storage).
+    Generate a PDF for a specific report type as an ExportJob.
+
+    The file is kept in storage for EXPORT_JOB_EXPIRY_DAYS and, when
+    ``user_id`` is given, the requester follows progress over the
+    notification WebSocket and downloads it from the exports page.
     """
-    from apps.reports.services import ReportService, DashboardService
+    from django.contrib.auth import get_user_model
+
+    from apps.core.constants import ExportFormat, ExportJobType
+    from apps.core.services_export_jobs import ExportJobService
+
+    user = get_user_model().objects.filter(pk=user_id).first() if user_id else None
+    job = ExportJobService.create(
+        user, ExportJobType.REPORT, ExportFormat.PDF,
+        {'report_type': report_type, 'filters': filters or {}},
+    )
+    job = ExportJobService.run(job.pk)
+    return {'status': job.status, 'report_type': report_type, 'job_id': str(job.pk)}
+
+
+@shared_task(name='reports.refresh_daily_rollups')
+def refresh_daily_rollups():
+    """
+    Roll up every closed day since the last run into the Daily*Rollup
+    tables. Scheduled nightly via celery beat.
+    """
+    from apps.reports.services_rollup import RollupService
 
-    report_data = _generate_report_for_type(report_type, filters)
-    # For now, return the data dict (PDF generation would use xhtml2pdf)
-    return {'status': 'generated', 'report_type': report_type}
+    days = RollupService.refresh()
+    return f'Rolled up {days} day(s).'
 
 
 def _generate_report_for_type(report_type, filters=None):
@@ -0,0 +1,160 @@
+"""Tests for daily rollup maintenance and rollup-backed analytics."""
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from apps.attendance.services import AttendanceAnalyticsService
+from apps.attendance.tests.factories import AttendanceRecordFactory, AttendanceSessionFactory
+from apps.donations.services_analytics import GivingAnalyticsService
+from apps.donations.tests.factories import DonationFactory
+from apps.members.tests.factories import MemberFactory
+from apps.reports.models import (
+    DailyAttendanceRollup, DailyDonationRollup, DailyMembershipRollup,
+)
+from apps.reports.services import DashboardService
+from apps.reports.services_rollup import RollupService
+from apps.reports.tasks import refresh_daily_rollups
+
+
+@pytest.mark.django_db
+class TestRollupMaintenance:
+    """Tests for building the rollup tables."""
+
+    def test_refresh_without_data(self):
+        assert RollupService.refresh() == 0
+        assert RollupService.watermark() is None
+
+    def test_refresh_builds_closed_days(self):
+        today = timezone.localdate()
+        DonationFactory(amount=Decimal('20.00'), date=today - timedelta(days=3))
+        DonationFactory(amount=Decimal('30.00'), date=today - timedelta(days=3))
+        DonationFactory(amount=Decimal('99.00'), date=today)
+
+        days = RollupService.refresh()
+
+        assert days >= 3
+        assert RollupService.watermark() == today - timedelta(days=1)
+        rollup = DailyDonationRollup.objects.get(date=today - timedelta(days=3))
+        assert rollup.total_amount == Decimal('50.00')
+        assert rollup.donation_count == 2
+        assert not DailyDonationRollup.objects.filter(date=today).exists()
+
+    def test_refresh_is_incremental(self):
+        DonationFactory(date=timezone.localdate() - timedelta(days=2))
+        RollupService.refresh()
+        assert RollupService.refresh() == 0
+
+    def test_attendance_rollup_by_type(self):
+        day = timezone.localdate() - timedelta(days=1)
+        session = AttendanceSessionFactory(date=day)
+        AttendanceRecordFactory.create_batch(3, session=session)
+        RollupService.refresh()
+        rollup = DailyAttendanceRollup.objects.get(date=day, session_type=session.session_type)
+        assert rollup.session_count == 1
+        assert rollup.checkin_count == 3
+
+    def test_membership_rollup_row_per_day(self):
+        MemberFactory.create_batch(2)
+        DonationFactory(date=timezone.localdate() - timedelta(days=4))
+        RollupService.refresh()
+        assert DailyMembershipRollup.objects.count() == 4
+
+    def test_task(self):
+        DonationFactory(date=timezone.localdate() - timedelta(days=1))
+        assert refresh_daily_rollups() == 'Rolled up 1 day(s).'
+
+    def test_signal_refreshes_corrected_closed_day(self, django_capture_on_commit_callbacks):
+        day = timezone.localdate() - timedelta(days=2)
+        donation = DonationFactory(amount=Decimal('10.00'), date=day)
+        RollupService.refresh()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            donation.amount = Decimal('25.00')
+            donation.save()
+            DonationFactory(amount=Decimal('5.00'), date=day)
+
+        rollup = DailyDonationRollup.objects.get(date=day)
+        assert rollup.total_amount == Decimal('30.00')
+        assert rollup.donation_count == 2
+
+    def test_signal_moves_donation_between_days(self, django_capture_on_commit_callbacks):
+        old_day = timezone.localdate() - timedelta(days=3)
+        new_day = timezone.localdate() - timedelta(days=1)
+        donation = DonationFactory(date=old_day)
+        RollupService.refresh()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            donation.date = new_day
+            donation.save()
+
+        assert not DailyDonationRollup.objects.filter(date=old_day).exists()
+        assert DailyDonationRollup.objects.filter(date=new_day).exists()
+
+    def test_inactive_donations_are_not_rolled_up(self):
+        day = timezone.localdate() - timedelta(days=2)
+        DonationFactory(amount=Decimal('10.00'), date=day)
+        DonationFactory(amount=Decimal('90.00'), date=day, is_active=False)
+
+        RollupService.refresh()
+
+        rollup = DailyDonationRollup.objects.get(date=day)
+        assert rollup.total_amount == Decimal('10.00')
+        assert rollup.donation_count == 1
+
+
+@pytest.mark.django_db
+class TestRollupQueries:
+    """Rollup-backed queries must agree with the raw-table queries."""
+
+    def test_giving_trends_match_raw(self):
+        today = timezone.localdate()
+        DonationFactory(amount=Decimal('40.00'), date=today - timedelta(days=40))
+        DonationFactory(amount=Decimal('15.00'), date=today - timedelta(days=1))
+        RollupService.refresh()
+        DonationFactory(amount=Decimal('7.00'), date=today)
+
+        raw = GivingAnalyticsService.giving_trends('monthly')
+        rolled = GivingAnalyticsService.giving_trends('monthly', use_rollups=True)
+
+        assert [(r['period'], r['total'], r['count']) for r in rolled] == [
+            (r['period'], r['total'], r['count']) for r in raw
+        ]
+
+    def test_donation_trends_skip_inactive_raw_donations(self):
+        today = timezone.localdate()
+        DonationFactory(amount=Decimal('15.00'), date=today - timedelta(days=1))
+        RollupService.refresh()
+        DonationFactory(amount=Decimal('7.00'), date=today)
+        DonationFactory(amount=Decimal('50.00'), date=today, is_active=False)
+
+        rows = RollupService.donation_trends('month')
+
+        assert sum(row['total'] for row in rows) == Decimal('22.00')
+        assert sum(row['count'] for row in rows) == 2
+
+    def test_attendance_trends_match_raw(self):
+        today = timezone.localdate()
+        AttendanceRecordFactory.create_batch(
+            2, session=AttendanceSessionFactory(date=today - timedelta(days=8)),
+        )
+        RollupService.refresh()
+        AttendanceRecordFactory(session=AttendanceSessionFactory(date=today))
+
+        raw = AttendanceAnalyticsService.get_attendance_trends('weekly')
+        rolled = AttendanceAnalyticsService.get_attendance_trends('weekly', use_rollups=True)
+
+        assert [(r['period'], r['count']) for r in rolled] == [
+            (r['period'], r['count']) for r in raw
+        ]
+
+    def test_member_growth_matches_raw(self):
+        MemberFactory.create_batch(3)
+        DonationFactory(date=timezone.localdate() - timedelta(days=2))
+        RollupService.refresh()
+        MemberFactory()
+
+        raw = DashboardService.get_member_growth_trend()
+        rolled = DashboardService.get_member_growth_trend(use_rollups=True)
+        assert rolled == raw
@@ -67,6 +67,51 @@ class TestDashboardService:
         assert 'upcoming_birthdays' in summary
         assert 'generated_at' in summary
 
+    def test_get_dashboard_summary_query_budget(self, django_assert_max_num_queries):
+        MemberFactory.create_batch(3)
+        DonationFactory.create_batch(2)
+        EventFactory.create_batch(2)
+        HelpRequestFactory(status='new')
+        with django_assert_max_num_queries(20):
+            DashboardService.get_dashboard_summary(use_cache=False)
+
+    def test_get_dashboard_summary_memoizes_sections(self, django_assert_num_queries):
+        MemberFactory.create_batch(2, is_active=True)
+        first = DashboardService.get_dashboard_summary()
+        MemberFactory()
+        # Only the birthday lookup runs again; sections come from the cache
+        with django_assert_num_queries(1):
+            second = DashboardService.get_dashboard_summary()
+        assert second['members']['total'] == first['members']['total']
+
+        DashboardService.invalidate_cache()
+        third = DashboardService.get_dashboard_summary()
+        assert third['members']['total'] == first['members']['total'] + 1
+
+    def test_get_member_stats_new_this_month(self):
+        MemberFactory.create_batch(2)
+        stats = DashboardService.get_member_stats()
+        assert stats['new_this_month'] == 2
+        assert stats['new_this_year'] == 2
+
+    def test_get_event_stats_rsvps(self):
+        event = EventFactory(is_cancelled=False)
+        EventRSVPFactory(event=event, status='confirmed')
+        EventRSVPFactory(event=event, status='declined')
+        stats = DashboardService.get_event_stats()
+        assert stats['total_rsvps'] == 2
+        assert stats['confirmed_rsvps'] == 1
+
+    def test_get_onboarding_pipeline_stats(self):
+        from apps.core.constants import MembershipStatus
+
+        MemberFactory(membership_status=MembershipStatus.REGISTERED)
+        MemberFactory(membership_status=MembershipStatus.IN_TRAINING)
+        stats = DashboardService.get_onboarding_pipeline_stats()
+        assert stats['registered'] == 1
+        assert stats['in_training'] == 1
+        assert stats['total_in_process'] == 2
+
 
 @pytest.mark.django_db
 class TestReportService:
@@ -104,3 +149,16 @@ class TestReportService:
         assert report['total_shifts'] >= 2
         assert report['completed'] >= 1
         assert report['no_shows'] >= 1
+
+    def test_get_communication_stats_reads_counters(self):
+        from apps.communication.tests.factories import NewsletterFactory
+        NewsletterFactory(
+            status='sent', sent_at=timezone.now(),
+            recipients_count=100, opened_count=25,
+        )
+        stats = ReportService.get_communication_stats()
+        assert stats['total_sent'] == 1
+        assert stats['total_recipients'] == 100
+        assert stats['total_opened'] == 25
+        assert stats['open_rate'] == 25.0
+        assert stats['opens'] == [25]
@@ -14,59 +14,32 @@ logger = logging.getLogger(__name__)
 @shared_task
 def send_service_assignment_reminders():
     """Send reminders at 5d/3d/1d/same-day before a worship service."""
-    from .models import ServiceAssignment, WorshipService
-
-    now = timezone.now()
-    today = now.date()
-
-    # Get upcoming confirmed/planned services
-    upcoming_services = WorshipService.objects.filter(
-        date__gte=today,
-        status__in=[WorshipServiceStatus.PLANNED, WorshipServiceStatus.CONFIRMED],
-    )
-
-    total_sent = 0
-
-    for service in upcoming_services:
-        days_until = (service.date - today).days
-        assignments = ServiceAssignment.objects.filter(
-            section__service=service,
+    from apps.core.reminders import send_reminders
+    from .models import ServiceAssignment
+
+    def build(assignment, offset):
+        service = assignment.section.service
+        section = assignment.section.name
+        if offset == 5:
+            msg = f'Rappel: vous \u00eates assign\u00e9(e) au culte du {service.date:%d/%m/%Y} dans 5 jours.'
+        elif offset == 3:
+            msg = f'Rappel: le culte du {service.date:%d/%m/%Y} est dans 3 jours. Section: {section}.'
+        elif offset == 1:
+            msg = f'Rappel: le culte est DEMAIN ({service.date:%d/%m/%Y}). Section: {section}.'
+        else:
+            msg = f"C'est aujourd'hui! Culte \u00e0 {service.start_time:%H:%M}. Section: {section}."
+        return 'Rappel de culte', msg
+
+    total_sent = send_reminders(
+        ServiceAssignment.objects.filter(
+            section__service__status__in=[WorshipServiceStatus.PLANNED, WorshipServiceStatus.CONFIRMED],
             status__in=[AssignmentStatus.ASSIGNED, AssignmentStatus.CONFIRMED],
-        ).select_related('member', 'section')
-
-        for assignment in assignments:
-            sent = False
-
-            if days_until <= 5 and not assignment.reminder_5days_sent:
-                assignment.reminder_5days_sent = True
-                sent = True
-                msg = f'Rappel: vous \u00eates assign\u00e9(e) au culte du {service.date:%d/%m/%Y} dans 5 jours.'
-
-            elif days_until <= 3 and not assignment.reminder_3days_sent:
-                assignment.reminder_3days_sent = True
-                sent = True
-                msg = f'Rappel: le culte du {service.date:%d/%m/%Y} est dans 3 jours. Section: {assignment.section.name}.'
-
-            elif days_until <= 1 and not assignment.reminder_1day_sent:
-                assignment.reminder_1day_sent = True
-                sent = True
-                msg = f'Rappel: le culte est DEMAIN ({service.date:%d/%m/%Y}). Section: {assignment.section.name}.'
-
-            elif days_until == 0 and not assignment.reminder_sameday_sent:
-                assignment.reminder_sameday_sent = True
-                sent = True
-                msg = f"C'est aujourd'hui! Culte \u00e0 {service.start_time:%H:%M}. Section: {assignment.section.name}."
-
-            if sent:
-                assignment.save()
-                Notification.objects.create(
-                    member=assignment.member,
-                    title='Rappel de culte',
-                    message=msg,
-                    notification_type='general',
-                    link='/worship/my-assignments/',
-                )
-                total_sent += 1
+        ).select_related('member', 'section__service'),
+        'section__service__date',
+        build,
+        link='/worship/my-assignments/',
+        today=timezone.now().date(),
+    )
 
     logger.info(f'Sent {total_sent} worship service reminders.')
     return total_sent
@@ -77,6 +77,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'allauth.account.middleware.AccountMiddleware',
+    'apps.core.middleware.MemberProfileMiddleware',
     'apps.core.middleware.TwoFactorEnforcementMiddleware',
     'apps.core.middleware.MembershipAccessMiddleware',
     'waffle.middleware.WaffleMiddleware',
@@ -248,12 +249,32 @@ SPECTACULAR_SETTINGS = {
 }
 
 
+# Cache shared by the web workers and the Celery worker: unread counters,
+# cache version counters and other state written by one process and read by
+# another. Without REDIS_URL each process keeps its own memory cache.
+REDIS_URL = env('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'chms',
+        },
+    }
+
+
 CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = env('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Export jobs (incl. bulk PDF statements) run on their own worker started with
+# ``-Q exports --pool=threads``: prefork children are daemonic and cannot start
+# the PDF rendering process pool
+CELERY_TASK_ROUTES = {
+    'apps.core.tasks.run_export_job': {'queue': 'exports'},
+}
 
 
 EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
@@ -304,3 +325,55 @@ MEMBER_ROLES = [
     ('treasurer', 'Trésorier'),
     ('admin', 'Administrateur'),
 ]
+
+# Seconds each admin dashboard section stays memoized in the cache
+DASHBOARD_CACHE_TIMEOUT = env.int('DASHBOARD_CACHE_TIMEOUT', default=60)
+
+# Global search backend (dotted path); empty selects one from the database vendor
+SEARCH_BACKEND = env('SEARCH_BACKEND', default='')
+
+# Days a finished background export stays downloadable before its file is purged
+EXPORT_JOB_EXPIRY_DAYS = env.int('EXPORT_JOB_EXPIRY_DAYS', default=7)
+
+# Seconds a member's cached unread notification count lives before it is recounted
+NOTIFICATION_COUNT_CACHE_TIMEOUT = env.int('NOTIFICATION_COUNT_CACHE_TIMEOUT', default=86400)
+
+# Public base URL used for links in outgoing mail (e.g. newsletter open tracking)
+SITE_URL = env('SITE_URL', default='')
+
+# Newsletter delivery: recipients per Celery chunk and messages per second overall
+NEWSLETTER_CHUNK_SIZE = env.int('NEWSLETTER_CHUNK_SIZE', default=200)
+NEWSLETTER_SEND_RATE = env.int('NEWSLETTER_SEND_RATE', default=10)
+# Seconds a queued newsletter chunk holds its recipients past its scheduled start (renewed while sending)
+NEWSLETTER_CLAIM_TIMEOUT = env.int('NEWSLETTER_CLAIM_TIMEOUT', default=600)
+
+# Seconds the church branding stays cached (saves invalidate it immediately)
+BRANDING_CACHE_TIMEOUT = env.int('BRANDING_CACHE_TIMEOUT', default=3600)
+
+# Push / SMS fan-out: concurrent provider requests and requests per second overall
+PUSH_FANOUT_WORKERS = env.int('PUSH_FANOUT_WORKERS', default=8)
+PUSH_SEND_RATE = env.int('PUSH_SEND_RATE', default=50)
+SMS_FANOUT_WORKERS = env.int('SMS_FANOUT_WORKERS', default=4)
+SMS_SEND_RATE = env.int('SMS_SEND_RATE', default=10)
+
+# Automation step processor: enrollments per claimed batch and seconds before an unfinished claim expires
+AUTOMATION_BATCH_SIZE = env.int('AUTOMATION_BATCH_SIZE', default=200)
+AUTOMATION_CLAIM_TIMEOUT = env.int('AUTOMATION_CLAIM_TIMEOUT', default=900)
+
+# Processes rendering PDFs in bulk statement runs (0 = one per CPU)
+PDF_RENDER_WORKERS = env.int('PDF_RENDER_WORKERS', default=0)
+
+# Donation import: rows validated and inserted per batch (one transaction and one number range each)
+DONATION_IMPORT_BATCH_SIZE = env.int('DONATION_IMPORT_BATCH_SIZE', default=1000)
+
+# iCal subscription feed: days of past and upcoming events, and seconds each serialized event stays cached
+ICAL_FEED_PAST_DAYS = env.int('ICAL_FEED_PAST_DAYS', default=30)
+ICAL_FEED_FUTURE_DAYS = env.int('ICAL_FEED_FUTURE_DAYS', default=365)
+ICAL_FEED_CACHE_TIMEOUT = env.int('ICAL_FEED_CACHE_TIMEOUT', default=604800)
+
+# Recurring events: days ahead each series is materialized (extended daily by a beat task)
+EVENT_RECURRENCE_HORIZON_DAYS = env.int('EVENT_RECURRENCE_HORIZON_DAYS', default=90)
+
+# Calendar API: longest start/end window in days, and seconds each window's payload stays cached
+CALENDAR_MAX_WINDOW_DAYS = env.int('CALENDAR_MAX_WINDOW_DAYS', default=92)
+CALENDAR_CACHE_TIMEOUT = env.int('CALENDAR_CACHE_TIMEOUT', default=3600)
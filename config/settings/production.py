@@ -1,4 +1,6 @@
 """Django production settings for ÉgliseConnect."""
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *  # noqa: F401, F403
 
 DEBUG = False
@@ -29,6 +31,11 @@ DATABASES = {
     'default': env.db('DATABASE_URL'),  # noqa: F405
 }
 
+# Cache versions (branding, calendar) and counters are bumped by one worker
+# and read by the others, so production must not fall back to a per-process cache
+if not REDIS_URL:  # noqa: F405
+    raise ImproperlyConfigured('REDIS_URL must be set: the cache is shared between processes.')
+
 
 CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=[])  # noqa: F405
 
@@ -0,0 +1,12 @@
+"""Project-wide pytest fixtures."""
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    """Keep memoized service results from leaking between tests."""
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
@@ -7,10 +7,9 @@ def dz_static(request):
     # Add unread notification count for authenticated users
     if hasattr(request, 'user') and request.user.is_authenticated:
         if hasattr(request.user, 'member_profile'):
-            from apps.communication.models import Notification
-            context['unread_notification_count'] = Notification.objects.filter(
-                member=request.user.member_profile,
-                is_read=False,
-            ).count()
+            from apps.communication.services_unread import UnreadCountService
+            context['unread_notification_count'] = UnreadCountService.get(
+                request.user.member_profile,
+            )
 
     return context
@@ -81,6 +81,9 @@
                 case 'toast':
                     this.showToast(data.title, data.message, data.level, data.url);
                     break;
+                case 'export_progress':
+                    document.dispatchEvent(new CustomEvent('export-progress', { detail: data.job }));
+                    break;
             }
         },
 